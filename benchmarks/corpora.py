@@ -0,0 +1,101 @@
+import random
+from typing import List
+
+# Fixed seed so every run measures the same expressions
+SEED = 20240601
+
+
+def short_arithmetic(count: int = 200, seed: int = SEED) -> List[str]:
+    """
+    Short basic-mode expressions such as `12 + 7 * 3`.
+    """
+    rng = random.Random(seed)
+    operators = ["+", "-", "*", "/", "//", "%"]
+    return [
+        f"{rng.randint(1, 999)} {rng.choice(operators)} {rng.randint(1, 99)} "
+        f"{rng.choice(operators)} {rng.randint(1, 99)}"
+        for _ in range(count)
+    ]
+
+
+def nested_trig(count: int = 200, seed: int = SEED) -> List[str]:
+    """
+    Scientific-mode expressions with nested trigonometric and exponential calls.
+    """
+    rng = random.Random(seed + 1)
+    functions = ["sin", "cos", "tan", "atan", "sinh", "tanh", "exp", "sqrt", "log1p"]
+    expressions = []
+    for _ in range(count):
+        x = round(rng.uniform(0.1, 1.5), 3)
+        inner = f"{rng.choice(functions)}({x})"
+        for _ in range(rng.randint(2, 4)):
+            inner = f"{rng.choice(functions)}({inner} * {round(rng.uniform(0.1, 0.9), 2)})"
+        expressions.append(f"{inner} + hypot({x}, pi/4)")
+    return expressions
+
+
+def repeated_subterms(count: int = 200, seed: int = SEED) -> List[str]:
+    """
+    Generated scientific formulas that repeat subterms like `sqrt(x*x+y*y)` and contain `2*pi/360`.
+    """
+    rng = random.Random(seed + 4)
+    expressions = []
+    for _ in range(count):
+        x, y = round(rng.uniform(-10, 10), 3), round(rng.uniform(-10, 10), 3)
+        radius = f"sqrt({x}*{x}+{y}*{y})"
+        angle = f"atan2({y}, {x})"
+        expressions.append(
+            f"{radius} * cos({angle} + 2*pi/360*{rng.randint(1, 90)}) "
+            f"+ {radius} * sin({angle} + 2*pi/360*{rng.randint(1, 90)}) "
+            f"- {radius} / (1 + {radius})"
+        )
+    return expressions
+
+
+def combinatorics(count: int = 100, seed: int = SEED) -> List[str]:
+    """
+    Large-integer combinatorics: factorial, comb and perm with results of thousands of bits.
+    """
+    rng = random.Random(seed + 2)
+    expressions = []
+    for _ in range(count):
+        n = rng.randint(500, 3000)
+        k = rng.randint(1, n // 2)
+        choice = rng.randrange(3)
+        if choice == 0:
+            expressions.append(f"factorial({n}) % 1000000007")
+        elif choice == 1:
+            expressions.append(f"comb({n}, {k}) % 998244353")
+        else:
+            expressions.append(f"perm({n}, {k // 4 + 1}) % 1000003")
+    return expressions
+
+
+def modular_combinatorics(count: int = 100, seed: int = SEED) -> List[str]:
+    """
+    comb_mod and factorial_mod with n up to a million, whose exact values would have millions of bits.
+    """
+    rng = random.Random(seed + 5)
+    expressions = []
+    for _ in range(count):
+        n = rng.randint(10**5, 10**6)
+        if rng.randrange(4):
+            expressions.append(f"comb_mod({n}, {rng.randint(1, n // 2)}, 1000000007)")
+        else:
+            expressions.append(f"factorial_mod({n}, 998244353)")
+    return expressions
+
+
+def wide_bitwise(count: int = 200, seed: int = SEED) -> List[str]:
+    """
+    Programmer-mode expressions mixing hex/binary literals, shifts and masks on 64-bit values.
+    """
+    rng = random.Random(seed + 3)
+    expressions = []
+    for _ in range(count):
+        a, b, c = (rng.getrandbits(64) for _ in range(3))
+        shift = rng.randint(1, 63)
+        expressions.append(
+            f"((0x{a:X} ^ 0x{b:X}) >> {shift} | 0b{c & 0xFFFF:b}) & ~0x{rng.getrandbits(32):X} + {rng.randint(1, 1000)}"
+        )
+    return expressions
@@ -0,0 +1,348 @@
+"""
+# Calculator Benchmarks
+
+Standalone benchmark runner covering every calculator mode and evaluation path.
+It needs no network and no extra packages; NumPy-backed cases are skipped when
+NumPy is missing.
+
+## Usage
+
+    python -m benchmarks.run                       # run and compare against baseline.json
+    python -m benchmarks.run --save                # record a new baseline
+    python -m benchmarks.run --filter scientific   # only matching cases
+    python -m benchmarks.run --json results.json   # also write the raw results
+
+Each case reports ops/sec, p50/p99 latency per operation and peak traced memory.
+Every case first runs one untimed round with a cold cache; ops/sec comes from
+the fastest call of each input over the `--rounds` timed rounds that follow.
+When a baseline exists, cases whose ops/sec dropped by more than `--threshold`
+(default 25%) are reported as regressions and the exit code is 1. The baseline
+records its number of rounds, and runs with a different `--rounds` are refused.
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from . import corpora
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+class Case(NamedTuple):
+    name: str
+    function: Callable
+    inputs: List
+    # Operations performed by one call (e.g. array length for vectorized cases)
+    ops_per_call: int = 1
+
+
+class CaseResult(NamedTuple):
+    name: str
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    peak_kib: float
+    operations: int
+
+
+def _percentile(sorted_samples: List[float], fraction: float) -> float:
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def run_case(case: Case, rounds: int = 5) -> CaseResult:
+    """
+    Time every input of a case for `rounds` rounds, then measure peak memory in one extra round.
+
+    An untimed warm-up round runs first with a cold expression cache, so the
+    timed rounds measure the cached path, as in a replay of repeating formulas.
+    Ops/sec is taken from the fastest timed call of every input, which is the
+    least disturbed by other activity on the machine; p50/p99 cover every timed call.
+    """
+    from calcservice.expression_cache import expression_cache
+
+    expression_cache.clear()
+    function = case.function
+    for item in case.inputs:
+        function(item)
+
+    samples = []
+    best = [math.inf] * len(case.inputs)
+    clock = time.perf_counter_ns
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            for index, item in enumerate(case.inputs):
+                start = clock()
+                function(item)
+                elapsed = clock() - start
+                samples.append(elapsed)
+                best[index] = min(best[index], elapsed)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    expression_cache.clear()
+    tracemalloc.start()
+    try:
+        for item in case.inputs:
+            function(item)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    best_seconds = sum(best) / 1e9
+    return CaseResult(
+        case.name,
+        len(case.inputs) * case.ops_per_call / best_seconds if best_seconds else float("inf"),
+        _percentile(samples, 0.50) / 1e3,
+        _percentile(samples, 0.99) / 1e3,
+        peak / 1024,
+        len(samples) * case.ops_per_call,
+    )
+
+
+def build_cases() -> List[Case]:
+    """
+    Build the benchmark cases for every mode and evaluation path.
+    """
+    from calcservice.basic_calculator import evaluate_basic
+    from calcservice.combinatorics import comb
+    from calcservice.precision import evaluate_precise
+    from calcservice.programmer_calculator import evaluate_programmer, evaluate_programmer_many
+    from calcservice.scientific_calculator import build_functions, evaluate_scientific
+
+    functions = build_functions()
+    short = corpora.short_arithmetic()
+    trig = corpora.nested_trig()
+    combinatorics = corpora.combinatorics()
+    modular = corpora.modular_combinatorics()
+    repeated = corpora.repeated_subterms()
+    bitwise = corpora.wide_bitwise()
+
+    cases = [
+        Case("basic/short_arithmetic", evaluate_basic, short),
+        Case("scientific/short_arithmetic", lambda e: evaluate_scientific(e, functions), short),
+        Case("scientific/nested_trig", lambda e: evaluate_scientific(e, functions), trig),
+        Case("scientific/combinatorics", lambda e: evaluate_scientific(e, functions), combinatorics),
+        Case("scientific/modular_combinatorics", lambda e: evaluate_scientific(e, functions), modular),
+        Case("combinatorics/comb_100k", lambda k: comb(100_000, k), [10_000, 25_000, 50_000]),
+        Case("scientific/repeated_subterms", lambda e: evaluate_scientific(e, functions), repeated),
+        Case(
+            "scientific_optimized/repeated_subterms",
+            lambda e: evaluate_scientific(e, functions, optimize=True),
+            repeated,
+        ),
+        Case(
+            "scientific_optimized/nested_trig",
+            lambda e: evaluate_scientific(e, functions, optimize=True),
+            trig,
+        ),
+        Case("programmer/wide_bitwise_64", lambda e: evaluate_programmer(e, 64), bitwise),
+        Case("programmer/wide_bitwise_32_signed", lambda e: evaluate_programmer(e, 32, True), bitwise),
+        Case("precise/nested_trig_50", lambda e: evaluate_precise(e, 50), trig),
+        Case("precise/nested_trig_500", lambda e: evaluate_precise(e, 500), trig[:40]),
+        Case(
+            "programmer/bulk_64",
+            lambda chunk: evaluate_programmer_many(chunk, 64),
+            [bitwise[i : i + 50] for i in range(0, len(bitwise), 50)],
+            ops_per_call=50,
+        ),
+    ]
+
+    try:
+        import numpy as np
+    except ImportError:
+        return cases
+
+    from calcservice.bitwise_arrays import evaluate_bitwise_array
+    from calcservice.complex_calculator import vectorize_complex
+    from calcservice.numerics import integrate, solve_ivp
+    from calcservice.optimization import minimize
+    from calcservice.signals import FIRFilter, IIRFilter, lowpass_biquad, lowpass_fir
+    from calcservice.stats import StreamingStats
+    from calcservice.uncertainty import monte_carlo
+    from calcservice.units import convert
+    from calcservice.vectorized import evaluate_vectorized
+
+    points = [np.linspace(0.0, 10.0, 100_000) for _ in range(5)]
+    registers = [np.arange(1_000_000, dtype=np.uint32) * np.uint32(2654435761) for _ in range(5)]
+    frequencies = [np.linspace(1.0, 50.0, 1000) + i for i in range(3)]
+    damping = [np.linspace(0.0, 2.0, 1000) + i for i in range(3)]
+    sweeps = [2 * np.pi * np.logspace(1, 6, 1_000_000) * (1 + i) for i in range(3)]
+    impedance = vectorize_complex("R + j*w*L + 1/(j*w*C)", ["w", "R", "L", "C"])
+    signals = [np.random.default_rng(seed).normal(size=1_000_000) for seed in range(3)]
+    taps = lowpass_fir(1025, 0.05)
+    biquad = lowpass_biquad(0.05)
+    readings = [np.random.default_rng(seed).uniform(0.0, 150.0, 1_000_000) for seed in range(5)]
+    samples = [np.random.default_rng(seed).normal(size=(500_000, 2)) for seed in range(3)]
+    resistance_inputs = {"V": (12.0, 0.05), "I": (0.5, 0.01), "a": (0.0039, 0.0001), "T": (25.0, 0.5)}
+    rosenbrock_starts = [np.random.default_rng(seed).uniform(-2.0, 2.0, (2, 256)) for seed in range(3)]
+    cases += [
+        Case(
+            "vectorized/damped_sine_100k",
+            lambda x: evaluate_vectorized("sin(x)*exp(-x/tau)", x=x),
+            points,
+            ops_per_call=100_000,
+        ),
+        Case(
+            "bitwise_array/extract_nibble_1M",
+            lambda data: evaluate_bitwise_array("(x >> 4) & 0xF ^ x << 3", data, bits=32),
+            registers,
+            ops_per_call=1_000_000,
+        ),
+        Case(
+            "numerics/quad_batch_1k",
+            lambda k: integrate("sin(k*x)*exp(-x)", 0, 3, params={"k": k}),
+            frequencies,
+            ops_per_call=1000,
+        ),
+        Case(
+            "numerics/rk45_batch_1k",
+            lambda c: solve_ivp({"x": "v", "v": "-x - c*v"}, (0, 10), {"x": 1.0, "v": 0.0}, params={"c": c}),
+            damping,
+            ops_per_call=1000,
+        ),
+        Case(
+            "stats/streaming_update_1M",
+            lambda chunk: StreamingStats().update(chunk),
+            samples,
+            ops_per_call=1_000_000,
+        ),
+        Case(
+            "units/convert_1M",
+            lambda psi: convert(psi, "psi", "kPa"),
+            readings,
+            ops_per_call=1_000_000,
+        ),
+        Case(
+            "complex/impedance_sweep_1M",
+            lambda w: impedance(w=w, R=50.0, L=1e-3, C=1e-6),
+            sweeps,
+            ops_per_call=1_000_000,
+        ),
+        Case(
+            "signals/fir_1025_taps_1M",
+            lambda x: FIRFilter(taps).process(x),
+            signals,
+            ops_per_call=1_000_000,
+        ),
+        Case(
+            "signals/iir_biquad_1M",
+            lambda x: IIRFilter(*biquad).process(x),
+            signals,
+            ops_per_call=1_000_000,
+        ),
+        Case(
+            "optimization/bfgs_rosenbrock_256_starts",
+            lambda start: minimize("(1 - x)**2 + 100*(y - x**2)**2", {"x": start[0], "y": start[1]}),
+            rosenbrock_starts,
+            ops_per_call=256,
+        ),
+        Case(
+            "uncertainty/monte_carlo_1M",
+            lambda seed: monte_carlo("V / I * (1 + a*(T - 20))", resistance_inputs, seed=seed),
+            [0, 1, 2],
+            ops_per_call=1_000_000,
+        ),
+    ]
+    return cases
+
+
+def compare(results: List[CaseResult], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """
+    Return a message for every case whose ops/sec fell more than `threshold` below the baseline.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous:
+            continue
+        ratio = result.ops_per_sec / previous["ops_per_sec"]
+        if ratio < 1.0 - threshold:
+            regressions.append(
+                f"{result.name}: {result.ops_per_sec:,.0f} ops/s vs baseline "
+                f"{previous['ops_per_sec']:,.0f} ops/s ({(ratio - 1) * 100:+.1f}%)"
+            )
+    return regressions
+
+
+def _print_table(results: List[CaseResult], baseline: Dict[str, dict]) -> None:
+    header = f"{'case':<36} {'ops/sec':>14} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10} {'vs base':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        previous = baseline.get(r.name)
+        change = f"{(r.ops_per_sec / previous['ops_per_sec'] - 1) * 100:+.1f}%" if previous else "-"
+        print(
+            f"{r.name:<36} {r.ops_per_sec:>14,.0f} {r.p50_us:>10.2f} {r.p99_us:>10.2f} "
+            f"{r.peak_kib:>10.1f} {change:>9}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rounds", type=int, default=5, help="timed rounds per case")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare against")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed ops/sec drop (fraction)")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.rounds < 1:
+        parser.error("--rounds must be at least 1")
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline, encoding="utf-8") as f:
+            recorded = json.load(f)
+        # Timings from a different number of rounds are not comparable
+        if recorded.get("rounds") != args.rounds:
+            parser.error(
+                f"{args.baseline} was recorded with --rounds {recorded.get('rounds', 'unknown')}; "
+                f"rerun with the same --rounds or record a new baseline with --save"
+            )
+        baseline = recorded.get("cases", {})
+
+    cases = [case for case in build_cases() if args.filter in case.name]
+    results = [run_case(case, args.rounds) for case in cases]
+    _print_table(results, baseline)
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "rounds": args.rounds,
+        "cases": {r.name: r._asdict() for r in results},
+    }
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("\nRegressions:")
+        for message in regressions:
+            print("  " + message)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,44 @@
-import math
-import re
-from . basic_calculator import basic_calculator
-from . scientific_calculator import scientific_calculator
-from . programmer_calculator import programmer_calculator
-from . financial_calculator import financial_calculator
\ No newline at end of file
+import importlib
+import sys
+import types
+
+# Public name → submodule that defines it; submodules are imported on first access
+_LAZY_ATTRIBUTES = {
+    "basic_calculator": "basic_calculator",
+    "scientific_calculator": "scientific_calculator",
+    "programmer_calculator": "programmer_calculator",
+    "financial_calculator": "financial_calculator",
+    "engineering_calculator": "engineering_calculator",
+    "evaluate_basic": "basic_calculator",
+    "evaluate_scientific": "scientific_calculator",
+    "evaluate_programmer": "programmer_calculator",
+    "ExpressionError": "engine",
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+class _Package(types.ModuleType):
+    # Importing a submodule binds it on the package under its own name. The mode
+    # submodules share their name with their mode function, so keep the function
+    # there instead, as the eager imports used to.
+    def __setattr__(self, name, value):
+        if isinstance(value, types.ModuleType) and _LAZY_ATTRIBUTES.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,38 @@
+def require_numpy():
+    """
+    Import NumPy on first use, with a clear error when it isn't installed.
+
+    NumPy is only needed by the array-based features, so it is imported lazily
+    to keep `import calcservice` fast and dependency-free.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "This feature requires NumPy. Install it with: pip install numpy"
+        ) from None
+    return numpy
+
+
+def optional_scipy(submodule: str):
+    """
+    Return a SciPy submodule (e.g. `"special"`), or `None` when SciPy isn't installed.
+    """
+    try:
+        import importlib
+
+        return importlib.import_module(f"scipy.{submodule}")
+    except ImportError:
+        return None
+
+
+def require_scipy(submodule: str):
+    """
+    Import a SciPy submodule on first use, with a clear error when SciPy isn't installed.
+    """
+    module = optional_scipy(submodule)
+    if module is None:
+        raise ImportError(
+            "This feature requires SciPy. Install it with: pip install scipy"
+        )
+    return module
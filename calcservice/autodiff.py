@@ -0,0 +1,355 @@
+import math
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .engine import (
+    BINARY_OPERATORS,
+    DEFAULT_LIMITS,
+    BinOp,
+    Call,
+    Constant,
+    ExpressionError,
+    Limits,
+    Name,
+    Sequence,
+    UnaryOp,
+    _checked_calls,
+    _checked_operators,
+    parse,
+)
+from .expression_cache import expression_cache, normalize_expression
+from .optimizer import _node_key, _step, fold_constants, pure_functions
+
+_LN2 = math.log(2.0)
+_LN10 = math.log(10.0)
+_TWO_OVER_SQRT_PI = 2.0 / math.sqrt(math.pi)
+
+
+# Local derivatives of the scientific functions. Each rule takes the adjoint
+# `g` of the call's result, the argument values, the result and the function
+# table in use (scalar `math` or NumPy), and returns the adjoint contributed to
+# each argument. Table functions are looked up by name, so the same rule works
+# for floats and for arrays.
+_DERIVATIVES: Dict[str, Callable] = {
+    "sin": lambda g, x, r, F: (g * F["cos"](x[0]),),
+    "cos": lambda g, x, r, F: (-g * F["sin"](x[0]),),
+    "tan": lambda g, x, r, F: (g * (1 + r * r),),
+    "asin": lambda g, x, r, F: (g / F["sqrt"](1 - x[0] * x[0]),),
+    "acos": lambda g, x, r, F: (-g / F["sqrt"](1 - x[0] * x[0]),),
+    "atan": lambda g, x, r, F: (g / (1 + x[0] * x[0]),),
+    "atan2": lambda g, x, r, F: (
+        g * x[1] / (x[0] * x[0] + x[1] * x[1]),
+        -g * x[0] / (x[0] * x[0] + x[1] * x[1]),
+    ),
+    "sinh": lambda g, x, r, F: (g * F["cosh"](x[0]),),
+    "cosh": lambda g, x, r, F: (g * F["sinh"](x[0]),),
+    "tanh": lambda g, x, r, F: (g * (1 - r * r),),
+    "asinh": lambda g, x, r, F: (g / F["sqrt"](x[0] * x[0] + 1),),
+    "acosh": lambda g, x, r, F: (g / F["sqrt"](x[0] * x[0] - 1),),
+    "atanh": lambda g, x, r, F: (g / (1 - x[0] * x[0]),),
+    "exp": lambda g, x, r, F: (g * r,),
+    "exp2": lambda g, x, r, F: (g * r * _LN2,),
+    "expm1": lambda g, x, r, F: (g * (r + 1),),
+    "log": lambda g, x, r, F: (
+        (g / x[0],)
+        if len(x) == 1
+        else (g / (x[0] * F["log"](x[1])), -g * r / (x[1] * F["log"](x[1])))
+    ),
+    "log2": lambda g, x, r, F: (g / (x[0] * _LN2),),
+    "log10": lambda g, x, r, F: (g / (x[0] * _LN10),),
+    "log1p": lambda g, x, r, F: (g / (1 + x[0]),),
+    "sqrt": lambda g, x, r, F: (0.5 * g / r,),
+    "cbrt": lambda g, x, r, F: (g / (3 * r * r),),
+    "fabs": lambda g, x, r, F: (g * F["copysign"](1.0, x[0]),),
+    "copysign": lambda g, x, r, F: (g * F["copysign"](1.0, x[0]) * F["copysign"](1.0, x[1]), 0.0),
+    "hypot": lambda g, x, r, F: tuple(g * value / r for value in x),
+    "fmod": lambda g, x, r, F: (g, -g * F["trunc"](x[0] / x[1])),
+    "erf": lambda g, x, r, F: (g * _TWO_OVER_SQRT_PI * F["exp"](-x[0] * x[0]),),
+    "erfc": lambda g, x, r, F: (-g * _TWO_OVER_SQRT_PI * F["exp"](-x[0] * x[0]),),
+    "degrees": lambda g, x, r, F: (g * (180.0 / math.pi),),
+    "radians": lambda g, x, r, F: (g * (math.pi / 180.0),),
+    # Piecewise constant: zero almost everywhere
+    "ceil": lambda g, x, r, F: (0.0,),
+    "floor": lambda g, x, r, F: (0.0,),
+    "trunc": lambda g, x, r, F: (0.0,),
+}
+
+
+def differentiable_functions() -> frozenset:
+    """
+    Names of the scientific functions that gradients can be taken through.
+    """
+    return frozenset(_DERIVATIVES) | {"pow"}
+
+
+def _power_log(a, r, F):
+    # log(a) in the db term: a**b*log(a) tends to 0 where a**b is 0 (a = 0), and a negative
+    # base gives NaN, as NumPy's log does, instead of math's domain error
+    if isinstance(a, (int, float)):
+        if r == 0:
+            return 0.0
+        return F["log"](a) if a > 0 else math.nan
+    return F["log"](a + (r == 0))
+
+
+def _power_rule(base_active: bool, exponent_active: bool) -> Callable:
+    # d(a**b) = b*a**(b-1) da + a**b*log(a) db; the log is only taken when b varies
+    def rule(g, x, r, F):
+        a, b = x
+        return (
+            g * b * a ** (b - 1) if base_active else 0.0,
+            g * r * _power_log(a, r, F) if exponent_active else 0.0,
+        )
+
+    return rule
+
+
+_BINARY_RULES = {
+    "+": lambda g, x, r, F: (g, g),
+    "-": lambda g, x, r, F: (g, -g),
+    "*": lambda g, x, r, F: (g * x[1], g * x[0]),
+    "/": lambda g, x, r, F: (g / x[1], -g * r / x[1]),
+    "%": lambda g, x, r, F: (g, -g * F["floor"](x[0] / x[1])),
+    "//": lambda g, x, r, F: (0.0, 0.0),
+}
+
+_UNARY_RULES = {
+    "-": lambda g, x, r, F: (-g,),
+    "+": lambda g, x, r, F: (g,),
+}
+
+
+class Gradient:
+    """
+    An expression compiled for its value and its gradient, by reverse-mode automatic differentiation.
+
+    The parsed tree is folded and hash-consed into slots as in
+    `optimizer.OptimizedExpression`; a call runs the forward steps, then
+    sweeps the slots that depend on a variable once in reverse, applying the
+    chain rule. Nothing is re-parsed and no derivative expressions are built,
+    so a gradient costs a small constant multiple of one evaluation. Values
+    may be floats or NumPy arrays (with the vectorized function table), in
+    which case a whole batch of points is differentiated in one pass.
+
+    ## Example
+
+    ```python
+    rosenbrock = compile_gradient("(1 - x)**2 + 100*(y - x**2)**2", ["x", "y"])
+    rosenbrock(dict(build_functions(), x=0.5, y=0.5))  # (6.5, (-51.0, 50.0))
+    ```
+    """
+
+    __slots__ = ("source", "variables", "tree", "_template", "_steps", "_backward", "_positions")
+
+    def __init__(self, source, variables, tree, template, steps, backward, positions) -> None:
+        self.source = source
+        self.variables = variables
+        self.tree = tree
+        self._template = template
+        self._steps = steps
+        self._backward = backward
+        self._positions = positions
+
+    def __call__(self, namespace) -> Tuple[Any, Tuple[Any, ...]]:
+        """
+        Return `(value, gradient)`, where `gradient` has one entry per variable, in order.
+
+        `namespace` must hold the function table and the variables' values.
+        """
+        values = self._template.copy()
+        append = values.append
+        for step in self._steps:
+            append(step(values, namespace))
+        adjoints = [None] * len(values)
+        adjoints[-1] = 1.0
+        for position, children, targets, rule in self._backward:
+            g = adjoints[position]
+            if g is None:
+                continue
+            contributions = rule(g, [values[child] for child in children], values[position], namespace)
+            for target, contribution in zip(targets, contributions):
+                if target is None:
+                    continue
+                previous = adjoints[target]
+                adjoints[target] = contribution if previous is None else previous + contribution
+        gradient = tuple(
+            0.0 if position is None or adjoints[position] is None else adjoints[position]
+            for position in self._positions
+        )
+        return values[-1], gradient
+
+    def __repr__(self) -> str:
+        return f"Gradient({self.source!r}, variables={list(self.variables)!r})"
+
+
+def _compile_gradient(source: str, tree, variables: Tuple[str, ...], functions: dict, limits: Limits) -> Gradient:
+    # A variable may shadow a table constant such as `e`; it must not be folded
+    functions = {name: value for name, value in functions.items() if name not in variables}
+    pure = pure_functions(functions)
+    tree, _ = fold_constants(tree, functions, pure, limits)
+    binary = dict(BINARY_OPERATORS)
+    binary.update(_checked_operators(limits))
+    checks = _checked_calls(limits)
+    max_bits = limits.max_int_bits
+
+    # Hash-cons into slots: constants first (the template), then computed nodes in post-order
+    constants, nodes, slots = [], [], {}
+
+    def visit(node):
+        kind = type(node)
+        if kind is BinOp:
+            children = (visit(node.left), visit(node.right))
+        elif kind is UnaryOp:
+            children = (visit(node.operand),)
+        elif kind is Call:
+            children = tuple(visit(arg) for arg in node.args) + tuple(visit(value) for _, value in node.keywords)
+        elif kind is Sequence:
+            children = tuple(visit(item) for item in node.items)
+        else:
+            children = ()
+        key = _node_key(node, children)
+        slot = slots.get(key)
+        if slot is None:
+            if kind is Constant:
+                slot = ("c", len(constants))
+                constants.append(node.value)
+            else:
+                slot = ("n", len(nodes))
+                nodes.append((node, children))
+            slots[key] = slot
+        return slot
+
+    visit(tree)
+    if type(tree) is Constant:
+        nodes.append((tree, ()))
+    offset = len(constants)
+
+    def index(slot):
+        return slot[1] if slot[0] == "c" else offset + slot[1]
+
+    steps, backward = [], []
+    active = set()  # slots whose value depends on a variable
+    positions = {}
+    for node, children in nodes:
+        children = [index(child) for child in children]
+        position = offset + len(steps)
+        steps.append(_step(node, children, binary, checks, max_bits))
+        kind = type(node)
+        if kind is Name:
+            if node.id in variables:
+                active.add(position)
+                positions[node.id] = position
+            continue
+        varying = [child in active for child in children]
+        if not any(varying):
+            continue
+        active.add(position)
+        if kind is BinOp:
+            if node.op == "**":
+                rule = _power_rule(*varying)
+            elif node.op in _BINARY_RULES:
+                rule = _BINARY_RULES[node.op]
+            else:
+                raise ExpressionError(f"cannot differentiate the '{node.op}' operator")
+        elif kind is UnaryOp:
+            if node.op not in _UNARY_RULES:
+                raise ExpressionError(f"cannot differentiate the '{node.op}' operator")
+            rule = _UNARY_RULES[node.op]
+        elif kind is Call:
+            if node.keywords:
+                raise ExpressionError(f"cannot differentiate '{node.func}' with keyword arguments")
+            if node.func == "pow" and len(node.args) == 2:
+                rule = _power_rule(*varying)
+            elif node.func in _DERIVATIVES:
+                rule = _DERIVATIVES[node.func]
+            else:
+                raise ExpressionError(f"cannot differentiate '{node.func}'")
+        else:
+            raise ExpressionError("cannot differentiate lists")
+        # Children that don't depend on a variable receive no adjoint
+        targets = tuple(child if varying[i] else None for i, child in enumerate(children))
+        backward.append((position, tuple(children), targets, rule))
+    backward.reverse()
+    positions = tuple(positions.get(name) for name in variables)
+    return Gradient(source, variables, tree, constants, steps, backward, positions)
+
+
+def compile_gradient(
+    expression: str,
+    variables: Iterable[str],
+    functions: Optional[dict] = None,
+    limits: Limits = DEFAULT_LIMITS,
+) -> Gradient:
+    """
+    Parse an expression once and compile its value-and-gradient function with respect to `variables`.
+
+    Compiled gradients are kept in the shared expression cache. Names that
+    are neither variables nor in the table (e.g. parameters) are read from
+    the namespace at each call and treated as constants.
+
+    ## Error Handling
+
+    - Raises `ExpressionError` for syntax errors, unknown functions and
+      subexpressions of the variables that have no derivative (`factorial`,
+      `gamma`, bitwise operators, ...)
+    """
+    if functions is None:
+        from .scientific_calculator import build_functions
+
+        functions = build_functions()
+    variables = tuple(variables)
+    text = normalize_expression(expression)
+
+    def build():
+        tree = parse(text, None, limits)
+        _check_calls(tree, functions)
+        return _compile_gradient(text, tree, variables, functions, limits)
+
+    return expression_cache.get_or_compile(("gradient", text, variables, limits), build)
+
+
+def _check_calls(tree, functions: dict) -> None:
+    kind = type(tree)
+    if kind is Call:
+        if not callable(functions.get(tree.func)):
+            raise ExpressionError(f"unknown function '{tree.func}'")
+        children = list(tree.args) + [value for _, value in tree.keywords]
+    elif kind is BinOp:
+        children = [tree.left, tree.right]
+    elif kind is UnaryOp:
+        children = [tree.operand]
+    elif kind is Sequence:
+        children = list(tree.items)
+    else:
+        children = []
+    for child in children:
+        _check_calls(child, functions)
+
+
+def gradient(expression: str, **values) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Evaluate an expression and its gradient with respect to every keyword argument.
+
+    Arrays (or lists) of values select the NumPy function table and give
+    the gradient at every point in one pass.
+
+    ## Examples
+
+    - `gradient("x**2 * y", x=3, y=2)` → `(18, {'x': 12, 'y': 9})`
+    - `gradient("sin(x)", x=np.linspace(0, 1, 5))[1]["x"]` - cos(x) at five points
+    - `gradient("hypot(x, y)", x=3.0, y=4.0)` → `(5.0, {'x': 0.6, 'y': 0.8})`
+    """
+    from .scientific_calculator import build_functions
+
+    if any(not isinstance(value, (int, float)) for value in values.values()):
+        from ._optional import require_numpy
+        from .vectorized import build_vectorized_functions
+
+        np = require_numpy()
+        namespace = dict(build_vectorized_functions())
+        namespace.update((name, np.asarray(value, dtype=float)) for name, value in values.items())
+    else:
+        namespace = dict(build_functions())
+        namespace.update(values)
+    compiled = compile_gradient(expression, tuple(values))
+    value, partials = compiled(namespace)
+    return value, dict(zip(compiled.variables, partials))
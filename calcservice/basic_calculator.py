@@ -1,3 +1,16 @@
+from .engine import compile_expression
+
+
+def evaluate_basic(expression: str):
+    """
+    Evaluate a basic arithmetic expression without any terminal I/O.
+
+    Only numeric literals and arithmetic/bitwise operators are allowed; names
+    and function calls are rejected with `ExpressionError`.
+    """
+    return compile_expression(expression, (), mode="basic").evaluate()
+
+
 def basic_calculator() -> None:
     """
     Basic Calculator Mode
@@ -28,8 +41,8 @@ def basic_calculator() -> None:
         if expression.lower() in ["exit"]:
             break
         try:
-            # Evaluate the expression
-            result = eval(expression)
+            # Evaluate with the safe expression engine (parsed trees are cached)
+            result = evaluate_basic(expression)
             print("-" * 50)
             print("The result is: ", result)
             print("-" * 50)
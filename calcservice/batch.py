@@ -0,0 +1,305 @@
+import json
+import math
+from decimal import Decimal
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from .basic_calculator import evaluate_basic
+from .profiling import Profiler
+from .result_cache import DEFAULT_MAX_BYTES, ResultCache
+from .programmer_calculator import evaluate_programmer
+from .scientific_calculator import build_functions, evaluate_scientific
+
+# Number of result lines joined into one write call
+WRITE_CHUNK_LINES = 1024
+
+# Number of records sent to a worker process at a time
+DEFAULT_CHUNK_SIZE = 2048
+
+# Largest integer (in bits) written out in decimal once it exceeds the str() digit limit;
+# decimal conversion is quadratic, so larger ones are written in hex
+MAX_DECIMAL_BITS = 1 << 18
+
+# Evaluator (and optional profiler and result cache) of the current worker process, built once by `_init_worker`
+_worker_evaluator = None
+_worker_profiler = None
+_worker_cache = None
+
+
+class BatchRecord(NamedTuple):
+    """
+    One expression read from the batch input.
+
+    `id` is taken from JSONL input when present, otherwise it is `None`.
+    """
+
+    line: int
+    expression: str
+    id: object = None
+
+
+def make_evaluator(
+    mode: str,
+    bits: int = 64,
+    signed: bool = False,
+    profiler: Optional[Profiler] = None,
+    cache: Optional[ResultCache] = None,
+):
+    """
+    Return a one-argument evaluation function for a calculator mode.
+
+    Per-mode tables (such as the scientific function table) are built once
+    here rather than once per expression. `bits` and `signed` only apply to
+    the programmer mode, whose results are dictionaries of every output format.
+    A `profiler` is supported for the scientific mode only. With a `cache`,
+    results are looked up in (and slow ones stored to) the persistent result cache.
+    """
+    if profiler is not None and mode != "scientific":
+        raise ValueError("profiling is only available for the scientific mode")
+    if mode == "basic":
+        evaluator = evaluate_basic
+    elif mode == "scientific":
+        if profiler is None:
+            functions = build_functions()
+            evaluator = lambda expression: evaluate_scientific(expression, functions)
+        else:
+            functions = profiler.instrument(build_functions())
+            evaluator = lambda expression: evaluate_scientific(expression, functions, profiler)
+    elif mode == "programmer":
+        evaluate_programmer("0", bits, signed)  # Validate the bit size up front
+        evaluator = lambda expression: evaluate_programmer(expression, bits, signed).to_dict()
+    else:
+        raise ValueError(f"unknown batch mode: {mode!r}")
+    if cache is None:
+        return evaluator
+    # Bit size and signedness only change programmer results
+    key = (bits, signed) if mode == "programmer" else (0, False)
+    return lambda expression: cache.get_or_compute(mode, expression, lambda: evaluator(expression), *key)
+
+
+def read_records(stream: IO[str], input_format: str = "auto") -> Iterator[BatchRecord]:
+    """
+    Stream expressions from a text file or stdin, one record per line.
+
+    ## Input Formats
+
+    - `text`: every non-blank line is an expression
+    - `jsonl`: every line is a JSON object with an `expression` key and an optional `id`
+    - `auto`: lines starting with `{` are read as JSONL, all others as text
+
+    Invalid JSON lines are yielded with the raw line as the expression so the
+    error is reported in the output instead of stopping the batch.
+    """
+    for number, line in enumerate(stream, 1):
+        text = line.strip()
+        if not text:
+            continue
+        if input_format == "jsonl" or (input_format == "auto" and text.startswith("{")):
+            try:
+                data = json.loads(text)
+                yield BatchRecord(number, str(data["expression"]), data.get("id"))
+            except (ValueError, KeyError, TypeError):
+                yield BatchRecord(number, text, None)
+        else:
+            yield BatchRecord(number, text)
+
+
+def evaluate_records(records: Iterable[BatchRecord], evaluator) -> Iterator[dict]:
+    """
+    Evaluate records lazily, turning each into a result dictionary.
+
+    Successful evaluations produce `{"expression": ..., "result": ...}`; failures
+    produce `{"expression": ..., "error": ...}`. The `id` is copied when present.
+    """
+    for record in records:
+        result = {"line": record.line}
+        if record.id is not None:
+            result["id"] = record.id
+        result["expression"] = record.expression
+        try:
+            result["result"] = evaluator(record.expression)
+        except Exception as e:
+            result["error"] = str(e)
+        yield result
+
+
+def _int_text(value: int) -> str:
+    # Decimal converts without the interpreter's str() digit limit, and without changing it
+    if value.bit_length() <= MAX_DECIMAL_BITS:
+        return str(Decimal(value))
+    return hex(value)
+
+
+def _strict(value):
+    # JSON has no NaN or infinity: report non-finite floats as None, like stats._plain.
+    # Integers too long for str() are written as strings of their digits.
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if type(value) is int:
+        try:
+            str(value)
+        except ValueError:
+            return _int_text(value)
+        return value
+    if isinstance(value, dict):
+        return {key: _strict(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_strict(item) for item in value]
+    return value
+
+
+def format_result(result: dict) -> str:
+    """
+    Serialize one result dictionary as a strict JSON line.
+
+    NaN and infinite results become `null`. Integers beyond the interpreter's
+    str() digit limit become strings: decimal digits up to `MAX_DECIMAL_BITS`
+    bits, `0x`-prefixed hex beyond that.
+    """
+    try:
+        try:
+            return json.dumps(result, default=str, allow_nan=False) + "\n"
+        except ValueError:
+            return json.dumps(_strict(result), default=str, allow_nan=False) + "\n"
+    except ValueError as e:
+        # e.g. other objects whose str() refuses their size
+        result = {key: value for key, value in result.items() if key != "result"}
+        result["error"] = f"result cannot be formatted: {e}"
+        return json.dumps(result, default=str) + "\n"
+
+
+def write_lines(lines: Iterable[str], stream: IO[str], chunk_lines: int = WRITE_CHUNK_LINES) -> int:
+    """
+    Write lines in chunks to cut per-line write overhead; returns the line count.
+    """
+    count = 0
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, chunk_lines))
+        if not chunk:
+            break
+        stream.write("".join(chunk))
+        count += len(chunk)
+    return count
+
+
+def _init_worker(mode: str, bits: int, signed: bool, profile: bool, cache: Optional[Tuple[str, int]]) -> None:
+    global _worker_evaluator, _worker_profiler, _worker_cache
+    _worker_profiler = Profiler() if profile else None
+    # Each process opens its own connection to the shared cache file
+    _worker_cache = ResultCache(*cache) if cache else None
+    _worker_evaluator = make_evaluator(mode, bits, signed, _worker_profiler, _worker_cache)
+
+
+def _format_results(results: Iterable[dict], profiler: Optional[Profiler]) -> Iterator[str]:
+    if profiler is None:
+        return map(format_result, results)
+    return profiler.format_results(results, format_result)
+
+
+def _evaluate_chunk(records: list):
+    results = evaluate_records(records, _worker_evaluator)
+    lines = list(_format_results(results, _worker_profiler))
+    if _worker_cache is not None:
+        _worker_cache.flush()
+    if _worker_profiler is None:
+        return lines, None
+    # Ship this chunk's counters back to the parent and start afresh
+    stats = _worker_profiler.stats()
+    _worker_profiler.reset()
+    return lines, stats
+
+
+def evaluate_parallel(
+    records: Iterable[BatchRecord],
+    mode: str,
+    workers: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    bits: int = 64,
+    signed: bool = False,
+    profiler: Optional[Profiler] = None,
+    cache: Optional[str] = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Iterator[str]:
+    """
+    Evaluate records in a process pool, yielding formatted JSON lines in input order.
+
+    The input is split into chunks of `chunk_size` records. Each worker builds
+    its evaluator (and function table) once at start-up. At most `2 * workers`
+    chunks are in flight, so memory stays bounded for unbounded input. With a
+    `profiler`, every worker profiles its chunks and the counters are merged into it.
+    With a `cache` path, every worker opens the persistent result cache there.
+    """
+    records = iter(records)
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    max_pending = 2 * workers
+
+    def collect(future):
+        lines, stats = future.result()
+        if stats is not None:
+            profiler.merge(stats)
+        return lines
+
+    initargs = (mode, bits, signed, profiler is not None, (cache, cache_max_bytes) if cache else None)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_evaluate_chunk, chunk))
+            # Wait for the oldest chunk first so output keeps input order
+            if len(pending) >= max_pending:
+                yield from collect(pending.popleft())
+        while pending:
+            yield from collect(pending.popleft())
+
+
+def run_batch(
+    input_stream: IO[str],
+    output_stream: IO[str],
+    mode: str = "scientific",
+    input_format: str = "auto",
+    evaluator=None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    bits: int = 64,
+    signed: bool = False,
+    profiler: Optional[Profiler] = None,
+    cache: Optional[str] = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+) -> int:
+    """
+    Evaluate every expression in `input_stream` and write JSONL results.
+
+    The pipeline is a chain of generators (read → evaluate → format → write),
+    so memory use stays flat regardless of the input size. Returns the number
+    of results written.
+
+    With `workers` greater than 1 the records are evaluated in chunks by a
+    process pool (see `evaluate_parallel`); output order is unchanged. A
+    `profiler` records parse/evaluate/format and per-function timings.
+    With a `cache` path, results persist in a `ResultCache` file shared by
+    later runs and by every worker process.
+
+    ## Example
+
+    ```
+    $ printf '2 + 3\\nsqrt(16)\\n' | python -m calcservice batch --mode scientific
+    {"line": 1, "expression": "2 + 3", "result": 5}
+    {"line": 2, "expression": "sqrt(16)", "result": 4.0}
+    ```
+    """
+    records = read_records(input_stream, input_format)
+    if workers > 1 and evaluator is None:
+        lines = evaluate_parallel(records, mode, workers, chunk_size, bits, signed, profiler, cache, cache_max_bytes)
+        return write_lines(lines, output_stream)
+
+    result_cache = ResultCache(cache, cache_max_bytes) if cache and evaluator is None else None
+    try:
+        if evaluator is None:
+            evaluator = make_evaluator(mode, bits, signed, profiler, result_cache)
+        results = evaluate_records(records, evaluator)
+        return write_lines(_format_results(results, profiler), output_stream)
+    finally:
+        if result_cache is not None:
+            result_cache.close()
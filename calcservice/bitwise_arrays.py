@@ -0,0 +1,191 @@
+from array import array
+from typing import Optional
+
+from ._optional import require_numpy
+from .engine import ExpressionError
+from .programmer_calculator import (
+    _LOAD,
+    _PUSH,
+    _UNARY,
+    _check_bits,
+    compile_programmer,
+)
+
+# Elements processed per chunk when streaming memory-mapped files (8 MiB of 64-bit values)
+DEFAULT_CHUNK_ELEMENTS = 1 << 20
+
+
+def _dtypes(bits: int, byteorder: str = "="):
+    np = require_numpy()
+    width = bits // 8
+    return np.dtype(f"{byteorder}u{width}"), np.dtype(f"{byteorder}i{width}")
+
+
+def as_registers(data, bits: int, byteorder: str = "="):
+    """
+    View a buffer as an unsigned fixed-width NumPy array without copying.
+
+    Accepts NumPy arrays, `array.array`, `bytes`/`bytearray`/`memoryview` and
+    memory-mapped arrays. Integer arrays (including `array.array` and typed
+    buffers) whose item size matches `bits` are reinterpreted in place; other
+    integer arrays are converted by value with wrap-around. Raw byte buffers
+    are read with the given `byteorder` (`"<"`, `">"` or native `"="`).
+    """
+    np = require_numpy()
+    unsigned, _ = _dtypes(bits, byteorder)
+    if not isinstance(data, np.ndarray):
+        view = memoryview(data)
+        if not isinstance(data, array) and view.format in ("B", "b", "c"):
+            return np.frombuffer(view.cast("B"), dtype=unsigned)
+        # A typed buffer, e.g. array.array("I"): a zero-copy array of its items
+        data = np.asarray(view)
+    if data.dtype.kind not in "iub":
+        raise TypeError(f"expected an integer array, got dtype {data.dtype}")
+    if data.dtype.itemsize == unsigned.itemsize:
+        return data.view(unsigned.newbyteorder(data.dtype.byteorder))
+    return data.astype(unsigned)
+
+
+def _shift_amounts(np, count, bits):
+    # Shift counts clamped to the register width, plus a mask of counts that clear every bit
+    count = np.asarray(count)
+    return np.minimum(count, bits - 1).astype(count.dtype), count >= bits
+
+
+def _run_array(program, arrays: dict, bits: int, signed: bool):
+    np = require_numpy()
+    unsigned, signed_dtype = _dtypes(bits)
+    mask = (1 << bits) - 1
+
+    def as_signed(value):
+        return np.asarray(value).view(signed_dtype)
+
+    def binary(op, left, right):
+        if op == "&":
+            return np.bitwise_and(left, right)
+        if op == "|":
+            return np.bitwise_or(left, right)
+        if op == "^":
+            return np.bitwise_xor(left, right)
+        if op == "+":
+            return np.add(left, right)
+        if op == "-":
+            return np.subtract(left, right)
+        if op == "*":
+            return np.multiply(left, right)
+        if op in ("/", "%"):
+            if not np.all(right):
+                raise ZeroDivisionError("integer division or modulo by zero")
+            if signed:
+                left, right = as_signed(left), as_signed(right)
+            result = np.floor_divide(left, right) if op == "/" else np.remainder(left, right)
+            return np.asarray(result).view(unsigned)
+        if op in ("<<", ">>"):
+            if signed and np.any(as_signed(right) < 0):
+                raise ExpressionError("negative shift count")
+            count, clears = _shift_amounts(np, right, bits)
+            if op == "<<":
+                return np.where(clears, unsigned.type(0), np.left_shift(left, count))
+            if signed:
+                # Arithmetic shift: clamping the count to bits - 1 already fills with the sign bit
+                return np.right_shift(as_signed(left), count.view(signed_dtype)).view(unsigned)
+            return np.where(clears, unsigned.type(0), np.right_shift(left, count))
+        raise ExpressionError(f"unsupported operator {op!r}")
+
+    stack = []
+    with np.errstate(over="ignore"):
+        for kind, value in program.instructions:
+            if kind == _PUSH:
+                stack.append(unsigned.type(value & mask))
+            elif kind == _LOAD:
+                try:
+                    stack.append(arrays[value])
+                except KeyError:
+                    raise ExpressionError(f"name '{value}' is not defined") from None
+            elif kind == _UNARY:
+                operand = stack.pop()
+                if value == "~":
+                    stack.append(np.invert(operand))
+                elif value == "-":
+                    stack.append(np.negative(operand))
+                else:
+                    stack.append(operand)
+            else:
+                right = stack.pop()
+                stack.append(binary(value, stack.pop(), right))
+
+    result = np.asarray(stack[0], dtype=unsigned)
+    return result.view(signed_dtype) if signed else result
+
+
+def evaluate_bitwise_array(expression: str, data, bits: int = 32, signed: bool = False, name: str = "x"):
+    """
+    Evaluate a programmer expression over every element of a fixed-width buffer.
+
+    The buffer is bound to `name` (default `x`) and the whole expression is
+    evaluated with NumPy ufuncs, one pass per operator, with no per-element
+    Python objects. Arithmetic wraps at `bits` exactly like `evaluate_programmer`,
+    and right shift, division and modulo use two's complement when `signed` is set.
+
+    ## Examples
+
+    - `evaluate_bitwise_array("(x >> 4) & 0xF", np.array([0xAB, 0xCD], np.uint8), bits=8)` → `[10, 12]`
+    - `evaluate_bitwise_array("~x", array.array("H", [0]), bits=16, signed=True)` → `[-1]`
+
+    Returns a `uint{bits}` array, or an `int{bits}` view when `signed` is set.
+    """
+    _check_bits(bits)
+    program = compile_programmer(expression)
+    if program.is_float:
+        raise ExpressionError("Floating point numbers are not supported in array mode.")
+    registers = as_registers(data, bits)
+    if not registers.dtype.isnative:
+        registers = registers.astype(registers.dtype.newbyteorder("="))
+    return _run_array(program, {name: registers}, bits, signed)
+
+
+def load_registers(path: str, bits: int = 32, byteorder: str = "=", mode: str = "r"):
+    """
+    Memory-map a binary register dump as a fixed-width unsigned array.
+    """
+    np = require_numpy()
+    unsigned, _ = _dtypes(bits, byteorder)
+    return np.memmap(path, dtype=unsigned, mode=mode)
+
+
+def evaluate_bitwise_file(
+    expression: str,
+    input_path: str,
+    output_path: Optional[str] = None,
+    bits: int = 32,
+    signed: bool = False,
+    byteorder: str = "=",
+    chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+    name: str = "x",
+) -> int:
+    """
+    Stream a memory-mapped binary dump through an expression in fixed-size chunks.
+
+    Results are written to `output_path` as raw values of the same width and
+    byte order. Only one chunk is resident at a time, so multi-GB dumps are
+    processed in a single pass in constant memory. Returns the element count.
+    """
+    _check_bits(bits)
+    program = compile_programmer(expression)
+    if program.is_float:
+        raise ExpressionError("Floating point numbers are not supported in array mode.")
+    unsigned, _ = _dtypes(bits, byteorder)
+    registers = load_registers(input_path, bits, byteorder)
+
+    output = open(output_path, "wb") if output_path else None
+    try:
+        for start in range(0, len(registers), chunk_elements):
+            # Convert the chunk to native byte order once, then evaluate it
+            chunk = registers[start : start + chunk_elements].astype(unsigned.newbyteorder("="))
+            result = _run_array(program, {name: chunk}, bits, signed)
+            if output is not None:
+                result.astype(unsigned).tofile(output)
+    finally:
+        if output is not None:
+            output.close()
+    return len(registers)
@@ -0,0 +1,249 @@
+import argparse
+import sys
+from typing import List, Optional
+
+# Buffer size for batch input and output files
+IO_BUFFER_SIZE = 1 << 20
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {text}")
+    return value
+
+
+def _open_input(path: str):
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8", buffering=IO_BUFFER_SIZE)
+
+
+def _open_output(path: str):
+    if path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", buffering=IO_BUFFER_SIZE)
+
+
+def _run_batch(args) -> int:
+    from .batch import run_batch
+    from .profiling import Profiler
+
+    if args.profile and args.mode != "scientific":
+        print("--profile is only available for the scientific mode", file=sys.stderr)
+        return 2
+    profiler = Profiler(slowest=args.profile_slowest) if args.profile else None
+    cache = None
+    if args.cache is not None:
+        from .result_cache import default_cache_path
+
+        cache = args.cache or default_cache_path()
+
+    input_stream = _open_input(args.input)
+    output_stream = _open_output(args.output)
+    try:
+        run_batch(
+            input_stream,
+            output_stream,
+            mode=args.mode,
+            input_format=args.format,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            bits=args.bits,
+            signed=args.signed,
+            profiler=profiler,
+            cache=cache,
+            cache_max_bytes=args.cache_size << 20,
+        )
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+        else:
+            output_stream.flush()
+    if profiler is not None:
+        profiler.dump(args.profile)
+    return 0
+
+
+def _run_server(args) -> int:
+    from .server import run_server
+
+    run_server(args.host, args.port, args.workers)
+    return 0
+
+
+def _run_bitwise(args) -> int:
+    from .bitwise_arrays import evaluate_bitwise_file
+
+    count = evaluate_bitwise_file(
+        args.expression,
+        args.input,
+        args.output,
+        bits=args.bits,
+        signed=args.signed,
+        byteorder={"little": "<", "big": ">", "native": "="}[args.byteorder],
+    )
+    print(f"processed {count} values", file=sys.stderr)
+    return 0
+
+
+def _run_cache(args) -> int:
+    import json
+
+    from .result_cache import ResultCache
+
+    with ResultCache(args.path) as cache:
+        if args.action == "clear":
+            cache.clear()
+        stats = cache.stats()
+    summary = {"path": cache.path, **stats._asdict()}
+    del summary["max_bytes"]  # a setting of the process that writes, not of the file
+    lookups = stats.hits + stats.misses
+    summary["hit_rate"] = stats.hits / lookups if lookups else None
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+def _quantiles(text: str) -> List[float]:
+    try:
+        values = [float(part) for part in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated fractions, got {text}") from None
+    if not all(0 <= value <= 1 for value in values):
+        raise argparse.ArgumentTypeError(f"quantiles must lie between 0 and 1, got {text}")
+    return values
+
+
+def _run_stats(args) -> int:
+    import json
+
+    from .stats import data_range, describe_file
+
+    options = {"workers": args.workers, "delimiter": args.delimiter, "dtype": args.dtype, "columns": args.columns}
+    if args.bins is not None and args.range is None:
+        # A first pass finds the range of the histogram
+        args.range = data_range(args.input, **options)
+    stats = describe_file(
+        args.input, bins=args.bins, range=args.range, correlation=not args.no_correlation, **options
+    )
+    json.dump(stats.summary(args.quantiles), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command-line parser for `python -m calcservice`.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m calcservice",
+        description="Non-interactive entry points for the calculator service.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch", help="evaluate newline-delimited expressions or JSONL and write JSONL results"
+    )
+    batch.add_argument("--mode", choices=["basic", "scientific", "programmer"], default="scientific")
+    batch.add_argument("--input", "-i", default="-", help="input file (default: stdin)")
+    batch.add_argument("--output", "-o", default="-", help="output file (default: stdout)")
+    batch.add_argument(
+        "--format", choices=["auto", "text", "jsonl"], default="auto", help="input format"
+    )
+    batch.add_argument(
+        "--bits", type=int, choices=[8, 16, 32, 64], default=64, help="bit size (programmer mode)"
+    )
+    batch.add_argument(
+        "--signed", action="store_true", help="two's complement arithmetic (programmer mode)"
+    )
+    batch.add_argument(
+        "--workers", "-j", type=_positive_int, default=1, help="number of worker processes"
+    )
+    batch.add_argument(
+        "--chunk-size",
+        type=_positive_int,
+        default=2048,
+        help="records sent to a worker at a time (with --workers)",
+    )
+    batch.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="record per-function and per-phase timings to a JSON file (scientific mode)",
+    )
+    batch.add_argument(
+        "--profile-slowest", type=_positive_int, default=10, help="slowest expressions to keep"
+    )
+    batch.add_argument(
+        "--cache",
+        metavar="FILE",
+        nargs="?",
+        const="",
+        default=None,
+        help="reuse results across runs from a persistent cache file "
+        "(default file: $CALCSERVICE_CACHE or ~/.cache/calcservice/results.sqlite3)",
+    )
+    batch.add_argument(
+        "--cache-size", type=_positive_int, default=256, metavar="MB", help="evict old results beyond this size"
+    )
+    batch.set_defaults(handler=_run_batch)
+
+    bitwise = commands.add_parser(
+        "bitwise", help="apply a programmer expression to every value of a binary dump"
+    )
+    bitwise.add_argument("expression", help="expression over x, e.g. '(x >> 4) & 0xF'")
+    bitwise.add_argument("--input", "-i", required=True, help="binary input file (memory-mapped)")
+    bitwise.add_argument("--output", "-o", help="binary output file")
+    bitwise.add_argument("--bits", type=int, choices=[8, 16, 32, 64], default=32)
+    bitwise.add_argument("--signed", action="store_true", help="two's complement arithmetic")
+    bitwise.add_argument("--byteorder", choices=["little", "big", "native"], default="native")
+    bitwise.set_defaults(handler=_run_bitwise)
+
+    stats = commands.add_parser(
+        "stats", help="summary statistics of a CSV, .npy or raw binary file in one streaming pass"
+    )
+    stats.add_argument("input", help="CSV, .npy or raw binary (.bin/.dat/.raw) file")
+    stats.add_argument(
+        "--workers", "-j", type=_positive_int, default=1, help="split the file across this many processes"
+    )
+    stats.add_argument("--delimiter", default=",", help="CSV field delimiter")
+    stats.add_argument("--dtype", default="float64", help="value type of raw binary files")
+    stats.add_argument("--columns", type=_positive_int, default=1, help="columns per row of raw binary files")
+    stats.add_argument(
+        "--quantiles", type=_quantiles, default=[0.01, 0.25, 0.5, 0.75, 0.99], help="e.g. 0.5,0.9,0.99"
+    )
+    stats.add_argument("--bins", type=_positive_int, help="add a histogram with this many bins")
+    stats.add_argument(
+        "--range", type=float, nargs=2, metavar=("LOW", "HIGH"), help="histogram range (default: min to max)"
+    )
+    stats.add_argument("--no-correlation", action="store_true", help="skip the correlation matrix")
+    stats.set_defaults(handler=_run_stats)
+
+    cache = commands.add_parser("cache", help="inspect or clear the persistent result cache")
+    cache.add_argument("action", choices=["stats", "clear"])
+    cache.add_argument("--path", help="cache file (default: $CALCSERVICE_CACHE or ~/.cache/calcservice/results.sqlite3)")
+    cache.set_defaults(handler=_run_cache)
+
+    serve = commands.add_parser("serve", help="run the HTTP/JSON calculation service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument(
+        "--workers",
+        "-j",
+        type=_positive_int,
+        default=None,
+        help="evaluate in this many worker processes (default: a thread pool)",
+    )
+    serve.set_defaults(handler=_run_server)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command-line interface and return the process exit code.
+    """
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
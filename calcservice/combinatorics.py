@@ -0,0 +1,468 @@
+import math
+import operator
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import compress
+from threading import Lock
+from typing import Iterator, Optional, Tuple
+
+# Below this, math.factorial is as fast as the prime-swing algorithm
+PRIME_SWING_MIN = 1 << 14
+
+# comb/perm of smaller k (or of k much smaller than n) go to math, which then wins
+KUMMER_MIN_K = 2048
+
+# Largest n whose primes are sieved (one byte per number while sieving)
+SIEVE_LIMIT = 1 << 25
+
+# Recent large factorials kept for reuse, in total bits
+FACTORIAL_CACHE_BITS = 1 << 28
+
+# A cached m! is extended to n! when n - m is at most n >> NEARBY_SHIFT
+NEARBY_SHIFT = 4
+
+# Largest n held in a modular factorial table (two machine words per entry)
+TABLE_LIMIT = 1 << 22
+
+# Moduli whose factorial tables are kept
+TABLE_CACHE_SIZE = 4
+
+# Most factors multiplied one by one for a modular result (about a second of work)
+MAX_PRODUCT_TERMS = 1 << 23
+
+# Largest C(n, k), in bits, computed exactly for comb_mod with a composite modulus and n above SIEVE_LIMIT
+MAX_EXACT_BITS = 1 << 22
+
+# Miller–Rabin bases that are deterministic below 3.3 · 10^24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Smallest strong pseudoprime to all of `_WITNESSES`; the modular functions only
+# take their prime-modulus paths below it
+_WITNESSES_BOUND = 3_317_044_064_679_887_385_961_981
+
+_lock = Lock()
+_primes = array("q")
+_sieved = 1
+_factorials: "OrderedDict[int, int]" = OrderedDict()
+_factorial_bits = 0
+
+
+def _primes_through(n: int) -> Tuple[array, int]:
+    # The shared sorted prime list (sieved to at least n) and the count of primes <= n
+    global _primes, _sieved
+    with _lock:
+        if n > _sieved:
+            limit = min(max(n, 2 * _sieved), max(n, SIEVE_LIMIT))
+            sieve = bytearray([1]) * (limit + 1)
+            sieve[:2] = b"\0\0"
+            for p in range(2, math.isqrt(limit) + 1):
+                if sieve[p]:
+                    sieve[p * p :: p] = bytes(len(range(p * p, limit + 1, p)))
+            _primes = array("q", compress(range(limit + 1), sieve))
+            _sieved = limit
+        primes = _primes
+    return primes, bisect_right(primes, n)
+
+
+def _product(values, lo: int, hi: int) -> int:
+    # Balanced product tree: multiplies numbers of similar size, which big integers do fastest
+    if hi - lo <= 16:
+        return math.prod(values[lo:hi])
+    middle = (lo + hi) // 2
+    return _product(values, lo, middle) * _product(values, middle, hi)
+
+
+def _power_product(pairs) -> int:
+    # Π p^e as Horner's scheme over the bits of the exponents: square, then
+    # multiply in the primes whose exponent has that bit, so every product is balanced
+    groups = {}
+    for p, exponent in pairs:
+        bit = 0
+        while exponent:
+            if exponent & 1:
+                groups.setdefault(bit, []).append(p)
+            exponent >>= 1
+            bit += 1
+    result = 1
+    for bit in range(max(groups, default=-1), -1, -1):
+        primes = groups.get(bit, ())
+        result = result * result * _product(primes, 0, len(primes))
+    return result
+
+
+def _swing(n: int) -> int:
+    # Luschny's prime swing n! / ((n//2)!)^2, as a product of prime powers
+    primes, count = _primes_through(n)
+    root = math.isqrt(n)
+    factors = []
+    for p in primes[: bisect_right(primes, root, 0, count)]:
+        q, power = n, 1
+        while q:
+            q //= p
+            if q & 1:
+                power *= p
+        if power > 1:
+            factors.append(power)
+    # Between sqrt(n) and n a prime appears at most once; none in (n/3, n/2]
+    start = bisect_right(primes, root, 0, count)
+    factors.extend(p for p in primes[start : bisect_right(primes, n // 3, 0, count)] if (n // p) & 1)
+    factors.extend(primes[bisect_right(primes, n // 2, 0, count) : count])
+    return _product(factors, 0, len(factors))
+
+
+def _swing_factorial(n: int) -> int:
+    if n < PRIME_SWING_MIN:
+        return math.factorial(n)
+    return _swing_factorial(n // 2) ** 2 * _swing(n)
+
+
+def _remember(n: int, value: int) -> None:
+    global _factorial_bits
+    bits = value.bit_length()
+    if bits > FACTORIAL_CACHE_BITS:
+        return
+    with _lock:
+        if n in _factorials:
+            return
+        _factorials[n] = value
+        _factorial_bits += bits
+        while _factorial_bits > FACTORIAL_CACHE_BITS:
+            _, old = _factorials.popitem(last=False)
+            _factorial_bits -= old.bit_length()
+
+
+def _nearby(n: int) -> Optional[Tuple[int, int]]:
+    # The largest cached m! with m <= n close enough to extend by a short product
+    with _lock:
+        best = max((m for m in _factorials if n - (n >> NEARBY_SHIFT) <= m <= n), default=None)
+        if best is None:
+            return None
+        _factorials.move_to_end(best)
+        return best, _factorials[best]
+
+
+def factorial(n) -> int:
+    """
+    n!, exactly as `math.factorial`, by the prime-swing algorithm for large n.
+
+    Large results are memoized (up to `FACTORIAL_CACHE_BITS` in total), and
+    a request near a memoized value extends it by the short product in
+    between, so repeated factorials of nearby values cost little.
+
+    ## Error Handling
+
+    - Raises `ValueError` for negative n and `TypeError` for non-integers, as `math.factorial` does
+    """
+    n = operator.index(n)
+    if n < 0:
+        raise ValueError("factorial() not defined for negative values")
+    if n < PRIME_SWING_MIN or n > SIEVE_LIMIT:
+        return math.factorial(n)
+    found = _nearby(n)
+    if found is None:
+        value = _swing_factorial(n)
+    else:
+        m, value = found
+        if m == n:
+            return value
+        value *= _product(range(m + 1, n + 1), 0, n - m)
+    _remember(n, value)
+    return value
+
+
+def _check_nk(n, k) -> Tuple[int, int]:
+    n, k = operator.index(n), operator.index(k)
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if k < 0:
+        raise ValueError("k must be a non-negative integer")
+    return n, k
+
+
+def _use_kummer(n: int, k: int) -> bool:
+    return k >= KUMMER_MIN_K and 64 * k >= n and n <= SIEVE_LIMIT
+
+
+def _comb_exponents(n: int, k: int) -> Iterator[Tuple[int, int]]:
+    # Kummer: the power of p in C(n, k) is the number of carries adding k and n - k in base p
+    primes, count = _primes_through(n)
+    root = math.isqrt(n)
+    m = n - k
+    small = bisect_right(primes, root, 0, count)
+    for p in primes[:small]:
+        exponent, a, b, c = 0, n, k, m
+        while a:
+            a, b, c = a // p, b // p, c // p
+            exponent += a - b - c
+        if exponent:
+            yield p, exponent
+    for p in primes[small:count]:
+        if n // p - k // p - m // p:
+            yield p, 1
+
+
+def _perm_exponents(n: int, k: int) -> Iterator[Tuple[int, int]]:
+    # Legendre: the power of p in n! / (n - k)!
+    primes, count = _primes_through(n)
+    m = n - k
+    for p in primes[:count]:
+        exponent, a, c = 0, n, m
+        while a:
+            a, c = a // p, c // p
+            exponent += a - c
+        if exponent:
+            yield p, exponent
+
+
+def comb(n, k) -> int:
+    """
+    Number of ways to choose k items from n, exactly as `math.comb`.
+
+    Large cases are computed from the prime factorization of C(n, k)
+    (Kummer's theorem) with balanced products, which is much faster than
+    `math.comb` when k and n - k are both large.
+    """
+    n, k = _check_nk(n, k)
+    if k > n:
+        return 0
+    k = min(k, n - k)
+    if not _use_kummer(n, k):
+        return math.comb(n, k)
+    return _power_product(_comb_exponents(n, k))
+
+
+def perm(n, k=None) -> int:
+    """
+    Number of ordered arrangements of k items from n, exactly as `math.perm`.
+
+    `perm(n)` is `factorial(n)`; large cases use the prime factorization of n! / (n - k)!.
+    """
+    if k is None:
+        return factorial(n)
+    n, k = _check_nk(n, k)
+    if k > n:
+        return 0
+    if not _use_kummer(n, k):
+        return math.perm(n, k)
+    return _power_product(_perm_exponents(n, k))
+
+
+# Modular arithmetic
+
+
+def is_prime(n) -> bool:
+    """
+    Primality by Miller–Rabin, deterministic for n below 3.3 · 10^24 and a
+    probable-prime test above.
+    """
+    n = operator.index(n)
+    if n < 2:
+        return False
+    for p in _WITNESSES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for a in _WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+class _FactorialTable:
+    # i! mod p and their inverses for i below `size`, grown by doubling
+    def __init__(self, p: int) -> None:
+        self.p = p
+        self.typecode = "Q" if p < 1 << 64 else None
+        self.factorials = self._new([1])
+        self.inverses = self._new([1])
+        self.lock = Lock()
+
+    def _new(self, values):
+        return array(self.typecode, values) if self.typecode else list(values)
+
+    def entries(self, n: int):
+        # (factorials, inverses) covering 0..n, for n < p
+        with self.lock:
+            size = len(self.factorials)
+            if n >= size:
+                p = self.p
+                target = min(max(n + 1, 2 * size), p, TABLE_LIMIT + 1)
+                factorials = self.factorials
+                value = factorials[-1]
+                for i in range(size, target):
+                    value = value * i % p
+                    factorials.append(value)
+                inverses = self._new([0]) * target
+                inverse = pow(value, -1, p)
+                for i in range(target - 1, 0, -1):
+                    inverses[i] = inverse
+                    inverse = inverse * i % p
+                inverses[0] = 1
+                self.inverses = inverses
+            return self.factorials, self.inverses
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _table(p: int) -> _FactorialTable:
+    return _FactorialTable(p)
+
+
+def _product_mod(start: int, stop: int, m: int) -> int:
+    # start * (start + 1) * ... * (stop - 1) mod m, a few dozen factors per reduction
+    result = 1
+    for low in range(start, stop, 32):
+        if low - start >= MAX_PRODUCT_TERMS:
+            raise ValueError(f"the result needs more than {MAX_PRODUCT_TERMS} multiplications")
+        result = result * math.prod(range(low, min(low + 32, stop))) % m
+        if not result:
+            break
+    return result
+
+
+def _check_modulus(m) -> int:
+    m = operator.index(m)
+    if m < 1:
+        raise ValueError("the modulus must be a positive integer")
+    return m
+
+
+def _is_small_prime(m: int) -> bool:
+    # Only a proven prime may use Fermat, Wilson or Lucas
+    return m < _WITNESSES_BOUND and is_prime(m)
+
+
+def _factorial_mod_prime(n: int, p: int) -> int:
+    # n < p
+    if n <= TABLE_LIMIT:
+        return _table(p).entries(n)[0][n]
+    rest = p - 1 - n
+    if rest < n:
+        # Wilson: (p-1)! = -1, and (n+1)...(p-1) = (-1)^rest · rest! (mod p)
+        tail = _factorial_mod_prime(rest, p) if rest <= TABLE_LIMIT else _product_mod(2, rest + 1, p)
+        sign = -1 if rest & 1 else 1
+        return -sign * pow(tail, -1, p) % p
+    return _product_mod(2, n + 1, p)
+
+
+def factorial_mod(n, m) -> int:
+    """
+    n! mod m, without computing n!.
+
+    For a prime m below 3.3 · 10^24 the values come from a table of factorials mod m that is
+    built once per modulus (and grown on demand); n close to m uses
+    Wilson's theorem. Any n >= m gives 0.
+
+    ## Examples
+
+    - `factorial_mod(10**6, 10**9 + 7)` → 641102369
+    - `factorial_mod(10, 7)` → 0
+
+    ## Error Handling
+
+    - Raises `ValueError` for negative n or a modulus below 1, and when the
+      result would need more than `MAX_PRODUCT_TERMS` multiplications
+    """
+    n, m = operator.index(n), _check_modulus(m)
+    if n < 0:
+        raise ValueError("factorial() not defined for negative values")
+    if m == 1 or n >= m:
+        return 0
+    if _is_small_prime(m):
+        return _factorial_mod_prime(n, m)
+    return _product_mod(2, n + 1, m)
+
+
+def _comb_mod_prime_small(n: int, k: int, p: int) -> int:
+    # C(n, k) mod p for n < p
+    k = min(k, n - k)
+    if n <= TABLE_LIMIT:
+        factorials, inverses = _table(p).entries(n)
+        return factorials[n] * inverses[k] % p * inverses[n - k] % p
+    numerator = _product_mod(n - k + 1, n + 1, p)
+    return numerator * pow(_factorial_mod_prime(k, p), -1, p) % p
+
+
+def _factorial_terms(n: int, p: int) -> int:
+    # Multiplications `_factorial_mod_prime(n, p)` does beyond the cached tables
+    if n <= TABLE_LIMIT:
+        return 0
+    rest = p - 1 - n
+    return _factorial_terms(rest, p) if rest < n else n
+
+
+def _comb_terms(n: int, k: int, p: int) -> int:
+    # Multiplications `_comb_mod_prime_small(n, k, p)` does beyond the cached tables
+    k = min(k, n - k)
+    if n <= TABLE_LIMIT:
+        return 0
+    return k + _factorial_terms(k, p)
+
+
+def comb_mod(n, k, m) -> int:
+    """
+    C(n, k) mod m, without computing C(n, k).
+
+    - prime m below 3.3 · 10^24: factorial and inverse-factorial tables mod m, built once per
+      modulus; when n >= m, Lucas' theorem splits the problem into base-m digits
+    - other m: the prime factorization of C(n, k) (Kummer's theorem), one
+      modular power per prime
+
+    The result equals `comb(n, k) % m`.
+
+    ## Examples
+
+    - `comb_mod(10**6, 5*10**5, 10**9 + 7)` → 996692777
+    - `comb_mod(10**18, 10**9, 13)` - Lucas' theorem
+
+    ## Error Handling
+
+    - Raises `ValueError` for negative n or k, or a modulus below 1, and `TypeError` for non-integers
+    - Raises `ValueError` when the result would need more than `MAX_PRODUCT_TERMS`
+      multiplications, or (composite m, n above `SIEVE_LIMIT`) an exact C(n, k)
+      of more than `MAX_EXACT_BITS` bits. With Lucas' theorem the multiplications
+      of all digits share one budget, and splitting off each digit counts as
+      one multiplication per 64 bits of the remaining n.
+    """
+    n, k = _check_nk(n, k)
+    m = _check_modulus(m)
+    if k > n or m == 1:
+        return 0
+    k = min(k, n - k)
+    if _is_small_prime(m):
+        result = 1
+        terms = 0
+        # Lucas: C(n, k) = Π C(n_i, k_i) over the base-m digits; digits of n beyond k's contribute 1
+        while k:
+            n, n_digit = divmod(n, m)
+            k, k_digit = divmod(k, m)
+            if k_digit > n_digit:
+                return 0
+            # Each digit costs a division of n, linear in its size, on top of its own products
+            terms += (n.bit_length() >> 6) + 1 + _comb_terms(n_digit, k_digit, m)
+            if terms > MAX_PRODUCT_TERMS:
+                raise ValueError(f"the result needs more than {MAX_PRODUCT_TERMS} multiplications")
+            result = result * _comb_mod_prime_small(n_digit, k_digit, m) % m
+        return result
+    if n <= SIEVE_LIMIT:
+        result = 1
+        for p, exponent in _comb_exponents(n, k):
+            result = result * pow(p, exponent, m) % m
+            if not result:
+                break
+        return result
+    # C(n, k) >= (n / k)^k
+    if k * (math.log2(n) - math.log2(k)) > MAX_EXACT_BITS:
+        raise ValueError(f"C(n, k) exceeds {MAX_EXACT_BITS} bits; use a prime modulus")
+    return comb(n, k) % m
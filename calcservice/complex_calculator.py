@@ -0,0 +1,324 @@
+import cmath
+import math
+import re
+from functools import cache
+from typing import Callable, Iterable
+
+from .engine import compile_expression
+
+# Polar literals such as 10∠30 (magnitude, angle in degrees)
+_ANGLE = re.compile(
+    r"(\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)\s*∠\s*([-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)"
+)
+
+
+def _phasor(magnitude, degrees):
+    return cmath.rect(magnitude, math.radians(degrees))
+
+
+def _angle(z):
+    return math.degrees(cmath.phase(z))
+
+
+def _parallel(*impedances):
+    return 1 / sum(1 / z for z in impedances)
+
+
+@cache
+def build_complex_functions() -> dict:
+    """
+    Build the table of names available in complex expressions.
+
+    Maps function names to their `cmath` implementations, so `sqrt(-1)` is
+    `1j` rather than a domain error, and adds helpers for polar form and
+    phasor arithmetic. `j` is the imaginary unit; literals such as `3+4j`
+    work as well.
+
+    Built once per process and shared; treat it as read-only.
+    """
+    functions = {
+        # Trigonometric and hyperbolic functions
+        "sin": cmath.sin,  # sine
+        "cos": cmath.cos,  # cosine
+        "tan": cmath.tan,  # tangent
+        "asin": cmath.asin,  # arcsine
+        "acos": cmath.acos,  # arccosine
+        "atan": cmath.atan,  # arctangent
+        "sinh": cmath.sinh,  # hyperbolic sine
+        "cosh": cmath.cosh,  # hyperbolic cosine
+        "tanh": cmath.tanh,  # hyperbolic tangent
+        "asinh": cmath.asinh,  # hyperbolic arcsine
+        "acosh": cmath.acosh,  # hyperbolic arccosine
+        "atanh": cmath.atanh,  # hyperbolic arctangent
+        # Powers, roots and logarithms
+        "exp": cmath.exp,  # exponential function
+        "log": cmath.log,  # natural logarithm (optional base)
+        "log10": cmath.log10,  # base-10 logarithm
+        "sqrt": cmath.sqrt,  # principal square root
+        "pow": pow,  # power function
+        # Parts of a complex number
+        "abs": abs,  # magnitude
+        "real": lambda z: complex(z).real,  # real part
+        "imag": lambda z: complex(z).imag,  # imaginary part
+        "conj": lambda z: complex(z).conjugate(),  # complex conjugate
+        # Polar form (angles in radians)
+        "phase": cmath.phase,  # argument
+        "polar": cmath.polar,  # (magnitude, argument)
+        "rect": cmath.rect,  # magnitude and argument to rectangular
+        # Phasors (angles in degrees)
+        "phasor": _phasor,  # magnitude and angle to rectangular
+        "angle": _angle,  # angle of z in degrees
+        "degrees": math.degrees,  # radians to degrees
+        "radians": math.radians,  # degrees to radians
+        # Impedances
+        "parallel": _parallel,  # z1 || z2 || ...
+        # Number classification
+        "isfinite": cmath.isfinite,  # finite real and imaginary parts
+        "isinf": cmath.isinf,  # infinite part
+        "isnan": cmath.isnan,  # NaN part
+        "isclose": cmath.isclose,  # check for closeness
+        # Constants
+        "j": 1j,  # imaginary unit
+        "pi": cmath.pi,  # π constant
+        "e": cmath.e,  # Euler's number
+        "tau": cmath.tau,  # τ constant (2π)
+        "inf": cmath.inf,  # positive infinity
+        "infj": cmath.infj,  # imaginary infinity
+        "nan": cmath.nan,  # not a number
+        "nanj": cmath.nanj,  # imaginary NaN
+    }
+    return functions
+
+
+def _angle_notation(expression: str) -> str:
+    # 10∠30 → phasor(10, 30)
+    return _ANGLE.sub(r"phasor(\1, \2)", expression)
+
+
+def evaluate_complex(expression: str, functions=None):
+    """
+    Evaluate a complex expression without any terminal I/O.
+
+    ## Examples
+
+    - `evaluate_complex("sqrt(-4)")` → 2j
+    - `evaluate_complex("(3+4j) * conj(3+4j)")` → (25+0j)
+    - `evaluate_complex("10∠30 + 10∠-30")` → (17.32...+0j)
+    - `evaluate_complex("parallel(100, 1/(j*2*pi*50*10e-6))")` - R || C at 50 Hz
+
+    ## Error Handling
+
+    - Raises `ExpressionError` for unknown names, unsupported syntax or exceeded limits
+    - Errors from the `cmath` functions (e.g. `ValueError: math domain error`) propagate
+    """
+    if functions is None:
+        functions = build_complex_functions()
+    return compile_expression(_angle_notation(expression), functions, mode="complex").evaluate(functions)
+
+
+def format_complex(value, polar: bool = False, digits: int = 12) -> str:
+    """
+    Format a result in rectangular (`3+4j`) or polar (`5∠53.1301°`) form.
+
+    Values that aren't numbers (e.g. the tuple from `polar()`) use `str()`.
+
+    ## Examples
+
+    - `format_complex(3+4j)` → `'3+4j'`
+    - `format_complex(3+4j, polar=True, digits=6)` → `'5∠53.1301°'`
+    - `format_complex(2.0)` → `'2'`
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float, complex)):
+        return str(value)
+    if polar:
+        magnitude, phase = cmath.polar(value)
+        return f"{magnitude:.{digits}g}∠{math.degrees(phase):.{digits}g}°"
+    if type(value) is not complex:
+        return f"{value:.{digits}g}"
+    if value.imag == 0:
+        return f"{value.real:.{digits}g}"
+    if value.real == 0:
+        return f"{value.imag:.{digits}g}j"
+    return f"{value.real:.{digits}g}{value.imag:+.{digits}g}j"
+
+
+# Vectorized evaluation over complex128 arrays
+
+# Names with a NumPy ufunc that is correct for complex arguments
+_UFUNC_NAMES = {
+    "sin": "sin",
+    "cos": "cos",
+    "tan": "tan",
+    "sinh": "sinh",
+    "cosh": "cosh",
+    "tanh": "tanh",
+    "asinh": "arcsinh",
+    "atan": "arctan",
+    "exp": "exp",
+    "abs": "abs",
+    "real": "real",
+    "imag": "imag",
+    "conj": "conjugate",
+    "phase": "angle",
+    "isfinite": "isfinite",
+    "isinf": "isinf",
+    "isnan": "isnan",
+    "isclose": "isclose",
+}
+
+# Ufuncs that return NaN for real arguments outside their real domain; their
+# arguments are cast to complex128 first, as cmath would
+_BRANCH_NAMES = {
+    "sqrt": "sqrt",
+    "log10": "log10",
+    "asin": "arcsin",
+    "acos": "arccos",
+    "acosh": "arccosh",
+    "atanh": "arctanh",
+    "pow": "power",
+}
+
+
+def _complex_ufunc(np, ufunc) -> Callable:
+    complex128 = np.complex128
+
+    def apply(*args):
+        return ufunc(*[np.asarray(arg, dtype=complex128) for arg in args])
+
+    return apply
+
+
+@cache
+def build_vectorized_complex_functions() -> dict:
+    """
+    Build a NumPy-backed version of the complex function table, for complex128 arrays.
+
+    Functions with a branch cut (sqrt, log, asin, ...) cast their arguments
+    to complex128, so `sqrt(x)` of a negative real array is imaginary
+    rather than NaN. Built once per process and shared; treat it as read-only.
+    """
+    from ._optional import require_numpy
+
+    np = require_numpy()
+    functions = {name: value for name, value in build_complex_functions().items() if not callable(value)}
+    for name, ufunc in _UFUNC_NAMES.items():
+        functions[name] = getattr(np, ufunc)
+    for name, ufunc in _BRANCH_NAMES.items():
+        functions[name] = _complex_ufunc(np, getattr(np, ufunc))
+    log = _complex_ufunc(np, np.log)
+    functions["log"] = lambda z, base=None: log(z) if base is None else log(z) / log(base)
+    functions["polar"] = lambda z: (np.abs(z), np.angle(z))
+    functions["rect"] = lambda r, phi: r * np.exp(1j * np.asarray(phi))
+    # Angles are real; variables arrive as complex128, so take their real part
+    functions["degrees"] = lambda x: np.degrees(np.real(x))
+    functions["radians"] = lambda x: np.radians(np.real(x))
+    functions["phasor"] = lambda r, degrees: r * np.exp(1j * np.radians(np.real(degrees)))
+    functions["angle"] = lambda z: np.angle(z, deg=True)
+    functions["parallel"] = _parallel
+    return functions
+
+
+def vectorize_complex(expression: str, variables: Iterable[str] = ("w",)) -> Callable:
+    """
+    Compile a complex expression into a function of NumPy arrays.
+
+    The expression is parsed once; the returned function takes the
+    variables as keyword arguments, converts them to complex128 and
+    evaluates the whole array in a single pass.
+
+    ## Example
+
+    ```python
+    impedance = vectorize_complex("R + j*w*L + 1/(j*w*C)", variables=["w", "R", "L", "C"])
+    impedance(w=2*pi*np.logspace(1, 6, 1_000_000), R=50, L=1e-3, C=1e-6)
+    ```
+    """
+    from ._optional import require_numpy
+
+    np = require_numpy()
+    variables = tuple(sorted(variables))
+    functions = build_vectorized_complex_functions()
+    names = dict(functions)
+    names.update(dict.fromkeys(variables, 0j))
+    compiled = compile_expression(
+        _angle_notation(expression), names, mode="complex-vectorized:" + ",".join(variables)
+    )
+
+    def evaluate(**arrays):
+        missing = set(variables) - set(arrays)
+        if missing:
+            raise TypeError(f"missing values for: {', '.join(sorted(missing))}")
+        namespace = dict(functions)
+        for name, value in arrays.items():
+            namespace[name] = np.asarray(value, dtype=np.complex128)
+        return compiled.evaluate(namespace)
+
+    return evaluate
+
+
+def evaluate_complex_vectorized(expression: str, **arrays):
+    """
+    Evaluate a complex expression over arrays of input values in one pass.
+
+    ## Examples
+
+    - `evaluate_complex_vectorized("sqrt(x)", x=[-4, 4])` → `array([0.+2.j, 2.+0.j])`
+    - `evaluate_complex_vectorized("abs(1/(1 + j*w))", w=np.logspace(-2, 2, 5))` - a low-pass magnitude
+    """
+    return vectorize_complex(expression, arrays)(**arrays)
+
+
+def complex_calculator() -> None:
+    """
+    Complex Number Mode
+
+    Evaluates expressions with complex numbers using `cmath`, for AC circuit
+    work with phasors and impedances.
+
+    ## Examples
+
+    - `sqrt(-1)` → 1j
+    - `(3+4j) * (1-2j)` → 11-2j
+    - `10∠30 + 5∠-45` - phasors as magnitude∠degrees; `phasor(10, 30)` is the same
+    - `parallel(100, 1/(j*2*pi*50*10e-6))` - impedances in parallel
+    - `Z = 50 + j*30`, `I = 230∠0 / Z` - variables, as in scientific mode
+
+    ## Commands
+
+    - `polar` - show results as magnitude∠angle°
+    - `rect` - show results as a+bj (default)
+    """
+    print("Complex Number Calculator")
+
+    functions = build_complex_functions()
+    polar = False
+    # Variables and user functions, created by the first definition
+    session = None
+
+    while True:
+        expression = input("\nEnter the expression (e.g., sqrt(-1), 10∠30 * (3+4j)) or ('exit' to return): ")
+        if expression.lower() in ["exit"]:
+            break
+        if expression.strip().lower() in ("polar", "rect"):
+            polar = expression.strip().lower() == "polar"
+            print("-" * 50)
+            print(f"Results in {'polar' if polar else 'rectangular'} form")
+            print("-" * 50)
+            continue
+
+        try:
+            if session is not None or "=" in expression:
+                from .session import Session
+
+                if session is None:
+                    session = Session(functions)
+                result = session.execute(_angle_notation(expression))
+            else:
+                result = evaluate_complex(expression, functions)
+            print("-" * 50)
+            print("The result is: ", format_complex(result, polar))
+            print("-" * 50)
+        except Exception as e:
+            print("-" * 50)
+            print(f"Invalid input. Please enter a valid complex expression. Error: {str(e)}")
+            print("-" * 50)
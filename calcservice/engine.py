@@ -0,0 +1,483 @@
+import ast
+import math
+import operator
+from collections.abc import Mapping
+from typing import Any, Callable, Collection, NamedTuple, Optional, Tuple
+
+from .expression_cache import expression_cache, normalize_expression
+
+
+class ExpressionError(ValueError):
+    """
+    Raised when an expression is rejected by the parser or exceeds an evaluation limit.
+    """
+
+
+class Limits(NamedTuple):
+    """
+    Evaluation limits that keep a single expression from hanging a worker.
+
+    - `max_depth`: deepest allowed nesting of the node tree
+    - `max_exponent`: largest integer exponent allowed for `**` with a base other than 0/±1
+    - `max_int_bits`: largest integer (in bits) an operator or function may produce
+    - `max_call_bits`: largest integer (in bits) passed to `gcd`, `lcm` or `isqrt`,
+      whose cost grows faster than linearly with the size of their arguments
+    - `max_division_work`: largest product of quotient and divisor bits allowed for
+      integer `//`, `%` and `divmod`, whose cost is quadratic in that size
+    - `max_modulus_bits`: largest modulus (in bits) of `factorial_mod` and `comb_mod`,
+      which reduce every product by it
+    """
+
+    max_depth: int = 100
+    max_exponent: int = 1_000_000
+    max_int_bits: int = 1 << 22
+    max_call_bits: int = 1 << 18
+    max_division_work: int = 1 << 36
+    max_modulus_bits: int = 256
+
+
+DEFAULT_LIMITS = Limits()
+
+
+# Node types of the parsed expression tree
+
+
+class Constant(NamedTuple):
+    value: Any
+
+
+class Name(NamedTuple):
+    id: str
+
+
+class UnaryOp(NamedTuple):
+    op: str
+    operand: Any
+
+
+class BinOp(NamedTuple):
+    op: str
+    left: Any
+    right: Any
+
+
+class Call(NamedTuple):
+    func: str
+    args: Tuple[Any, ...]
+    keywords: Tuple[Tuple[str, Any], ...] = ()
+
+
+class Sequence(NamedTuple):
+    items: Tuple[Any, ...]
+
+
+# Whitelisted operators: Python AST operator → symbol used in the node tree
+_AST_BINARY = {
+    ast.Add: "+",
+    ast.Sub: "-",
+    ast.Mult: "*",
+    ast.MatMult: "@",
+    ast.Div: "/",
+    ast.FloorDiv: "//",
+    ast.Mod: "%",
+    ast.Pow: "**",
+    ast.BitAnd: "&",
+    ast.BitOr: "|",
+    ast.BitXor: "^",
+    ast.LShift: "<<",
+    ast.RShift: ">>",
+}
+_AST_UNARY = {ast.USub: "-", ast.UAdd: "+", ast.Invert: "~"}
+
+BINARY_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "@": operator.matmul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "**": operator.pow,
+    "&": operator.and_,
+    "|": operator.or_,
+    "^": operator.xor,
+    "<<": operator.lshift,
+    ">>": operator.rshift,
+}
+UNARY_OPERATORS = {"-": operator.neg, "+": operator.pos, "~": operator.invert}
+
+_NUMBER_TYPES = (int, float, complex)
+
+
+def parse(
+    expression: str,
+    names: Optional[Collection[str]] = None,
+    limits: Limits = DEFAULT_LIMITS,
+):
+    """
+    Parse an expression into a node tree.
+
+    Only numeric literals, names, whitelisted operators, function calls and
+    list/tuple literals are accepted. When `names` is given, every name and
+    called function must appear in it; if `names` is a mapping, called names
+    must also be callable.
+
+    ## Examples
+
+    - `parse("2 + 3")` → `BinOp('+', Constant(2), Constant(3))`
+    - `parse("sqrt(x)", names={"sqrt": math.sqrt, "x": 0})` → `Call('sqrt', (Name('x'),))`
+    - `parse("__import__('os')")` → raises `ExpressionError`
+    """
+    try:
+        body = ast.parse(expression.strip(), mode="eval").body
+    except SyntaxError as e:
+        raise ExpressionError(f"invalid syntax: {e.msg}") from None
+    except RecursionError:
+        raise ExpressionError("expression is nested too deeply") from None
+    return _convert(body, names, limits.max_depth)
+
+
+def _convert(node, names, depth):
+    if depth <= 0:
+        raise ExpressionError("expression is nested too deeply")
+    depth -= 1
+    kind = type(node)
+
+    if kind is ast.Constant:
+        if type(node.value) not in _NUMBER_TYPES:
+            raise ExpressionError(f"unsupported literal: {node.value!r}")
+        return Constant(node.value)
+
+    if kind is ast.Name:
+        if names is not None and node.id not in names:
+            raise ExpressionError(f"name '{node.id}' is not defined")
+        return Name(node.id)
+
+    if kind is ast.BinOp:
+        op = _AST_BINARY.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"unsupported operator: {type(node.op).__name__}")
+        return BinOp(op, _convert(node.left, names, depth), _convert(node.right, names, depth))
+
+    if kind is ast.UnaryOp:
+        op = _AST_UNARY.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"unsupported operator: {type(node.op).__name__}")
+        return UnaryOp(op, _convert(node.operand, names, depth))
+
+    if kind is ast.Call:
+        if type(node.func) is not ast.Name:
+            raise ExpressionError("only named functions can be called")
+        func = node.func.id
+        if names is not None:
+            if func not in names:
+                raise ExpressionError(f"unknown function '{func}'")
+            if isinstance(names, Mapping) and not callable(names[func]):
+                raise ExpressionError(f"'{func}' is not a function")
+        args = []
+        for arg in node.args:
+            if type(arg) is ast.Starred:
+                raise ExpressionError("star arguments are not supported")
+            args.append(_convert(arg, names, depth))
+        keywords = []
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                raise ExpressionError("keyword unpacking is not supported")
+            keywords.append((keyword.arg, _convert(keyword.value, names, depth)))
+        return Call(func, tuple(args), tuple(keywords))
+
+    if kind is ast.List or kind is ast.Tuple:
+        return Sequence(tuple(_convert(item, names, depth) for item in node.elts))
+
+    raise ExpressionError(f"unsupported syntax: {kind.__name__}")
+
+
+# Guarded operators that can grow integers without bound
+
+
+def _check_power(base, exponent, limits: Limits) -> None:
+    if type(exponent) is int and type(base) is int and exponent > 0:
+        if base not in (0, 1, -1):
+            if exponent > limits.max_exponent:
+                raise ExpressionError(f"exponent {exponent} exceeds the limit of {limits.max_exponent}")
+            if (base.bit_length() - 1) * exponent > limits.max_int_bits:
+                raise ExpressionError(f"result exceeds the {limits.max_int_bits}-bit integer limit")
+
+
+def _check_division(dividend, divisor, limits: Limits) -> None:
+    if type(dividend) is int and type(divisor) is int and divisor:
+        divisor_bits = divisor.bit_length()
+        quotient_bits = dividend.bit_length() - divisor_bits
+        if quotient_bits > 0 and quotient_bits * divisor_bits > limits.max_division_work:
+            raise ExpressionError(f"integer division exceeds the work limit of {limits.max_division_work}")
+
+
+def _checked_operators(limits: Limits):
+    max_bits = limits.max_int_bits
+
+    def power(base, exponent):
+        _check_power(base, exponent, limits)
+        return base ** exponent
+
+    def multiply(left, right):
+        if type(left) is int and type(right) is int:
+            if left.bit_length() + right.bit_length() > max_bits + 1:
+                raise ExpressionError(f"result exceeds the {max_bits}-bit integer limit")
+        elif type(left) is list or type(right) is list:
+            raise ExpressionError("sequences do not support multiplication")
+        return left * right
+
+    def left_shift(value, shift):
+        if type(value) is int and type(shift) is int and value:
+            if value.bit_length() + shift > max_bits:
+                raise ExpressionError(f"result exceeds the {max_bits}-bit integer limit")
+        return value << shift
+
+    def floor_divide(left, right):
+        _check_division(left, right, limits)
+        return left // right
+
+    def modulo(left, right):
+        _check_division(left, right, limits)
+        return left % right
+
+    return {"**": power, "*": multiply, "<<": left_shift, "//": floor_divide, "%": modulo}
+
+
+# Bits of slack for float rounding in the size estimates of `_checked_calls`
+_ESTIMATE_SLACK = 1024
+
+# Below this, lgamma differences are accurate to well within `_ESTIMATE_SLACK`
+_LGAMMA_EXACT = 1 << 53
+
+
+def _log2_factorial(n: int) -> float:
+    return math.lgamma(n + 1) / math.log(2) if n.bit_length() < 1000 else math.inf
+
+
+def _checked_calls(limits: Limits):
+    # Pre-checks for functions whose result size or cost follows from their integer arguments,
+    # keyed by the name they are called by. Each raises before the call, so a function like
+    # factorial never runs for minutes only to have its result rejected. Size estimates are
+    # lower bounds, up to float rounding.
+    max_bits = limits.max_int_bits
+    max_call_bits = limits.max_call_bits
+    max_modulus_bits = limits.max_modulus_bits
+
+    def check_bits(bits):
+        if bits > max_bits + _ESTIMATE_SLACK:
+            raise ExpressionError(f"result exceeds the {max_bits}-bit integer limit")
+
+    def integers(*values):
+        return all(type(value) is int for value in values)
+
+    def factorial(n):
+        if type(n) is int and n > 1:
+            check_bits(_log2_factorial(n))
+
+    def perm(n, k=None):
+        if k is None:
+            return factorial(n)
+        if integers(n, k) and 0 < k <= n:
+            if n < _LGAMMA_EXACT:
+                check_bits(_log2_factorial(n) - _log2_factorial(n - k))
+            else:
+                # P(n, k) >= (n - k + 1)^k
+                check_bits(k * math.log2(n - k + 1))
+
+    def comb(n, k):
+        if integers(n, k) and 0 < k < n:
+            k = min(k, n - k)
+            if n < _LGAMMA_EXACT:
+                check_bits(_log2_factorial(n) - _log2_factorial(k) - _log2_factorial(n - k))
+            else:
+                # C(n, k) >= (n / k)^k
+                check_bits(k * (math.log2(n) - math.log2(k)))
+
+    def power(base, exp, mod=None):
+        if mod is None:
+            _check_power(base, exp, limits)
+        else:
+            operands(base, exp, mod)
+
+    def operands(*values):
+        for value in values:
+            if type(value) is int and value.bit_length() > max_call_bits:
+                raise ExpressionError(f"argument exceeds the {max_call_bits}-bit limit")
+
+    def lcm(*values):
+        operands(*values)
+        # Like `*`: the result can have as many bits as all arguments together
+        if sum(value.bit_length() for value in values if type(value) is int) > max_bits + 1:
+            raise ExpressionError(f"result exceeds the {max_bits}-bit integer limit")
+
+    def division(dividend, divisor):
+        _check_division(dividend, divisor, limits)
+
+    def modulus(m):
+        if type(m) is int and m.bit_length() > max_modulus_bits:
+            raise ExpressionError(f"modulus exceeds the {max_modulus_bits}-bit limit")
+
+    def factorial_mod(n, m):
+        modulus(m)
+
+    def comb_mod(n, k, m):
+        modulus(m)
+
+    def product(iterable, start=1):
+        if type(iterable) is list:
+            if sum(value.bit_length() for value in iterable if type(value) is int) > max_bits + 1:
+                raise ExpressionError(f"result exceeds the {max_bits}-bit integer limit")
+
+    return {
+        "factorial": factorial,
+        "perm": perm,
+        "comb": comb,
+        "pow": power,
+        "gcd": operands,
+        "lcm": lcm,
+        "isqrt": operands,
+        "prod": product,
+        "divmod": division,
+        "factorial_mod": factorial_mod,
+        "comb_mod": comb_mod,
+    }
+
+
+def compile_tree(tree, limits: Limits = DEFAULT_LIMITS, operators=None) -> Callable:
+    """
+    Compile a node tree into a Python callable taking a namespace mapping.
+
+    `operators` optionally overrides entries of `BINARY_OPERATORS`, which lets
+    other modes reuse the tree with different semantics (e.g. integer division).
+    """
+    binary = dict(BINARY_OPERATORS)
+    binary.update(_checked_operators(limits))
+    if operators:
+        binary.update(operators)
+    checks = _checked_calls(limits)
+    max_bits = limits.max_int_bits
+
+    def build(node):
+        kind = type(node)
+
+        if kind is Constant:
+            value = node.value
+            return lambda namespace: value
+
+        if kind is Name:
+            name = node.id
+
+            def load(namespace):
+                try:
+                    return namespace[name]
+                except KeyError:
+                    raise ExpressionError(f"name '{name}' is not defined") from None
+
+            return load
+
+        if kind is BinOp:
+            function = binary[node.op]
+            left, right = build(node.left), build(node.right)
+            return lambda namespace: function(left(namespace), right(namespace))
+
+        if kind is UnaryOp:
+            function = UNARY_OPERATORS[node.op]
+            operand = build(node.operand)
+            return lambda namespace: function(operand(namespace))
+
+        if kind is Call:
+            target = build(Name(node.func))
+            args = tuple(build(arg) for arg in node.args)
+            keywords = tuple((key, build(value)) for key, value in node.keywords)
+            check = checks.get(node.func)
+
+            def call(namespace):
+                function = target(namespace)
+                values = [arg(namespace) for arg in args]
+                named = {key: value(namespace) for key, value in keywords}
+                if check is not None:
+                    try:
+                        check(*values, **named)
+                    except TypeError:
+                        # A bad signature; let the function itself report it
+                        pass
+                result = function(*values, **named)
+                # Keep huge integers from functions like factorial out of later steps
+                if type(result) is int and result.bit_length() > max_bits:
+                    raise ExpressionError(f"result exceeds the {max_bits}-bit integer limit")
+                return result
+
+            return call
+
+        if kind is Sequence:
+            items = tuple(build(item) for item in node.items)
+            return lambda namespace: [item(namespace) for item in items]
+
+        raise ExpressionError(f"unsupported node: {kind.__name__}")
+
+    return build(tree)
+
+
+class Expression:
+    """
+    A parsed expression ready for repeated evaluation.
+
+    ## Example
+
+    ```python
+    expr = compile_expression("x * 2 + 1", names={"x"})
+    expr.evaluate({"x": 20})  # 41
+    ```
+    """
+
+    __slots__ = ("source", "tree", "_code")
+
+    def __init__(self, source: str, tree, code: Callable) -> None:
+        self.source = source
+        self.tree = tree
+        self._code = code
+
+    def evaluate(self, namespace=None) -> Any:
+        """
+        Evaluate the expression, resolving names in `namespace`.
+        """
+        try:
+            return self._code({} if namespace is None else namespace)
+        except RecursionError:
+            raise ExpressionError("expression is nested too deeply") from None
+
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r})"
+
+
+def compile_expression(
+    expression: str,
+    names: Optional[Collection[str]] = None,
+    mode: str = "default",
+    limits: Limits = DEFAULT_LIMITS,
+    operators=None,
+) -> Expression:
+    """
+    Parse and compile an expression, reusing the shared LRU cache.
+
+    `mode` is part of the cache key and must identify the `names` table and
+    `operators` used, so that modes with different functions don't share entries.
+    """
+    text = normalize_expression(expression)
+
+    def build():
+        tree = parse(text, names, limits)
+        return Expression(text, tree, compile_tree(tree, limits, operators))
+
+    return expression_cache.get_or_compile((mode, text, limits), build)
+
+
+def evaluate(expression: str, namespace=None, mode: str = "default", limits: Limits = DEFAULT_LIMITS) -> Any:
+    """
+    Evaluate an expression in one step.
+
+    Every name used by the expression must be present in `namespace`.
+    """
+    names = {} if namespace is None else namespace
+    return compile_expression(expression, names, mode, limits).evaluate(names)
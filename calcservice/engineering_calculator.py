@@ -1,49 +1,123 @@
-import math
-import cmath
-from decimal import Decimal
+import importlib
+
+# Menu phases: (heading, items); each item is (number, title, module, function).
+# Items whose module is None are listed but not implemented yet.
+MENU = (
+    (
+        "PHASE 1: CORE ENGINE",
+        (
+            (1, "Arithmetic calculations", "basic_calculator", "basic_calculator"),
+            (2, "Scientific calculations", "scientific_calculator", "scientific_calculator"),
+            (3, "Expression & scripting mode", None, None),
+            (4, "Units conversion & dimensional analysis", "units", "units_calculator"),
+        ),
+    ),
+    (
+        "PHASE 2: CORE ENGINEERING MATHEMATICS",
+        (
+            (5, "Algebraic calculations", None, None),
+            (6, "Complex number calculations", "complex_calculator", "complex_calculator"),
+            (7, "Matrix operations", "matrix", "matrix_calculator"),
+            (8, "Calculus operations", "numerics", "numerics_calculator"),
+            (9, "Numerical methods calculations", "numerics", "numerics_calculator"),
+        ),
+    ),
+    (
+        "PHASE 3: STATISTICS & DATA",
+        (
+            (10, "Statistical calculations", "stats", "statistics_calculator"),
+            (11, "Probability & distributions calculations", None, None),
+            (12, "Data import & export calculations", "stats", "statistics_calculator"),
+        ),
+    ),
+    (
+        "PHASE 4: ENGINEERING DISCIPLINES",
+        (
+            (13, "Electrical engineering calculations", None, None),
+            (14, "Mechanical engineering calculations", None, None),
+            (15, "Civil engineering calculations", None, None),
+            (16, "Thermodynamics calculations", None, None),
+            (17, "Signal & control systems calculations", "signals", "signal_calculator"),
+        ),
+    ),
+    (
+        "PHASE 5: FINANCIAL & TIME",
+        (
+            (18, "Financial & engineering economics calculations", "financial_calculator", "financial_calculator"),
+            (19, "Time & date calculations", None, None),
+        ),
+    ),
+    (
+        "PHASE 6: ADVANCED & PROFESSIONAL",
+        (
+            (20, "Optimization & operations research calculations", "optimization", "optimization_calculator"),
+            (21, "Error analysis & uncertainty calculations", "uncertainty", "uncertainty_calculator"),
+            (22, "Differential equations & system simulation", "numerics", "numerics_calculator"),
+            (23, "Signal processing & transforms", "signals", "signal_calculator"),
+            (24, "Graphing & plotting calculations", None, None),
+            (25, "Memory, history & session management", "scientific_calculator", "scientific_calculator"),
+            (26, "Help, documentation & formula reference", None, None),
+        ),
+    ),
+)
+
+EXIT_CHOICE = 27
+
+# Menu number → (title, module, function)
+MENU_ITEMS = {number: (title, module, function) for _, items in MENU for number, title, module, function in items}
+
+
+def _print_menu() -> None:
+    print("ENGINEERING CALCULATOR MODULE")
+    for heading, items in MENU:
+        print(f"\n--- {heading} ---")
+        for number, title, _, _ in items:
+            print(f"{number}. {title}")
+    print(f"\n{EXIT_CHOICE}. Exit")
+
 
 def engineering_calculator() -> None:
+    """
+    Engineering Calculator Mode
+
+    Menu of engineering tools grouped by phase. Each implemented item opens its
+    own interactive mode (modules are imported only when selected); the others
+    report that they are not implemented yet.
 
+    ## Menu Options
+
+    - 1 / 2: the basic and scientific calculators
+    - 4: units conversion and dimension-checked expressions (`calcservice.units`)
+    - 6: complex numbers, phasors and impedances (`calcservice.complex_calculator`)
+    - 7: matrix operations (`calcservice.matrix`)
+    - 8 / 9 / 22: integrals, derivatives, roots and ODEs (`calcservice.numerics`)
+    - 10 / 12: streaming statistics and file conversion (`calcservice.stats`)
+    - 17 / 23: FFTs, convolution, streaming filters and spectra (`calcservice.signals`)
+    - 18: financial calculations (`calcservice.financial_calculator`)
+    - 20: minimization, global search and linear programming (`calcservice.optimization`)
+    - 21: linearized and Monte Carlo uncertainty propagation (`calcservice.uncertainty`)
+    - 25: variables, functions and saved sessions (scientific mode)
+    - 27: return to the main menu
+    """
     while True:
-        print("ENGINEERING CALCULATOR MODULE")
-
-
-        print("\n--- PHASE 1: CORE ENGINE ---")
-        print("1. Arithmetic calculations")
-        print("2. Scientific calculations")
-        print("3. Expression & scripting mode")
-        print("4. Units conversion & dimensional analysis")
-
-        print("\n--- PHASE 2: CORE ENGINEERING MATHEMATICS ---")
-        print("5. Algebraic calculations")
-        print("6. Complex number calculations")
-        print("7. Matrix operations")
-        print("8. Calculus operations")
-        print("9. Numerical methods calculations")
-
-        print("\n--- PHASE 3: STATISTICS & DATA ---")
-        print("10. Statistical calculations")
-        print("11. Probability & distributions calculations")
-        print("12. Data import & export calculations")
-
-        print("\n--- PHASE 4: ENGINEERING DISCIPLINES ---")
-        print("13. Electrical engineering calculations")
-        print("14. Mechanical engineering calculations")
-        print("15. Civil engineering calculations")
-        print("16. Thermodynamics calculations")
-        print("17. Signal & control systems calculations")
-
-        print("\n--- PHASE 5: FINANCIAL & TIME ---")
-        print("18. Financial & engineering economics calculations")
-        print("19. Time & date calculations")
-
-        print("\n--- PHASE 6: ADVANCED & PROFESSIONAL ---")
-        print("20. Optimization & operations research calculations")
-        print("21. Error analysis & uncertainty calculations")
-        print("22. Differential equations & system simulation")
-        print("23. Signal processing & transforms")
-        print("24. Graphing & plotting calculations")
-        print("25. Memory, history & session management")
-        print("26. Help, documentation & formula reference")
-
-        print("\n27. Exit")
+        _print_menu()
+        try:
+            choice = int(input("Enter your choice: "))
+        except ValueError:
+            print(f"Invalid input. Please enter a number between 1 and {EXIT_CHOICE}.")
+            print("---------------------------------------")
+            continue
+
+        if choice == EXIT_CHOICE:
+            break
+        item = MENU_ITEMS.get(choice)
+        if item is None:
+            print(f"Invalid choice. Please select a number between 1 and {EXIT_CHOICE}.")
+            print("---------------------------------------")
+            continue
+        title, module, function = item
+        if module is None:
+            print(f"{title} - Feature not yet implemented")
+            print("---------------------------------------")
+            continue
+        getattr(importlib.import_module(f".{module}", __package__), function)()
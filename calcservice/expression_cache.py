@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, NamedTuple
+
+
+class CacheStats(NamedTuple):
+    """
+    Snapshot of the expression cache counters.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+def normalize_expression(expression: str) -> str:
+    """
+    Normalize expression text so that formatting differences share one cache entry.
+
+    Leading/trailing whitespace is removed and inner runs of whitespace are
+    collapsed to a single space, e.g. `" 2 +   3 "` → `"2 + 3"`.
+    """
+    return " ".join(expression.split())
+
+
+class ExpressionCache:
+    """
+    Size-bounded LRU cache of compiled expressions.
+
+    Entries are keyed on any hashable value (usually the normalized expression
+    text, optionally combined with the calculator mode). When the cache is full
+    the least recently used entry is evicted.
+
+    ## Example
+
+    ```python
+    cache = ExpressionCache(maxsize=128)
+    code = cache.get_or_compile("2 + 3", lambda: compile("2 + 3", "<expr>", "eval"))
+    cache.stats()  # CacheStats(hits=0, misses=1, evictions=0, size=1, maxsize=128)
+    ```
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compile(self, key: Hashable, compiler: Callable[[], Any]) -> Any:
+        """
+        Return the cached entry for `key`, calling `compiler()` to build it on a miss.
+
+        Errors raised by `compiler` are propagated and nothing is cached, so an
+        invalid expression is reported again on every attempt.
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Compile outside the lock so a slow compile doesn't block other callers
+        value = compiler()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self) -> CacheStats:
+        """
+        Return the current hit/miss/eviction counters.
+        """
+        with self._lock:
+            return CacheStats(
+                self.hits, self.misses, self.evictions, len(self._entries), self.maxsize
+            )
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared cache used by every calculator mode
+expression_cache = ExpressionCache()
+
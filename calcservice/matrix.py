@@ -0,0 +1,416 @@
+import os
+import re
+from functools import cache
+from itertools import islice
+from typing import Optional
+
+from ._optional import optional_scipy, require_numpy, require_scipy
+from .engine import compile_expression
+
+# Rows parsed per block when converting CSV files
+CSV_CHUNK_ROWS = 1 << 16
+
+# Eigenvalues / singular values computed for sparse matrices when `k` isn't given
+DEFAULT_SPARSE_K = 6
+
+
+def is_sparse(a) -> bool:
+    """
+    True for SciPy sparse matrices and arrays; always False without SciPy.
+    """
+    sparse = optional_scipy("sparse")
+    return sparse is not None and sparse.issparse(a)
+
+
+def as_matrix(data):
+    """
+    Return `data` as a NumPy array, leaving sparse matrices and arrays (including memory maps) unchanged.
+    """
+    if is_sparse(data):
+        return data
+    np = require_numpy()
+    return np.asarray(data)
+
+
+def _check_square(a) -> None:
+    if a.ndim != 2 or a.shape[0] != a.shape[1]:
+        raise ValueError(f"expected a square matrix, got shape {a.shape}")
+
+
+# Linear algebra. Dense matrices go to LAPACK through numpy.linalg (or
+# scipy.linalg); sparse matrices go to scipy.sparse.linalg.
+
+
+def inverse(a):
+    """
+    Inverse of a square dense matrix.
+
+    Sparse inverses are dense in general, so they are refused; use `solve`.
+    """
+    if is_sparse(a):
+        raise ValueError("the inverse of a sparse matrix is dense; use solve(A, b) instead")
+    np = require_numpy()
+    a = as_matrix(a)
+    _check_square(a)
+    return np.linalg.inv(a)
+
+
+def determinant(a):
+    """
+    Determinant of a square matrix (LU based; sparse matrices use SuperLU).
+
+    Large matrices easily overflow a float; use `log_determinant` for those.
+    """
+    np = require_numpy()
+    if is_sparse(a):
+        sign, logdet = log_determinant(a)
+        return sign * np.exp(logdet)
+    a = as_matrix(a)
+    _check_square(a)
+    return np.linalg.det(a)
+
+
+def log_determinant(a):
+    """
+    Return `(sign, log|det|)` of a square matrix, which doesn't overflow for large matrices.
+    """
+    np = require_numpy()
+    if is_sparse(a):
+        splu = require_scipy("sparse.linalg").splu
+        _check_square(a)
+        try:
+            factors = splu(a.tocsc())
+        except RuntimeError:
+            # "Factor is exactly singular"
+            return 0.0, -np.inf
+        diagonal = factors.U.diagonal()
+        # Each permutation contributes the parity of its cycle decomposition
+        sign = np.prod(np.sign(diagonal)) * _permutation_sign(np, factors.perm_r) * _permutation_sign(
+            np, factors.perm_c
+        )
+        return sign, np.log(np.abs(diagonal)).sum()
+    a = as_matrix(a)
+    _check_square(a)
+    return np.linalg.slogdet(a)
+
+
+def _permutation_sign(np, permutation) -> int:
+    # Parity from the number of cycles: sign = (-1)^(n - cycles)
+    seen = np.zeros(len(permutation), dtype=bool)
+    cycles = 0
+    for start in range(len(permutation)):
+        if not seen[start]:
+            cycles += 1
+            index = start
+            while not seen[index]:
+                seen[index] = True
+                index = permutation[index]
+    return -1 if (len(permutation) - cycles) % 2 else 1
+
+
+def solve(a, b):
+    """
+    Solve `A x = b`.
+
+    Square dense systems use LAPACK `gesv`; non-square systems are solved in
+    the least-squares sense. Sparse systems use SuperLU (`spsolve`).
+    """
+    np = require_numpy()
+    if is_sparse(a):
+        spsolve = require_scipy("sparse.linalg").spsolve
+        return spsolve(a.tocsc(), as_matrix(b))
+    a, b = as_matrix(a), as_matrix(b)
+    if a.ndim == 2 and a.shape[0] == a.shape[1]:
+        return np.linalg.solve(a, b)
+    return np.linalg.lstsq(a, b, rcond=None)[0]
+
+
+def lu(a):
+    """
+    LU decomposition with partial pivoting.
+
+    Dense matrices return `(P, L, U)` with `A = P @ L @ U`; sparse matrices
+    return SciPy's `SuperLU` object. Requires SciPy.
+    """
+    if is_sparse(a):
+        return require_scipy("sparse.linalg").splu(a.tocsc())
+    return require_scipy("linalg").lu(as_matrix(a))
+
+
+def qr(a, mode: str = "reduced"):
+    """
+    QR decomposition `A = Q @ R` of a dense matrix.
+    """
+    np = require_numpy()
+    if is_sparse(a):
+        raise ValueError("QR of a sparse matrix is not supported; convert it with .toarray() first")
+    return np.linalg.qr(as_matrix(a), mode=mode)
+
+
+def svd(a, k: Optional[int] = None, full_matrices: bool = False):
+    """
+    Singular value decomposition `(U, S, Vh)`.
+
+    Dense matrices use LAPACK `gesdd`; with `k`, or for sparse matrices, only
+    the `k` largest singular triplets are computed (`svds`, default 6).
+    """
+    np = require_numpy()
+    a = as_matrix(a)
+    if k is not None or is_sparse(a):
+        svds = require_scipy("sparse.linalg").svds
+        u, s, vh = svds(a, k=k or DEFAULT_SPARSE_K)
+        order = np.argsort(s)[::-1]
+        return u[:, order], s[order], vh[order]
+    return np.linalg.svd(a, full_matrices=full_matrices)
+
+
+def _is_hermitian(np, a) -> bool:
+    return a.shape[0] == a.shape[1] and bool(np.allclose(a, a.conj().T))
+
+
+def eigenvalues(a, k: Optional[int] = None):
+    """
+    Eigenvalues of a square matrix.
+
+    Hermitian (symmetric) dense matrices use `eigvalsh`, which is faster and
+    returns sorted real values; others use `eigvals`. With `k`, or for sparse
+    matrices, the `k` largest-magnitude eigenvalues are computed with ARPACK.
+    """
+    np = require_numpy()
+    a = as_matrix(a)
+    _check_square(a)
+    if k is not None or is_sparse(a):
+        linalg = require_scipy("sparse.linalg")
+        k = k or DEFAULT_SPARSE_K
+        symmetric = (abs(a - a.T.conj()) > 0).nnz == 0 if is_sparse(a) else _is_hermitian(np, a)
+        if symmetric:
+            return np.sort(linalg.eigsh(a, k=k, return_eigenvectors=False))
+        return linalg.eigs(a, k=k, return_eigenvectors=False)
+    if _is_hermitian(np, a):
+        return np.linalg.eigvalsh(a)
+    return np.linalg.eigvals(a)
+
+
+def eig(a):
+    """
+    Eigenvalues and right eigenvectors `(w, V)` of a square dense matrix.
+    """
+    np = require_numpy()
+    a = as_matrix(a)
+    _check_square(a)
+    if _is_hermitian(np, a):
+        return np.linalg.eigh(a)
+    return np.linalg.eig(a)
+
+
+# Loading and saving
+
+
+def _data_lines(f):
+    for line in f:
+        if line.strip():
+            yield line
+
+
+def _is_header(line: str, delimiter: str) -> bool:
+    try:
+        [float(field) for field in line.split(delimiter)]
+    except ValueError:
+        return True
+    return False
+
+
+def csv_to_npy(csv_path: str, npy_path: str, delimiter: str = ",", chunk_rows: int = CSV_CHUNK_ROWS) -> None:
+    """
+    Convert a numeric CSV file to a `.npy` file in blocks of `chunk_rows` rows.
+
+    The output is written through a memory map, so files larger than RAM
+    convert in constant memory. A non-numeric first line is taken as a header.
+    """
+    np = require_numpy()
+    with open(csv_path, encoding="utf-8") as f:
+        lines = _data_lines(f)
+        first = next(lines, None)
+        if first is None:
+            raise ValueError(f"{csv_path} contains no data")
+        header = _is_header(first, delimiter)
+        columns = len(first.split(delimiter))
+        rows = sum(1 for _ in lines) + (0 if header else 1)
+
+    output = np.lib.format.open_memmap(npy_path, mode="w+", dtype=np.float64, shape=(rows, columns))
+    try:
+        with open(csv_path, encoding="utf-8") as f:
+            lines = _data_lines(f)
+            if header:
+                next(lines)
+            row = 0
+            while True:
+                block = list(islice(lines, chunk_rows))
+                if not block:
+                    break
+                values = np.loadtxt(block, delimiter=delimiter, dtype=np.float64, ndmin=2)
+                output[row : row + len(values)] = values
+                row += len(values)
+        output.flush()
+    finally:
+        del output
+
+
+def load_matrix(path: str, mmap: bool = True, delimiter: str = ",", cache_path: Optional[str] = None):
+    """
+    Load a matrix from a `.npy`, `.npz` (SciPy sparse) or CSV file.
+
+    `.npy` files are memory-mapped read-only by default, so only the pages a
+    computation touches are read. CSV files are converted once to a `.npy`
+    file (`cache_path`, default `<path>.npy`) which is then memory-mapped;
+    the conversion is redone when the CSV file is newer than its cache.
+    """
+    np = require_numpy()
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return np.load(path, mmap_mode="r" if mmap else None)
+    if extension == ".npz":
+        return require_scipy("sparse").load_npz(path)
+    if cache_path is None:
+        cache_path = path + ".npy"
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(path):
+        csv_to_npy(path, cache_path, delimiter)
+    return np.load(cache_path, mmap_mode="r" if mmap else None)
+
+
+def save_matrix(path: str, a) -> None:
+    """
+    Save a dense matrix as `.npy` (or CSV when the path ends in `.csv`), or a sparse one as `.npz`.
+    """
+    np = require_numpy()
+    if is_sparse(a):
+        require_scipy("sparse").save_npz(path, a)
+    elif path.lower().endswith(".csv"):
+        np.savetxt(path, as_matrix(a), delimiter=",")
+    else:
+        np.save(path, as_matrix(a))
+
+
+# Expression engine integration
+
+
+@cache
+def build_matrix_functions() -> dict:
+    """
+    Build the table of names available in matrix expressions.
+
+    Starts from the NumPy-backed scientific table (so `sin(A)` is element-wise)
+    and adds linear-algebra functions. Matrices are multiplied with `@`.
+    Built once per process and shared; treat it as read-only.
+    """
+    from .vectorized import build_vectorized_functions
+
+    np = require_numpy()
+    functions = dict(build_vectorized_functions())
+    functions.update(
+        {
+            # Construction
+            "matrix": lambda rows: np.asarray(rows, dtype=float),
+            "eye": np.eye,
+            "zeros": lambda rows, columns=None: np.zeros((rows, rows if columns is None else columns)),
+            "ones": lambda rows, columns=None: np.ones((rows, rows if columns is None else columns)),
+            "diag": np.diag,
+            # Products and structure
+            "transpose": np.transpose,
+            "dot": np.dot,
+            "outer": np.outer,
+            "kron": np.kron,
+            "trace": np.trace,
+            # Linear algebra
+            "inv": inverse,
+            "pinv": np.linalg.pinv,
+            "det": determinant,
+            "logdet": lambda a: log_determinant(a)[1],
+            "solve": solve,
+            "lstsq": lambda a, b: np.linalg.lstsq(as_matrix(a), as_matrix(b), rcond=None)[0],
+            "lu": lu,
+            "qr": qr,
+            "svd": svd,
+            "eig": eig,
+            "eigvals": eigenvalues,
+            "norm": np.linalg.norm,
+            "rank": np.linalg.matrix_rank,
+            "cond": np.linalg.cond,
+        }
+    )
+    return functions
+
+
+def evaluate_matrix(expression: str, **matrices):
+    """
+    Evaluate an expression over matrices bound by keyword.
+
+    ## Examples
+
+    - `evaluate_matrix("inv(A) @ b", A=[[2, 0], [0, 4]], b=[1, 1])` → `array([0.5 , 0.25])`
+    - `evaluate_matrix("det(A @ transpose(A))", A=load_matrix("data.npy"))`
+    - `evaluate_matrix("solve(K, f)", K=scipy_sparse_matrix, f=forces)`
+    """
+    functions = build_matrix_functions()
+    names = dict(functions)
+    for name, value in matrices.items():
+        names[name] = as_matrix(value)
+    compiled = compile_expression(expression, names, mode="matrix:" + ",".join(sorted(matrices)))
+    return compiled.evaluate(names)
+
+
+_ASSIGNMENT = re.compile(r"^\s*([A-Za-z_]\w*)\s*=(?!=)(.*)$")
+
+
+def matrix_calculator() -> None:
+    """
+    Matrix Calculator Mode
+
+    Evaluates matrix expressions with the same engine as the scientific mode,
+    backed by NumPy/LAPACK (and SciPy for LU and sparse matrices).
+
+    ## Commands
+
+    - `load A data.npy` - memory-map a matrix from `.npy`, `.npz` (sparse) or CSV
+    - `A = [[1, 2], [3, 4]]` - define a matrix (any expression can be assigned)
+    - `inv(A) @ b`, `det(A)`, `solve(A, b)`, `eigvals(A)`, `svd(A)` - evaluate
+    - `save A out.npy` - write a matrix to `.npy`, `.npz` or `.csv`
+
+    ## Functions
+
+    matrix, eye, zeros, ones, diag, transpose, dot, outer, kron, trace, inv,
+    pinv, det, logdet, solve, lstsq, lu, qr, svd, eig, eigvals, norm, rank,
+    cond, plus every scientific function applied element-wise.
+    """
+    print("\nMatrix Calculator")
+    matrices = {}
+
+    while True:
+        line = input(
+            "\nEnter a matrix expression (e.g., inv(A) @ b), 'load A file.npy' or ('exit' to return): "
+        )
+        if line.lower() in ["exit"]:
+            break
+        try:
+            words = line.split()
+            match = _ASSIGNMENT.match(line)
+            if len(words) == 3 and words[0] in ("load", "save"):
+                if words[0] == "load":
+                    matrices[words[1]] = load_matrix(words[2])
+                    result = f"{words[1]}: {matrices[words[1]].shape} matrix"
+                else:
+                    save_matrix(words[2], matrices[words[1]])
+                    result = f"{words[1]} saved to {words[2]}"
+            elif match:
+                name, expression = match.groups()
+                matrices[name] = as_matrix(evaluate_matrix(expression, **matrices))
+                result = matrices[name]
+            else:
+                result = evaluate_matrix(line, **matrices)
+            print("-" * 50)
+            print("The result is: ", result)
+            print("-" * 50)
+        except Exception as e:
+            print("-" * 50)
+            print(f"Invalid input. Please enter a valid matrix expression. Error: {str(e)}")
+            print("-" * 50)
@@ -0,0 +1,777 @@
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from ._optional import optional_scipy, require_numpy
+from .autodiff import compile_gradient
+from .engine import BinOp, Call, ExpressionError, Name, UnaryOp, parse
+
+DEFAULT_MAX_ITERATIONS = 1000
+
+# Sufficient-decrease constant of the backtracking (Armijo) line search
+ARMIJO = 1e-4
+
+# Halvings of the step before a line search gives up
+MAX_BACKTRACKS = 60
+
+# A step that lowers the objective by less than this (relatively) ends the search
+FTOL = 1e-14
+
+# Interior-point iterations for linear programs
+LP_MAX_ITERATIONS = 200
+
+
+class OptimizeResult(NamedTuple):
+    """
+    Outcome of `minimize` / `maximize`.
+
+    For a batch of starting points every field is an array with one entry per start.
+
+    - `x`: the point found, as a mapping of variable name to value
+    - `value`: the objective at `x`
+    - `iterations`, `evaluations`: steps taken and objective evaluations made
+    - `converged`: whether the stopping tolerance was met
+    """
+
+    x: Dict[str, Any]
+    value: Any
+    iterations: Any
+    evaluations: Any
+    converged: Any
+
+
+class MultiStartResult(NamedTuple):
+    """
+    Outcome of `multistart`: the best run, and all runs as one batched `OptimizeResult`.
+    """
+
+    best: OptimizeResult
+    runs: OptimizeResult
+
+
+class LinearProgramResult(NamedTuple):
+    """
+    Outcome of `linprog`: the solution vector, the objective value and the solver status.
+    """
+
+    x: Any
+    value: float
+    converged: bool
+    iterations: int
+    message: str
+
+
+def _objective_text(expression: str, maximize: bool) -> str:
+    return f"-({expression})" if maximize else expression
+
+
+def _batched_objective(expression: str, variables: Tuple[str, ...], params: Optional[Mapping], size: int):
+    # Returns evaluate(X, rows) → (values (m,), gradients (m, d)) for points X (m, d)
+    # of the batch rows `rows`; the gradient is compiled once and evaluated with NumPy
+    np = require_numpy()
+    from .vectorized import build_vectorized_functions
+
+    compiled = compile_gradient(expression, variables)
+    base = dict(build_vectorized_functions())
+    params = {name: np.broadcast_to(np.asarray(value, dtype=float), (size,)) for name, value in (params or {}).items()}
+
+    def evaluate(X, rows):
+        namespace = dict(base)
+        for name, value in params.items():
+            namespace[name] = value[rows]
+        for k, name in enumerate(variables):
+            namespace[name] = X[:, k]
+        with np.errstate(all="ignore"):
+            try:
+                value, gradient = compiled(namespace)
+            except (ArithmeticError, ValueError):
+                return np.full(len(X), np.nan), np.full(X.shape, np.nan)
+            values = np.broadcast_to(np.asarray(value, dtype=float), (len(X),)).copy()
+            gradients = np.stack([np.broadcast_to(np.asarray(g, dtype=float), (len(X),)) for g in gradient], axis=1)
+        return values, gradients
+
+    return evaluate
+
+
+def _bfgs(evaluate, X, tol: float, max_iterations: int):
+    # Batched BFGS: every row is an independent problem with its own inverse
+    # Hessian estimate and line search; finished rows drop out of the batch
+    np = require_numpy()
+    n, d = X.shape
+    all_rows = np.arange(n)
+    f, G = evaluate(X, all_rows)
+    evaluations = np.ones(n, dtype=int)
+    iterations = np.zeros(n, dtype=int)
+    identity = np.eye(d)
+    H = np.repeat(identity[None], n, axis=0)
+    first = np.ones(n, dtype=bool)
+    finite = np.isfinite(f) & np.isfinite(G).all(axis=1)
+    converged = finite & (np.abs(G).max(axis=1, initial=0.0) <= tol)
+    done = converged | ~finite
+
+    for _ in range(max_iterations):
+        rows = np.flatnonzero(~done)
+        if not rows.size:
+            break
+        p = -np.einsum("nij,nj->ni", H[rows], G[rows])
+        slope = (p * G[rows]).sum(axis=1)
+        uphill = ~(slope < 0)
+        if uphill.any():
+            # The estimate lost positive definiteness: restart along the steepest descent
+            H[rows[uphill]] = identity
+            p[uphill] = -G[rows[uphill]]
+            slope[uphill] = -(G[rows[uphill]] ** 2).sum(axis=1)
+
+        step = np.ones(rows.size)
+        new_X, new_f, new_G = X[rows].copy(), f[rows].copy(), G[rows].copy()
+        accepted = np.zeros(rows.size, dtype=bool)
+        pending = np.arange(rows.size)
+        for _ in range(MAX_BACKTRACKS):
+            trial = X[rows[pending]] + step[pending, None] * p[pending]
+            ft, Gt = evaluate(trial, rows[pending])
+            evaluations[rows[pending]] += 1
+            ok = np.isfinite(ft) & np.isfinite(Gt).all(axis=1)
+            ok &= ft <= f[rows[pending]] + ARMIJO * step[pending] * slope[pending]
+            good = pending[ok]
+            new_X[good], new_f[good], new_G[good] = trial[ok], ft[ok], Gt[ok]
+            accepted[good] = True
+            pending = pending[~ok]
+            if not pending.size:
+                break
+            step[pending] *= 0.5
+        # No step lowers the objective any more: the point is as good as it gets
+        done[rows[~accepted]] = True
+
+        took = rows[accepted]
+        s = new_X[accepted] - X[took]
+        y = new_G[accepted] - G[took]
+        sy = (s * y).sum(axis=1)
+        yy = (y * y).sum(axis=1)
+        # Scale the first estimate to the curvature seen along the first step
+        scale = first[took] & (sy > 0) & (yy > 0)
+        H[took[scale]] = identity * (sy[scale] / yy[scale])[:, None, None]
+        update = sy > 1e-10 * np.sqrt((s * s).sum(axis=1) * yy)
+        if update.any():
+            su, yu, rows_u = s[update], y[update], took[update]
+            rho = 1.0 / sy[update]
+            Hy = np.einsum("nij,nj->ni", H[rows_u], yu)
+            yHy = (yu * Hy).sum(axis=1)
+            H[rows_u] += (
+                -rho[:, None, None] * (Hy[:, :, None] * su[:, None, :] + su[:, :, None] * Hy[:, None, :])
+                + ((rho * rho * yHy + rho)[:, None, None]) * su[:, :, None] * su[:, None, :]
+            )
+        first[took] = False
+
+        previous = f[took]
+        X[took], f[took], G[took] = new_X[accepted], new_f[accepted], new_G[accepted]
+        iterations[took] += 1
+        small_gradient = np.abs(G[took]).max(axis=1, initial=0.0) <= tol
+        stalled = previous - f[took] <= FTOL * np.maximum(1.0, np.maximum(np.abs(previous), np.abs(f[took])))
+        finished = took[small_gradient | stalled]
+        done[finished] = True
+        converged[finished] = True
+    return X, f, iterations, evaluations, converged
+
+
+def _nelder_mead(function, x0: List[float], tol: float, max_iterations: int):
+    # Adaptive Nelder–Mead (Gao & Han) on one starting point
+    d = len(x0)
+    alpha, gamma, rho, sigma = 1.0, 1.0 + 2.0 / d, 0.75 - 0.5 / d, 1.0 - 1.0 / d
+    simplex = [list(x0)]
+    for k in range(d):
+        point = list(x0)
+        point[k] = point[k] * 1.05 if point[k] != 0 else 0.00025
+        simplex.append(point)
+    values = [function(point) for point in simplex]
+    evaluations = d + 1
+    iterations = 0
+    converged = False
+    while iterations < max_iterations:
+        order = sorted(range(d + 1), key=values.__getitem__)
+        simplex = [simplex[i] for i in order]
+        values = [values[i] for i in order]
+        spread = max(abs(a - b) for point in simplex[1:] for a, b in zip(point, simplex[0]))
+        if spread <= tol and max(abs(v - values[0]) for v in values[1:]) <= tol:
+            converged = True
+            break
+        iterations += 1
+        centroid = [sum(point[k] for point in simplex[:-1]) / d for k in range(d)]
+        worst = simplex[-1]
+
+        def towards(coefficient):
+            return [c + coefficient * (c - w) for c, w in zip(centroid, worst)]
+
+        reflected = towards(alpha)
+        f_reflected = function(reflected)
+        evaluations += 1
+        if f_reflected < values[0]:
+            expanded = towards(gamma)
+            f_expanded = function(expanded)
+            evaluations += 1
+            if f_expanded < f_reflected:
+                simplex[-1], values[-1] = expanded, f_expanded
+            else:
+                simplex[-1], values[-1] = reflected, f_reflected
+            continue
+        if f_reflected < values[-2]:
+            simplex[-1], values[-1] = reflected, f_reflected
+            continue
+        outside = f_reflected < values[-1]
+        contracted = towards(rho * alpha) if outside else towards(-rho)
+        f_contracted = function(contracted)
+        evaluations += 1
+        if f_contracted < (f_reflected if outside else values[-1]):
+            simplex[-1], values[-1] = contracted, f_contracted
+            continue
+        # Shrink towards the best point
+        best = simplex[0]
+        for i in range(1, d + 1):
+            simplex[i] = [b + sigma * (x - b) for b, x in zip(best, simplex[i])]
+            values[i] = function(simplex[i])
+        evaluations += d
+    best = min(range(d + 1), key=values.__getitem__)
+    return simplex[best], values[best], iterations, evaluations, converged
+
+
+def _scalar_objective(expression: str, variables: Tuple[str, ...], params: Optional[Mapping]):
+    from .optimizer import optimize_expression
+    from .scientific_calculator import build_functions
+
+    functions = build_functions()
+    compiled = optimize_expression(expression, functions)
+    base = dict(functions)
+    base.update(params or {})
+
+    def function(point):
+        namespace = dict(base)
+        namespace.update(zip(variables, point))
+        try:
+            value = float(compiled.evaluate(namespace))
+        except (ArithmeticError, ValueError):
+            return math.inf
+        return value if value == value else math.inf
+
+    return function
+
+
+def minimize(
+    expression: str,
+    x0: Mapping[str, Any],
+    params: Optional[Mapping[str, Any]] = None,
+    method: str = "bfgs",
+    tol: float = 1e-8,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    maximize: bool = False,
+) -> OptimizeResult:
+    """
+    Find a local minimum of an expression, starting from `x0` (a mapping of variable name to value).
+
+    - `method="bfgs"` (default) uses exact gradients from automatic
+      differentiation of the parsed expression (`calcservice.autodiff`) and
+      stops when every partial derivative is within `tol` of zero
+    - `method="nelder-mead"` needs no gradients, for objectives with
+      non-differentiable parts; it stops when the simplex is within `tol`
+
+    The objective is compiled once. Arrays in `x0` (and `params`) give a
+    batch of independent problems, which BFGS solves together with
+    vectorized evaluations; the result then holds arrays.
+
+    ## Examples
+
+    - `minimize("(x - 3)**2 + 1", {"x": 0}).x` → `{'x': 3.0}`
+    - `minimize("(1 - x)**2 + 100*(y - x**2)**2", {"x": -1.2, "y": 1})` - Rosenbrock's function
+    - `minimize("fabs(x - 2) + floor(y)**2", {"x": 0, "y": 0.5}, method="nelder-mead")`
+
+    ## Error Handling
+
+    - Raises `ExpressionError` for invalid expressions, or when BFGS needs
+      the gradient of a function that has none (use Nelder–Mead then)
+    - Raises `ValueError` for an unknown method or an empty `x0`
+    """
+    np = require_numpy()
+    if not x0:
+        raise ValueError("x0 must name at least one variable")
+    variables = tuple(x0)
+    text = _objective_text(expression, maximize)
+    arrays = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in x0.values()])
+    shape = arrays[0].shape
+    X = np.stack([array.ravel() for array in arrays], axis=1)
+    if params:
+        shape = np.broadcast_shapes(shape, *[np.shape(value) for value in params.values()])
+        X = np.stack([np.broadcast_to(array, shape).ravel() for array in arrays], axis=1)
+        params = {name: np.broadcast_to(np.asarray(value, dtype=float), shape).ravel() for name, value in params.items()}
+
+    if method == "bfgs":
+        evaluate = _batched_objective(text, variables, params, len(X))
+        X, values, iterations, evaluations, converged = _bfgs(evaluate, X.copy(), tol, max_iterations)
+    elif method == "nelder-mead":
+        runs = []
+        for row in range(len(X)):
+            row_params = {name: value[row] for name, value in (params or {}).items()}
+            function = _scalar_objective(text, variables, row_params)
+            runs.append(_nelder_mead(function, X[row].tolist(), tol, max_iterations))
+        X = np.array([run[0] for run in runs], dtype=float).reshape(len(X), len(variables))
+        values, iterations, evaluations, converged = (np.array([run[k] for run in runs]) for k in range(1, 5))
+    else:
+        raise ValueError(f"method must be 'bfgs' or 'nelder-mead', not {method!r}")
+
+    if maximize:
+        values = -values
+    return _shape_result(variables, X, values, iterations, evaluations, converged, shape)
+
+
+def maximize(expression: str, x0: Mapping[str, Any], **options) -> OptimizeResult:
+    """
+    Find a local maximum of an expression; takes the same options as `minimize`.
+
+    ## Example
+
+    - `maximize("x*exp(-x)", {"x": 0.5}).x` → `{'x': 1.0}`
+    """
+    return minimize(expression, x0, maximize=True, **options)
+
+
+def _shape_result(variables, X, values, iterations, evaluations, converged, shape) -> OptimizeResult:
+    if shape == ():
+        return OptimizeResult(
+            {name: float(X[0, k]) for k, name in enumerate(variables)},
+            float(values[0]),
+            int(iterations[0]),
+            int(evaluations[0]),
+            bool(converged[0]),
+        )
+    return OptimizeResult(
+        {name: X[:, k].reshape(shape) for k, name in enumerate(variables)},
+        values.reshape(shape),
+        iterations.reshape(shape),
+        evaluations.reshape(shape),
+        converged.reshape(shape),
+    )
+
+
+def _minimize_part(expression: str, x0: dict, options: dict) -> OptimizeResult:
+    return minimize(expression, x0, **options)
+
+
+def multistart(
+    expression: str,
+    bounds: Mapping[str, Tuple[float, float]],
+    starts: int = 64,
+    workers: int = 1,
+    seed: Optional[int] = 0,
+    params: Optional[Mapping[str, float]] = None,
+    method: str = "bfgs",
+    tol: float = 1e-8,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    maximize: bool = False,
+) -> MultiStartResult:
+    """
+    Search for a global minimum by local optimization from many random starting points.
+
+    Starts are drawn uniformly from the box `bounds` (variable name →
+    (low, high)); the local searches themselves are unconstrained. Each
+    worker process optimizes its share of the starts as one vectorized
+    batch, so `workers` > 1 spreads the runs across a process pool.
+
+    ## Example
+
+    ```python
+    result = multistart("x**4 - 3*x**2 + x", {"x": (-3, 3)}, starts=32, workers=4)
+    result.best.x  # {'x': -1.300...}, the lower of the two minima
+    ```
+    """
+    np = require_numpy()
+    if starts < 1:
+        raise ValueError("starts must be at least 1")
+    names = tuple(bounds)
+    low = np.array([bounds[name][0] for name in names], dtype=float)
+    high = np.array([bounds[name][1] for name in names], dtype=float)
+    if not (np.isfinite(low).all() and np.isfinite(high).all() and (low <= high).all()):
+        raise ValueError("bounds must be finite (low, high) pairs")
+    points = low + (high - low) * np.random.default_rng(seed).random((starts, len(names)))
+    options = dict(params=params, method=method, tol=tol, max_iterations=max_iterations, maximize=maximize)
+
+    parts = [part for part in np.array_split(points, max(1, min(workers, starts))) if len(part)]
+    starts_of = [{name: part[:, k] for k, name in enumerate(names)} for part in parts]
+    if len(parts) == 1:
+        results = [_minimize_part(expression, starts_of[0], options)]
+    else:
+        with ProcessPoolExecutor(max_workers=len(parts)) as pool:
+            futures = [pool.submit(_minimize_part, expression, x0, options) for x0 in starts_of]
+            results = [future.result() for future in futures]
+
+    runs = OptimizeResult(
+        {name: np.concatenate([result.x[name] for result in results]) for name in names},
+        *(np.concatenate([result[k] for result in results]) for k in range(1, 5)),
+    )
+    objective = -runs.value if maximize else runs.value
+    finite = np.where(np.isfinite(objective), objective, np.inf)
+    best = int(finite.argmin())
+    best_result = OptimizeResult(
+        {name: float(runs.x[name][best]) for name in names},
+        float(runs.value[best]),
+        int(runs.iterations[best]),
+        int(runs.evaluations[best]),
+        bool(runs.converged[best]),
+    )
+    return MultiStartResult(best_result, runs)
+
+
+# Linear programming
+
+
+def _as_matrix(np, matrix, columns: int):
+    if matrix is None:
+        return np.zeros((0, columns))
+    if hasattr(matrix, "toarray"):
+        matrix = matrix.toarray()
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=float))
+    if matrix.shape[1] != columns:
+        raise ValueError(f"constraint matrices need {columns} columns, got {matrix.shape[1]}")
+    return matrix
+
+
+def _bounds(bounds, n: int):
+    if bounds is None:
+        bounds = (0, None)
+    if len(bounds) == 2 and not isinstance(bounds[0], (tuple, list)):
+        bounds = [bounds] * n
+    if len(bounds) != n:
+        raise ValueError(f"expected {n} bounds, got {len(bounds)}")
+    return [
+        (-math.inf if low is None else float(low), math.inf if high is None else float(high))
+        for low, high in bounds
+    ]
+
+
+def _step_length(np, v, dv) -> float:
+    negative = dv < 0
+    if not negative.any():
+        return math.inf
+    return float((-v[negative] / dv[negative]).min())
+
+
+def _interior_point(np, A, b, c, tol: float, max_iterations: int):
+    # Mehrotra predictor-corrector for min c·x subject to A x = b, x >= 0
+    m, n = A.shape
+    if m == 0:
+        if (c < 0).any():
+            return np.full(n, math.nan), False, 0, "problem is unbounded"
+        return np.zeros(n), True, 0, "optimal"
+
+    def factor(M):
+        # Solver for M y = r by Cholesky, lightly regularized for dependent rows
+        M = M + np.eye(m) * (1e-14 * max(1.0, float(np.abs(np.diag(M)).max())))
+        try:
+            L = np.linalg.cholesky(M)
+        except np.linalg.LinAlgError:
+            return lambda r: np.linalg.lstsq(M, r, rcond=None)[0]
+        return lambda r: np.linalg.solve(L.T, np.linalg.solve(L, r))
+
+    # Starting point (Nocedal & Wright, section 14.2)
+    solve = factor(A @ A.T)
+    x = A.T @ solve(b)
+    lam = solve(A @ c)
+    s = c - A.T @ lam
+    x += max(-1.5 * float(x.min()), 0.0)
+    s += max(-1.5 * float(s.min()), 0.0)
+    product = float(x @ s)
+    x, s = (
+        x + 0.5 * product / max(float(s.sum()), 1e-300) + 1e-8,
+        s + 0.5 * product / max(float(x.sum()), 1e-300) + 1e-8,
+    )
+
+    norm_b, norm_c = 1.0 + np.linalg.norm(b), 1.0 + np.linalg.norm(c)
+    for iteration in range(1, max_iterations + 1):
+        rb = A @ x - b
+        rc = A.T @ lam + s - c
+        mu = float(x @ s) / n
+        primal, dual = float(c @ x), float(b @ lam)
+        primal_residual = np.linalg.norm(rb) / norm_b
+        dual_residual = np.linalg.norm(rc) / norm_c
+        if primal_residual <= tol and dual_residual <= tol and abs(primal - dual) / (1.0 + abs(primal)) <= tol:
+            return x, True, iteration, "optimal"
+        # Divergent iterates, or complementarity reached while a residual stays put
+        stalled = mu <= 1e-6 * tol
+        if float(np.abs(x).max()) > 1e12 or (stalled and dual_residual > tol):
+            return np.full(n, math.nan), False, iteration, "problem appears to be unbounded"
+        if float(np.abs(lam).max()) > 1e12 or (stalled and primal_residual > tol):
+            return np.full(n, math.nan), False, iteration, "problem appears to be infeasible"
+
+        D = x / s
+        solve = factor((A * D) @ A.T)
+
+        def direction(rxs):
+            dlam = solve(-rb + A @ (rxs / s - D * rc))
+            ds = -rc - A.T @ dlam
+            dx = -rxs / s - D * ds
+            return dx, dlam, ds
+
+        # Predictor (affine scaling), then the centred corrector
+        dx, dlam, ds = direction(x * s)
+        alpha_primal = min(1.0, _step_length(np, x, dx))
+        alpha_dual = min(1.0, _step_length(np, s, ds))
+        mu_affine = float((x + alpha_primal * dx) @ (s + alpha_dual * ds)) / n
+        sigma = (mu_affine / mu) ** 3
+        dx, dlam, ds = direction(x * s + dx * ds - sigma * mu)
+        alpha_primal = min(1.0, 0.99 * _step_length(np, x, dx))
+        alpha_dual = min(1.0, 0.99 * _step_length(np, s, ds))
+        x = x + alpha_primal * dx
+        lam = lam + alpha_dual * dlam
+        s = s + alpha_dual * ds
+    return x, False, max_iterations, "iteration limit reached"
+
+
+def linprog(
+    c: Sequence[float],
+    A_ub=None,
+    b_ub: Optional[Sequence[float]] = None,
+    A_eq=None,
+    b_eq: Optional[Sequence[float]] = None,
+    bounds=None,
+    tol: float = 1e-9,
+    max_iterations: int = LP_MAX_ITERATIONS,
+) -> LinearProgramResult:
+    """
+    Minimize `c·x` subject to `A_ub x <= b_ub`, `A_eq x == b_eq` and bounds on `x`.
+
+    `bounds` is one `(low, high)` pair for every variable or a list of
+    pairs; `None` means unbounded. The default is `x >= 0`.
+
+    With SciPy installed the problem goes to the HiGHS solver, which takes
+    `scipy.sparse` matrices and handles large sparse problems. Otherwise a
+    primal-dual interior-point method (Mehrotra predictor-corrector) runs
+    on dense NumPy arrays, which suits problems up to a few thousand
+    constraints.
+
+    Both solvers return `x` as an array with one entry per variable; it is
+    all NaN, as is the objective value, when the problem is infeasible or
+    unbounded.
+
+    ## Example
+
+    ```python
+    # max 3x + 2y  s.t.  x + y <= 4,  x + 3y <= 6,  x <= 3
+    linprog([-3, -2], A_ub=[[1, 1], [1, 3], [1, 0]], b_ub=[4, 6, 3]).x  # array([3., 1.])
+    ```
+    """
+    np = require_numpy()
+    c = np.asarray(c, dtype=float).ravel()
+    n = c.size
+    optimize = optional_scipy("optimize")
+    if optimize is not None:
+        result = optimize.linprog(
+            c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds if bounds is not None else (0, None), method="highs"
+        )
+        x = result.x if result.x is not None else np.full(n, math.nan)
+        value = float(result.fun) if result.fun is not None else math.nan
+        return LinearProgramResult(x, value, bool(result.success), int(result.nit), result.message)
+
+    A_ub, A_eq = _as_matrix(np, A_ub, n), _as_matrix(np, A_eq, n)
+    b_ub = np.zeros(0) if b_ub is None else np.asarray(b_ub, dtype=float).ravel()
+    b_eq = np.zeros(0) if b_eq is None else np.asarray(b_eq, dtype=float).ravel()
+    if len(b_ub) != len(A_ub) or len(b_eq) != len(A_eq):
+        raise ValueError("each constraint row needs a right-hand side")
+
+    # Standard form: x = offset + T u with u >= 0; finite upper bounds become rows
+    offset = np.zeros(n)
+    columns, upper = [], []
+    for j, (low, high) in enumerate(_bounds(bounds, n)):
+        if low > high:
+            raise ValueError(f"bounds of variable {j} are empty")
+        if math.isfinite(low):
+            offset[j] = low
+            columns.append((j, 1.0))
+            if math.isfinite(high):
+                upper.append((len(columns) - 1, high - low))
+        elif math.isfinite(high):
+            offset[j] = high
+            columns.append((j, -1.0))
+        else:
+            columns += [(j, 1.0), (j, -1.0)]
+    T = np.zeros((n, len(columns)))
+    for k, (j, sign) in enumerate(columns):
+        T[j, k] = sign
+    bound_rows = np.zeros((len(upper), len(columns)))
+    for row, (k, width) in enumerate(upper):
+        bound_rows[row, k] = 1.0
+    inequalities = np.vstack([A_ub @ T, bound_rows])
+    rhs_ub = np.concatenate([b_ub - A_ub @ offset, [width for _, width in upper]])
+    slacks = len(inequalities)
+    A = np.vstack(
+        [
+            np.hstack([inequalities, np.eye(slacks)]),
+            np.hstack([A_eq @ T, np.zeros((len(A_eq), slacks))]),
+        ]
+    )
+    b = np.concatenate([rhs_ub, b_eq - A_eq @ offset])
+    cost = np.concatenate([T.T @ c, np.zeros(slacks)])
+
+    u, converged, iterations, message = _interior_point(np, A, b, cost, tol, max_iterations)
+    x = offset + T @ u[: len(columns)]
+    return LinearProgramResult(x, float(c @ x), converged, iterations, message)
+
+
+# Interactive mode
+
+_RELATION = re.compile(r"(<=|>=|==|=)")
+
+
+def _free_names(tree, functions) -> set:
+    kind = type(tree)
+    if kind is Name:
+        return set() if tree.id in functions else {tree.id}
+    if kind is BinOp:
+        return _free_names(tree.left, functions) | _free_names(tree.right, functions)
+    if kind is UnaryOp:
+        return _free_names(tree.operand, functions)
+    if kind is Call:
+        names = set()
+        for arg in tree.args:
+            names |= _free_names(arg, functions)
+        return names
+    return set()
+
+
+def _linear(expression: str, variables: Tuple[str, ...], functions) -> Tuple[List[float], float]:
+    # Coefficients and constant of a linear expression, read off its gradient
+    compiled = compile_gradient(expression, variables)
+    constant, coefficients = compiled(dict(functions, **dict.fromkeys(variables, 0.0)))
+    probe = {name: 1.0 + 0.5 * k for k, name in enumerate(variables)}
+    value, slopes = compiled(dict(functions, **probe))
+    expected = constant + sum(a * probe[name] for a, name in zip(coefficients, variables))
+    if any(abs(a - b) > 1e-9 * (1 + abs(a)) for a, b in zip(coefficients, slopes)) or abs(value - expected) > 1e-9 * (1 + abs(value)):
+        raise ExpressionError(f"'{expression}' is not linear")
+    return [float(a) for a in coefficients], float(constant)
+
+
+def solve_linear_program(text: str) -> Tuple[Dict[str, float], float, LinearProgramResult]:
+    """
+    Solve a linear program written as expressions; variables are non-negative.
+
+    The text is `min` or `max`, the objective, `st` and constraints
+    separated by `;`, each using `<=`, `>=` or `==`. Returns the solution
+    (variable name → value), the objective value and the solver result;
+    when the solver did not converge, the values are NaN and
+    `result.message` says why.
+
+    ## Example
+
+    - `solve_linear_program("max 3*x + 2*y st x + y <= 4; x + 3*y <= 6; x <= 3")`
+      → `({'x': 3.0, 'y': 1.0}, 11.0, ...)`
+    """
+    from .scientific_calculator import build_functions
+
+    functions = build_functions()
+    sense, _, rest = text.strip().partition(" ")
+    if sense.lower() not in ("min", "max"):
+        raise ValueError("a linear program starts with 'min' or 'max'")
+    objective, _, constraints = rest.partition(" st ")
+    constraints = [part.strip() for part in constraints.split(";") if part.strip()]
+    sides = []
+    for constraint in constraints:
+        parts = _RELATION.split(constraint)
+        if len(parts) != 3:
+            raise ValueError(f"constraint needs one of <=, >=, ==: {constraint!r}")
+        sides.append(parts)
+    names = _free_names(parse(objective), functions)
+    for left, _, right in sides:
+        names |= _free_names(parse(left), functions) | _free_names(parse(right), functions)
+    variables = tuple(sorted(names))
+    if not variables:
+        raise ValueError("the linear program has no variables")
+
+    c, _ = _linear(objective, variables, functions)
+    if sense.lower() == "max":
+        c = [-value for value in c]
+    A_ub, b_ub, A_eq, b_eq = [], [], [], []
+    for left, relation, right in sides:
+        coefficients, constant = _linear(f"({left}) - ({right})", variables, functions)
+        if relation == ">=":
+            A_ub.append([-a for a in coefficients])
+            b_ub.append(constant)
+        elif relation == "<=":
+            A_ub.append(coefficients)
+            b_ub.append(-constant)
+        else:
+            A_eq.append(coefficients)
+            b_eq.append(-constant)
+    result = linprog(c, A_ub or None, b_ub or None, A_eq or None, b_eq or None)
+    if not result.converged:
+        return dict.fromkeys(variables, math.nan), math.nan, result
+    x = {name: float(value) for name, value in zip(variables, result.x)}
+    value = -result.value if sense.lower() == "max" else result.value
+    return x, value, result
+
+
+def _assignments(text: str) -> Dict[str, str]:
+    # "x=1, y=-2..2" → {"x": "1", "y": "-2..2"}
+    pairs = {}
+    for part in text.split(","):
+        name, _, value = part.partition("=")
+        if not value.strip():
+            raise ValueError(f"expected name=value, got {part.strip()!r}")
+        pairs[name.strip()] = value.strip()
+    return pairs
+
+
+def _format_point(x: Mapping[str, float], value: float) -> str:
+    point = ", ".join(f"{name} = {coordinate:.8g}" for name, coordinate in x.items())
+    return f"{point}; value = {value:.8g}"
+
+
+def optimization_calculator() -> None:
+    """
+    Optimization & Operations Research Mode
+
+    ## Commands
+
+    - `min (x - 3)**2 + (y + 1)**2 from x=0, y=0` - local minimum (BFGS with exact gradients)
+    - `max x*exp(-x) from x=0.5` - local maximum
+    - `min x**4 - 3*x**2 + x over x=-3..3` - global search from 64 random starts
+      (add `starts N` for another number of starts)
+    - `lp max 3*x + 2*y st x + y <= 4; x + 3*y <= 6; x <= 3` - linear program,
+      variables non-negative
+    """
+    print("\nOptimization & Operations Research")
+
+    while True:
+        line = input("\nEnter a command (e.g., min (x-3)**2 from x=0) or ('exit' to return): ")
+        if line.lower() in ["exit"]:
+            break
+        try:
+            command, _, rest = line.strip().partition(" ")
+            command = command.lower()
+            if command in ("min", "max") and " from " in rest:
+                expression, _, start = rest.rpartition(" from ")
+                x0 = {name: float(value) for name, value in _assignments(start).items()}
+                found = minimize(expression, x0, maximize=command == "max")
+                status = "" if found.converged else " (not converged)"
+                result = _format_point(found.x, found.value) + status
+            elif command in ("min", "max") and " over " in rest:
+                expression, _, region = rest.rpartition(" over ")
+                starts = 64
+                match = re.search(r"\s+starts\s+(\d+)\s*$", region)
+                if match:
+                    starts, region = int(match.group(1)), region[: match.start()]
+                bounds = {}
+                for name, interval in _assignments(region).items():
+                    low, _, high = interval.partition("..")
+                    bounds[name] = (float(low), float(high))
+                found = multistart(expression, bounds, starts=starts, maximize=command == "max").best
+                result = _format_point(found.x, found.value)
+            elif command == "lp":
+                x, value, solved = solve_linear_program(rest)
+                if not solved.converged:
+                    raise ValueError(solved.message)
+                result = _format_point(x, value)
+            else:
+                raise ValueError("unknown command")
+            print("-" * 50)
+            print("The result is: ", result)
+            print("-" * 50)
+        except Exception as e:
+            print("-" * 50)
+            print(f"Invalid input. Please enter a valid command. Error: {str(e)}")
+            print("-" * 50)
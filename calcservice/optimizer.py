@@ -0,0 +1,418 @@
+from typing import Any, Callable, Collection, NamedTuple, Optional
+
+from .engine import (
+    BINARY_OPERATORS,
+    DEFAULT_LIMITS,
+    UNARY_OPERATORS,
+    BinOp,
+    Call,
+    Constant,
+    ExpressionError,
+    Limits,
+    Name,
+    Sequence,
+    UnaryOp,
+    _checked_calls,
+    _checked_operators,
+    compile_tree,
+    parse,
+)
+from .expression_cache import expression_cache, normalize_expression
+
+_NUMBER_TYPES = (int, float, complex)
+
+
+class OptimizationReport(NamedTuple):
+    """
+    What the optimizer did to one expression.
+
+    - `original_nodes`: nodes in the parsed tree
+    - `folded_nodes`: nodes removed by constant folding
+    - `shared_nodes`: repeated subtrees evaluated once instead of every time
+    - `optimized_nodes`: distinct nodes left to evaluate
+    """
+
+    original_nodes: int
+    folded_nodes: int
+    shared_nodes: int
+    optimized_nodes: int
+
+    @property
+    def saved(self) -> int:
+        return self.original_nodes - self.optimized_nodes
+
+
+def count_nodes(tree) -> int:
+    """
+    Count the nodes of a tree, counting repeated subtrees every time they occur.
+    """
+    kind = type(tree)
+    if kind is BinOp:
+        return 1 + count_nodes(tree.left) + count_nodes(tree.right)
+    if kind is UnaryOp:
+        return 1 + count_nodes(tree.operand)
+    if kind is Call:
+        return (
+            1
+            + sum(count_nodes(arg) for arg in tree.args)
+            + sum(count_nodes(value) for _, value in tree.keywords)
+        )
+    if kind is Sequence:
+        return 1 + sum(count_nodes(item) for item in tree.items)
+    return 1
+
+
+def pure_functions(functions: dict) -> frozenset:
+    """
+    Names of `functions` whose value is the scientific table's own function.
+
+    Those are free of side effects, so calls to them may be folded and shared.
+    Replaced entries (e.g. a profiler's instrumented wrappers) are left alone.
+    """
+    from .scientific_calculator import build_functions
+
+    reference = build_functions()
+    return frozenset(
+        name
+        for name, value in functions.items()
+        if callable(value) and reference.get(name) is value
+    )
+
+
+def _node_key(node, children):
+    # Identity of a node for hash-consing. NamedTuple equality would treat
+    # Name("x") and Constant("x"), or 1 and 1.0 and True, as equal, so the node
+    # type and the constant's type and repr (which keeps -0.0 and nan apart) are part of it.
+    # Integers are keyed by value: a folded result may be too long for repr.
+    kind = type(node)
+    if kind is Constant:
+        value = node.value
+        return (Constant, type(value), value if type(value) is int else repr(value))
+    if kind is Name:
+        return (Name, node.id)
+    if kind is Call:
+        return (Call, node.func, children, tuple(key for key, _ in node.keywords))
+    if kind is Sequence:
+        return (Sequence, children)
+    return (kind, node.op, children)
+
+
+def fold_constants(
+    tree,
+    functions: dict,
+    pure: Optional[Collection[str]] = None,
+    limits: Limits = DEFAULT_LIMITS,
+    operators=None,
+):
+    """
+    Replace constant-only subtrees with their value.
+
+    Names bound to numbers in `functions` (pi, e, inf, nan, ...) are constants;
+    a call is constant when its function is in `pure` (by default
+    `pure_functions(functions)`) and all its arguments are constant. Subtrees
+    are evaluated with the same operators and limits as the compiled
+    expression, so results such as `inf - inf` → nan are unchanged. Subtrees
+    that raise (e.g. `1/0`) are kept, so the error still surfaces on evaluation.
+
+    Only real subtrees are folded: `x*2*pi/360` parses as `((x*2)*pi)/360` and
+    is left as is, because reassociating float operations changes rounding.
+    Write `2*pi/360*x` or `x*(2*pi/360)` to have the constant folded.
+
+    Returns the folded tree and the number of nodes removed.
+    """
+    if pure is None:
+        pure = pure_functions(functions)
+    removed = 0
+
+    def evaluate(node):
+        try:
+            value = compile_tree(node, limits, operators)(functions)
+        except (ArithmeticError, ValueError, TypeError):
+            return None
+        return value if type(value) in _NUMBER_TYPES else None
+
+    def fold(node):
+        # Returns (node, is_constant)
+        nonlocal removed
+        kind = type(node)
+        if kind is Constant:
+            return node, True
+        if kind is Name:
+            value = functions.get(node.id)
+            if type(value) in _NUMBER_TYPES:
+                return Constant(value), True
+            return node, False
+        if kind is BinOp:
+            (left, a), (right, b) = fold(node.left), fold(node.right)
+            node, constant = BinOp(node.op, left, right), a and b
+        elif kind is UnaryOp:
+            operand, constant = fold(node.operand)
+            node = UnaryOp(node.op, operand)
+        elif kind is Call:
+            args = [fold(arg) for arg in node.args]
+            keywords = [(key, fold(value)) for key, value in node.keywords]
+            constant = (
+                node.func in pure
+                and all(c for _, c in args)
+                and all(c for _, (_, c) in keywords)
+            )
+            node = Call(
+                node.func,
+                tuple(arg for arg, _ in args),
+                tuple((key, value) for key, (value, _) in keywords),
+            )
+        elif kind is Sequence:
+            items = [fold(item) for item in node.items]
+            node = Sequence(tuple(item for item, _ in items))
+            # A constant list is not a number, but calls on it may fold
+            return node, all(c for _, c in items)
+        else:
+            raise ExpressionError(f"unsupported node: {kind.__name__}")
+
+        if not constant:
+            return node, False
+        value = evaluate(node)
+        if value is None:
+            return node, False
+        removed += count_nodes(node) - 1
+        return Constant(value), True
+
+    folded, _ = fold(tree)
+    return folded, removed
+
+
+class OptimizedExpression:
+    """
+    An expression compiled to a list of steps in which every distinct subtree appears once.
+
+    Identical subtrees are hash-consed into a single slot, so `sqrt(x*x+y*y)`
+    repeated five times is computed once per evaluation. Same interface as
+    `engine.Expression`, plus a `report` of the nodes saved.
+
+    ## Example
+
+    ```python
+    expr = optimize_expression("sqrt(x*x+y*y) / (1 + sqrt(x*x+y*y)) * (2*pi/360)", table)
+    expr.report.saved  # 14
+    expr.evaluate(dict(table, x=3, y=4))
+    ```
+    """
+
+    __slots__ = ("source", "tree", "report", "_template", "_steps")
+
+    def __init__(self, source: str, tree, report: OptimizationReport, template: list, steps: list) -> None:
+        self.source = source
+        self.tree = tree
+        self.report = report
+        self._template = template
+        self._steps = steps
+
+    def evaluate(self, namespace=None) -> Any:
+        """
+        Evaluate the expression, resolving names in `namespace`.
+        """
+        namespace = {} if namespace is None else namespace
+        values = self._template.copy()
+        append = values.append
+        for step in self._steps:
+            append(step(values, namespace))
+        return values[-1]
+
+    def __repr__(self) -> str:
+        return f"OptimizedExpression({self.source!r})"
+
+
+def _compile_steps(tree, pure, limits: Limits, operators):
+    # Hash-cons the tree into slots: constants first (the template), then one
+    # step per distinct computed node in post-order. Returns the template, the
+    # steps and the number of distinct nodes.
+    binary = dict(BINARY_OPERATORS)
+    binary.update(_checked_operators(limits))
+    if operators:
+        binary.update(operators)
+    checks = _checked_calls(limits)
+    max_bits = limits.max_int_bits
+
+    constants = []
+    nodes = []  # (node, child slots) for computed nodes, in evaluation order
+    slots = {}  # key → ("c", index) or ("n", index)
+    unshared = 0
+
+    def visit(node):
+        nonlocal unshared
+        kind = type(node)
+        if kind is BinOp:
+            children = (visit(node.left), visit(node.right))
+        elif kind is UnaryOp:
+            children = (visit(node.operand),)
+        elif kind is Call:
+            children = tuple(visit(arg) for arg in node.args) + tuple(
+                visit(value) for _, value in node.keywords
+            )
+        elif kind is Sequence:
+            children = tuple(visit(item) for item in node.items)
+        else:
+            children = ()
+        key = _node_key(node, children)
+        if kind is Call and node.func not in pure:
+            # Calls with possible side effects are never shared
+            unshared += 1
+            key = (key, unshared)
+        slot = slots.get(key)
+        if slot is None:
+            if kind is Constant:
+                slot = ("c", len(constants))
+                constants.append(node.value)
+            else:
+                slot = ("n", len(nodes))
+                nodes.append((node, children))
+            slots[key] = slot
+        return slot
+
+    visit(tree)
+    if type(tree) is Constant:
+        # Keep the result in the last slot
+        nodes.append((tree, ()))
+
+    offset = len(constants)
+
+    def index(slot):
+        return slot[1] if slot[0] == "c" else offset + slot[1]
+
+    steps = []
+    for node, children in nodes:
+        positions = [index(child) for child in children]
+        steps.append(_step(node, positions, binary, checks, max_bits))
+    return constants, steps, len(constants) + len(nodes) - (type(tree) is Constant)
+
+
+def _step(node, positions, binary, checks, max_bits) -> Callable:
+    kind = type(node)
+
+    if kind is Constant:
+        value = node.value
+        return lambda values, namespace: value
+
+    if kind is Name:
+        name = node.id
+
+        def load(values, namespace):
+            try:
+                return namespace[name]
+            except KeyError:
+                raise ExpressionError(f"name '{name}' is not defined") from None
+
+        return load
+
+    if kind is BinOp:
+        function = binary[node.op]
+        a, b = positions
+        return lambda values, namespace: function(values[a], values[b])
+
+    if kind is UnaryOp:
+        function = UNARY_OPERATORS[node.op]
+        (a,) = positions
+        return lambda values, namespace: function(values[a])
+
+    if kind is Sequence:
+        return lambda values, namespace: [values[i] for i in positions]
+
+    if kind is Call:
+        load = _step(Name(node.func), (), binary, checks, max_bits)
+        args = positions[: len(node.args)]
+        keywords = tuple(zip((key for key, _ in node.keywords), positions[len(node.args):]))
+        check = checks.get(node.func)
+
+        def call(values, namespace):
+            function = load(values, namespace)
+            arguments = [values[i] for i in args]
+            named = {key: values[i] for key, i in keywords}
+            if check is not None:
+                try:
+                    check(*arguments, **named)
+                except TypeError:
+                    # A bad signature; let the function itself report it
+                    pass
+            result = function(*arguments, **named)
+            # Keep huge integers from functions like factorial out of later steps
+            if type(result) is int and result.bit_length() > max_bits:
+                raise ExpressionError(f"result exceeds the {max_bits}-bit integer limit")
+            return result
+
+        return call
+
+    raise ExpressionError(f"unsupported node: {kind.__name__}")
+
+
+def optimize_tree(
+    source: str,
+    tree,
+    functions: dict,
+    pure: Optional[Collection[str]] = None,
+    limits: Limits = DEFAULT_LIMITS,
+    operators=None,
+) -> OptimizedExpression:
+    """
+    Fold constants in a parsed tree and compile it with shared subtrees.
+
+    `functions` must be the table the expression will be evaluated with,
+    since names bound to numbers in it are folded into the tree.
+    """
+    if pure is None:
+        pure = pure_functions(functions)
+    original = count_nodes(tree)
+    folded, removed = fold_constants(tree, functions, pure, limits, operators)
+    template, steps, distinct = _compile_steps(folded, pure, limits, operators)
+    report = OptimizationReport(original, removed, count_nodes(folded) - distinct, distinct)
+    return OptimizedExpression(source, folded, report, template, steps)
+
+
+def optimize_expression(
+    expression: str,
+    functions: dict,
+    mode: str = "scientific",
+    limits: Limits = DEFAULT_LIMITS,
+    operators=None,
+) -> OptimizedExpression:
+    """
+    Parse, optimize and compile an expression, reusing the shared LRU cache.
+
+    Names other than those in `functions` are allowed and resolved at
+    evaluation time, so they can serve as variables. As for
+    `compile_expression`, `mode` must identify the `functions` table.
+
+    ## Example
+
+    ```python
+    expr = optimize_expression("2*pi/360 * sqrt(x*x+y*y) + sqrt(x*x+y*y)", build_functions())
+    expr.report  # OptimizationReport(original_nodes=23, folded_nodes=4, shared_nodes=10, optimized_nodes=9)
+    ```
+    """
+    text = normalize_expression(expression)
+
+    def build():
+        tree = parse(text, None, limits)
+        for name in _called_names(tree):
+            if not callable(functions.get(name)):
+                raise ExpressionError(f"unknown function '{name}'")
+        return optimize_tree(text, tree, functions, None, limits, operators)
+
+    return expression_cache.get_or_compile(("optimized:" + mode, text, limits), build)
+
+
+def _called_names(tree):
+    kind = type(tree)
+    if kind is Call:
+        yield tree.func
+        for arg in tree.args:
+            yield from _called_names(arg)
+        for _, value in tree.keywords:
+            yield from _called_names(value)
+    elif kind is BinOp:
+        yield from _called_names(tree.left)
+        yield from _called_names(tree.right)
+    elif kind is UnaryOp:
+        yield from _called_names(tree.operand)
+    elif kind is Sequence:
+        for item in tree.items:
+            yield from _called_names(item)
@@ -0,0 +1,832 @@
+import ast
+import io
+import math
+import tokenize
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, ROUND_HALF_EVEN, Context, Decimal, Overflow, getcontext, localcontext
+from functools import lru_cache
+from threading import Lock
+
+from . import combinatorics
+from .engine import (
+    DEFAULT_LIMITS,
+    BinOp,
+    Call,
+    Constant,
+    Expression,
+    ExpressionError,
+    Limits,
+    Sequence,
+    UnaryOp,
+    _checked_operators,
+    compile_tree,
+    parse,
+)
+from .expression_cache import expression_cache, normalize_expression
+
+# Extra digits carried through every evaluation and dropped from the final result
+GUARD_DIGITS = 10
+
+# Largest precision accepted by `evaluate_precise`
+MAX_DIGITS = 10_000
+
+# Longest integer (in bits) converted to Decimal exactly; Decimal(int) is quadratic in the length,
+# so longer integers are converted from their leading bits
+MAX_EXACT_INT_BITS = 1 << 16
+
+# Largest decimal exponent of a trigonometric argument (reduction needs that many extra digits of pi)
+MAX_TRIG_EXPONENT = 10_000
+
+
+# Memoized constants
+
+
+class _Constant:
+    """
+    A constant computed once at the highest precision requested so far.
+
+    Lower precisions are rounded from the stored value instead of being
+    recomputed, and every rounded value is kept, so repeated evaluations at
+    the same precision never recompute pi or ln(2).
+    """
+
+    def __init__(self, compute) -> None:
+        self._compute = compute
+        self._digits = 0
+        self._value = None
+        self._rounded = {}
+        self._lock = Lock()
+
+    def __call__(self, digits: int) -> Decimal:
+        value = self._rounded.get(digits)
+        if value is not None:
+            return value
+        with self._lock:
+            if digits > self._digits:
+                self._value = self._compute(digits + GUARD_DIGITS)
+                self._digits = digits
+                self._rounded.clear()
+            value = Context(prec=digits).plus(self._value)
+            self._rounded[digits] = value
+        return value
+
+
+def _atan_inverse(n: int, scale: int) -> int:
+    # atan(1/n) in fixed point: sum of (-1)^k / ((2k + 1) n^(2k + 1))
+    power = scale // n
+    n2 = n * n
+    total = power
+    k = 1
+    while power:
+        power //= n2
+        term = power // (2 * k + 1)
+        total = total - term if k & 1 else total + term
+        k += 1
+    return total
+
+
+def _compute_pi(digits: int) -> Decimal:
+    # Machin's formula: pi = 16 atan(1/5) - 4 atan(1/239)
+    scale = 10 ** (digits + 5)
+    fixed = 16 * _atan_inverse(5, scale) - 4 * _atan_inverse(239, scale)
+    return Decimal(fixed).scaleb(-(digits + 5), Context(prec=digits))
+
+
+def _compute_e(digits: int) -> Decimal:
+    return Decimal(1).exp(Context(prec=digits))
+
+
+def _compute_ln2(digits: int) -> Decimal:
+    return Decimal(2).ln(Context(prec=digits))
+
+
+def _compute_ln10(digits: int) -> Decimal:
+    return Decimal(10).ln(Context(prec=digits))
+
+
+pi = _Constant(_compute_pi)
+e = _Constant(_compute_e)
+ln2 = _Constant(_compute_ln2)
+ln10 = _Constant(_compute_ln10)
+
+
+# Functions evaluated at the precision of the current decimal context
+
+_EXACT = Context(prec=MAX_PREC)
+
+
+def _decimal(x) -> Decimal:
+    if isinstance(x, Decimal):
+        return x
+    if isinstance(x, int):
+        return _int_decimal(x)
+    if isinstance(x, float):
+        return Decimal(repr(x))
+    raise TypeError(f"expected a real number, got {type(x).__name__}")
+
+
+def _int_decimal(x: int) -> Decimal:
+    digits = getcontext().prec + GUARD_DIGITS
+    shift = x.bit_length() - max(MAX_EXACT_INT_BITS, 4 * digits)
+    if shift <= 0:
+        return Decimal(x)
+    # The dropped bits are far below `digits` significant digits
+    context = Context(prec=digits, Emax=MAX_EMAX, Emin=MIN_EMIN)
+    return context.multiply(Decimal(x >> shift), context.power(2, shift))
+
+
+def _negligible_square(x: Decimal, prec: int) -> bool:
+    # x^2 is below the working precision relative to x, so a series' first terms are exact enough;
+    # raising the precision by -log10(|x|) instead would make tiny arguments arbitrarily slow
+    return 2 * x.adjusted() < -(prec + 5)
+
+
+def _domain_error() -> ValueError:
+    return ValueError("math domain error")
+
+
+def _to_fixed(x: Decimal, places: int) -> int:
+    # Scaling is exact; only the final rounding to an integer loses digits
+    return int(x.scaleb(places, _EXACT).to_integral_value(ROUND_HALF_EVEN))
+
+
+def _from_fixed(value: int, places: int) -> Decimal:
+    return Decimal(value).scaleb(-places)
+
+
+def _sin_cos_fixed(x: int, scale: int):
+    # Taylor series for |x| <= pi/4 in fixed point
+    x2 = x * x // scale
+    sin_total = term = x
+    k = 1
+    while term:
+        term = -term * x2 // (scale * (k + 1) * (k + 2))
+        sin_total += term
+        k += 2
+    cos_total = term = scale
+    k = 0
+    while term:
+        term = -term * x2 // (scale * (k + 1) * (k + 2))
+        cos_total += term
+        k += 2
+    return sin_total, cos_total
+
+
+def _sin_cos(x) -> tuple:
+    x = _decimal(x)
+    if not x.is_finite():
+        raise _domain_error()
+    prec = getcontext().prec
+    if x.adjusted() > MAX_TRIG_EXPONENT:
+        raise ExpressionError(f"argument too large for trigonometric reduction: {x}")
+    # Reduce x modulo pi/2 with enough digits of pi to cover the integer part of x, and again
+    # with more if x is so close to a multiple of pi/2 that the subtraction cancels digits
+    extra = max(0, x.adjusted()) + 5
+    while True:
+        with localcontext() as ctx:
+            ctx.prec = prec + extra
+            half_pi = pi(prec + extra) / 2
+            quadrant = (x / half_pi).to_integral_value(ROUND_HALF_EVEN)
+            reduced = x - quadrant * half_pi
+        needed = max(0, x.adjusted()) + max(0, -reduced.adjusted()) + 5
+        if not quadrant or needed <= extra:
+            break
+        extra = needed
+    if _negligible_square(reduced, prec):
+        # x^2 is below the working precision: the first terms of the series are exact enough
+        with localcontext() as ctx:
+            ctx.prec = prec + 5
+            s, c = reduced - reduced * reduced * reduced / 6, 1 - reduced * reduced / 2
+    else:
+        # Fixed point keeps `places` digits after the point, so small arguments need more of them
+        places = prec + 5 + max(0, -reduced.adjusted())
+        s, c = _sin_cos_fixed(_to_fixed(reduced, places), 10 ** places)
+        s, c = _from_fixed(s, places), _from_fixed(c, places)
+    quadrant = int(quadrant) % 4
+    if quadrant == 1:
+        s, c = c, s.copy_negate()
+    elif quadrant == 2:
+        s, c = s.copy_negate(), c.copy_negate()
+    elif quadrant == 3:
+        s, c = c.copy_negate(), s
+    return s, c
+
+
+def sin(x) -> Decimal:
+    return _sin_cos(x)[0]
+
+
+def cos(x) -> Decimal:
+    return _sin_cos(x)[1]
+
+
+def tan(x) -> Decimal:
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        s, c = _sin_cos(x)
+        if not c:
+            raise _domain_error()
+        result = s / c
+    return +result
+
+
+def _atan_fixed(x: int, scale: int) -> int:
+    # atan(x) for |x| <= 0.1 in fixed point: x - x^3/3 + x^5/5 - ...
+    if x < 0:
+        return -_atan_fixed(-x, scale)
+    x2 = x * x // scale
+    power = x
+    total = 0
+    k = 0
+    while power:
+        term = power // (2 * k + 1)
+        total = total - term if k & 1 else total + term
+        power = power * x2 // scale
+        k += 1
+    return total
+
+
+def atan(x) -> Decimal:
+    x = _decimal(x)
+    prec = getcontext().prec
+    if x.is_nan():
+        raise _domain_error()
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        if abs(x) > 1:
+            # atan(x) = ±pi/2 - atan(1/x)
+            result = (pi(prec + 5) / 2).copy_sign(x) - (atan(1 / x) if x.is_finite() else 0)
+        elif _negligible_square(x, prec):
+            # x^2 is below the working precision: the first terms of the series are exact enough
+            result = x - x * x * x / 3
+        else:
+            # atan(x) = 2 atan(x / (1 + sqrt(1 + x^2))) until the series converges quickly
+            doublings = 0
+            while abs(x) > Decimal("0.1"):
+                x = x / (1 + (1 + x * x).sqrt())
+                doublings += 1
+            places = prec + 5 + doublings + max(0, -x.adjusted())
+            fixed = _atan_fixed(_to_fixed(x, places), 10 ** places) << doublings
+            result = _from_fixed(fixed, places)
+    return +result
+
+
+def atan2(y, x) -> Decimal:
+    y, x = _decimal(y), _decimal(x)
+    prec = getcontext().prec
+    if x > 0:
+        # atan rounds a -0 quotient to +0
+        return atan(y / x).copy_sign(y)
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        half_pi = pi(prec + 5) / 2
+        if y == 0:
+            # Signed zeros as in math.atan2: ±pi when x is negative or -0, ±0 when x is +0
+            result = (2 * half_pi if x.is_signed() else Decimal(0)).copy_sign(y)
+        elif x == 0:
+            result = half_pi.copy_sign(y)
+        elif not y.is_signed():
+            result = atan(y / x) + 2 * half_pi
+        else:
+            result = atan(y / x) - 2 * half_pi
+    return +result
+
+
+def asin(x) -> Decimal:
+    x = _decimal(x)
+    if abs(x) > 1:
+        raise _domain_error()
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        if abs(x) == 1:
+            return +(pi(prec + 5) / 2).copy_sign(x)
+        # (1 - x)(1 + x) rather than 1 - x^2, which cancels digits near ±1
+        result = atan(x / ((1 - x) * (1 + x)).sqrt())
+    return +result
+
+
+def acos(x) -> Decimal:
+    x = _decimal(x)
+    if abs(x) > 1:
+        raise _domain_error()
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        if x == -1:
+            return +pi(prec)
+        # acos(x) = 2 atan(sqrt((1 - x) / (1 + x))), without the cancellation of pi/2 - asin(x) near 1
+        result = 2 * atan(((1 - x) / (1 + x)).sqrt())
+    return +result
+
+
+def sqrt(x) -> Decimal:
+    x = _decimal(x)
+    if x < 0:
+        raise _domain_error()
+    return x.sqrt()
+
+
+def cbrt(x) -> Decimal:
+    x = _decimal(x)
+    if not x:
+        return x
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        root = exp(_ln(abs(x)) / 3)
+        # One Newton step cleans up the last digits, so exact cubes come out exact
+        root = (2 * root + abs(x) / (root * root)) / 3
+    return (+root).copy_sign(x)
+
+
+def _exp_fixed(x: int, scale: int, halvings: int) -> int:
+    # exp(x / 2^halvings) by its Taylor series, then squared `halvings` times
+    divisor = scale << halvings
+    total = term = scale
+    n = 1
+    while term:
+        term = term * x // (divisor * n)
+        total += term
+        n += 1
+    for _ in range(halvings):
+        total = total * total // scale
+    return total
+
+
+def exp(x) -> Decimal:
+    x = _decimal(x)
+    if not x.is_finite() or x.adjusted() > 6:
+        # Infinities, NaN, overflow and underflow are handled by the decimal module
+        return x.exp()
+    prec = getcontext().prec
+    halvings = math.isqrt(prec)
+    places = prec + halvings // 3 + 10
+    with localcontext() as ctx:
+        # exp(x) = 2^k exp(r) with |r| <= ln(2)/2, using the cached ln(2)
+        ctx.prec = places + max(0, x.adjusted()) + 5
+        log2 = ln2(ctx.prec)
+        k = (x / log2).to_integral_value(ROUND_HALF_EVEN)
+        reduced = x - k * log2
+        ctx.prec = prec + 5
+        result = _from_fixed(_exp_fixed(_to_fixed(reduced, places), 10 ** places, halvings), places)
+        result *= Decimal(2) ** int(k)
+    return +result
+
+
+def _atanh_fixed(x: int, scale: int) -> int:
+    # atanh(x) for small |x| in fixed point: x + x^3/3 + x^5/5 + ...
+    if x < 0:
+        return -_atanh_fixed(-x, scale)
+    x2 = x * x // scale
+    power = x
+    total = 0
+    k = 0
+    while power:
+        total += power // (2 * k + 1)
+        power = power * x2 // scale
+        k += 1
+    return total
+
+
+def _ln(x: Decimal) -> Decimal:
+    if not x.is_finite():
+        return x.ln()
+    if x == 1:
+        return Decimal(0)
+    prec = getcontext().prec
+    # x = m * 10^exponent, except near 1 where splitting off a power of ten would cancel
+    exponent = 0 if Decimal("0.5") < x < 2 else x.adjusted()
+    mantissa = x.scaleb(-exponent)
+    # ln(m) = 2^(roots + 1) atanh(z) with z = (r - 1) / (r + 1) and r = m^(1 / 2^roots)
+    roots = math.isqrt(prec) // 4
+    cancelled = max(0, -(mantissa - 1).adjusted())
+    places = prec + roots // 3 + cancelled + 10
+    with localcontext() as ctx:
+        ctx.prec = places
+        for _ in range(roots):
+            mantissa = mantissa.sqrt()
+        z = (mantissa - 1) / (mantissa + 1)
+        ctx.prec = prec + 5
+        result = _from_fixed(_atanh_fixed(_to_fixed(z, places), 10 ** places) << (roots + 1), places)
+        if exponent:
+            result += exponent * ln10(prec + 5)
+    return +result
+
+
+def exp2(x) -> Decimal:
+    return Decimal(2) ** _decimal(x)
+
+
+def expm1(x) -> Decimal:
+    x = _decimal(x)
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        if _negligible_square(x, prec):
+            ctx.prec = prec + 5
+            result = x + x * x / 2
+        else:
+            # exp(x) - 1 cancels about -log10(|x|) leading digits for small x
+            ctx.prec = prec + max(0, -x.adjusted()) + 2
+            result = exp(x) - 1
+    return +result
+
+
+def log(x, base=None) -> Decimal:
+    x = _decimal(x)
+    if x <= 0:
+        raise _domain_error()
+    if base is None:
+        return _ln(x)
+    base = _decimal(base)
+    if base <= 0 or base == 1:
+        raise _domain_error()
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        denominator = ln2(prec + 5) if base == 2 else _ln(base)
+        result = _ln(x) / denominator
+    return +result
+
+
+def log2(x) -> Decimal:
+    return log(x, 2)
+
+
+def log10(x) -> Decimal:
+    x = _decimal(x)
+    if x <= 0:
+        raise _domain_error()
+    if x == Decimal(1).scaleb(x.adjusted()):
+        # Exact powers of ten give exact results, as in math.log10
+        return Decimal(x.adjusted())
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        result = _ln(x) / ln10(prec + 5)
+    return +result
+
+
+def log1p(x) -> Decimal:
+    x = _decimal(x)
+    if x <= -1:
+        raise _domain_error()
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        if _negligible_square(x, prec):
+            ctx.prec = prec + 5
+            result = x - x * x / 2
+        else:
+            # Keep 1 + x exact enough for tiny x
+            ctx.prec = prec + max(0, -x.adjusted()) + 2
+            result = _ln(1 + x)
+    return +result
+
+
+def pow(x, y) -> Decimal:
+    x, y = _decimal(x), _decimal(y)
+    if x < 0 and y != y.to_integral_value():
+        raise _domain_error()
+    if not x and y < 0:
+        raise _domain_error()
+    return x ** y
+
+
+def sinh(x) -> Decimal:
+    x = _decimal(x)
+    prec = getcontext().prec
+    if _negligible_square(x, prec):
+        return +x
+    with localcontext() as ctx:
+        ctx.prec = prec + max(0, -x.adjusted()) + 5
+        grown = exp(x)
+        result = (grown - 1 / grown) / 2
+    return +result
+
+
+def cosh(x) -> Decimal:
+    x = _decimal(x)
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        grown = exp(x)
+        result = (grown + 1 / grown) / 2
+    return +result
+
+
+def tanh(x) -> Decimal:
+    x = _decimal(x)
+    prec = getcontext().prec
+    if abs(x) > prec:
+        return Decimal(1).copy_sign(x)
+    if _negligible_square(x, prec):
+        return +x
+    with localcontext() as ctx:
+        ctx.prec = prec + max(0, -x.adjusted()) + 5
+        grown = exp(2 * x)
+        result = (grown - 1) / (grown + 1)
+    return +result
+
+
+def asinh(x) -> Decimal:
+    x = _decimal(x)
+    prec = getcontext().prec
+    if _negligible_square(x, prec):
+        return +x
+    with localcontext() as ctx:
+        ctx.prec = prec + max(0, -x.adjusted()) + 5
+        result = _ln(abs(x) + (x * x + 1).sqrt())
+    return (+result).copy_sign(x)
+
+
+def acosh(x) -> Decimal:
+    x = _decimal(x)
+    if x < 1:
+        raise _domain_error()
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        result = _ln(x + (x * x - 1).sqrt())
+    return +result
+
+
+def atanh(x) -> Decimal:
+    x = _decimal(x)
+    if abs(x) >= 1:
+        raise _domain_error()
+    prec = getcontext().prec
+    if _negligible_square(x, prec):
+        return +x
+    with localcontext() as ctx:
+        ctx.prec = prec + max(0, -x.adjusted()) + 5
+        result = _ln((1 + x) / (1 - x)) / 2
+    return +result
+
+
+def hypot(*coordinates) -> Decimal:
+    return sum(_decimal(c) * _decimal(c) for c in coordinates).sqrt()
+
+
+def degrees(x) -> Decimal:
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        result = _decimal(x) * 180 / pi(prec + 5)
+    return +result
+
+
+def radians(x) -> Decimal:
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec = prec + 5
+        result = _decimal(x) * pi(prec + 5) / 180
+    return +result
+
+
+def fabs(x) -> Decimal:
+    return abs(_decimal(x))
+
+
+def fsum(values) -> Decimal:
+    # Exact running sum, rounded once at the end
+    with localcontext() as ctx:
+        ctx.prec = MAX_PREC
+        total = sum((_decimal(value) for value in values), Decimal(0))
+    return +total
+
+
+def _floor_divide(left, right):
+    if type(left) is int and type(right) is int:
+        return left // right
+    left, right = _decimal(left), _decimal(right)
+    if not right:
+        raise ZeroDivisionError("float floor division by zero")
+    # Decimal's // truncates toward zero; use Python's floor semantics instead
+    quotient = left // right
+    if quotient * right != left and (left < 0) != (right < 0):
+        quotient -= 1
+    return quotient
+
+
+def _modulo(left, right):
+    if type(left) is int and type(right) is int:
+        return left % right
+    left, right = _decimal(left), _decimal(right)
+    if not right:
+        raise ZeroDivisionError("float modulo")
+    remainder = left % right
+    if remainder and (remainder < 0) != (right < 0):
+        remainder += right
+    return remainder
+
+
+def _divide(left, right):
+    if not right:
+        raise ZeroDivisionError("division by zero")
+    return _decimal(left) / _decimal(right)
+
+
+def _precise_operators(limits: Limits) -> dict:
+    checked = _checked_operators(limits)
+    checked_power = checked["**"]
+
+    def power(base, exponent):
+        if type(base) is int and type(exponent) is int and exponent >= 0:
+            return checked_power(base, exponent)
+        return pow(base, exponent)
+
+    def floor_divide(left, right):
+        if type(left) is int and type(right) is int:
+            return checked["//"](left, right)
+        return _floor_divide(left, right)
+
+    def modulo(left, right):
+        if type(left) is int and type(right) is int:
+            return checked["%"](left, right)
+        return _modulo(left, right)
+
+    return {"/": _divide, "//": floor_divide, "%": modulo, "**": power}
+
+
+# Expression evaluation
+
+# Precision used when none is given
+DEFAULT_DIGITS = 50
+
+_CONSTANTS = {"pi": pi, "e": e, "tau": lambda digits: 2 * pi(digits + 1)}
+
+
+@lru_cache(maxsize=None)
+def build_precise_functions() -> dict:
+    """
+    Build the table of functions available in precise expressions.
+
+    Real functions work on `Decimal` values at the precision of the current
+    decimal context; integer functions (factorial, comb, gcd, ...) are exact,
+    from `math` or `calcservice.combinatorics`. Like `build_functions()`, the
+    table is built once per process and shared, so treat it as read-only.
+    """
+    return {
+        # Trigonometric and hyperbolic functions
+        "sin": sin,
+        "cos": cos,
+        "tan": tan,
+        "asin": asin,
+        "acos": acos,
+        "atan": atan,
+        "atan2": atan2,
+        "sinh": sinh,
+        "cosh": cosh,
+        "tanh": tanh,
+        "asinh": asinh,
+        "acosh": acosh,
+        "atanh": atanh,
+        # Powers, roots, exponentials and logarithms
+        "sqrt": sqrt,
+        "cbrt": cbrt,
+        "pow": pow,
+        "exp": exp,
+        "exp2": exp2,
+        "expm1": expm1,
+        "log": log,
+        "log2": log2,
+        "log10": log10,
+        "log1p": log1p,
+        # Rounding, sign and angles
+        "ceil": math.ceil,
+        "floor": math.floor,
+        "trunc": math.trunc,
+        "fabs": fabs,
+        "copysign": lambda x, y: _decimal(x).copy_sign(_decimal(y)),
+        "degrees": degrees,
+        "radians": radians,
+        "hypot": hypot,
+        # Sums and products
+        "fsum": fsum,
+        "prod": math.prod,
+        # Exact integer functions
+        "factorial": combinatorics.factorial,
+        "comb": combinatorics.comb,
+        "perm": combinatorics.perm,
+        "factorial_mod": combinatorics.factorial_mod,
+        "comb_mod": combinatorics.comb_mod,
+        "gcd": math.gcd,
+        "lcm": math.lcm,
+        "isqrt": math.isqrt,
+    }
+
+
+@lru_cache(maxsize=32)
+def _namespace(working_digits: int) -> dict:
+    # Function table plus the constants rounded to the working precision
+    namespace = dict(build_precise_functions())
+    for name, constant in _CONSTANTS.items():
+        namespace[name] = constant(working_digits)
+    namespace["inf"] = Decimal("Infinity")
+    namespace["nan"] = Decimal("NaN")
+    return namespace
+
+
+def _float_literals(text: str) -> list:
+    # Source text of every float literal, in order, so each becomes an exact Decimal
+    literals = []
+    for token in tokenize.generate_tokens(io.StringIO(text).readline):
+        if token.type == tokenize.NUMBER and type(ast.literal_eval(token.string)) is float:
+            literals.append(token.string)
+    return literals
+
+
+def _with_decimal_literals(tree, literals):
+    # Replace float constants with Decimals read from their source text; the tree
+    # is walked in source order, the same order in which the tokens appear
+    literals = iter(literals)
+
+    def convert(node):
+        kind = type(node)
+        if kind is Constant:
+            if type(node.value) is float:
+                return Constant(Decimal(next(literals)))
+            if type(node.value) is complex:
+                raise ExpressionError("complex numbers are not supported in precise mode")
+            return node
+        if kind is BinOp:
+            return BinOp(node.op, convert(node.left), convert(node.right))
+        if kind is UnaryOp:
+            operand = convert(node.operand)
+            # Negating a Decimal zero in a context drops its sign; -0.0 keeps it, as a float does
+            if node.op == "-" and type(operand) is Constant and isinstance(operand.value, Decimal):
+                return Constant(operand.value.copy_negate())
+            return UnaryOp(node.op, operand)
+        if kind is Call:
+            args = tuple(convert(arg) for arg in node.args)
+            keywords = tuple((key, convert(value)) for key, value in node.keywords)
+            return Call(node.func, args, keywords)
+        if kind is Sequence:
+            return Sequence(tuple(convert(item) for item in node.items))
+        return node
+
+    return convert(tree)
+
+
+def compile_precise(expression: str, limits: Limits = DEFAULT_LIMITS) -> Expression:
+    """
+    Parse and compile an expression for precise evaluation, reusing the shared LRU cache.
+
+    The compiled expression does not depend on the precision: literals are
+    exact Decimals and rounding happens in the decimal context at evaluation time.
+    """
+    text = normalize_expression(expression)
+
+    def build():
+        tree = parse(text, _namespace(DEFAULT_DIGITS + GUARD_DIGITS), limits)
+        tree = _with_decimal_literals(tree, _float_literals(text))
+        return Expression(text, tree, compile_tree(tree, limits, _precise_operators(limits)))
+
+    return expression_cache.get_or_compile(("precise", text, limits), build)
+
+
+def _round(value):
+    if isinstance(value, Decimal):
+        # Unary plus rounds -0 to +0
+        return (+value).copy_sign(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_round(item) for item in value)
+    return value
+
+
+def evaluate_precise(expression: str, digits: int = DEFAULT_DIGITS, limits: Limits = DEFAULT_LIMITS):
+    """
+    Evaluate a scientific expression with `digits` significant digits.
+
+    Real arithmetic and functions run on `decimal.Decimal` with a few guard
+    digits, and the result is rounded to `digits`. Integer arithmetic stays
+    exact, so results are `Decimal` or `int`. Float literals are read from
+    their source text, so `0.1` is exactly one tenth.
+
+    pi, e and ln(2) are computed once at the highest precision requested so
+    far and reused for every lower precision.
+
+    ## Examples
+
+    - `evaluate_precise("sqrt(2)", 30)` → `Decimal('1.41421356237309504880168872421')`
+    - `evaluate_precise("4*atan(1) - pi", 500)` → `Decimal('0E-...')`
+    - `evaluate_precise("0.1 + 0.2")` → `Decimal('0.3')`
+
+    ## Error Handling
+
+    - Raises `ValueError` when `digits` is outside 1..MAX_DIGITS
+    - Raises `ExpressionError` for unknown names, unsupported syntax or exceeded limits
+    - Domain errors raise `ValueError: math domain error`, and results beyond the
+      decimal exponent range `OverflowError: math range error`, as in the float mode
+    """
+    if not 1 <= digits <= MAX_DIGITS:
+        raise ValueError(f"digits must be between 1 and {MAX_DIGITS}")
+    compiled = compile_precise(expression, limits)
+    working = digits + GUARD_DIGITS
+    with localcontext(Context(prec=working)) as ctx:
+        try:
+            result = compiled.evaluate(_namespace(working))
+            ctx.prec = digits
+            return _round(result)
+        except Overflow:
+            raise OverflowError("math range error") from None
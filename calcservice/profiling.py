@@ -0,0 +1,147 @@
+import heapq
+import json
+from functools import wraps
+from itertools import count
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Phases recorded for every profiled expression
+PHASES = ("parse", "evaluate", "format")
+
+
+class Profiler:
+    """
+    Opt-in profiler for scientific evaluation.
+
+    Records call counts and cumulative time for each function of the scientific
+    function table, for the parse/evaluate/format phases, and keeps the slowest
+    `slowest` expressions. Nothing is recorded unless a profiler is passed in,
+    so the normal evaluation path pays only a single `is None` check.
+
+    ## Example
+
+    ```python
+    profiler = Profiler()
+    functions = profiler.instrument(build_functions())
+    evaluate_scientific("factorial(2000) % 7", functions, profiler=profiler)
+    profiler.stats()["functions"]["factorial"]  # {"count": 1, "total_seconds": ...}
+    profiler.dump("profile.json")
+    ```
+    """
+
+    def __init__(self, slowest: int = 10) -> None:
+        self.slowest_limit = slowest
+        self.functions: Dict[str, List[float]] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.phases: Dict[str, List[float]] = {phase: [0, 0.0] for phase in PHASES}
+        # Zero in place: instrumented wrappers keep references to these lists
+        for totals in self.functions.values():
+            totals[0], totals[1] = 0, 0.0
+        self.expressions = 0
+        self._slowest = []
+        self._sequence = count()
+
+    def instrument(self, functions: dict) -> dict:
+        """
+        Return a copy of a function table whose callables record their time here.
+
+        Constants are copied unchanged. Each wrapper times only its own call,
+        since arguments are evaluated before the call starts.
+        """
+        instrumented = {}
+        for name, value in functions.items():
+            instrumented[name] = self._wrap(name, value) if callable(value) else value
+        return instrumented
+
+    def _wrap(self, name: str, function: Callable) -> Callable:
+        totals = self.functions.setdefault(name, [0, 0.0])
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                totals[0] += 1
+                totals[1] += perf_counter() - start
+
+        return timed
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        totals = self.phases[phase]
+        totals[0] += 1
+        totals[1] += seconds
+
+    def record_expression(self, expression: str, seconds: float) -> None:
+        """
+        Count one evaluated expression and keep it if it is among the slowest.
+        """
+        self.expressions += 1
+        self._keep_slowest(seconds, expression)
+
+    def _keep_slowest(self, seconds: float, expression: str) -> None:
+        # Min-heap of the slowest expressions; the sequence number breaks ties
+        entry = (seconds, next(self._sequence), expression)
+        if len(self._slowest) < self.slowest_limit:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def merge(self, stats: dict) -> None:
+        """
+        Add the counters of a `stats()` dictionary, e.g. from a worker process.
+        """
+        self.expressions += stats["expressions"]
+        for section, target in (("phases", self.phases), ("functions", self.functions)):
+            for name, data in stats[section].items():
+                totals = target.setdefault(name, [0, 0.0])
+                totals[0] += data["count"]
+                totals[1] += data["total_seconds"]
+        for item in stats["slowest"]:
+            self._keep_slowest(item["seconds"], item["expression"])
+
+    def stats(self) -> dict:
+        """
+        Return the collected data as plain dictionaries, sorted by cumulative time.
+        """
+
+        def table(totals: Dict[str, List[float]]) -> dict:
+            rows = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+            return {
+                name: {"count": calls, "total_seconds": seconds}
+                for name, (calls, seconds) in rows
+                if calls
+            }
+
+        return {
+            "expressions": self.expressions,
+            "phases": table(self.phases),
+            "functions": table(self.functions),
+            "slowest": [
+                {"expression": expression, "seconds": seconds}
+                for seconds, _, expression in sorted(self._slowest, reverse=True)
+            ],
+        }
+
+    def format_results(self, results: Iterable[dict], formatter: Callable) -> Iterator[str]:
+        """
+        Format results lazily, recording the time of each call as the format phase.
+        """
+        for result in results:
+            start = perf_counter()
+            line = formatter(result)
+            self.record_phase("format", perf_counter() - start)
+            yield line
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.stats(), indent=indent)
+
+    def dump(self, path: str) -> None:
+        """
+        Write the collected data to a JSON file.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+            f.write("\n")
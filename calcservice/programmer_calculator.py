@@ -1,4 +1,314 @@
-from . import re
+import operator
+import re
+from typing import Iterable, List, NamedTuple, Union
+
+from .engine import ExpressionError
+from .expression_cache import expression_cache, normalize_expression
+
+# Supported bit sizes for calculations
+BIT_SIZES = (8, 16, 32, 64)
+
+# Tokenizer compiled once at import time
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:"
+    r"(?P<float>\d+\.\d+)|"  # Floating-point numbers (e.g., 3.14)
+    r"(?P<int>0b[01]+|0o[0-7]+|0x[0-9a-f]+|\d+)|"  # Integer literals (binary, octal, hex, decimal)
+    r"(?P<word>\b(?:and|xor|or|not)\b)|"  # Word operators
+    r"(?P<name>[a-z_]\w*)|"  # Variable names (array mode)
+    r"(?P<op><<|>>|[~&|^()+\-*/%])"  # Operators and parentheses
+    r")",
+    re.IGNORECASE,
+)
+_WORD_OPERATORS = {"and": "&", "or": "|", "xor": "^", "not": "~"}
+
+# Binary operators: symbol → precedence (higher binds tighter), same order as Python
+_PRECEDENCE = {"|": 1, "^": 2, "&": 3, "<<": 4, ">>": 4, "+": 5, "-": 5, "*": 6, "/": 6, "%": 6}
+_BITWISE_OPERATORS = {"~", "&", "|", "^", "<<", ">>"}
+
+# Instruction kinds of a compiled program
+_PUSH, _UNARY, _BINARY, _LOAD = 0, 1, 2, 3
+
+
+class ProgrammerResult(NamedTuple):
+    """
+    Result of a programmer-mode expression.
+
+    `unsigned` is the raw bit pattern masked to `bits` (or a float when the
+    expression used floating-point numbers).
+    """
+
+    unsigned: Union[int, float]
+    bits: int
+    signed: bool
+
+    @property
+    def is_float(self) -> bool:
+        return isinstance(self.unsigned, float)
+
+    @property
+    def decimal(self) -> Union[int, float]:
+        """Decimal value, using two's complement when `signed` is set."""
+        if self.signed and not self.is_float:
+            return _to_signed(self.unsigned, self.bits)
+        return self.unsigned
+
+    @property
+    def hexadecimal(self) -> str:
+        return format(self.unsigned, "X")
+
+    @property
+    def octal(self) -> str:
+        return format(self.unsigned, "o")
+
+    @property
+    def binary(self) -> str:
+        return format(self.unsigned, f"0{self.bits}b")
+
+    def to_dict(self) -> dict:
+        """Return the result in every output format (or just the float value)."""
+        if self.is_float:
+            return {"decimal": self.unsigned}
+        return {
+            "decimal": self.decimal,
+            "hexadecimal": self.hexadecimal,
+            "octal": self.octal,
+            "binary": self.binary,
+        }
+
+
+def _to_signed(value: int, bits: int) -> int:
+    # Two's complement conversion of a masked value
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+
+def tokenize(expression: str) -> List[str]:
+    """
+    Split a programmer expression into normalized tokens.
+
+    Literals keep their base prefix in lowercase and word operators
+    (AND, OR, XOR, NOT) are replaced by their symbols. Any character that is not
+    part of a token raises `ExpressionError`.
+    """
+    tokens = []
+    position = 0
+    text = expression.rstrip()
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None or match.end() == position:
+            raise ExpressionError(f"unexpected character {text[position:].lstrip()[:1]!r}")
+        token = match.group(match.lastgroup).lower()
+        tokens.append(_WORD_OPERATORS.get(token, token))
+        position = match.end()
+    return tokens
+
+
+class _Program(NamedTuple):
+    instructions: tuple
+    is_float: bool
+    is_bitwise: bool
+    names: tuple
+
+
+def _compile(tokens: List[str]) -> _Program:
+    # Precedence-climbing parser emitting a postfix instruction list
+    instructions = []
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def operand():
+        nonlocal position
+        token = peek()
+        if token is None:
+            raise ExpressionError("unexpected end of expression")
+        position += 1
+        if token in ("~", "-", "+"):
+            operand()
+            instructions.append((_UNARY, token))
+        elif token == "(":
+            binary(0)
+            if peek() != ")":
+                raise ExpressionError("missing closing parenthesis")
+            position += 1
+        elif "." in token:
+            instructions.append((_PUSH, float(token)))
+        elif token[0].isdigit():
+            instructions.append((_PUSH, int(token, 0) if token[:2] in ("0b", "0o", "0x") else int(token, 10)))
+        elif token[0].isalpha() or token[0] == "_":
+            instructions.append((_LOAD, token))
+        else:
+            raise ExpressionError(f"unexpected token {token!r}")
+
+    def binary(min_precedence):
+        nonlocal position
+        operand()
+        while True:
+            token = peek()
+            precedence = _PRECEDENCE.get(token)
+            if precedence is None or precedence <= min_precedence:
+                return
+            position += 1
+            binary(precedence)
+            instructions.append((_BINARY, token))
+
+    binary(0)
+    if position != len(tokens):
+        raise ExpressionError(f"unexpected token {tokens[position]!r}")
+
+    is_float = any(kind == _PUSH and isinstance(value, float) for kind, value in instructions)
+    is_bitwise = any(kind in (_UNARY, _BINARY) and value in _BITWISE_OPERATORS for kind, value in instructions)
+    names = tuple(dict.fromkeys(value for kind, value in instructions if kind == _LOAD))
+    return _Program(tuple(instructions), is_float, is_bitwise, names)
+
+
+def compile_programmer(expression: str) -> _Program:
+    """
+    Tokenize and parse a programmer expression once, reusing the shared LRU cache.
+    """
+    text = normalize_expression(expression)
+    return expression_cache.get_or_compile(("programmer", text), lambda: _compile(tokenize(text)))
+
+
+def _shift_left(value, shift, bits, signed):
+    return 0 if shift >= bits else value << shift
+
+
+def _shift_right(value, shift, bits, signed):
+    # Arithmetic shift for signed mode, logical shift for unsigned mode
+    if signed:
+        value = _to_signed(value, bits)
+    return value >> min(shift, bits)
+
+
+def _divide(left, right, bits, signed):
+    if signed:
+        left, right = _to_signed(left, bits), _to_signed(right, bits)
+    return left // right
+
+
+def _modulo(left, right, bits, signed):
+    if signed:
+        left, right = _to_signed(left, bits), _to_signed(right, bits)
+    return left % right
+
+
+# Operators on fixed-width integers; each takes (left, right, bits, signed)
+_INTEGER_OPERATORS = {
+    "&": lambda a, b, bits, signed: a & b,
+    "|": lambda a, b, bits, signed: a | b,
+    "^": lambda a, b, bits, signed: a ^ b,
+    "+": lambda a, b, bits, signed: a + b,
+    "-": lambda a, b, bits, signed: a - b,
+    "*": lambda a, b, bits, signed: a * b,
+    "/": _divide,
+    "%": _modulo,
+    "<<": _shift_left,
+    ">>": _shift_right,
+}
+_FLOAT_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.floordiv,  # "/" is integer (floor) division in programmer mode
+    "%": operator.mod,
+}
+_UNARY_OPERATORS = {"~": operator.invert, "-": operator.neg, "+": operator.pos}
+
+
+def _run(program: _Program, bits: int, signed: bool, mask: int) -> Union[int, float]:
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    if program.is_float:
+        for kind, value in program.instructions:
+            if kind == _PUSH:
+                push(value)
+            elif kind == _UNARY:
+                push(_UNARY_OPERATORS[value](pop()))
+            else:
+                right = pop()
+                push(_FLOAT_OPERATORS[value](pop(), right))
+        return float(stack[0])
+
+    for kind, value in program.instructions:
+        if kind == _PUSH:
+            push(value & mask)
+        elif kind == _UNARY:
+            push(_UNARY_OPERATORS[value](pop()) & mask)
+        else:
+            right = pop()
+            if value in ("<<", ">>") and signed and right >> (bits - 1):
+                raise ExpressionError("negative shift count")
+            push(_INTEGER_OPERATORS[value](pop(), right, bits, signed) & mask)
+    return stack[0]
+
+
+def _check_bits(bits: int) -> None:
+    if bits not in BIT_SIZES:
+        raise ValueError(f"Invalid bit size {bits}. Please use 8, 16, 32, or 64.")
+
+
+def _check_scalar_program(program: _Program) -> None:
+    if program.names:
+        raise ExpressionError(f"name '{program.names[0]}' is not defined")
+    if program.is_float and program.is_bitwise:
+        raise ExpressionError("Floating point numbers are not supported in bitwise operations.")
+
+
+def evaluate_programmer(expression: str, bits: int = 64, signed: bool = False) -> ProgrammerResult:
+    """
+    Evaluate a programmer expression at a fixed bit width without any terminal I/O.
+
+    Every intermediate value is masked to `bits`, so arithmetic wraps exactly
+    like a fixed-width register. Right shift, division and modulo treat operands
+    as two's complement values when `signed` is set.
+
+    ## Examples
+
+    - `evaluate_programmer("0b1010 & 0b1100", 8).binary` → `"00001000"`
+    - `evaluate_programmer("0xFF + 1", 8).decimal` → 0 (wraps around)
+    - `evaluate_programmer("0x80 >> 1", 8, signed=True).decimal` → -64
+
+    ## Error Handling
+
+    - Raises `ValueError` for unsupported bit sizes
+    - Raises `ExpressionError` for invalid expressions or when floating-point
+      numbers are mixed with bitwise operators
+    - Raises `ZeroDivisionError` for division or modulo by zero
+    """
+    _check_bits(bits)
+    program = compile_programmer(expression)
+    _check_scalar_program(program)
+    return ProgrammerResult(_run(program, bits, signed, (1 << bits) - 1), bits, signed)
+
+
+def evaluate_programmer_many(
+    expressions: Iterable[str], bits: int = 64, signed: bool = False
+) -> List[ProgrammerResult]:
+    """
+    Evaluate many programmer expressions at one fixed bit width.
+
+    The bit size is validated and the mask computed once for the whole list.
+    Raises on the first invalid expression, like `evaluate_programmer`.
+    """
+    _check_bits(bits)
+    mask = (1 << bits) - 1
+    results = []
+    for expression in expressions:
+        program = compile_programmer(expression)
+        _check_scalar_program(program)
+        results.append(ProgrammerResult(_run(program, bits, signed, mask), bits, signed))
+    return results
+
+
+def show_bits(value: int, bits: int) -> None:
+    """
+    Print the binary representation of `value` with bit positions from MSB to LSB.
+    """
+    print("\nBit position: ")
+    print(" ".join(str(i) for i in range(bits - 1, -1, -1)))
+    print(format(value, f"0{bits}b"))
 
 
 def programmer_calculator() -> None:
@@ -60,51 +370,18 @@ def programmer_calculator() -> None:
     """
     print("\nParty Programmer Calculator")
 
-    # Define supported operations and bit sizes
-    operations = [
-        "~",
-        "&",
-        "|",
-        "^",
-        "<<",
-        ">>",
-        "+",
-        "-",
-        "*",
-        "/",
-        "%",
-    ]  # List of all supported operators
-    bits = [8, 16, 32, 64]  # Supported bit sizes for calculations
-    bitwise_ops = [
-        "~",
-        "&",
-        "|",
-        "^",
-        "<<",
-        ">>",
-    ]  # Operators that require bitwise handling
-
     # Main calculation loop
     while True:
 
-        # Get user input and normalize it
+        # Get user input and check for exit command
         expression = input("Enter your expression (or 'exit' to return to main menu): ")
-        expression = expression.upper()  # Convert to uppercase for consistency
-        expression = (
-            expression.replace("AND", "&")
-            .replace("OR", "|")
-            .replace("XOR", "^")
-            .replace("NOT", "~")
-        )  # Replace word operators with symbols
-
-        # Check for exit command
-        if expression.lower() == "exit":
+        if expression.strip().lower() == "exit":
             break
 
         # Get and validate bit size
         try:
             bit = int(input("Enter the bit size (8, 16, 32, 64): "))
-            if bit not in bits:
+            if bit not in BIT_SIZES:
                 raise ValueError
         except ValueError:
             print("Invalid bit size. Please enter 8, 16, 32, or 64.")
@@ -113,104 +390,25 @@ def programmer_calculator() -> None:
         # Determine if signed or unsigned arithmetic
         signed = input("Signed or Unsigned (s/u): ").lower() == "s"
 
-        # Tokenize the expression using regex
-        tokens = re.findall(
-            r"0b[01]+|"  # Match binary literals (e.g., 0b1010)
-            r"0o[0-7]+|"  # Match octal literals (e.g., 0o777)
-            r"0x[0-9A-F]+|"  # Match hexadecimal literals (e.g., 0xFF)
-            r"\d+\.\d+|"  # Match floating-point numbers (e.g., 3.14)
-            r"\d+|"  # Match decimal integers (e.g., 42)
-            r"<<|>>|"  # Match shift operators
-            r"[~&|^()+\-*/%]",  # Match operators and parentheses
-            expression,
-            re.VERBOSE | re.IGNORECASE,
-        )
-
-        # Check if the expression contains bitwise operations
-        is_bitwise = any(op in expression for op in bitwise_ops)
-        # Check if the expression contains floating-point numbers
-        is_float = any("." in token for token in expression.split())
-
-        # Validate that floating-point and bitwise operations are not mixed
-        if is_float and is_bitwise:
-            print(
-                "Error: Floating point numbers are not supported in bitwise operations."
-            )
-            continue
-
-        # Convert tokens to decimal for evaluation
-        converted_expression = []
         try:
-            for token in tokens:
-                token = token.lower()  # Normalize token to lowercase
-
-                # Handle operators and parentheses
-                if token in operations or token in ("(", ")"):
-                    if token == "/":
-                        converted_expression.append("// ")  # Use integer division
-                    else:
-                        converted_expression.append(token)
-                # Convert binary literals to decimal
-                elif token.startswith("0b"):
-                    converted_expression.append(str(int(token, 2)))
-                # Convert hexadecimal literals to decimal
-                elif token.startswith("0x"):
-                    converted_expression.append(str(int(token, 16)))
-                # Convert octal literals to decimal
-                elif token.startswith("0o"):
-                    converted_expression.append(str(int(token, 8)))
-                else:
-                    # Handle numbers
-                    if is_float and "." in token:
-                        converted_expression.append(token)  # Keep floats as-is
-                    else:
-                        converted_expression.append(
-                            str(int(token, 10))
-                        )  # Convert to decimal int
-
-            # Join tokens into evaluable expression
-            converted_expr = "".join(converted_expression)
-
-            # Evaluate the expression in a restricted environment
-            result = eval(converted_expr, {"__builtins__": None}, {})
-
-            # Handle floating-point results separately
-            if is_float:
-                print("Result (float): ", result)
-                continue
-
-            # Ensure result is an integer
-            if not isinstance(result, int):
-                print("Error: Result is not an integer. Please check your expression.")
-                continue
-
-        # Handle specific exceptions
+            result = evaluate_programmer(expression, bit, signed)
         except ZeroDivisionError:
             print("Error: Division by zero is not allowed.")
             continue
-        except:
-            print("Error in expression. Please check your input.")
+        except ExpressionError as e:
+            if "Floating point" in str(e):
+                print(f"Error: {e}")
+            else:
+                print("Error in expression. Please check your input.")
             continue
 
-        # Apply bit mask to constrain result to specified bit size
-        mask = (1 << bit) - 1
-        result = result & mask
-
-        # Handle unsigned right shift (logical shift)
-        if not signed and ">>" in tokens:
-            result = result & mask
-
-        # Function to display the binary representation with bit positions
-        def show_bits(value):
-            b = format(value, f"0{bit}b")  # Format as binary string with leading zeros
-            print("\nBit position: ")
-            print(
-                " ".join(str(i) for i in range(bit - 1, -1, -1))
-            )  # Print bit positions from MSB to LSB
-            print("".join(b))  # Print the binary digits
+        # Floating-point results are shown as-is
+        if result.is_float:
+            print("Result (float): ", result.unsigned)
+            continue
 
         # Display the current result in binary
-        show_bits(result)
+        show_bits(result.unsigned, bit)
 
         # Interactive bit toggling
         toggle = input("Do you want to toggle any bit?(yes/no):").lower()
@@ -219,41 +417,18 @@ def programmer_calculator() -> None:
             try:
                 position = int(input("enter bit position to toggle: "))
                 if 0 <= position < bit:
-                    result ^= 1 << position  # Toggle the bit using XOR
-                    result &= mask  # Apply mask to keep within bit size
-                    show_bits(result)  # Show updated binary
+                    # Toggle the bit using XOR
+                    result = result._replace(unsigned=result.unsigned ^ (1 << position))
+                    show_bits(result.unsigned, bit)
                 else:
                     print("Invalid bit position. Please try again.")
-                    continue
             except ValueError:
                 print("Invalid input. Please enter a valid bit position.")
-                continue
-
-            # Reapply mask after toggling
-            result = result & ((1 << bit) - 1)
-
-            # Redisplay binary after toggle
-            binary_str = format(result, "0" + str(bit) + "b")
-            print("\nBit position: ")
-            print(" ".join(str(i) for i in range(bit - 1, -1, -1)))
-            print("".join(binary_str))
-
-            # Note: The toggle loop continues until user says no, but toggle is not updated inside the loop
-
-        # Convert result to signed decimal if signed arithmetic is selected
-        if signed:
-            sign_bit = 1 << (bit - 1)  # Position of the sign bit
-            decimal = (
-                result - (1 << bit) if (result & sign_bit) else result
-            )  # Two's complement conversion
-        else:
-            decimal = result  # For unsigned, decimal is the same as result
-
-        unsigned = result  # Unsigned value is always the raw result
+            toggle = input("Do you want to toggle another bit?(yes/no):").lower()
 
         # Display final results in multiple formats
         print("\nResult:")
-        print("decimal: ", decimal)
-        print("hexadecimal: ", format(unsigned, "X"))  # Uppercase hex
-        print("octal: ", format(unsigned, "o"))  # Octal
-        print("binary: ", format(unsigned, f"0{bit}b"))  # Binary with leading zeros
+        print("decimal: ", result.decimal)
+        print("hexadecimal: ", result.hexadecimal)  # Uppercase hex
+        print("octal: ", result.octal)  # Octal
+        print("binary: ", result.binary)  # Binary with leading zeros
@@ -0,0 +1,262 @@
+import os
+import pickle
+import sqlite3
+import time
+from threading import Lock
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from .expression_cache import normalize_expression
+
+# Default location of the cache file; CALCSERVICE_CACHE overrides it
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "calcservice", "results.sqlite3")
+
+DEFAULT_MAX_BYTES = 256 << 20
+
+# Results computed faster than this are not worth a disk write
+DEFAULT_MIN_SECONDS = 0.0005
+
+# Seconds to wait for another process holding the write lock
+BUSY_TIMEOUT = 30.0
+
+# Eviction frees space down to this fraction of the size limit, so it runs rarely
+EVICTION_LOW_WATER = 0.9
+
+# A hit refreshes the entry's last-used time only if it is older than this, to spare writes
+TOUCH_INTERVAL = 60.0
+
+# Hit/miss counts accumulated in memory before they are added to the file
+COUNTER_FLUSH_INTERVAL = 256
+
+# Bytes charged per entry on top of its key and value, for SQLite's row and index overhead
+ENTRY_OVERHEAD = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    mode TEXT NOT NULL,
+    expression TEXT NOT NULL,
+    bits INTEGER NOT NULL,
+    signed INTEGER NOT NULL,
+    precision INTEGER NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (mode, expression, bits, signed, precision)
+);
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO counters VALUES ('bytes', 0), ('hits', 0), ('misses', 0), ('evictions', 0);
+"""
+
+_COUNTERS = ("hits", "misses", "evictions")
+
+
+class ResultCacheStats(NamedTuple):
+    """
+    Counters of a persistent result cache, summed over every process that has used the file.
+    """
+
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+def default_cache_path() -> str:
+    """
+    Return the cache file used when none is given: `$CALCSERVICE_CACHE`, else `~/.cache/calcservice/results.sqlite3`.
+    """
+    return os.environ.get("CALCSERVICE_CACHE") or DEFAULT_CACHE_PATH
+
+
+class ResultCache:
+    """
+    Persistent cache of evaluation results, shared by every process that opens the same file.
+
+    Results are keyed on (mode, normalized expression, bit size, signedness,
+    precision) and stored in SQLite in write-ahead-log mode, so any number
+    of processes can read while one writes; writers wait for each other up
+    to `BUSY_TIMEOUT`. When the stored entries exceed `max_bytes` the least
+    recently used ones are evicted. Only results that took at least
+    `min_seconds` to compute are stored; errors are never cached.
+
+    Values are pickled, so only open cache files you trust.
+
+    ## Example
+
+    ```python
+    with ResultCache("results.sqlite3") as cache:
+        cache.get_or_compute("scientific", "factorial(20000)", lambda: evaluate_scientific("factorial(20000)"))
+        cache.stats()
+    ```
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        min_seconds: float = DEFAULT_MIN_SECONDS,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.min_seconds = min_seconds
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly around writes
+        self._connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self._lock = Lock()
+        self._pending = dict.fromkeys(_COUNTERS, 0)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+
+    @staticmethod
+    def key(mode: str, expression: str, bits: int = 0, signed: bool = False, precision: int = 0) -> Tuple:
+        return (mode, normalize_expression(expression), int(bits), int(bool(signed)), int(precision))
+
+    def get(self, mode: str, expression: str, bits: int = 0, signed: bool = False, precision: int = 0):
+        """
+        Return `(True, value)` for a cached result, or `(False, None)`.
+        """
+        key = self.key(mode, expression, bits, signed, precision)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, used FROM results WHERE mode=? AND expression=? AND bits=? AND signed=? AND precision=?",
+                key,
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return False, None
+            self._count("hits")
+            now = time.time()
+            if now - row[1] > TOUCH_INTERVAL:
+                self._connection.execute(
+                    "UPDATE results SET used=? WHERE mode=? AND expression=? AND bits=? AND signed=? AND precision=?",
+                    (now, *key),
+                )
+        return True, pickle.loads(row[0])
+
+    def put(self, mode: str, expression: str, value: Any, bits: int = 0, signed: bool = False, precision: int = 0) -> None:
+        """
+        Store a result, evicting the least recently used entries if the cache grows past `max_bytes`.
+        """
+        key = self.key(mode, expression, bits, signed, precision)
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        size = len(blob) + len(key[0]) + len(key[1].encode()) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                previous = connection.execute(
+                    "SELECT size FROM results WHERE mode=? AND expression=? AND bits=? AND signed=? AND precision=?", key
+                ).fetchone()
+                connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (*key, blob, size, time.time()))
+                total = self._add_bytes(size - (previous[0] if previous else 0))
+                if total > self.max_bytes:
+                    self._evict(total - int(self.max_bytes * EVICTION_LOW_WATER))
+                self._flush_counters()
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def get_or_compute(
+        self,
+        mode: str,
+        expression: str,
+        compute: Callable[[], Any],
+        bits: int = 0,
+        signed: bool = False,
+        precision: int = 0,
+    ) -> Any:
+        """
+        Return the cached result, or call `compute()` and store its result if it was slow enough.
+
+        Errors raised by `compute` propagate and nothing is stored.
+        """
+        found, value = self.get(mode, expression, bits, signed, precision)
+        if found:
+            return value
+        start = time.perf_counter()
+        value = compute()
+        if time.perf_counter() - start >= self.min_seconds:
+            self.put(mode, expression, value, bits, signed, precision)
+        return value
+
+    def _add_bytes(self, delta: int) -> int:
+        connection = self._connection
+        connection.execute("UPDATE counters SET value = value + ? WHERE name = 'bytes'", (delta,))
+        return connection.execute("SELECT value FROM counters WHERE name = 'bytes'").fetchone()[0]
+
+    def _evict(self, excess: int) -> None:
+        # Oldest entries first, until `excess` bytes are freed; runs inside the write transaction
+        connection = self._connection
+        freed, victims = 0, []
+        for rowid, size in connection.execute("SELECT rowid, size FROM results ORDER BY used"):
+            victims.append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        connection.executemany("DELETE FROM results WHERE rowid = ?", victims)
+        self._add_bytes(-freed)
+        self._pending["evictions"] += len(victims)
+
+    def _count(self, name: str) -> None:
+        self._pending[name] += 1
+        if self._pending["hits"] + self._pending["misses"] >= COUNTER_FLUSH_INTERVAL:
+            self._flush_counters()
+
+    def _flush_counters(self) -> None:
+        pending = [(value, name) for name, value in self._pending.items() if value]
+        if pending:
+            self._connection.executemany("UPDATE counters SET value = value + ? WHERE name = ?", pending)
+            self._pending = dict.fromkeys(_COUNTERS, 0)
+
+    def flush(self) -> None:
+        """
+        Add this process's pending hit/miss counts to the file.
+        """
+        with self._lock:
+            self._flush_counters()
+
+    def stats(self) -> ResultCacheStats:
+        """
+        Return the entry count, stored bytes and the hit/miss/eviction counters of all processes.
+        """
+        with self._lock:
+            self._flush_counters()
+            entries = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            counters = dict(self._connection.execute("SELECT name, value FROM counters"))
+        return ResultCacheStats(
+            entries, counters["bytes"], self.max_bytes, counters["hits"], counters["misses"], counters["evictions"]
+        )
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the counters.
+        """
+        with self._lock:
+            self._pending = dict.fromkeys(_COUNTERS, 0)
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute("DELETE FROM results")
+            self._connection.execute("UPDATE counters SET value = 0")
+            self._connection.execute("COMMIT")
+        with self._lock:
+            self._connection.execute("VACUUM")
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_counters()
+            self._connection.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
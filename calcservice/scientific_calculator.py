@@ -1,4 +1,193 @@
-from . import math
+import math
+from functools import cache
+from time import perf_counter
+
+from . import combinatorics
+from .engine import compile_expression
+from .optimizer import optimize_expression
+
+
+@cache
+def build_functions() -> dict:
+    """
+    Build the table of names available in scientific expressions.
+
+    Maps function and constant names to their `math` implementations, except
+    the combinatorics, which come from `calcservice.combinatorics` (same
+    results, faster for big integers, plus modular variants). Functions
+    missing from the running Python version (e.g. `fma` before 3.13) are left out.
+
+    The table is built once per process and shared by every caller, so treat it
+    as read-only; copy it before adding or replacing entries.
+    """
+    # Define available mathematical functions
+    functions = {
+        # Trigonometric functions
+        "acos": math.acos,  # arccosine
+        "acosh": math.acosh,  # hyperbolic arccosine
+        "sin": math.sin,  # sine
+        "asin": math.asin,  # arcsine
+        "asinh": math.asinh,  # hyperbolic arcsine
+        "atan": math.atan,  # arctangent
+        "atan2": math.atan2,  # arctangent of y/x
+        "atanh": math.atanh,  # hyperbolic arctangent
+        "cos": math.cos,  # cosine
+        "tan": math.tan,  # tangent
+        "sinh": math.sinh,  # hyperbolic sine
+        "cosh": math.cosh,  # hyperbolic cosine
+        "tanh": math.tanh,  # hyperbolic tangent
+        # Constants
+        "pi": math.pi,  # π constant
+        "e": math.e,  # Euler's number
+        "tau": math.tau,  # τ constant (2π)
+        "inf": math.inf,  # positive infinity
+        "nan": math.nan,  # not a number
+        # Rounding functions
+        "ceil": math.ceil,  # ceiling function
+        "floor": math.floor,  # floor function
+        "trunc": math.trunc,  # truncate function
+        # Absolute value and sign
+        "fabs": math.fabs,  # absolute value
+        "copysign": math.copysign,  # copy sign
+        # Factorial and combinatorics
+        "factorial": combinatorics.factorial,  # factorial function
+        "comb": combinatorics.comb,  # combinations
+        "perm": combinatorics.perm,  # permutations
+        "factorial_mod": combinatorics.factorial_mod,  # n! mod m
+        "comb_mod": combinatorics.comb_mod,  # C(n,k) mod m
+        # Power and root functions
+        "pow": math.pow,  # power function
+        "sqrt": math.sqrt,  # square root
+        "cbrt": math.cbrt,  # cube root
+        # Logarithmic functions
+        "log": math.log,  # natural logarithm
+        "log2": math.log2,  # base-2 logarithm
+        "log10": math.log10,  # base-10 logarithm
+        "log1p": math.log1p,  # log(1+x)
+        # Exponential functions
+        "exp": math.exp,  # exponential function
+        "exp2": math.exp2,  # 2^x
+        "expm1": math.expm1,  # exp(x) - 1
+        # Special functions
+        "gamma": math.gamma,  # gamma function
+        "lgamma": math.lgamma,  # log gamma function
+        "erf": math.erf,  # error function
+        "erfc": math.erfc,  # complementary error function
+        # Remainder and modulus
+        "fmod": math.fmod,  # floating-point modulus
+        "remainder": math.remainder,  # IEEE 754 remainder
+        # Distance and hypotenuse
+        "hypot": math.hypot,  # hypotenuse
+        "dist": math.dist,  # Euclidean distance
+        # GCD and LCM
+        "gcd": math.gcd,  # greatest common divisor
+        "lcm": math.lcm,  # least common multiple
+        # Number classification
+        "isfinite": math.isfinite,  # check for finite number
+        "isinf": math.isinf,  # check for infinity
+        "isnan": math.isnan,  # check for NaN
+        # Precision and comparison
+        "isclose": math.isclose,  # check for closeness
+        "ulp": math.ulp,  # unit in the last place
+        "nextafter": math.nextafter,  # next representable value
+        # Summation and products
+        "fsum": math.fsum,  # accurate floating-point sum
+        "prod": math.prod,  # product of iterable
+        "sumprod": getattr(math, "sumprod", None),  # sum and product (if available)
+        # Mantissa and exponent
+        "frexp": math.frexp,  # mantissa and exponent
+        "ldexp": math.ldexp,  # multiply by power of 2
+        "modf": math.modf,  # fractional and integer parts
+        # Fused operations
+        "fma": getattr(math, "fma", None),  # fused multiply-add (if available)
+        # Angle conversions
+        "degrees": math.degrees,  # radians to degrees
+        "radians": math.radians,  # degrees to radians
+        # Integer square root
+        "isqrt": math.isqrt,  # integer square root
+    }
+    # Drop functions missing from older Python versions
+    functions = {name: value for name, value in functions.items() if value is not None}
+    return functions
+
+
+def _compile(expression: str, functions: dict, optimize: bool, mode: str):
+    if optimize:
+        return optimize_expression(expression, functions, mode)
+    return compile_expression(expression, functions, mode="scientific")
+
+
+def evaluate_scientific(expression: str, functions=None, profiler=None, optimize: bool = False):
+    """
+    Evaluate a scientific expression without any terminal I/O.
+
+    ## Examples
+
+    - `evaluate_scientific("sin(pi/2)")` → 1.0
+    - `evaluate_scientific("factorial(5)")` → 120
+
+    ## Error Handling
+
+    - Raises `ExpressionError` for unknown names, unsupported syntax or exceeded limits
+    - Errors from the `math` functions (e.g. `ValueError: math domain error`) propagate
+
+    ## Optimization
+
+    With `optimize=True` constant subtrees such as `2*pi/360` are folded and
+    repeated subtrees such as `sqrt(x*x+y*y)` are evaluated once (see
+    `calcservice.optimizer`). `functions` must then be the shared table or a
+    profiler's instrumented copy of it, since its constants are folded into
+    the cached expression.
+
+    ## Profiling
+
+    Pass a `calcservice.profiling.Profiler` (and a function table from
+    `profiler.instrument(...)`) to record parse/evaluate time and per-function
+    timings. Without a profiler nothing is measured.
+    """
+    if functions is None:
+        functions = build_functions()
+    if profiler is None:
+        return _compile(expression, functions, optimize, "scientific").evaluate(functions)
+
+    start = perf_counter()
+    # Instrumented calls are not folded, so profiled expressions are cached separately
+    compiled = _compile(expression, functions, optimize, "scientific:profiled")
+    parsed = perf_counter()
+    profiler.record_phase("parse", parsed - start)
+    try:
+        return compiled.evaluate(functions)
+    finally:
+        finished = perf_counter()
+        profiler.record_phase("evaluate", finished - parsed)
+        profiler.record_expression(expression, finished - start)
+
+
+def _read_digits(command: str, current):
+    """
+    Parse a `digits N` / `digits off` command; returns the new precision or None for floats.
+
+    An invalid value keeps the `current` precision.
+    """
+    from .precision import MAX_DIGITS
+
+    value = command[len("digits"):].strip().lower()
+    print("-" * 50)
+    if value in ("", "off", "float"):
+        print("Precision: float")
+        print("-" * 50)
+        return None
+    try:
+        digits = int(value)
+        if not 1 <= digits <= MAX_DIGITS:
+            raise ValueError(f"digits must be between 1 and {MAX_DIGITS}")
+    except ValueError as e:
+        print(f"Invalid precision. Error: {str(e)}")
+        print("-" * 50)
+        return current
+    print(f"Precision: {digits} digits")
+    print("-" * 50)
+    return digits
 
 
 def scientific_calculator() -> None:
@@ -6,7 +195,7 @@ def scientific_calculator() -> None:
     Scientific Calculator Mode
 
     Provides access to advanced mathematical functions from Python's math module.
-    Functions are made available in a restricted evaluation context for safety.
+    Expressions are evaluated by the safe expression engine (`calcservice.engine`).
 
     ## Available Functions
 
@@ -59,6 +248,7 @@ def scientific_calculator() -> None:
     - `factorial(x)` - x!
     - `comb(n, k)` - combinations C(n,k)
     - `perm(n, k)` - permutations P(n,k)
+    - `factorial_mod(n, m)`, `comb_mod(n, k, m)` - n! and C(n,k) modulo m, without the huge integers
 
     ### Number Properties
     - `gcd(x, y)` - greatest common divisor
@@ -83,6 +273,18 @@ def scientific_calculator() -> None:
     - `log(100)` → 4.605... (natural log)
     - `factorial(5)` → 120
 
+    ## Variables and Functions
+
+    - `r = 2`, `area(r) = pi * r**2` - define variables and functions; changing
+      a variable recomputes everything that depends on it (see `calcservice.session`)
+    - `save work.calc`, `load work.calc` - store or restore the definitions and their values
+
+    ## Precision
+
+    - `digits 50` - evaluate with 50 significant digits using decimal arithmetic
+      (see `calcservice.precision`); only the functions listed there are available
+    - `digits off` - return to float evaluation
+
     ## Notes
 
     - All angles are in radians unless specified otherwise
@@ -91,90 +293,12 @@ def scientific_calculator() -> None:
     """
     print("Scientific Calculator")
 
-    # Define available mathematical functions
-    functions = {
-        # Trigonometric functions
-        "acos": math.acos,  # arccosine
-        "acosh": math.acosh,  # hyperbolic arccosine
-        "sin": math.sin,  # sine
-        "asin": math.asin,  # arcsine
-        "asinh": math.asinh,  # hyperbolic arcsine
-        "atan": math.atan,  # arctangent
-        "atan2": math.atan2,  # arctangent of y/x
-        "atanh": math.atanh,  # hyperbolic arctangent
-        "cos": math.cos,  # cosine
-        "tan": math.tan,  # tangent
-        "sinh": math.sinh,  # hyperbolic sine
-        "cosh": math.cosh,  # hyperbolic cosine
-        "tanh": math.tanh,  # hyperbolic tangent
-        # Constants
-        "pi": math.pi,  # π constant
-        "e": math.e,  # Euler's number
-        "tau": math.tau,  # τ constant (2π)
-        "inf": math.inf,  # positive infinity
-        "nan": math.nan,  # not a number
-        # Rounding functions
-        "ceil": math.ceil,  # ceiling function
-        "floor": math.floor,  # floor function
-        "trunc": math.trunc,  # truncate function
-        # Absolute value and sign
-        "fabs": math.fabs,  # absolute value
-        "copysign": math.copysign,  # copy sign
-        # Factorial and combinatorics
-        "factorial": math.factorial,  # factorial function
-        "comb": math.comb,  # combinations
-        "perm": math.perm,  # permutations
-        # Power and root functions
-        "pow": math.pow,  # power function
-        "sqrt": math.sqrt,  # square root
-        "cbrt": math.cbrt,  # cube root
-        # Logarithmic functions
-        "log": math.log,  # natural logarithm
-        "log2": math.log2,  # base-2 logarithm
-        "log10": math.log10,  # base-10 logarithm
-        "log1p": math.log1p,  # log(1+x)
-        # Exponential functions
-        "exp": math.exp,  # exponential function
-        "exp2": math.exp2,  # 2^x
-        "expm1": math.expm1,  # exp(x) - 1
-        # Special functions
-        "gamma": math.gamma,  # gamma function
-        "lgamma": math.lgamma,  # log gamma function
-        "erf": math.erf,  # error function
-        "erfc": math.erfc,  # complementary error function
-        # Remainder and modulus
-        "fmod": math.fmod,  # floating-point modulus
-        "remainder": math.remainder,  # IEEE 754 remainder
-        # Distance and hypotenuse
-        "hypot": math.hypot,  # hypotenuse
-        "dist": math.dist,  # Euclidean distance
-        # GCD and LCM
-        "gcd": math.gcd,  # greatest common divisor
-        "lcm": math.lcm,  # least common multiple
-        # Number classification
-        "isfinite": math.isfinite,  # check for finite number
-        "isinf": math.isinf,  # check for infinity
-        "isnan": math.isnan,  # check for NaN
-        # Precision and comparison
-        "isclose": math.isclose,  # check for closeness
-        "ulp": math.ulp,  # unit in the last place
-        "nextafter": math.nextafter,  # next representable value
-        # Summation and products
-        "fsum": math.fsum,  # accurate floating-point sum
-        "prod": math.prod,  # product of iterable
-        "sumprod": math.sumprod,  # sum and product (if available)
-        # Mantissa and exponent
-        "frexp": math.frexp,  # mantissa and exponent
-        "ldexp": math.ldexp,  # multiply by power of 2
-        "modf": math.modf,  # fractional and integer parts
-        # Fused operations
-        "fma": math.fma,  # fused multiply-add
-        # Angle conversions
-        "degrees": math.degrees,  # radians to degrees
-        "radians": math.radians,  # degrees to radians
-        # Integer square root
-        "isqrt": math.isqrt,  # integer square root
-    }
+    # Shared function table, built once per process
+    functions = build_functions()
+    # Significant digits of the arbitrary-precision mode, or None for floats
+    digits = None
+    # Variables and user functions, created by the first definition
+    session = None
 
     # Main calculation loop with error handling
 
@@ -185,9 +309,36 @@ def scientific_calculator() -> None:
         if expression.lower() in ["exit"]:
             break
 
+        if expression.lower().startswith("digits"):
+            digits = _read_digits(expression, digits)
+            continue
+
         try:
-            # Evaluate in restricted context for security
-            result = eval(expression, {"__builtins__": {}}, functions)
+            command, _, path = expression.strip().partition(" ")
+            if command in ("save", "load") and path:
+                # Save or load the session's variables and functions
+                from .session import Session
+
+                if command == "save":
+                    (session or Session(functions)).save(path.strip())
+                    result = f"session saved to {path.strip()}"
+                else:
+                    session = Session.load(path.strip(), functions)
+                    result = f"{len(session)} definitions loaded from {path.strip()}"
+            elif digits is not None:
+                from .precision import evaluate_precise
+
+                result = evaluate_precise(expression, digits)
+            elif session is not None or "=" in expression:
+                # Definitions such as `r = 2` or `area(r) = pi*r**2` start a session
+                from .session import Session
+
+                if session is None:
+                    session = Session(functions)
+                result = session.execute(expression)
+            else:
+                # Evaluate with the safe expression engine (parsed trees are cached)
+                result = evaluate_scientific(expression, functions)
             print("-" * 50)
             print("The result is: ", result)
             print("-" * 50)
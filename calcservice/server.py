@@ -0,0 +1,264 @@
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from .batch import format_result, make_evaluator
+
+# Request size limits
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# Modes reachable through the single-expression and batch endpoints
+SERVICE_MODES = ("basic", "scientific", "programmer")
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+# Evaluators of the current process (thread or worker process), built once per mode
+_evaluators = {}
+
+
+def evaluate_json(mode: str, expressions: List[str], bits: int = 64, signed: bool = False) -> List[str]:
+    """
+    Evaluate expressions and return one serialized JSON object per expression.
+
+    Runs inside the executor, so the evaluation and the JSON formatting of
+    large results both stay off the event loop.
+    """
+    key = (mode, bits, signed)
+    evaluator = _evaluators.get(key)
+    if evaluator is None:
+        evaluator = _evaluators[key] = make_evaluator(mode, bits, signed)
+    results = []
+    for expression in expressions:
+        result = {"expression": expression}
+        try:
+            result["result"] = evaluator(expression)
+        except Exception as e:
+            result["error"] = str(e)
+        results.append(format_result(result).rstrip("\n"))
+    return results
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class CalcServer:
+    """
+    Asyncio HTTP/JSON server exposing the calculator evaluators.
+
+    ## Endpoints
+
+    - `GET /health` → `{"status": "ok"}`
+    - `POST /evaluate/<mode>` with `{"expression": "sqrt(16)"}` → `{"expression": ..., "result": 4.0}`
+    - `POST /batch` with `{"mode": "scientific", "expressions": ["1+1", "sin(0)"]}`
+      → `{"results": [{...}, {...}]}`
+
+    Programmer-mode requests also accept `"bits"` (8, 16, 32, 64; default 64)
+    and `"signed"` (default false).
+
+    Connections are kept alive (HTTP/1.1) until the client sends
+    `Connection: close`. Evaluations run in an executor so a slow expression
+    never blocks the event loop: a thread pool by default, or a process pool
+    when `workers` is given for CPU-bound traffic.
+
+    ## Example
+
+    ```
+    $ python -m calcservice serve --port 8080 --workers 4
+    $ curl -s localhost:8080/evaluate/scientific -d '{"expression": "factorial(20)"}'
+    {"expression": "factorial(20)", "result": 2432902008176640000}
+    ```
+
+    Any HTTP/1.1 load generator (e.g. `wrk`, `ab -k`, `hey`) can be pointed at it.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, workers: Optional[int] = None) -> None:
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.executor: Optional[Executor] = None
+        self._server = None
+
+    async def start(self) -> None:
+        if self.workers:
+            self.executor = ProcessPoolExecutor(self.workers)
+        else:
+            self.executor = ThreadPoolExecutor()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        # Report the real port when port 0 asked the OS to pick one
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _evaluate(self, mode: str, expressions: List[str], data: dict) -> List[str]:
+        bits, signed = data.get("bits", 64), data.get("signed", False)
+        if type(bits) is not int or bits not in (8, 16, 32, 64) or not isinstance(signed, bool):
+            raise HTTPError(400, "'bits' must be 8, 16, 32 or 64 and 'signed' a boolean")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, evaluate_json, mode, expressions, bits, signed
+        )
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as e:
+                    await _write_response(writer, e.status, json.dumps({"error": str(e)}), False)
+                    break
+                if request is None:
+                    break
+                method, path, keep_alive, body = request
+                try:
+                    status, payload = 200, await self._route(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, json.dumps({"error": str(e)})
+                except Exception as e:
+                    status, payload = 500, json.dumps({"error": str(e)})
+                await _write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> str:
+        if path == "/health":
+            return '{"status": "ok"}'
+        if method != "POST":
+            raise HTTPError(405, f"{method} is not allowed for {path}")
+
+        data = _decode_json(body)
+        if path == "/batch":
+            mode = data.get("mode", "scientific")
+            expressions = data.get("expressions")
+            if not isinstance(expressions, list) or not all(isinstance(e, str) for e in expressions):
+                raise HTTPError(400, "'expressions' must be a list of strings")
+            _check_mode(mode)
+            results = await self._evaluate(mode, expressions, data)
+            return '{"results": [' + ", ".join(results) + "]}"
+
+        if path.startswith("/evaluate/"):
+            mode = path[len("/evaluate/"):]
+            _check_mode(mode)
+            expression = data.get("expression")
+            if not isinstance(expression, str):
+                raise HTTPError(400, "'expression' must be a string")
+            return (await self._evaluate(mode, [expression], data))[0]
+
+        raise HTTPError(404, f"no endpoint at {path}")
+
+
+def _check_mode(mode) -> None:
+    if mode not in SERVICE_MODES:
+        raise HTTPError(404, f"unknown mode: {mode!r}")
+
+
+def _decode_json(body: bytes) -> dict:
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "request body must be JSON") from None
+    if not isinstance(data, dict):
+        raise HTTPError(400, "request body must be a JSON object")
+    return data
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bool, bytes]]:
+    """
+    Read one HTTP/1.x request; returns `None` when the client closed the connection.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise HTTPError(400, "incomplete request") from None
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(413, "request headers too large") from None
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HTTPError(400, "malformed request line") from None
+
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        keep_alive = connection == "keep-alive"
+    else:
+        keep_alive = connection != "close"
+
+    # Plain ASCII digits only: int() would also take a sign, spaces or underscores
+    value = headers.get("content-length", "0")
+    if not (value.isascii() and value.isdigit()):
+        raise HTTPError(400, "invalid Content-Length")
+    length = int(value)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], keep_alive, body
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, payload: str, keep_alive: bool) -> None:
+    body = payload.encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8080, workers: Optional[int] = None) -> None:
+    """
+    Run the calculation service until interrupted.
+    """
+    server = CalcServer(host, port, workers)
+
+    async def serve():
+        await server.start()
+        print(f"calcservice listening on http://{server.host}:{server.port}", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
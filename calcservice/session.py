@@ -0,0 +1,360 @@
+import gzip
+import json
+import os
+import re
+import tempfile
+from collections import ChainMap
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .engine import BinOp, Call, ExpressionError, Name, Sequence, UnaryOp, parse
+from .optimizer import optimize_tree, pure_functions
+
+# `name = expression` or `name(a, b) = expression`
+_DEFINITION = re.compile(r"^\s*([A-Za-z_]\w*)\s*(?:\(([^()]*)\))?\s*=(?!=)(.*)$", re.DOTALL)
+_IDENTIFIER = re.compile(r"^[A-Za-z_]\w*$")
+
+# Integers longer than this are saved as hex strings, which have no digit limit
+_MAX_PLAIN_INT_BITS = 64
+
+# Identifies session files and their layout version
+FILE_FORMAT = "calcservice-session"
+FILE_VERSION = 1
+
+
+def _referenced_names(tree) -> Iterator[str]:
+    kind = type(tree)
+    if kind is Name:
+        yield tree.id
+    elif kind is Call:
+        yield tree.func
+        for arg in tree.args:
+            yield from _referenced_names(arg)
+        for _, value in tree.keywords:
+            yield from _referenced_names(value)
+    elif kind is BinOp:
+        yield from _referenced_names(tree.left)
+        yield from _referenced_names(tree.right)
+    elif kind is UnaryOp:
+        yield from _referenced_names(tree.operand)
+    elif kind is Sequence:
+        for item in tree.items:
+            yield from _referenced_names(item)
+
+
+class Cell:
+    """
+    One named definition of a session: a variable, or a function when `params` is set.
+
+    `dependencies` are the session names the definition refers to, whether
+    they are defined yet or not. `value` holds the last computed value and
+    `error` the message of the last failure.
+    """
+
+    __slots__ = ("name", "params", "source", "dependencies", "value", "error", "_expression")
+
+    def __init__(self, name: str, source: str, params: Optional[Tuple[str, ...]], dependencies: Tuple[str, ...]) -> None:
+        self.name = name
+        self.source = source
+        self.params = params
+        self.dependencies = dependencies
+        self.value = None
+        self.error = None
+        self._expression = None
+
+    def __repr__(self) -> str:
+        if self.params is not None:
+            return f"Cell({self.name}({', '.join(self.params)}) = {self.source})"
+        return f"Cell({self.name} = {self.source})"
+
+
+class Session:
+    """
+    Named variables and user-defined functions with spreadsheet-style recomputation.
+
+    Every definition is a cell in a dependency graph. Redefining a cell
+    re-evaluates only that cell and the cells downstream of it, in dependency
+    order; unrelated cells keep their values. Sessions can be saved to a
+    compact file, values included, and loaded again without re-evaluating.
+
+    ## Example
+
+    ```python
+    session = Session()
+    session.execute("r = 2")
+    session.execute("area(r) = pi * r**2")
+    session.execute("total = area(r) + area(1)")
+    session.execute("r = 3")  # recomputes r and total only
+    session["total"]           # 31.41...
+    session.save("work.calc")
+    ```
+
+    ## Error Handling
+
+    - Definitions that would form a cycle, or rebind a name of the function
+      table, raise `ExpressionError` and leave the session unchanged
+    - A cell that fails to evaluate keeps the error message; reading it, or
+      a cell that depends on it, raises `ExpressionError`
+    """
+
+    def __init__(self, functions: Optional[dict] = None) -> None:
+        if functions is None:
+            from .scientific_calculator import build_functions
+
+            functions = build_functions()
+        self.functions = functions
+        self._pure = pure_functions(functions)
+        self._cells: Dict[str, Cell] = {}
+        # name → cells that refer to it (the name need not be defined yet)
+        self._dependents: Dict[str, set] = {}
+        # Function table plus the value of every cell that evaluated successfully
+        self._namespace = dict(functions)
+
+    # Definitions
+
+    def execute(self, line: str) -> Any:
+        """
+        Run one line: a `name = ...` or `name(args) = ...` definition, or a plain expression.
+
+        Returns the value of the defined cell (or of the expression); function
+        definitions return the function's cell.
+        """
+        match = _DEFINITION.match(line)
+        if match is None:
+            return self.evaluate(line)
+        name, params, source = match.groups()
+        if params is not None:
+            params = tuple(param.strip() for param in params.split(",") if param.strip())
+        self.define(name, source, params)
+        cell = self._cells[name]
+        return cell if params is not None else self[name]
+
+    def define(self, name: str, source: str, params: Optional[Tuple[str, ...]] = None) -> List[str]:
+        """
+        Define or redefine a cell and recompute everything downstream of it.
+
+        Returns the names of the recomputed cells in evaluation order.
+        """
+        if not _IDENTIFIER.match(name):
+            raise ExpressionError(f"invalid name: {name!r}")
+        if name in self.functions:
+            raise ExpressionError(f"'{name}' is a built-in name and cannot be redefined")
+        for param in params or ():
+            if not _IDENTIFIER.match(param):
+                raise ExpressionError(f"invalid parameter name: {param!r}")
+        if params is not None and len(set(params)) != len(params):
+            raise ExpressionError(f"duplicate parameter in {name}()")
+
+        tree = parse(source)
+        local = set(params or ())
+        dependencies = tuple(
+            dict.fromkeys(
+                ref for ref in _referenced_names(tree) if ref not in local and ref not in self.functions
+            )
+        )
+        downstream = set(self._downstream(name))
+        for dependency in dependencies:
+            if dependency in downstream:
+                raise ExpressionError(f"circular reference: '{name}' depends on '{dependency}'")
+
+        old = self._cells.get(name)
+        if old is not None:
+            for dependency in old.dependencies:
+                self._dependents[dependency].discard(name)
+        cell = Cell(name, source.strip(), params, dependencies)
+        cell._expression = optimize_tree(cell.source, tree, self.functions, self._pure)
+        self._cells[name] = cell
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(name)
+        return self._recompute(name)
+
+    def delete(self, name: str) -> List[str]:
+        """
+        Remove a cell; cells that used it are recomputed (and now fail).
+        """
+        cell = self._cells.pop(name)
+        for dependency in cell.dependencies:
+            self._dependents[dependency].discard(name)
+        self._namespace.pop(name, None)
+        return self._recompute(name)
+
+    # Evaluation
+
+    def evaluate(self, expression: str) -> Any:
+        """
+        Evaluate an expression against the session's variables and functions without storing it.
+        """
+        tree = parse(expression)
+        self._check_dependencies(_referenced_names(tree))
+        return optimize_tree(expression, tree, self.functions, self._pure).evaluate(self._namespace)
+
+    def _check_dependencies(self, names) -> None:
+        for name in names:
+            cell = self._cells.get(name)
+            if cell is not None and cell.error is not None:
+                raise ExpressionError(f"'{name}' has no value: {cell.error}")
+
+    def _downstream(self, name: str) -> List[str]:
+        # `name` followed by every cell that depends on it, in dependency order
+        # (reverse post-order of an iterative depth-first search)
+        order = []
+        seen = {name}
+        stack = [(name, iter(sorted(self._dependents.get(name, ()))))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append((child, iter(sorted(self._dependents.get(child, ())))))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+        order.reverse()
+        return order
+
+    def _recompute(self, name: str) -> List[str]:
+        order = self._downstream(name)
+        for cell_name in order:
+            cell = self._cells.get(cell_name)
+            if cell is not None:
+                self._evaluate_cell(cell)
+        return [cell_name for cell_name in order if cell_name in self._cells]
+
+    def _expression(self, cell: Cell):
+        if cell._expression is None:
+            # Cells loaded from a file are compiled on first use
+            cell._expression = optimize_tree(cell.source, parse(cell.source), self.functions, self._pure)
+        return cell._expression
+
+    def _evaluate_cell(self, cell: Cell) -> None:
+        try:
+            self._check_dependencies(cell.dependencies)
+            if cell.params is None:
+                value = self._expression(cell).evaluate(self._namespace)
+            else:
+                value = self._make_function(cell)
+        except Exception as e:
+            cell.value, cell.error = None, str(e)
+            self._namespace.pop(cell.name, None)
+        else:
+            cell.value, cell.error = value, None
+            self._namespace[cell.name] = value
+
+    def _make_function(self, cell: Cell):
+        session = self
+        params = cell.params
+
+        def function(*args):
+            if len(args) != len(params):
+                raise TypeError(f"{cell.name}() takes {len(params)} arguments ({len(args)} given)")
+            scope = ChainMap(dict(zip(params, args)), session._namespace)
+            return session._expression(cell).evaluate(scope)
+
+        function.__name__ = cell.name
+        return function
+
+    # Access
+
+    def __getitem__(self, name: str) -> Any:
+        cell = self._cells[name]
+        if cell.error is not None:
+            raise ExpressionError(f"'{name}' has no value: {cell.error}")
+        return cell.value
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._cells
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def cells(self) -> List[Cell]:
+        """
+        Return the cells in definition order.
+        """
+        return list(self._cells.values())
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        """
+        Write the session, with every computed value, to a gzip-compressed JSON file.
+
+        The file is written under a temporary name and then moved into place,
+        so a failed save leaves any previous file at `path` intact.
+        """
+        cells = []
+        for cell in self._cells.values():
+            entry = {"n": cell.name, "s": cell.source, "d": list(cell.dependencies)}
+            if cell.params is not None:
+                entry["p"] = list(cell.params)
+            elif cell.error is not None:
+                entry["e"] = cell.error
+            else:
+                entry["v"] = _encode(cell.value)
+            cells.append(entry)
+        data = {"format": FILE_FORMAT, "version": FILE_VERSION, "cells": cells}
+        text = json.dumps(data, separators=(",", ":"))
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temporary = tempfile.mkstemp(prefix=".session-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(text.encode("utf-8"))
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path: str, functions: Optional[dict] = None) -> "Session":
+        """
+        Load a session saved by `save`, restoring stored values without re-evaluating.
+
+        Cells are compiled lazily, the first time they are recomputed.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != FILE_FORMAT or data.get("version") != FILE_VERSION:
+            raise ValueError(f"{path} is not a version {FILE_VERSION} session file")
+        session = cls(functions)
+        for entry in data["cells"]:
+            params = tuple(entry["p"]) if "p" in entry else None
+            cell = Cell(entry["n"], entry["s"], params, tuple(entry["d"]))
+            session._cells[cell.name] = cell
+            for dependency in cell.dependencies:
+                session._dependents.setdefault(dependency, set()).add(cell.name)
+            if params is not None:
+                cell.value = session._make_function(cell)
+            elif "e" in entry:
+                cell.error = entry["e"]
+                continue
+            else:
+                cell.value = _decode(entry["v"])
+            session._namespace[cell.name] = cell.value
+        return session
+
+
+def _encode(value):
+    # JSON keeps small ints and floats (including nan/inf); tag the rest
+    if type(value) is int and value.bit_length() > _MAX_PLAIN_INT_BITS:
+        return {"int": format(value, "x")}
+    if type(value) is complex:
+        return {"complex": [value.real, value.imag]}
+    if type(value) is tuple:
+        return {"tuple": [_encode(item) for item in value]}
+    if type(value) is list:
+        return [_encode(item) for item in value]
+    if type(value) in (int, float, bool):
+        return value
+    raise TypeError(f"cannot save a value of type {type(value).__name__}")
+
+
+def _decode(value):
+    if type(value) is dict:
+        if "int" in value:
+            return int(value["int"], 16)
+        if "complex" in value:
+            return complex(*value["complex"])
+        return tuple(_decode(item) for item in value["tuple"])
+    if type(value) is list:
+        return [_decode(item) for item in value]
+    return value
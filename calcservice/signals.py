@@ -0,0 +1,604 @@
+import math
+from typing import Optional, Sequence, Tuple
+
+from ._optional import optional_scipy, require_numpy
+from .stats import DEFAULT_CHUNK_BYTES, _is_csv, _open_array, read_chunks
+
+# Up to this many taps direct convolution is faster than the FFT
+DIRECT_CONVOLUTION_TAPS = 64
+
+# Samples per block of the NumPy IIR filter; each block is one matrix product
+IIR_BLOCK = 128
+
+# Highest order run as one block state-space filter; higher orders are split into sections
+IIR_SECTION_ORDER = 2
+
+# Samples per segment of Welch's spectrum estimate
+DEFAULT_SEGMENT = 1024
+
+WINDOWS = ("hann", "hamming", "blackman", "boxcar")
+
+
+def next_fast_len(n: int) -> int:
+    """
+    Smallest length >= `n` whose only prime factors are 2, 3 and 5, which FFTs handle fastest.
+    """
+    if n <= 6:
+        return max(n, 1)
+    best = 1 << (n - 1).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            # Smallest power of two that brings power35 up to n
+            quotient = -(-n // power35)
+            candidate = power35 << (quotient - 1).bit_length()
+            best = min(best, candidate)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def fft(x, n: Optional[int] = None):
+    """
+    Discrete Fourier transform of a sequence (optionally zero-padded or cut to `n` points).
+    """
+    np = require_numpy()
+    return np.fft.fft(np.asarray(x), n)
+
+
+def ifft(x, n: Optional[int] = None):
+    """
+    Inverse discrete Fourier transform; `ifft(fft(x))` gives `x` back (as complex values).
+    """
+    np = require_numpy()
+    return np.fft.ifft(np.asarray(x), n)
+
+
+def _fft_convolve(a, b):
+    # Full linear convolution along axis 0 of `a` with the 1-D sequence `b`
+    np = require_numpy()
+    length = a.shape[0] + b.shape[0] - 1
+    size = next_fast_len(length)
+    shape = (-1,) + (1,) * (a.ndim - 1)
+    if np.iscomplexobj(a) or np.iscomplexobj(b):
+        spectrum = np.fft.fft(a, size, axis=0) * np.fft.fft(b, size).reshape(shape)
+        return np.fft.ifft(spectrum, size, axis=0)[:length]
+    spectrum = np.fft.rfft(a, size, axis=0) * np.fft.rfft(b, size).reshape(shape)
+    return np.fft.irfft(spectrum, size, axis=0)[:length]
+
+
+def convolve(a, b, mode: str = "full"):
+    """
+    Linear convolution of two 1-D sequences, like `numpy.convolve`.
+
+    Long inputs are convolved through the FFT in O(n log n); when either
+    sequence has at most `DIRECT_CONVOLUTION_TAPS` values the direct sum is
+    faster and is used instead.
+
+    ## Examples
+
+    - `convolve([1, 2, 3], [0, 1, 0.5])` → `array([0. , 1. , 2.5, 4. , 1.5])`
+    - `convolve(signal, taps, "same")` - output aligned with `signal`
+
+    ## Error Handling
+
+    - Raises `ValueError` for empty or multi-dimensional inputs and unknown modes
+    """
+    np = require_numpy()
+    a, b = np.asarray(a), np.asarray(b)
+    if a.ndim != 1 or b.ndim != 1:
+        raise ValueError("convolve expects 1-D sequences")
+    if not a.size or not b.size:
+        raise ValueError("cannot convolve an empty sequence")
+    if mode not in ("full", "same", "valid"):
+        raise ValueError(f"mode must be 'full', 'same' or 'valid', not {mode!r}")
+    if min(a.size, b.size) <= DIRECT_CONVOLUTION_TAPS:
+        return np.convolve(a, b, mode)
+    if a.size < b.size:
+        a, b = b, a
+    full = _fft_convolve(a, b)
+    if mode == "full":
+        return full
+    if mode == "same":
+        start = (b.size - 1) // 2
+        return full[start : start + a.size]
+    return full[b.size - 1 : a.size]
+
+
+def _window(name: str, size: int):
+    # Periodic windows, as used for spectral analysis
+    np = require_numpy()
+    phase = 2 * np.pi * np.arange(size) / size
+    if name == "hann":
+        return 0.5 - 0.5 * np.cos(phase)
+    if name == "hamming":
+        return 0.54 - 0.46 * np.cos(phase)
+    if name == "blackman":
+        return 0.42 - 0.5 * np.cos(phase) + 0.08 * np.cos(2 * phase)
+    if name == "boxcar":
+        return np.ones(size)
+    raise ValueError(f"window must be one of {', '.join(WINDOWS)}, not {name!r}")
+
+
+def lowpass_fir(taps: int, cutoff: float, rate: float = 1.0):
+    """
+    Design a linear-phase low-pass FIR filter by the windowed-sinc method (Hamming window).
+
+    `cutoff` is in the units of `rate` (e.g. Hz with `rate` in samples per
+    second). The taps sum to 1, so the gain at 0 Hz is exactly 1.
+
+    ## Error Handling
+
+    - Raises `ValueError` unless `0 < cutoff < rate / 2` and `taps >= 1`
+    """
+    np = require_numpy()
+    if taps < 1:
+        raise ValueError("a filter needs at least one tap")
+    if not 0 < cutoff < rate / 2:
+        raise ValueError("cutoff must be between 0 and half the sample rate")
+    n = np.arange(taps) - (taps - 1) / 2
+    h = np.sinc(2 * cutoff / rate * n) * (0.54 - 0.46 * np.cos(2 * np.pi * np.arange(taps) / max(taps - 1, 1)))
+    return h / h.sum()
+
+
+def lowpass_biquad(cutoff: float, rate: float = 1.0, q: float = 1 / math.sqrt(2)) -> Tuple[list, list]:
+    """
+    Design a second-order low-pass IIR filter; returns `(b, a)`.
+
+    Uses the bilinear transform of the analog prototype (the "audio EQ
+    cookbook" formulas); the default `q` gives a Butterworth response.
+    """
+    if not 0 < cutoff < rate / 2:
+        raise ValueError("cutoff must be between 0 and half the sample rate")
+    w0 = 2 * math.pi * cutoff / rate
+    alpha = math.sin(w0) / (2 * q)
+    cos_w0 = math.cos(w0)
+    a0 = 1 + alpha
+    b = [(1 - cos_w0) / 2 / a0, (1 - cos_w0) / a0, (1 - cos_w0) / 2 / a0]
+    a = [1.0, -2 * cos_w0 / a0, (1 - alpha) / a0]
+    return b, a
+
+
+class FIRFilter:
+    """
+    Streaming FIR filter.
+
+    Feed the signal to `process` in consecutive chunks of any size; the
+    outputs put together equal filtering the whole signal at once. Only the
+    last `len(taps) - 1` input samples are carried between chunks
+    (overlap-save), so memory does not grow with the length of the signal.
+    Chunks may be 1-D or have one column per channel (time along axis 0).
+
+    Long filters are applied with FFT convolution, short ones directly.
+
+    ## Example
+
+    ```python
+    fir = FIRFilter(lowpass_fir(255, 1000, rate=48000))
+    for chunk in read_chunks("recording.npy"):
+        out.write(fir.process(chunk))
+    ```
+    """
+
+    def __init__(self, taps) -> None:
+        np = require_numpy()
+        self.taps = np.asarray(taps)
+        if self.taps.ndim != 1 or not self.taps.size:
+            raise ValueError("taps must be a non-empty 1-D sequence")
+        self._history = None
+
+    def reset(self) -> None:
+        """
+        Forget the carried samples, as before the first chunk.
+        """
+        self._history = None
+
+    def process(self, chunk):
+        """
+        Filter the next chunk of samples; returns as many output samples as were given.
+        """
+        np = require_numpy()
+        chunk = np.asarray(chunk)
+        carried = self.taps.size - 1
+        if self._history is None or self._history.shape[1:] != chunk.shape[1:]:
+            dtype = np.result_type(chunk, self.taps, np.float64)
+            self._history = np.zeros((carried,) + chunk.shape[1:], dtype=dtype)
+        buffer = np.concatenate([self._history, chunk])
+        self._history = buffer[buffer.shape[0] - carried :].copy()
+        if self.taps.size > DIRECT_CONVOLUTION_TAPS:
+            return _fft_convolve(buffer, self.taps)[carried : carried + chunk.shape[0]]
+        if buffer.ndim == 1:
+            return np.convolve(buffer, self.taps, "valid")
+        # One multiply-add per tap over the whole chunk
+        output = np.zeros((chunk.shape[0],) + chunk.shape[1:], dtype=buffer.dtype)
+        for k, tap in enumerate(self.taps.tolist()):
+            output += tap * buffer[carried - k : carried - k + chunk.shape[0]]
+        return output
+
+
+class IIRFilter:
+    """
+    Streaming IIR filter with transfer function `b(z) / a(z)`, like `scipy.signal.lfilter`.
+
+    The filter state (transposed direct form II) is carried between calls
+    to `process`, so a signal can be filtered chunk by chunk in constant
+    memory with the same result as filtering it at once.
+
+    `scipy.signal.lfilter` is used when SciPy is installed. Otherwise each
+    chunk is cut into blocks of `IIR_BLOCK` samples and a whole block is
+    computed with two matrix products (block state-space form); only the
+    state is passed from block to block, so the Python-level loop runs once
+    per block rather than once per sample. Powers of a high-order state
+    matrix amplify rounding errors, so filters above second order are run
+    as the FIR numerator `b` followed by a cascade of first- and
+    second-order all-pole sections, one per pole or conjugate pole pair.
+    """
+
+    def __init__(self, b, a=(1.0,)) -> None:
+        np = require_numpy()
+        b, a = np.atleast_1d(np.asarray(b, dtype=float)), np.atleast_1d(np.asarray(a, dtype=float))
+        if b.ndim != 1 or a.ndim != 1 or not b.size or not a.size:
+            raise ValueError("b and a must be non-empty 1-D sequences")
+        if a[0] == 0:
+            raise ValueError("a[0] must not be zero")
+        size = max(a.size, b.size)
+        self.b = np.pad(b, (0, size - b.size)) / a[0]
+        self.a = np.pad(a, (0, size - a.size)) / a[0]
+        self.order = size - 1
+        self._state = None
+        self._blocks = None
+        signal = optional_scipy("signal")
+        self._lfilter = None if signal is None else signal.lfilter
+        self._stages = None
+        if self._lfilter is None and self.order > IIR_SECTION_ORDER:
+            self._stages = [FIRFilter(self.b)] + [IIRFilter([1.0], section) for section in _pole_sections(self.a)]
+
+    def reset(self) -> None:
+        """
+        Zero the filter state, as before the first chunk.
+        """
+        self._state = None
+        for stage in self._stages or ():
+            stage.reset()
+
+    def process(self, chunk):
+        """
+        Filter the next chunk of samples (time along axis 0).
+        """
+        np = require_numpy()
+        chunk = np.asarray(chunk, dtype=float)
+        if self.order == 0:
+            return chunk * self.b[0]
+        if self._stages is not None:
+            for stage in self._stages:
+                chunk = stage.process(chunk)
+            return chunk
+        if self._state is None or self._state.shape[1:] != chunk.shape[1:]:
+            self._state = np.zeros((self.order,) + chunk.shape[1:])
+        if self._lfilter is not None:
+            output, self._state = self._lfilter(self.b, self.a, chunk, axis=0, zi=self._state)
+            return output
+        columns = chunk.reshape(chunk.shape[0], -1)
+        state = self._state.reshape(self.order, -1)
+        output, state = self._process_blocks(columns, state)
+        self._state = state.reshape(self._state.shape)
+        return output.reshape(chunk.shape)
+
+    def _state_space(self):
+        # z[n+1] = A z[n] + B x[n], y[n] = z[n][0] + D x[n]
+        np = require_numpy()
+        p = self.order
+        A = np.zeros((p, p))
+        A[:, 0] = -self.a[1:]
+        A[:-1, 1:] = np.eye(p - 1)
+        B = self.b[1:] - self.a[1:] * self.b[0]
+        return A, B, self.b[0]
+
+    def _block_matrices(self):
+        # Over a block of L samples: y = T x + O z, and the next state is Az z + Mx x
+        if self._blocks is None:
+            np = require_numpy()
+            A, B, D = self._state_space()
+            L, p = IIR_BLOCK, self.order
+            O = np.empty((L + 1, p))
+            row = np.eye(p)[0]
+            for i in range(L + 1):
+                O[i] = row
+                row = row @ A
+            impulse = np.concatenate([[D], O[:-1] @ B])
+            T = np.zeros((L, L))
+            for k in range(L):
+                T[k:, k] = impulse[: L - k]
+            Mx = np.empty((p, L))
+            column = B
+            for j in range(L - 1, -1, -1):
+                Mx[:, j] = column
+                column = A @ column
+            self._blocks = (T, O[:L], np.linalg.matrix_power(A, L), Mx, A)
+        return self._blocks
+
+    def _process_blocks(self, x, state):
+        np = require_numpy()
+        T, O, Az, Mx, A = self._block_matrices()
+        L = IIR_BLOCK
+        n, channels = x.shape
+        full = n // L * L
+        output = np.empty_like(x)
+        if full:
+            blocks = x[:full].reshape(-1, L, channels)
+            inputs = Mx @ blocks
+            states = np.empty((blocks.shape[0], self.order, channels))
+            for index in range(blocks.shape[0]):
+                states[index] = state
+                state = Az @ state + inputs[index]
+            output[:full] = (T @ blocks + O @ states).reshape(full, channels)
+        rest = n - full
+        if rest:
+            tail = x[full:]
+            output[full:] = T[:rest, :rest] @ tail + O[:rest] @ state
+            state = np.linalg.matrix_power(A, rest) @ state + Mx[:, L - rest :] @ tail
+        return output, state
+
+
+def _pole_sections(a) -> list:
+    # Factor the monic denominator a(z) into real first- and second-order polynomials, one per
+    # real pole or conjugate pair, so their product is a(z) up to rounding
+    np = require_numpy()
+    poles = np.roots(np.trim_zeros(a, "b"))
+    sections = [[1.0, -2 * pole.real, abs(pole) ** 2] for pole in poles if pole.imag > 0]
+    real = np.sort(poles[poles.imag == 0].real)
+    for i in range(0, real.size - 1, 2):
+        sections.append([1.0, -(real[i] + real[i + 1]), real[i] * real[i + 1]])
+    if real.size % 2:
+        sections.append([1.0, -real[-1]])
+    return sections
+
+
+class SpectrumEstimator:
+    """
+    Streaming power spectral density by Welch's method.
+
+    Samples are cut into overlapping windowed segments whose periodograms are
+    averaged; samples that don't complete a segment yet are carried to the
+    next `update`, so any length of signal is processed in constant memory.
+    The estimate matches `scipy.signal.welch` with the same segment, overlap
+    and window (mean detrending, density scaling).
+
+    ## Example
+
+    ```python
+    spectrum = SpectrumEstimator(segment=4096, rate=48000)
+    for chunk in read_chunks("recording.npy"):
+        spectrum.update(chunk)
+    frequencies, psd = spectrum.psd()
+    ```
+    """
+
+    def __init__(self, segment: int = DEFAULT_SEGMENT, overlap: float = 0.5, rate: float = 1.0, window: str = "hann") -> None:
+        if segment < 2:
+            raise ValueError("segment must have at least 2 samples")
+        if not 0 <= overlap < 1:
+            raise ValueError("overlap must be in [0, 1)")
+        self.segment = segment
+        self.step = segment - int(segment * overlap)
+        self.rate = rate
+        self.window = _window(window, segment)
+        self.segments = 0
+        self._power = None
+        self._tail = None
+
+    def update(self, chunk) -> None:
+        """
+        Add the next chunk of samples (1-D, or one column per channel).
+        """
+        np = require_numpy()
+        chunk = np.asarray(chunk, dtype=float)
+        buffer = chunk if self._tail is None else np.concatenate([self._tail, chunk])
+        count = 0 if buffer.shape[0] < self.segment else (buffer.shape[0] - self.segment) // self.step + 1
+        if count:
+            # All complete segments of the buffer at once, segment samples on the last axis
+            frames = np.lib.stride_tricks.sliding_window_view(buffer, self.segment, axis=0)[:: self.step][:count]
+            frames = frames - frames.mean(axis=-1, keepdims=True)
+            power = np.abs(np.fft.rfft(frames * self.window, axis=-1)) ** 2
+            power = power.sum(axis=0)
+            self._power = power if self._power is None else self._power + power
+            self.segments += count
+        self._tail = buffer[count * self.step :].copy()
+
+    def psd(self):
+        """
+        Return `(frequencies, psd)`; `psd` has one column per channel for multi-channel input.
+
+        ## Error Handling
+
+        - Raises `ValueError` when fewer than `segment` samples were seen
+        """
+        np = require_numpy()
+        if not self.segments:
+            raise ValueError(f"need at least {self.segment} samples for one segment")
+        density = self._power / (self.segments * self.rate * (self.window**2).sum())
+        # One-sided: fold the negative frequencies onto the positive ones
+        if self.segment % 2:
+            density[..., 1:] *= 2
+        else:
+            density[..., 1:-1] *= 2
+        frequencies = np.fft.rfftfreq(self.segment, 1 / self.rate)
+        return frequencies, np.moveaxis(density, -1, 0)
+
+
+def welch(x, rate: float = 1.0, segment: int = DEFAULT_SEGMENT, overlap: float = 0.5, window: str = "hann"):
+    """
+    Power spectral density of a signal held in memory; returns `(frequencies, psd)`.
+
+    A signal shorter than `segment` is analysed as a single segment.
+    """
+    np = require_numpy()
+    x = np.asarray(x, dtype=float)
+    estimator = SpectrumEstimator(min(segment, x.shape[0]), overlap, rate, window)
+    estimator.update(x)
+    return estimator.psd()
+
+
+# Files
+
+
+def _make_filter(taps, b, a):
+    if taps is not None:
+        return FIRFilter(taps)
+    if b is None:
+        raise ValueError("give FIR taps or IIR coefficients b (and a)")
+    return IIRFilter(b, a if a is not None else (1.0,))
+
+
+def filter_file(
+    source: str,
+    target: str,
+    taps: Optional[Sequence[float]] = None,
+    b: Optional[Sequence[float]] = None,
+    a: Optional[Sequence[float]] = None,
+    delimiter: str = ",",
+    dtype: str = "float64",
+    columns: int = 1,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> int:
+    """
+    Filter every column of a sample file into a new file, chunk by chunk. Returns the row count.
+
+    Give FIR `taps`, or IIR coefficients `b` and `a`. Files are read with
+    `stats.read_chunks` (`.npy` and raw binary inputs are memory-mapped) and
+    the filter state is carried between chunks, so files larger than memory
+    are processed in constant memory. The target format follows its
+    extension, as in `stats.convert_file`.
+    """
+    np = require_numpy()
+    filters = _make_filter(taps, b, a)
+    chunks = read_chunks(source, delimiter, dtype, columns, chunk_bytes)
+    rows = 0
+    if target.lower().endswith(".npy"):
+        if _is_csv(source):
+            shape = None
+            for chunk in read_chunks(source, delimiter, dtype, columns, chunk_bytes):
+                shape = (rows + chunk.shape[0],) + chunk.shape[1:]
+                rows = shape[0]
+            shape = shape or (0, columns)
+        else:
+            shape = _open_array(source, dtype, columns).shape
+        output = np.lib.format.open_memmap(target, mode="w+", dtype=np.float64, shape=shape)
+        rows = 0
+        for chunk in chunks:
+            output[rows : rows + len(chunk)] = filters.process(chunk)
+            rows += len(chunk)
+        output.flush()
+        del output
+        return rows
+    binary = not _is_csv(target)
+    with open(target, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+        for chunk in chunks:
+            filtered = filters.process(chunk)
+            if binary:
+                np.ascontiguousarray(filtered, dtype=np.dtype(dtype)).tofile(f)
+            else:
+                np.savetxt(f, filtered, delimiter=delimiter, fmt="%.17g")
+            rows += len(chunk)
+    return rows
+
+
+def spectrum_file(
+    path: str,
+    rate: float = 1.0,
+    segment: int = DEFAULT_SEGMENT,
+    overlap: float = 0.5,
+    window: str = "hann",
+    delimiter: str = ",",
+    dtype: str = "float64",
+    columns: int = 1,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+):
+    """
+    Welch power spectral density of every column of a sample file, in one streaming pass.
+
+    Returns `(frequencies, psd)` with one `psd` column per file column.
+    """
+    estimator = SpectrumEstimator(segment, overlap, rate, window)
+    for chunk in read_chunks(path, delimiter, dtype, columns, chunk_bytes):
+        estimator.update(chunk)
+    return estimator.psd()
+
+
+# Interactive mode
+
+
+def _numbers(text: str) -> list:
+    return [float(value) for value in text.replace(",", " ").split()]
+
+
+def _coefficients(text: str):
+    # "b0, b1, b2; a0, a1, a2" → IIR coefficients; without ";" → FIR taps
+    if ";" in text:
+        b, a = text.split(";", 1)
+        return None, _numbers(b), _numbers(a)
+    return _numbers(text), None, None
+
+
+def signal_calculator() -> None:
+    """
+    Signal Processing Mode
+
+    FFTs, convolution, filtering and spectra. File commands stream CSV,
+    `.npy` and raw binary files chunk by chunk, so their size is not limited
+    by memory.
+
+    ## Commands
+
+    - `fft 1, 0, -1, 0` / `ifft 0, 2, 0, 2` - discrete Fourier transforms
+    - `conv 1, 2, 3; 0, 1, 0.5` - convolution of two sequences
+    - `filter in.npy out.npy 0.25, 0.5, 0.25` - FIR filter a file with the given taps
+    - `filter in.npy out.npy b0, b1, b2; 1, a1, a2` - IIR filter a file
+    - `lowpass in.npy out.npy 1000 48000` - low-pass (cutoff, sample rate) a file
+    - `psd in.npy 48000` - power spectrum of a file: peak frequency and total power
+    """
+    print("\nSignal Processing")
+
+    while True:
+        line = input("\nEnter a command (e.g., fft 1, 0, -1, 0, psd data.npy 48000) or ('exit' to return): ")
+        if line.lower() in ["exit"]:
+            break
+        try:
+            command, _, rest = line.strip().partition(" ")
+            command = command.lower()
+            words = rest.split()
+            if command in ("fft", "ifft"):
+                transform = fft if command == "fft" else ifft
+                result = transform(_numbers(rest)).round(12)
+            elif command == "conv" and ";" in rest:
+                first, second = rest.split(";", 1)
+                result = convolve(_numbers(first), _numbers(second))
+            elif command == "filter" and len(words) >= 3:
+                source, target = words[0], words[1]
+                taps, b, a = _coefficients(rest.split(None, 2)[2])
+                result = f"{filter_file(source, target, taps, b, a)} rows written to {target}"
+            elif command == "lowpass" and len(words) in (4, 5):
+                source, target = words[0], words[1]
+                cutoff, rate = float(words[2]), float(words[3])
+                taps = int(words[4]) if len(words) == 5 else 101
+                result = f"{filter_file(source, target, lowpass_fir(taps, cutoff, rate))} rows written to {target}"
+            elif command == "psd" and len(words) in (2, 3):
+                rate = float(words[1])
+                segment = int(words[2]) if len(words) == 3 else DEFAULT_SEGMENT
+                frequencies, psd = spectrum_file(words[0], rate, segment)
+                step = frequencies[1] - frequencies[0]
+                result = "\n" + "\n".join(
+                    f"column {column}: peak at {frequencies[psd[:, column].argmax()]:.6g}, "
+                    f"total power {psd[:, column].sum() * step:.6g}"
+                    for column in range(psd.shape[1])
+                )
+            else:
+                raise ValueError("unknown command")
+            print("-" * 50)
+            print("The result is: ", result)
+            print("-" * 50)
+        except Exception as e:
+            print("-" * 50)
+            print(f"Invalid input. Please enter a valid command. Error: {str(e)}")
+            print("-" * 50)
@@ -0,0 +1,627 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from ._optional import require_numpy
+
+# Bytes of input parsed or mapped per chunk; only one chunk is resident at a time
+DEFAULT_CHUNK_BYTES = 8 << 20
+
+# t-digest compression: a digest keeps at most about `compression / 2` centroids
+DEFAULT_COMPRESSION = 200
+
+DEFAULT_QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+# Extensions read as raw binary arrays (with an explicit dtype and column count)
+BINARY_EXTENSIONS = (".bin", ".dat", ".raw")
+
+
+class QuantileDigest:
+    """
+    Mergeable streaming quantile estimate of one column (a merging t-digest).
+
+    Values are summarized by weighted centroids, small near the tails and
+    larger in the middle, following the arcsine scale function. Updates,
+    merges and queries are vectorized; the memory used is bounded by the
+    compression whatever the number of values. Quantiles are typically
+    accurate to a fraction of a percent of rank in the middle of the
+    distribution and much better at the tails; the minimum and maximum are exact.
+    """
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION) -> None:
+        np = require_numpy()
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values) -> None:
+        """
+        Add an array of values; NaNs are skipped.
+        """
+        np = require_numpy()
+        values = np.asarray(values, dtype=float).ravel()
+        # NumPy's sort is much faster than a stable argsort of random data;
+        # merging the two sorted runs in `_compress` is then cheap
+        values = np.sort(values[~np.isnan(values)])
+        if not values.size:
+            return
+        self.min = min(self.min, float(values[0]))
+        self.max = max(self.max, float(values[-1]))
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(values.size)]))
+
+    def merge(self, other: "QuantileDigest") -> None:
+        """
+        Add the values summarized by another digest.
+        """
+        np = require_numpy()
+        if not other.weights.size:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means, weights) -> None:
+        np = require_numpy()
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        # Position of each centroid on the scale k(q) = δ/2π · asin(2q - 1);
+        # centroids within the same unit of k are merged
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q - 1)
+        groups = np.floor(k + self.compression / 4)
+        starts = np.flatnonzero(np.diff(groups, prepend=-1))
+        merged = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged
+        self.weights = merged
+
+    def quantile(self, q):
+        """
+        Estimate the value below which a fraction `q` of the data falls (`q` may be an array).
+        """
+        np = require_numpy()
+        if not self.weights.size:
+            return np.full(np.shape(q), np.nan)[()]
+        total = self.weights.sum()
+        middles = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], middles, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(q, dtype=float) * total, positions, values)[()]
+
+    def cdf(self, x):
+        """
+        Estimate the fraction of the data at or below `x` (`x` may be an array).
+        """
+        np = require_numpy()
+        if not self.weights.size:
+            return np.full(np.shape(x), np.nan)[()]
+        total = self.weights.sum()
+        middles = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], middles, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return (np.interp(x, values, positions) / total)[()]
+
+
+def _combine(count, mean, m2, other_count, other_mean, other_m2):
+    # Chan et al.'s pairwise update of count, mean and sum of squared deviations
+    np = require_numpy()
+    total = count + other_count
+    delta = other_mean - mean
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.where(total > 0, other_count / total, 0.0)
+    # Co-moment matrices shift by the outer product of the change in means
+    shift = np.multiply.outer(delta, delta) if np.ndim(m2) == 2 else delta * delta
+    return total, mean + delta * fraction, m2 + other_m2 + shift * (count * fraction)
+
+
+class StreamingStats:
+    """
+    Single-pass, mergeable summary statistics of the columns of a table.
+
+    Feed it chunks of rows with `update`; it keeps per column the count,
+    mean and variance (Welford's method, applied a chunk at a time with
+    Chan's pairwise update), the minimum and maximum, a `QuantileDigest`
+    and, optionally, a histogram over a fixed range, plus the covariance
+    of all columns over the rows without NaNs. Memory is independent of
+    the number of rows. Accumulators built from separate parts of the data
+    (e.g. in worker processes) combine exactly with `merge`.
+
+    ## Example
+
+    ```python
+    stats = StreamingStats()
+    for chunk in read_chunks("measurements.csv"):
+        stats.update(chunk)
+    stats.quantile(0.99)
+    stats.summary()
+    ```
+    """
+
+    def __init__(
+        self,
+        compression: int = DEFAULT_COMPRESSION,
+        bins: Optional[int] = None,
+        range: Optional[Tuple[float, float]] = None,
+        correlation: bool = True,
+    ) -> None:
+        if bins is not None and range is None:
+            raise ValueError("a histogram needs a range; use histogram_file() to find one")
+        self.compression = compression
+        self.bins = bins
+        self.range = None if range is None else (float(range[0]), float(range[1]))
+        self.correlation = correlation
+        self.names: Optional[List[str]] = None
+        self.rows = 0
+        self.columns = None
+
+    def _start(self, columns: int) -> None:
+        np = require_numpy()
+        self.columns = columns
+        self.count = np.zeros(columns)
+        self.mean = np.zeros(columns)
+        self.m2 = np.zeros(columns)
+        self.min = np.full(columns, np.inf)
+        self.max = np.full(columns, -np.inf)
+        self.digests = [QuantileDigest(self.compression) for _ in range(columns)]
+        self.histograms = np.zeros((columns, self.bins), dtype=np.int64) if self.bins else None
+        # Co-moments over complete rows
+        self.complete_rows = 0
+        self.co_mean = np.zeros(columns)
+        self.co_m2 = np.zeros((columns, columns))
+
+    def update(self, chunk) -> None:
+        """
+        Add a chunk of rows (a 2-D array, or 1-D for a single column). NaNs count as missing.
+        """
+        np = require_numpy()
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.ndim == 1:
+            chunk = chunk[:, None]
+        if self.columns is None:
+            self._start(chunk.shape[1])
+        elif chunk.shape[1] != self.columns:
+            raise ValueError(f"expected {self.columns} columns, got {chunk.shape[1]}")
+        if not chunk.shape[0]:
+            return
+        self.rows += chunk.shape[0]
+
+        # One row per column, so every reduction runs over contiguous memory
+        data = np.ascontiguousarray(chunk.T)
+        present = ~np.isnan(data)
+        count = present.sum(axis=1)
+        complete = bool(count.sum() == data.size)
+        filled = data if complete else np.where(present, data, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, filled.sum(axis=1) / count, 0.0)
+        deviations = filled - mean[:, None]
+        if not complete:
+            deviations[~present] = 0.0
+        m2 = np.einsum("ij,ij->i", deviations, deviations)
+        self.count, self.mean, self.m2 = _combine(self.count, self.mean, self.m2, count, mean, m2)
+        # fmin/fmax ignore NaNs
+        self.min = np.fmin(self.min, np.fmin.reduce(data, axis=1))
+        self.max = np.fmax(self.max, np.fmax.reduce(data, axis=1))
+
+        for column, digest in enumerate(self.digests):
+            digest.update(data[column])
+        if self.histograms is not None:
+            for column in range(self.columns):
+                self.histograms[column] += np.histogram(data[column], self.bins, self.range)[0]
+        if self.correlation and self.columns > 1:
+            if not complete:
+                rows = data[:, present.all(axis=0)]
+                mean = rows.mean(axis=1)
+                deviations = rows - mean[:, None]
+            if deviations.shape[1]:
+                self.complete_rows, self.co_mean, self.co_m2 = _combine(
+                    self.complete_rows, self.co_mean, self.co_m2, deviations.shape[1], mean, deviations @ deviations.T
+                )
+
+    def merge(self, other: "StreamingStats") -> None:
+        """
+        Add the data summarized by another accumulator with the same settings.
+        """
+        if other.columns is None:
+            return
+        if self.columns is None:
+            self._start(other.columns)
+            self.names = other.names
+        elif other.columns != self.columns:
+            raise ValueError(f"expected {self.columns} columns, got {other.columns}")
+        np = require_numpy()
+        self.rows += other.rows
+        self.count, self.mean, self.m2 = _combine(self.count, self.mean, self.m2, other.count, other.mean, other.m2)
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        for digest, other_digest in zip(self.digests, other.digests):
+            digest.merge(other_digest)
+        if self.histograms is not None:
+            self.histograms += other.histograms
+        if other.complete_rows:
+            self.complete_rows, self.co_mean, self.co_m2 = _combine(
+                self.complete_rows, self.co_mean, self.co_m2, other.complete_rows, other.co_mean, other.co_m2
+            )
+
+    # Results
+
+    def variance(self, ddof: int = 1):
+        """
+        Return the variance of each column (the sample variance by default).
+        """
+        np = require_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def std(self, ddof: int = 1):
+        return require_numpy().sqrt(self.variance(ddof))
+
+    def quantile(self, q):
+        """
+        Estimate quantiles of every column: one row per column, one value per `q`.
+        """
+        np = require_numpy()
+        return np.array([digest.quantile(q) for digest in self.digests])
+
+    def covariance(self, ddof: int = 1):
+        np = require_numpy()
+        if self.complete_rows <= ddof:
+            return np.full((self.columns, self.columns), np.nan)
+        return self.co_m2 / (self.complete_rows - ddof)
+
+    def correlation_matrix(self):
+        """
+        Return the Pearson correlation matrix of the columns over the rows without NaNs.
+        """
+        np = require_numpy()
+        scale = np.sqrt(np.diag(self.co_m2))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.clip(self.co_m2 / np.outer(scale, scale), -1.0, 1.0)
+
+    def histogram(self, column: int = 0):
+        """
+        Return `(counts, edges)` of a column's histogram over `range` (values outside it are not counted).
+        """
+        np = require_numpy()
+        edges = np.linspace(self.range[0], self.range[1], self.bins + 1)
+        return self.histograms[column], edges
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> dict:
+        """
+        Return every statistic as plain, JSON-serializable Python values.
+        """
+        if self.columns is None:
+            return {"rows": 0, "columns": []}
+        variance = self.variance()
+        names = self.names or [str(index) for index in range(self.columns)]
+        columns = []
+        for column in range(self.columns):
+            digest = self.digests[column]
+            entry = {
+                "name": names[column],
+                "count": int(self.count[column]),
+                "mean": _plain(self.mean[column]) if self.count[column] else None,
+                "variance": _plain(variance[column]),
+                "std": _plain(math.sqrt(variance[column])) if variance[column] >= 0 else None,
+                "min": _plain(self.min[column]),
+                "max": _plain(self.max[column]),
+                "quantiles": {str(q): _plain(digest.quantile(q)) for q in quantiles},
+            }
+            if self.histograms is not None:
+                counts, edges = self.histogram(column)
+                entry["histogram"] = {"edges": edges.tolist(), "counts": counts.tolist()}
+            columns.append(entry)
+        result = {"rows": self.rows, "columns": columns}
+        if self.correlation and self.columns > 1:
+            result["correlation"] = [[_plain(value) for value in row] for row in self.correlation_matrix()]
+        return result
+
+
+def _plain(value):
+    # JSON has no NaN or infinity: report missing statistics as None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+# Readers
+
+
+def _is_csv(path: str) -> bool:
+    extension = os.path.splitext(path)[1].lower()
+    return extension != ".npy" and extension not in BINARY_EXTENSIONS
+
+
+def _open_array(path: str, dtype: str, columns: int):
+    # Memory-map a .npy file or a raw binary file as a 2-D array
+    np = require_numpy()
+    if path.lower().endswith(".npy"):
+        array = np.load(path, mmap_mode="r")
+    else:
+        array = np.memmap(path, dtype=np.dtype(dtype), mode="r")
+        if array.size % columns:
+            raise ValueError(f"{path} does not hold a whole number of {columns}-column rows")
+        array = array.reshape(-1, columns)
+    return array[:, None] if array.ndim == 1 else array
+
+
+def _csv_layout(path: str, delimiter: str):
+    # Column names (or None) and the column count, from the first non-empty line
+    from .matrix import _is_header
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                fields = [field.strip() for field in line.split(delimiter)]
+                if _is_header(line, delimiter):
+                    return fields, len(fields)
+                return None, len(fields)
+    raise ValueError(f"{path} contains no data")
+
+
+def _csv_chunks(path: str, delimiter: str, chunk_bytes: int, start: int, stop: int, header: bool) -> Iterator:
+    """
+    Parse the lines of a CSV file that start in the byte range `[start, stop)`.
+
+    Ranges can be read independently (in different processes): a line
+    belongs to the range in which it starts.
+    """
+    np = require_numpy()
+    with open(path, "rb") as f:
+        if start > 0:
+            # Skip the line that began in the previous range
+            f.seek(start - 1)
+            f.readline()
+        elif header:
+            f.readline()
+        position = f.tell()
+        while position < stop:
+            block = f.read(chunk_bytes) + f.readline()
+            if not block:
+                break
+            cut = block.find(b"\n", max(stop - position - 1, 0))
+            if cut != -1:
+                block = block[: cut + 1]
+            position += len(block)
+            lines = [line for line in block.decode("utf-8").splitlines() if line.strip()]
+            if lines:
+                yield np.loadtxt(lines, delimiter=delimiter, dtype=float, ndmin=2)
+
+
+def _array_chunks(array, chunk_bytes: int, start: int, stop: int) -> Iterator:
+    rows = max(1, chunk_bytes // max(1, array.shape[1] * array.dtype.itemsize))
+    for first in range(start, stop, rows):
+        yield array[first : min(first + rows, stop)]
+
+
+def read_chunks(
+    path: str,
+    delimiter: str = ",",
+    dtype: str = "float64",
+    columns: int = 1,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Iterator:
+    """
+    Read a numeric file as a sequence of 2-D chunks of rows, in constant memory.
+
+    - `.npy` files are memory-mapped; chunks are views of the map
+    - `.bin`, `.dat` and `.raw` files are memory-mapped as raw `dtype` values
+      in rows of `columns`
+    - anything else is parsed as CSV (a non-numeric first line is a header)
+    """
+    if _is_csv(path):
+        header, _ = _csv_layout(path, delimiter)
+        return _csv_chunks(path, delimiter, chunk_bytes, 0, os.path.getsize(path), header is not None)
+    array = _open_array(path, dtype, columns)
+    return _array_chunks(array, chunk_bytes, 0, array.shape[0])
+
+
+def _partitions(path: str, parts: int, delimiter: str, dtype: str, columns: int):
+    # Split a file into `parts` ranges: byte ranges of CSV files, row ranges of arrays
+    if _is_csv(path):
+        size = os.path.getsize(path)
+    else:
+        size = _open_array(path, dtype, columns).shape[0]
+    bounds = [size * part // parts for part in range(parts + 1)]
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def _describe_part(path: str, start: int, stop: int, header: bool, options: dict) -> StreamingStats:
+    stats = StreamingStats(options["compression"], options["bins"], options["range"], options["correlation"])
+    if _is_csv(path):
+        chunks = _csv_chunks(path, options["delimiter"], options["chunk_bytes"], start, stop, header and start == 0)
+    else:
+        array = _open_array(path, options["dtype"], options["columns"])
+        chunks = _array_chunks(array, options["chunk_bytes"], start, stop)
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
+
+
+def describe_file(
+    path: str,
+    workers: int = 1,
+    delimiter: str = ",",
+    dtype: str = "float64",
+    columns: int = 1,
+    compression: int = DEFAULT_COMPRESSION,
+    bins: Optional[int] = None,
+    range: Optional[Tuple[float, float]] = None,
+    correlation: bool = True,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> StreamingStats:
+    """
+    Compute streaming statistics of a CSV, `.npy` or raw binary file in one pass.
+
+    With `workers` greater than 1 the file is split into contiguous ranges
+    (byte ranges aligned to lines for CSV, row ranges for arrays), each
+    summarized by its own process, and the partial accumulators are merged.
+    See `read_chunks` for the file formats.
+
+    ## Example
+
+    ```python
+    stats = describe_file("sensor_log.csv", workers=8, bins=50, range=(0, 100))
+    stats.summary()["columns"][0]["quantiles"]["0.99"]
+    ```
+    """
+    header = None
+    if _is_csv(path):
+        header, columns = _csv_layout(path, delimiter)
+    options = {
+        "delimiter": delimiter,
+        "dtype": dtype,
+        "columns": columns,
+        "compression": compression,
+        "bins": bins,
+        "range": range,
+        "correlation": correlation,
+        "chunk_bytes": chunk_bytes,
+    }
+    parts = _partitions(path, workers, delimiter, dtype, columns)
+    if workers > 1 and len(parts) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_describe_part, path, start, stop, header is not None, options) for start, stop in parts]
+            partials = [future.result() for future in futures]
+    else:
+        partials = [_describe_part(path, start, stop, header is not None, options) for start, stop in parts]
+
+    stats = StreamingStats(compression, bins, range, correlation)
+    for partial in partials:
+        stats.merge(partial)
+    stats.names = header
+    return stats
+
+
+def data_range(path: str, **options) -> Tuple[float, float]:
+    """
+    Return the smallest and largest value of all columns of a file (one streaming pass).
+
+    Keyword arguments are passed to `describe_file`.
+    """
+    np = require_numpy()
+    stats = describe_file(path, correlation=False, **options)
+    low, high = float(np.min(stats.min)), float(np.max(stats.max))
+    if not low <= high:
+        raise ValueError(f"{path} contains no values")
+    if low == high:
+        # np.histogram's convention for a single value
+        return low - 0.5, high + 0.5
+    return low, high
+
+
+def histogram_file(path: str, bins: int = 10, range: Optional[Tuple[float, float]] = None, **options):
+    """
+    Return `(counts, edges)` for every column of a file: exact counts in `bins` equal bins.
+
+    Without `range`, a first pass finds the data's range (see `data_range`).
+    Other keyword arguments are passed to `describe_file`.
+    """
+    if range is None:
+        range = data_range(path, **options)
+    stats = describe_file(path, bins=bins, range=range, correlation=False, **options)
+    return [stats.histogram(column) for column, _ in enumerate(stats.digests)]
+
+
+def convert_file(source: str, target: str, delimiter: str = ",", dtype: str = "float64", columns: int = 1) -> int:
+    """
+    Convert a numeric file between CSV, `.npy` and raw binary, chunk by chunk. Returns the row count.
+    """
+    np = require_numpy()
+    if _is_csv(source) and target.lower().endswith(".npy"):
+        from .matrix import csv_to_npy
+
+        csv_to_npy(source, target, delimiter)
+        return np.load(target, mmap_mode="r").shape[0]
+
+    rows = 0
+    chunks = read_chunks(source, delimiter, dtype, columns)
+    if target.lower().endswith(".npy"):
+        array = _open_array(source, dtype, columns)
+        output = np.lib.format.open_memmap(target, mode="w+", dtype=array.dtype, shape=array.shape)
+        for chunk in chunks:
+            output[rows : rows + len(chunk)] = chunk
+            rows += len(chunk)
+        output.flush()
+        del output
+        return rows
+    binary = not _is_csv(target)
+    with open(target, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+        for chunk in chunks:
+            if binary:
+                np.ascontiguousarray(chunk, dtype=np.dtype(dtype)).tofile(f)
+            else:
+                np.savetxt(f, chunk, delimiter=delimiter, fmt="%.17g")
+            rows += len(chunk)
+    return rows
+
+
+# Interactive mode
+
+
+def _format_summary(summary: dict) -> str:
+    lines = [f"{summary['rows']} rows"]
+    for column in summary["columns"]:
+        quantiles = ", ".join(f"p{float(q) * 100:g}={value:.6g}" for q, value in column["quantiles"].items() if value is not None)
+        lines.append(
+            f"{column['name']}: n={column['count']} mean={column['mean']} std={column['std']} "
+            f"min={column['min']} max={column['max']} {quantiles}"
+        )
+    return "\n".join(lines)
+
+
+def statistics_calculator() -> None:
+    """
+    Statistics & Data Mode
+
+    Streams CSV, `.npy` and raw binary files of any size through single-pass
+    accumulators.
+
+    ## Commands
+
+    - `describe data.csv` - count, mean, std, min, max and quantiles of every column
+    - `quantile data.csv 0.9 0.99` - quantiles of every column
+    - `hist data.csv 20` - exact histogram (20 bins over the data's range)
+    - `corr data.csv` - correlation matrix of the columns
+    - `convert data.csv data.npy` - convert between CSV, `.npy` and raw binary
+    """
+    print("\nStatistics & Data")
+
+    while True:
+        line = input("\nEnter a command (e.g., describe data.csv, hist data.csv 20) or ('exit' to return): ")
+        if line.lower() in ["exit"]:
+            break
+        try:
+            words = line.split()
+            command = words[0].lower() if words else ""
+            if command == "describe" and len(words) == 2:
+                result = "\n" + _format_summary(describe_file(words[1]).summary())
+            elif command == "quantile" and len(words) >= 3:
+                quantiles = [float(word) for word in words[2:]]
+                result = describe_file(words[1], correlation=False).quantile(quantiles)
+            elif command == "hist" and len(words) in (2, 3):
+                bins = int(words[2]) if len(words) == 3 else 10
+                histograms = histogram_file(words[1], bins)
+                result = "\n" + "\n".join(
+                    f"[{low:.6g}, {high:.6g}): {count}"
+                    for counts, edges in histograms
+                    for low, high, count in zip(edges, edges[1:], counts)
+                )
+            elif command == "corr" and len(words) == 2:
+                result = describe_file(words[1]).correlation_matrix()
+            elif command == "convert" and len(words) == 3:
+                result = f"{convert_file(words[1], words[2])} rows written to {words[2]}"
+            else:
+                raise ValueError("unknown command")
+            print("-" * 50)
+            print("The result is: ", result)
+            print("-" * 50)
+        except Exception as e:
+            print("-" * 50)
+            print(f"Invalid input. Please enter a valid command. Error: {str(e)}")
+            print("-" * 50)
@@ -0,0 +1,339 @@
+import math
+import re
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from ._optional import require_numpy
+from .autodiff import compile_gradient
+
+DEFAULT_SAMPLES = 1_000_000
+
+# Samples drawn and evaluated per pass; memory stays bounded by this, not by `samples`
+DEFAULT_CHUNK = 1 << 18
+
+DEFAULT_COVERAGE = 0.95
+
+# Half-width of each distribution per unit of standard uncertainty
+DISTRIBUTIONS = {
+    "normal": 1.0,
+    "uniform": math.sqrt(3.0),
+    "triangular": math.sqrt(6.0),
+}
+
+
+class Measurement(NamedTuple):
+    """
+    An input quantity: its value, its standard uncertainty and the shape of its distribution.
+
+    `distribution` is `"normal"`, `"uniform"` (rectangular, e.g. a
+    resolution limit) or `"triangular"`; the uncertainty is always one
+    standard deviation, so a uniform ±a has `uncertainty = a / sqrt(3)`.
+    """
+
+    value: float
+    uncertainty: float
+    distribution: str = "normal"
+
+
+class LinearUncertainty(NamedTuple):
+    """
+    Result of first-order (GUM) propagation.
+
+    - `sensitivities`: the partial derivative of the result with respect to each uncertain input
+    - `contributions`: each input's share of the variance, ignoring correlations (0 for exact inputs)
+    """
+
+    value: float
+    uncertainty: float
+    sensitivities: Dict[str, float]
+    contributions: Dict[str, float]
+
+
+class MonteCarloUncertainty(NamedTuple):
+    """
+    Result of Monte Carlo propagation: the mean and standard deviation of the
+    sampled results, a probabilistically symmetric coverage interval and the
+    number of samples with a finite result.
+    """
+
+    value: float
+    uncertainty: float
+    interval: Tuple[float, float]
+    coverage: float
+    samples: int
+
+
+def _measurements(inputs: Mapping[str, Any]) -> Dict[str, Measurement]:
+    # Plain numbers are exact; pairs are (value, standard uncertainty)
+    measurements = {}
+    for name, item in inputs.items():
+        if isinstance(item, Measurement):
+            measurement = item
+        elif isinstance(item, (tuple, list)):
+            measurement = Measurement(*item)
+        else:
+            measurement = Measurement(item, 0.0)
+        uncertainty = float(measurement.uncertainty)
+        # Exact integers stay integers, so they can feed integer functions such as factorial
+        value = measurement.value
+        if not (type(value) is int and uncertainty == 0):
+            value = float(value)
+        measurement = Measurement(value, uncertainty, measurement.distribution)
+        if measurement.distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"unknown distribution '{measurement.distribution}' for {name}; use one of {', '.join(DISTRIBUTIONS)}"
+            )
+        if not measurement.uncertainty >= 0:
+            raise ValueError(f"the uncertainty of {name} must be non-negative")
+        measurements[name] = measurement
+    return measurements
+
+
+def _correlation_matrix(np, names: Tuple[str, ...], correlations: Optional[Mapping[Tuple[str, str], float]]):
+    matrix = np.eye(len(names))
+    index = {name: k for k, name in enumerate(names)}
+    for (first, second), rho in (correlations or {}).items():
+        if first not in index or second not in index:
+            raise ValueError(f"correlation between unknown or exact inputs {first!r} and {second!r}")
+        if not -1 <= rho <= 1:
+            raise ValueError("correlation coefficients must lie in [-1, 1]")
+        matrix[index[first], index[second]] = matrix[index[second], index[first]] = rho
+    return matrix
+
+
+def propagate(
+    expression: str,
+    inputs: Mapping[str, Any],
+    correlations: Optional[Mapping[Tuple[str, str], float]] = None,
+) -> LinearUncertainty:
+    """
+    Propagate input uncertainties through an expression to first order (the GUM law of propagation).
+
+    `inputs` maps each name to a `Measurement`, a `(value, uncertainty)`
+    pair or a plain (exact) number. The sensitivities are exact partial
+    derivatives from automatic differentiation of the parsed expression,
+    taken only with respect to inputs with a non-zero uncertainty; exact
+    inputs are constants, so they may appear in functions without a
+    derivative (e.g. `factorial(n) * x`) and contribute nothing.
+    `correlations` maps pairs of uncertain names to correlation coefficients.
+
+    ## Examples
+
+    - `propagate("x * y", {"x": (2.0, 0.1), "y": (3.0, 0.2)}).uncertainty` → 0.5
+    - `propagate("V / I", {"V": (12.0, 0.05), "I": (0.5, 0.01)})` - a resistance from two readings
+
+    ## Error Handling
+
+    - Raises `ExpressionError` for invalid expressions or functions without a derivative
+    - Raises `ValueError` for negative uncertainties, unknown distributions or bad correlations
+    """
+    np = require_numpy()
+    from .scientific_calculator import build_functions
+
+    measurements = _measurements(inputs)
+    names = tuple(name for name, measurement in measurements.items() if measurement.uncertainty > 0)
+    compiled = compile_gradient(expression, names)
+    namespace = dict(build_functions())
+    namespace.update((name, measurement.value) for name, measurement in measurements.items())
+    value, partials = compiled(namespace)
+
+    sensitivities = np.array(partials, dtype=float)
+    scale = np.array([measurements[name].uncertainty for name in names])
+    weighted = sensitivities * scale
+    uncorrelated = weighted * weighted
+    variance = float(weighted @ _correlation_matrix(np, names, correlations) @ weighted)
+    total = uncorrelated.sum()
+    shares = {name: float(c / total) if total else 0.0 for name, c in zip(names, uncorrelated)}
+    return LinearUncertainty(
+        float(value),
+        math.sqrt(max(variance, 0.0)),
+        {name: float(s) for name, s in zip(names, sensitivities)},
+        {name: shares.get(name, 0.0) for name in measurements},
+    )
+
+
+def _correlation_factor(np, matrix):
+    # F with F Fᵀ = matrix, from its eigendecomposition: unlike Cholesky, this
+    # accepts the singular matrices of perfectly correlated inputs (ρ = ±1)
+    eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+    if eigenvalues.min() < -1e-10 * len(matrix):
+        raise ValueError("the correlation matrix is not positive semi-definite")
+    return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+def _draw(np, rng, measurements: Dict[str, Measurement], names: Tuple[str, ...], factor, size: int) -> Dict[str, Any]:
+    # One chunk of samples of every uncertain input
+    if factor is not None:
+        normal = rng.standard_normal((size, len(names))) @ factor.T
+        return {
+            name: measurements[name].value + measurements[name].uncertainty * normal[:, k] for k, name in enumerate(names)
+        }
+    samples = {}
+    for name in names:
+        measurement = measurements[name]
+        width = DISTRIBUTIONS[measurement.distribution] * measurement.uncertainty
+        if measurement.distribution == "normal":
+            samples[name] = rng.normal(measurement.value, measurement.uncertainty, size)
+        elif measurement.distribution == "uniform":
+            samples[name] = rng.uniform(measurement.value - width, measurement.value + width, size)
+        else:
+            samples[name] = rng.triangular(measurement.value - width, measurement.value, measurement.value + width, size)
+    return samples
+
+
+def monte_carlo(
+    expression: str,
+    inputs: Mapping[str, Any],
+    samples: int = DEFAULT_SAMPLES,
+    seed: Optional[int] = 0,
+    correlations: Optional[Mapping[Tuple[str, str], float]] = None,
+    coverage: float = DEFAULT_COVERAGE,
+    chunk: int = DEFAULT_CHUNK,
+) -> MonteCarloUncertainty:
+    """
+    Propagate input distributions through an expression by Monte Carlo sampling (GUM Supplement 1).
+
+    The expression is compiled once and evaluated over `chunk` samples at
+    a time as NumPy arrays; the results stream into a `StreamingStats`
+    accumulator (exact mean and variance, t-digest quantiles), so memory
+    does not grow with `samples`. The same `seed` and `chunk` give the
+    same result; `seed=None` draws fresh entropy. Correlated inputs must
+    be normally distributed. Samples whose result is not finite (e.g. a
+    division by a value drawn near zero) are left out of the statistics.
+
+    ## Example
+
+    ```python
+    result = monte_carlo("V / I", {"V": (12.0, 0.05), "I": (0.5, 0.01)}, samples=2_000_000, seed=1)
+    result.interval  # 95 % coverage interval
+    ```
+    """
+    np = require_numpy()
+    from .stats import StreamingStats
+    from .vectorized import vectorize_expression
+
+    if samples < 1 or chunk < 1:
+        raise ValueError("samples and chunk must be positive")
+    if not 0 < coverage < 1:
+        raise ValueError("coverage must lie strictly between 0 and 1")
+    measurements = _measurements(inputs)
+    uncertain = tuple(name for name, measurement in measurements.items() if measurement.uncertainty > 0)
+    factor = None
+    if correlations:
+        if any(measurements[name].distribution != "normal" for name in uncertain):
+            raise ValueError("correlated inputs must be normally distributed")
+        factor = _correlation_factor(np, _correlation_matrix(np, uncertain, correlations))
+
+    evaluate = vectorize_expression(expression, measurements)
+    exact = {name: measurement.value for name, measurement in measurements.items() if name not in uncertain}
+    rng = np.random.default_rng(seed)
+    stats = StreamingStats(correlation=False)
+    remaining = samples
+    while remaining:
+        size = min(chunk, remaining)
+        remaining -= size
+        with np.errstate(all="ignore"):
+            results = np.broadcast_to(evaluate(**exact, **_draw(np, rng, measurements, uncertain, factor, size)), (size,))
+        stats.update(results[np.isfinite(results)])
+
+    count = int(stats.count[0]) if stats.columns else 0
+    if not count:
+        raise ValueError("no sample gave a finite result")
+    tail = (1 - coverage) / 2
+    low, high = stats.quantile([tail, 1 - tail])[0]
+    return MonteCarloUncertainty(
+        float(stats.mean[0]),
+        float(stats.std()[0]) if count > 1 else 0.0,
+        (float(low), float(high)),
+        coverage,
+        count,
+    )
+
+
+def format_uncertain(value: float, uncertainty: float) -> str:
+    """
+    Format a value with its uncertainty to two significant digits of the uncertainty.
+
+    ## Examples
+
+    - `format_uncertain(24.0371, 0.5153)` → `'24.04 ± 0.52'`
+    - `format_uncertain(123456.0, 789.0)` → `'123460 ± 790'`
+    """
+    if not (uncertainty > 0 and math.isfinite(uncertainty) and math.isfinite(value)):
+        return f"{value:.12g}"
+    decimals = 1 - math.floor(math.log10(uncertainty))
+    if decimals > 0:
+        return f"{value:.{decimals}f} ± {uncertainty:.{decimals}f}"
+    return f"{round(value, decimals):.0f} ± {round(uncertainty, decimals):.0f}"
+
+
+# Separates a value from its uncertainty: ±, +- or +/-
+_PLUS_MINUS = re.compile(r"±|\+/?-")
+
+
+def _parse_inputs(text: str) -> Dict[str, Measurement]:
+    # "V=12±0.05, I=0.5+-0.01 uniform, n=3" → measurements (n is exact)
+    inputs = {}
+    for part in text.split(","):
+        name, equals, spec = part.partition("=")
+        name = name.strip()
+        if not equals or not name.isidentifier():
+            raise ValueError(f"expected name=value±uncertainty, got {part.strip()!r}")
+        pieces = _PLUS_MINUS.split(spec, maxsplit=1)
+        if len(pieces) == 1:
+            inputs[name] = Measurement(float(spec), 0.0)
+            continue
+        words = pieces[1].split()
+        if not 1 <= len(words) <= 2:
+            raise ValueError(f"expected name=value±uncertainty [distribution], got {part.strip()!r}")
+        inputs[name] = Measurement(float(pieces[0]), float(words[0]), words[1] if len(words) == 2 else "normal")
+    return inputs
+
+
+def uncertainty_calculator() -> None:
+    """
+    Error Analysis & Uncertainty Mode
+
+    ## Commands
+
+    - `V / I with V=12±0.05, I=0.5±0.01` - first-order propagation with each input's share
+    - `mc V / I with V=12±0.05, I=0.5±0.01 uniform` - Monte Carlo with one million samples
+      (`mc 200000 ...` for another number); `+-` works in place of `±`
+    - `seed 42` - seed for the Monte Carlo runs (`seed none` for fresh entropy each run)
+    """
+    print("\nError Analysis & Uncertainty")
+
+    seed: Optional[int] = 0
+
+    while True:
+        line = input("\nEnter a command (e.g., V / I with V=12±0.05, I=0.5±0.01) or ('exit' to return): ")
+        if line.lower() in ["exit"]:
+            break
+        try:
+            command, _, rest = line.strip().partition(" ")
+            if command.lower() == "seed":
+                seed = None if rest.strip().lower() == "none" else int(rest)
+                result = f"seed set to {seed}"
+            elif command.lower() == "mc":
+                samples = DEFAULT_SAMPLES
+                count, _, remainder = rest.strip().partition(" ")
+                if count.isdigit():
+                    samples, rest = int(count), remainder
+                expression, _, inputs = rest.rpartition(" with ")
+                found = monte_carlo(expression, _parse_inputs(inputs), samples=samples, seed=seed)
+                low, high = found.interval
+                result = (
+                    f"{format_uncertain(found.value, found.uncertainty)}, "
+                    f"{found.coverage:.0%} interval [{low:.6g}, {high:.6g}] ({found.samples} samples)"
+                )
+            else:
+                expression, _, inputs = line.rpartition(" with ")
+                found = propagate(expression, _parse_inputs(inputs))
+                shares = ", ".join(f"{name} {share:.1%}" for name, share in found.contributions.items() if share)
+                result = format_uncertain(found.value, found.uncertainty) + (f" ({shares})" if shares else "")
+            print("-" * 50)
+            print("The result is: ", result)
+            print("-" * 50)
+        except Exception as e:
+            print("-" * 50)
+            print(f"Invalid input. Please enter a valid command. Error: {str(e)}")
+            print("-" * 50)
@@ -0,0 +1,714 @@
+import io
+import math
+import re
+import tokenize
+from functools import cache, lru_cache
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from .engine import BinOp, Call, Constant, ExpressionError, Name, Sequence, UnaryOp, compile_tree, parse
+from .expression_cache import expression_cache, normalize_expression
+
+# Order of the exponents in a dimension vector
+BASE_UNITS = ("m", "kg", "s", "A", "K", "mol", "cd")
+
+DIMENSIONLESS = (0, 0, 0, 0, 0, 0, 0)
+
+# Interned unit strings and conversion pairs
+UNIT_CACHE_SIZE = 4096
+
+
+class DimensionError(ExpressionError):
+    """
+    Raised when quantities of incompatible dimensions are combined or converted.
+    """
+
+
+class Unit(NamedTuple):
+    """
+    A unit as the SI value of one unit, its dimension vector and the SI value
+    of its zero point (non-zero only for temperature scales such as degC).
+    """
+
+    factor: float
+    dimension: Tuple[int, ...]
+    offset: float = 0.0
+
+
+def _dimension(m=0, kg=0, s=0, A=0, K=0, mol=0, cd=0) -> Tuple[int, ...]:
+    return (m, kg, s, A, K, mol, cd)
+
+
+# SI prefixes ("u" stands for micro)
+PREFIXES = {
+    "Y": 1e24,
+    "Z": 1e21,
+    "E": 1e18,
+    "P": 1e15,
+    "T": 1e12,
+    "G": 1e9,
+    "M": 1e6,
+    "k": 1e3,
+    "h": 1e2,
+    "da": 1e1,
+    "d": 1e-1,
+    "c": 1e-2,
+    "m": 1e-3,
+    "u": 1e-6,
+    "n": 1e-9,
+    "p": 1e-12,
+    "f": 1e-15,
+    "a": 1e-18,
+}
+
+# name → (SI factor, dimension); these also take every SI prefix
+_PREFIXED_UNITS = {
+    # Base units (the kilogram is a prefixed gram)
+    "m": (1.0, _dimension(m=1)),
+    "g": (1e-3, _dimension(kg=1)),
+    "s": (1.0, _dimension(s=1)),
+    "A": (1.0, _dimension(A=1)),
+    "K": (1.0, _dimension(K=1)),
+    "mol": (1.0, _dimension(mol=1)),
+    "cd": (1.0, _dimension(cd=1)),
+    # Derived SI units
+    "Hz": (1.0, _dimension(s=-1)),
+    "N": (1.0, _dimension(m=1, kg=1, s=-2)),
+    "Pa": (1.0, _dimension(m=-1, kg=1, s=-2)),
+    "J": (1.0, _dimension(m=2, kg=1, s=-2)),
+    "W": (1.0, _dimension(m=2, kg=1, s=-3)),
+    "C": (1.0, _dimension(s=1, A=1)),
+    "V": (1.0, _dimension(m=2, kg=1, s=-3, A=-1)),
+    "ohm": (1.0, _dimension(m=2, kg=1, s=-3, A=-2)),
+    "S": (1.0, _dimension(m=-2, kg=-1, s=3, A=2)),
+    "F": (1.0, _dimension(m=-2, kg=-1, s=4, A=2)),
+    "H": (1.0, _dimension(m=2, kg=1, s=-2, A=-2)),
+    "Wb": (1.0, _dimension(m=2, kg=1, s=-2, A=-1)),
+    "T": (1.0, _dimension(kg=1, s=-2, A=-1)),
+    "lm": (1.0, _dimension(cd=1)),
+    "lx": (1.0, _dimension(m=-2, cd=1)),
+    # Accepted non-SI units commonly prefixed
+    "L": (1e-3, _dimension(m=3)),
+    "t": (1e3, _dimension(kg=1)),
+    "bar": (1e5, _dimension(m=-1, kg=1, s=-2)),
+    "eV": (1.602176634e-19, _dimension(m=2, kg=1, s=-2)),
+    "Wh": (3600.0, _dimension(m=2, kg=1, s=-2)),
+    "Ah": (3600.0, _dimension(s=1, A=1)),
+    "cal": (4.184, _dimension(m=2, kg=1, s=-2)),
+}
+
+# Units without prefixes; they win over prefixed names of the same spelling (e.g. ft)
+_PLAIN_UNITS = {
+    # Time
+    "min": (60.0, _dimension(s=1)),
+    "h": (3600.0, _dimension(s=1)),
+    "d": (86400.0, _dimension(s=1)),
+    "wk": (604800.0, _dimension(s=1)),
+    "yr": (31557600.0, _dimension(s=1)),  # Julian year
+    # Length
+    "inch": (0.0254, _dimension(m=1)),
+    "ft": (0.3048, _dimension(m=1)),
+    "yd": (0.9144, _dimension(m=1)),
+    "mi": (1609.344, _dimension(m=1)),
+    "nmi": (1852.0, _dimension(m=1)),
+    "au": (149597870700.0, _dimension(m=1)),
+    "ly": (9460730472580800.0, _dimension(m=1)),
+    # Area and volume
+    "ha": (1e4, _dimension(m=2)),
+    "acre": (4046.8564224, _dimension(m=2)),
+    "gal": (3.785411784e-3, _dimension(m=3)),  # US gallon
+    "bbl": (0.158987294928, _dimension(m=3)),  # oil barrel
+    # Mass and force
+    "lb": (0.45359237, _dimension(kg=1)),
+    "oz": (0.028349523125, _dimension(kg=1)),
+    "lbf": (4.4482216152605, _dimension(m=1, kg=1, s=-2)),
+    # Speed and rotation
+    "mph": (0.44704, _dimension(m=1, s=-1)),
+    "kn": (1852.0 / 3600.0, _dimension(m=1, s=-1)),
+    "rpm": (1.0 / 60.0, _dimension(s=-1)),
+    # Pressure, energy and power
+    "atm": (101325.0, _dimension(m=-1, kg=1, s=-2)),
+    "psi": (6894.757293168361, _dimension(m=-1, kg=1, s=-2)),
+    "mmHg": (133.322387415, _dimension(m=-1, kg=1, s=-2)),
+    "torr": (101325.0 / 760.0, _dimension(m=-1, kg=1, s=-2)),
+    "BTU": (1055.05585262, _dimension(m=2, kg=1, s=-2)),
+    "hp": (745.69987158227022, _dimension(m=2, kg=1, s=-3)),
+    # Angles and ratios (dimensionless)
+    "rad": (1.0, DIMENSIONLESS),
+    "sr": (1.0, DIMENSIONLESS),
+    "deg": (math.pi / 180.0, DIMENSIONLESS),
+    "rev": (2 * math.pi, DIMENSIONLESS),
+    "percent": (0.01, DIMENSIONLESS),
+    "ppm": (1e-6, DIMENSIONLESS),
+}
+
+# Temperature scales with a zero point other than absolute zero
+_OFFSET_UNITS = {
+    "degC": Unit(1.0, _dimension(K=1), 273.15),
+    "degF": Unit(5.0 / 9.0, _dimension(K=1), 273.15 - 32.0 * 5.0 / 9.0),
+    "degR": Unit(5.0 / 9.0, _dimension(K=1)),
+}
+
+
+@cache
+def build_units() -> Dict[str, Unit]:
+    """
+    Build the table of unit names, with every SI prefix expanded.
+
+    Built once per process and shared; treat it as read-only.
+    """
+    units = {}
+    for name, (factor, dimension) in _PREFIXED_UNITS.items():
+        for prefix, scale in PREFIXES.items():
+            units[prefix + name] = Unit(factor * scale, dimension)
+    for name, (factor, dimension) in list(_PREFIXED_UNITS.items()) + list(_PLAIN_UNITS.items()):
+        units[name] = Unit(factor, dimension)
+    units.update(_OFFSET_UNITS)
+    return units
+
+
+def format_dimension(dimension: Tuple[int, ...]) -> str:
+    """
+    Format a dimension vector in SI base units, e.g. `(1, 1, -2, 0, 0, 0, 0)` → `"m*kg/s^2"`.
+    """
+
+    def power(name, exponent):
+        return name if exponent == 1 else f"{name}^{exponent}"
+
+    numerator = [power(name, e) for name, e in zip(BASE_UNITS, dimension) if e > 0]
+    denominator = [power(name, -e) for name, e in zip(BASE_UNITS, dimension) if e < 0]
+    text = "*".join(numerator) or ("1" if denominator else "")
+    if len(denominator) == 1:
+        text += "/" + denominator[0]
+    elif denominator:
+        text += "/(" + "*".join(denominator) + ")"
+    return text
+
+
+def _implicit_products(text: str, names: bool = False) -> str:
+    # Read "20 min" as "(20*min)" and "5 m**2" as "(5*m**2)", so that "5 km / 20 min"
+    # divides by the whole quantity; in unit strings "N m" also reads as "N*m"
+    tokens = []
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(text).readline):
+            if token.type in (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER):
+                continue
+            if token.start[0] != 1:
+                return text
+            tokens.append(token)
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        return text
+    edits = []  # (position, text to insert)
+    for index in range(1, len(tokens)):
+        previous, token = tokens[index - 1], tokens[index]
+        if token.type != tokenize.NAME:
+            continue
+        if names and previous.type == tokenize.NAME:
+            edits.append((token.start[1], "*"))
+        elif previous.type == tokenize.NUMBER:
+            # Keep a literal power of the unit inside the group
+            end = token.end[1]
+            rest = tokens[index + 1 : index + 4]
+            if len(rest) >= 2 and rest[0].string == "**":
+                if rest[1].type == tokenize.NUMBER:
+                    end = rest[1].end[1]
+                elif len(rest) == 3 and rest[1].string in ("-", "+") and rest[2].type == tokenize.NUMBER:
+                    end = rest[2].end[1]
+            edits += [(previous.start[1], "("), (token.start[1], "*"), (end, ")")]
+    for position, insert in sorted(edits, key=lambda edit: edit[0], reverse=True):
+        text = text[:position] + insert + text[position:]
+    return text
+
+
+def _combine_dimensions(left, right, sign: int = 1) -> Tuple[int, ...]:
+    return tuple(a + sign * b for a, b in zip(left, right))
+
+
+def _scale_dimension(dimension, exponent) -> Tuple[int, ...]:
+    scaled = [e * exponent for e in dimension]
+    rounded = tuple(int(round(e)) for e in scaled)
+    if any(abs(e - r) > 1e-9 for e, r in zip(scaled, rounded)):
+        raise DimensionError(f"cannot raise {format_dimension(dimension)} to the power {exponent}")
+    return rounded
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def parse_unit(text: str) -> Unit:
+    """
+    Parse a unit string such as `"km/h"`, `"kg*m/s^2"` or `"N m"` into a `Unit`.
+
+    Results are interned: parsing the same string again is a dictionary lookup.
+
+    ## Error Handling
+
+    - Raises `ExpressionError` for unknown units or invalid syntax
+    - Raises `DimensionError` when a temperature scale with an offset (degC,
+      degF) is combined with other units
+    """
+    units = build_units()
+    source = _implicit_products(text.strip().replace("^", "**").replace("·", "*"), names=True)
+    tree = parse(source)
+    if type(tree) is Name and tree.id in units:
+        return units[tree.id]
+
+    def walk(node) -> Unit:
+        kind = type(node)
+        if kind is Name:
+            unit = units.get(node.id)
+            if unit is None:
+                raise ExpressionError(f"unknown unit '{node.id}'")
+            if unit.offset:
+                raise DimensionError(f"'{node.id}' has an offset and can only be used on its own")
+            return unit
+        if kind is Constant and type(node.value) in (int, float):
+            return Unit(float(node.value), DIMENSIONLESS)
+        if kind is BinOp and node.op in ("*", "/"):
+            left, right = walk(node.left), walk(node.right)
+            if node.op == "*":
+                return Unit(left.factor * right.factor, _combine_dimensions(left.dimension, right.dimension))
+            return Unit(left.factor / right.factor, _combine_dimensions(left.dimension, right.dimension, -1))
+        if kind is BinOp and node.op == "**":
+            exponent = _constant_value(node.right)
+            if exponent is None:
+                raise ExpressionError("unit exponents must be numbers")
+            base = walk(node.left)
+            return Unit(base.factor**exponent, _scale_dimension(base.dimension, exponent))
+        raise ExpressionError(f"invalid unit: {text!r}")
+
+    return walk(tree)
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def conversion(source: str, target: str) -> Tuple[float, float]:
+    """
+    Return `(scale, offset)` such that a value in `source` is `value * scale + offset` in `target`.
+
+    Pairs are interned, so bulk conversions look their units up once.
+
+    ## Error Handling
+
+    - Raises `DimensionError` when the units measure different dimensions
+    """
+    a, b = parse_unit(source), parse_unit(target)
+    if a.dimension != b.dimension:
+        raise DimensionError(
+            f"cannot convert {source} ({format_dimension(a.dimension) or 'dimensionless'}) "
+            f"to {target} ({format_dimension(b.dimension) or 'dimensionless'})"
+        )
+    return a.factor / b.factor, (a.offset - b.offset) / b.factor
+
+
+def _as_values(values):
+    # Lists and tuples become NumPy arrays so conversion stays one vectorized operation
+    if isinstance(values, (list, tuple)):
+        from ._optional import require_numpy
+
+        return require_numpy().asarray(values, dtype=float)
+    return values
+
+
+def convert(values, source: str, target: str):
+    """
+    Convert a number or a whole array of values from one unit to another.
+
+    The conversion is a single multiply (plus an add for temperature
+    scales) with an interned factor; there is no per-value unit lookup.
+
+    ## Examples
+
+    - `convert(100, "km/h", "m/s")` → 27.77777777777778
+    - `convert(np.array([0, 100]), "degC", "degF")` → `array([ 32., 212.])`
+    - `convert(readings, "psi", "kPa")` converts a million readings in one pass
+    """
+    scale, offset = conversion(source, target)
+    values = _as_values(values)
+    if offset:
+        return values * scale + offset
+    return values * scale
+
+
+class Quantity:
+    """
+    A value (number or array) in SI base units together with its dimension vector.
+
+    ## Examples
+
+    ```python
+    distance = Quantity.of(5, "km")
+    speed = distance / Quantity.of(20, "min")
+    speed.to("km/h")          # 15.0
+    str(speed)                # '4.166666666666667 m/s'
+    distance + Quantity.of(1, "s")  # raises DimensionError
+    ```
+    """
+
+    __slots__ = ("value", "dimension")
+
+    def __init__(self, value, dimension: Tuple[int, ...] = DIMENSIONLESS) -> None:
+        self.value = value
+        self.dimension = tuple(dimension)
+
+    @classmethod
+    def of(cls, value, unit: str) -> "Quantity":
+        """
+        Create a quantity from a value (or array of values) expressed in `unit`.
+        """
+        parsed = parse_unit(unit)
+        value = _as_values(value) * parsed.factor
+        if parsed.offset:
+            value = value + parsed.offset
+        return cls(value, parsed.dimension)
+
+    def to(self, unit: str):
+        """
+        Return the value expressed in `unit`.
+        """
+        parsed = parse_unit(unit)
+        if parsed.dimension != self.dimension:
+            raise DimensionError(
+                f"cannot express {format_dimension(self.dimension) or 'a dimensionless value'} in {unit}"
+            )
+        if parsed.offset:
+            return (self.value - parsed.offset) / parsed.factor
+        return self.value / parsed.factor
+
+    @staticmethod
+    def _coerce(other) -> "Quantity":
+        return other if isinstance(other, Quantity) else Quantity(other)
+
+    def _same_dimension(self, other: "Quantity", op: str) -> None:
+        if other.dimension != self.dimension:
+            raise DimensionError(
+                f"cannot {op} {format_dimension(self.dimension) or 'dimensionless'} "
+                f"and {format_dimension(other.dimension) or 'dimensionless'}"
+            )
+
+    def __add__(self, other):
+        other = self._coerce(other)
+        self._same_dimension(other, "add")
+        return Quantity(self.value + other.value, self.dimension)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = self._coerce(other)
+        self._same_dimension(other, "subtract")
+        return Quantity(self.value - other.value, self.dimension)
+
+    def __rsub__(self, other):
+        return self._coerce(other) - self
+
+    def __mul__(self, other):
+        other = self._coerce(other)
+        return Quantity(self.value * other.value, _combine_dimensions(self.dimension, other.dimension))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = self._coerce(other)
+        return Quantity(self.value / other.value, _combine_dimensions(self.dimension, other.dimension, -1))
+
+    def __rtruediv__(self, other):
+        return self._coerce(other) / self
+
+    def __pow__(self, exponent):
+        return Quantity(self.value**exponent, _scale_dimension(self.dimension, exponent))
+
+    def __neg__(self):
+        return Quantity(-self.value, self.dimension)
+
+    def __eq__(self, other):
+        return isinstance(other, Quantity) and self.dimension == other.dimension and bool(self.value == other.value)
+
+    def __repr__(self) -> str:
+        return f"Quantity({self.value!r}, {format_dimension(self.dimension)!r})"
+
+    def __str__(self) -> str:
+        unit = format_dimension(self.dimension)
+        return f"{self.value} {unit}" if unit else str(self.value)
+
+
+# Expressions with units
+
+# Functions whose arguments all share one dimension, which the result keeps
+_SAME_DIMENSION = {"fabs", "ceil", "floor", "trunc", "hypot", "fmod", "remainder"}
+# Functions taking a root of their argument's dimension
+_ROOTS = {"sqrt": 2, "cbrt": 3}
+
+
+def _constant_value(node) -> Optional[float]:
+    # Value of a subtree made of literals and operators only, else None
+    kind = type(node)
+    if kind is Constant:
+        return node.value
+    if kind is UnaryOp:
+        operand = _constant_value(node.operand)
+        return None if operand is None else compile_tree(node)({})
+    if kind is BinOp:
+        if _constant_value(node.left) is None or _constant_value(node.right) is None:
+            return None
+        return compile_tree(node)({})
+    return None
+
+
+class _Analysis:
+    """
+    Infers the dimension of every subtree of an expression, before it is ever evaluated.
+
+    Unit names met on the way are collected with their SI factors, which is
+    all the compiled expression needs: it then runs on plain numbers.
+    """
+
+    def __init__(self, variables: Mapping[str, Unit], functions: Mapping[str, Any]) -> None:
+        self.variables = variables
+        self.functions = functions
+        self.units = build_units()
+        self.factors: Dict[str, float] = {}
+
+    def dimension(self, node) -> Tuple[int, ...]:
+        kind = type(node)
+        if kind is Constant:
+            return DIMENSIONLESS
+        if kind is Name:
+            return self._name(node.id)
+        if kind is UnaryOp:
+            dimension = self.dimension(node.operand)
+            if node.op == "~":
+                self._dimensionless(dimension, "~")
+            return dimension
+        if kind is BinOp:
+            return self._binary(node)
+        if kind is Call:
+            return self._call(node)
+        if kind is Sequence:
+            raise ExpressionError("lists are not supported in unit expressions")
+        raise ExpressionError(f"unsupported node: {kind.__name__}")
+
+    def _name(self, name: str) -> Tuple[int, ...]:
+        if name in self.variables:
+            return self.variables[name].dimension
+        if name in self.functions:
+            if callable(self.functions[name]):
+                raise ExpressionError(f"'{name}' is a function")
+            return DIMENSIONLESS
+        unit = self.units.get(name)
+        if unit is None:
+            raise ExpressionError(f"name '{name}' is not defined")
+        if unit.offset:
+            raise DimensionError(f"'{name}' has an offset; use it for conversions only, or use K")
+        self.factors[name] = unit.factor
+        return unit.dimension
+
+    def _dimensionless(self, dimension, where: str) -> None:
+        if dimension != DIMENSIONLESS:
+            raise DimensionError(f"{where} needs a dimensionless value, got {format_dimension(dimension)}")
+
+    def _same(self, left, right, where: str) -> Tuple[int, ...]:
+        if left != right:
+            raise DimensionError(
+                f"{where}: incompatible dimensions {format_dimension(left) or 'dimensionless'} "
+                f"and {format_dimension(right) or 'dimensionless'}"
+            )
+        return left
+
+    def _power(self, base, exponent_node, where: str) -> Tuple[int, ...]:
+        self._dimensionless(self.dimension(exponent_node), f"the exponent of {where}")
+        if base == DIMENSIONLESS:
+            return base
+        exponent = _constant_value(exponent_node)
+        if exponent is None or type(exponent) is complex:
+            raise DimensionError(f"{where}: a quantity with units needs a constant exponent")
+        return _scale_dimension(base, exponent)
+
+    def _binary(self, node) -> Tuple[int, ...]:
+        op = node.op
+        left = self.dimension(node.left)
+        if op == "**":
+            return self._power(left, node.right, "'**'")
+        right = self.dimension(node.right)
+        if op in ("+", "-", "%"):
+            return self._same(left, right, f"'{op}'")
+        if op in ("*", "@"):
+            return _combine_dimensions(left, right)
+        if op in ("/", "//"):
+            return _combine_dimensions(left, right, -1)
+        self._dimensionless(left, f"'{op}'")
+        self._dimensionless(right, f"'{op}'")
+        return DIMENSIONLESS
+
+    def _call(self, node) -> Tuple[int, ...]:
+        name = node.func
+        if name not in self.functions or not callable(self.functions[name]):
+            raise ExpressionError(f"unknown function '{name}'")
+        args = [self.dimension(arg) for arg in node.args]
+        keywords = [self.dimension(value) for _, value in node.keywords]
+        if name in _ROOTS and len(args) == 1:
+            return self._root(args[0], _ROOTS[name], name)
+        if name == "pow" and len(args) == 2:
+            return self._power(args[0], node.args[1], "pow()")
+        if name in _SAME_DIMENSION and args:
+            for dimension in args[1:]:
+                self._same(args[0], dimension, f"{name}()")
+            return args[0]
+        if name == "copysign" and len(args) == 2:
+            return args[0]
+        if name == "atan2" and len(args) == 2:
+            self._same(args[0], args[1], "atan2()")
+            return DIMENSIONLESS
+        for dimension in args + keywords:
+            self._dimensionless(dimension, f"{name}()")
+        return DIMENSIONLESS
+
+    def _root(self, dimension, degree: int, name: str) -> Tuple[int, ...]:
+        if any(e % degree for e in dimension):
+            raise DimensionError(f"{name}() of {format_dimension(dimension)} has no whole dimension")
+        return tuple(e // degree for e in dimension)
+
+
+class UnitExpression:
+    """
+    An expression whose dimension was checked when it was compiled.
+
+    Unit names are bound to their SI factors and variables are converted to
+    SI on the way in, so evaluation is plain arithmetic on numbers or arrays,
+    with no unit bookkeeping per value.
+    """
+
+    __slots__ = ("source", "tree", "dimension", "_code", "_variables", "_factors")
+
+    def __init__(self, source: str, tree, dimension, code, variables, factors) -> None:
+        self.source = source
+        self.tree = tree
+        self.dimension = dimension
+        self._code = code
+        self._variables = variables
+        self._factors = factors
+
+    def evaluate(self, unit: Optional[str] = None, **values):
+        """
+        Evaluate with variables given in their declared units.
+
+        Returns a `Quantity`, or plain values in `unit` when one is given.
+        Arrays (or lists) of values select the NumPy function table, so a
+        whole column is computed in one pass.
+        """
+        missing = set(self._variables) - set(values)
+        if missing:
+            raise TypeError(f"missing values for: {', '.join(sorted(missing))}")
+        arrays = any(not isinstance(value, (int, float, complex)) for value in values.values())
+        if arrays:
+            from .vectorized import build_vectorized_functions
+
+            namespace = dict(build_vectorized_functions())
+        else:
+            from .scientific_calculator import build_functions
+
+            namespace = dict(build_functions())
+        namespace.update(self._factors)
+        for name, value in values.items():
+            variable = self._variables[name]
+            value = _as_values(value) * variable.factor
+            namespace[name] = value + variable.offset if variable.offset else value
+        quantity = Quantity(self._code(namespace), self.dimension)
+        return quantity if unit is None else quantity.to(unit)
+
+    def __repr__(self) -> str:
+        return f"UnitExpression({self.source!r}, {format_dimension(self.dimension)!r})"
+
+
+def compile_units(expression: str, variables: Optional[Mapping[str, str]] = None) -> UnitExpression:
+    """
+    Parse an expression with units and check its dimensions, without evaluating it.
+
+    Unit names (`km`, `h`, `N`, `psi`, ...) can be used like constants, and
+    a number followed by a unit is one quantity (`20 min` is `(20*min)`);
+    `^` is a power, as in unit strings.
+    `variables` maps variable names to the units their values are given in.
+    Compiled expressions are cached.
+
+    ## Examples
+
+    - `compile_units("5 km + 300 m").evaluate().to("mi")` → 3.293...
+    - `compile_units("d / t", {"d": "km", "t": "h"}).evaluate("m/s", d=array, t=2)`
+    - `compile_units("3 m + 2 s")` → raises `DimensionError` at compile time
+
+    ## Error Handling
+
+    - Raises `DimensionError` for additions of unlike dimensions, units in
+      functions that need dimensionless arguments (`sin`, `exp`, ...) and
+      non-constant exponents of quantities
+    - Raises `ExpressionError` for unknown names, units or syntax
+    """
+    from .scientific_calculator import build_functions
+
+    variables = dict(variables or {})
+    text = normalize_expression(_implicit_products(expression.replace("^", "**")))
+    key = ("units", text, tuple(sorted(variables.items())))
+
+    def build():
+        tree = parse(text)
+        declared = {name: parse_unit(unit) for name, unit in variables.items()}
+        analysis = _Analysis(declared, build_functions())
+        dimension = analysis.dimension(tree)
+        return UnitExpression(text, tree, dimension, compile_tree(tree), declared, analysis.factors)
+
+    return expression_cache.get_or_compile(key, build)
+
+
+def evaluate_units(expression: str, unit: Optional[str] = None):
+    """
+    Evaluate an expression with units; returns a `Quantity`, or a number in `unit`.
+
+    ## Examples
+
+    - `str(evaluate_units("5 km / 20 min"))` → `'4.166666666666667 m/s'`
+    - `evaluate_units("60 mph", "km/h")` → 96.56064
+    - `evaluate_units("sqrt(2 * 9.81 m/s^2 * 10 m)", "m/s")` → 14.007...
+    """
+    return compile_units(expression).evaluate(unit)
+
+
+# Interactive mode
+
+_CONVERSION = re.compile(r"^(.*\S)\s+(?:to|in)\s+(\S.*)$")
+
+
+def units_calculator() -> None:
+    """
+    Units & Dimensional Analysis Mode
+
+    Evaluates expressions with units; dimensions are checked before anything
+    is computed.
+
+    ## Examples
+
+    - `5 km + 300 m to mi` - convert the result to a unit
+    - `100 degC to degF` - temperature scales
+    - `2 kN * 3 m / 4 s` - result in SI base units (`1500.0 m^2*kg/s^3`)
+    - `3 m + 2 s` - rejected: incompatible dimensions
+    """
+    print("\nUnits & Dimensional Analysis")
+
+    while True:
+        line = input("\nEnter an expression with units (e.g., 5 km + 300 m to mi) or ('exit' to return): ")
+        if line.lower() in ["exit"]:
+            break
+        try:
+            match = _CONVERSION.match(line.strip())
+            if match is None:
+                result = evaluate_units(line)
+            else:
+                expression, unit = match.groups()
+                words = expression.split()
+                if len(words) == 2 and words[1] in _OFFSET_UNITS:
+                    # "100 degC to degF": a temperature scale on its own
+                    value = convert(float(words[0]), words[1], unit)
+                else:
+                    value = evaluate_units(expression, unit)
+                result = f"{value:.12g} {unit}"
+            print("-" * 50)
+            print("The result is: ", result)
+            print("-" * 50)
+        except Exception as e:
+            print("-" * 50)
+            print(f"Invalid input. Please enter a valid expression with units. Error: {str(e)}")
+            print("-" * 50)
@@ -0,0 +1,224 @@
+from functools import cache, reduce
+from typing import Callable, Iterable, Optional
+
+from ._optional import optional_scipy, require_numpy
+from .engine import DEFAULT_LIMITS, ExpressionError, Limits, _checked_calls, compile_expression
+from .scientific_calculator import build_functions
+
+# Scientific-table names with a direct NumPy ufunc of the same meaning
+_UFUNC_NAMES = {
+    "sin": "sin",
+    "cos": "cos",
+    "tan": "tan",
+    "asin": "arcsin",
+    "acos": "arccos",
+    "atan": "arctan",
+    "atan2": "arctan2",
+    "sinh": "sinh",
+    "cosh": "cosh",
+    "tanh": "tanh",
+    "asinh": "arcsinh",
+    "acosh": "arccosh",
+    "atanh": "arctanh",
+    "exp": "exp",
+    "exp2": "exp2",
+    "expm1": "expm1",
+    "log2": "log2",
+    "log10": "log10",
+    "log1p": "log1p",
+    "sqrt": "sqrt",
+    "cbrt": "cbrt",
+    "pow": "float_power",
+    "ceil": "ceil",
+    "floor": "floor",
+    "trunc": "trunc",
+    "fabs": "fabs",
+    "copysign": "copysign",
+    "fmod": "fmod",
+    "degrees": "degrees",
+    "radians": "radians",
+    "isfinite": "isfinite",
+    "isinf": "isinf",
+    "isnan": "isnan",
+    "ldexp": "ldexp",
+    "nextafter": "nextafter",
+}
+
+# Variadic functions reduced pairwise with a binary ufunc, with the identity to start from
+_REDUCED_NAMES = {"hypot": ("hypot", 0.0), "gcd": ("gcd", 0), "lcm": ("lcm", 1)}
+
+# Special functions taken from scipy.special when SciPy is installed
+_SCIPY_SPECIAL_NAMES = {"erf": "erf", "erfc": "erfc", "gamma": "gamma", "lgamma": "gammaln"}
+
+# Functions that consume whole sequences; they are passed through unchanged
+_SEQUENCE_FUNCTIONS = {"fsum", "prod", "dist", "sumprod"}
+
+
+def _elementwise(function: Callable, check: Optional[Callable] = None, limits: Limits = DEFAULT_LIMITS) -> Callable:
+    """
+    Wrap a scalar function so it is applied element by element over broadcast arrays.
+
+    Used for functions without a vectorized form (e.g. `comb`, `factorial`).
+    Integer results that don't fit in int64 are kept as Python ints in an
+    object array, so exact values are never lost. `check` is the engine's
+    pre-call check for the function; like the engine's call step, it runs
+    before every element and oversized integer results are rejected.
+    """
+    np = require_numpy()
+    max_bits = limits.max_int_bits
+
+    def call(*row):
+        if check is not None:
+            try:
+                check(*row)
+            except TypeError:
+                # A bad signature; let the function itself report it
+                pass
+        result = function(*row)
+        if type(result) is int and result.bit_length() > max_bits:
+            raise ExpressionError(f"result exceeds the {max_bits}-bit integer limit")
+        return result
+
+    def apply(*args):
+        arrays = np.broadcast_arrays(*[np.asarray(arg) for arg in args])
+        if arrays and arrays[0].ndim == 0:
+            return call(*[array.item() for array in arrays])
+        # Convert to Python scalars first, since math functions reject np.int64 in places
+        columns = [array.ravel().tolist() for array in arrays]
+        values = [call(*row) for row in zip(*columns)]
+        try:
+            result = np.array(values)
+        except OverflowError:
+            result = np.array(values, dtype=object)
+        return result.reshape(arrays[0].shape)
+
+    return apply
+
+
+def _int64_bits(array) -> int:
+    if array.size == 0:
+        return 0
+    return max(int(array.max()), -int(array.min())).bit_length()
+
+
+def _reduced(np, name: str, fallback: Callable) -> Callable:
+    """
+    Apply a variadic function (hypot, gcd, lcm) by reducing its arguments pairwise with a ufunc.
+
+    Pairs the ufunc can't compute exactly (object-dtype integers beyond int64,
+    or an `lcm` that could wrap around) go through `fallback` element by element.
+    """
+    ufunc_name, identity = _REDUCED_NAMES[name]
+    ufunc = getattr(np, ufunc_name)
+
+    def fits(a, b):
+        if a.dtype.kind == "O" or b.dtype.kind == "O":
+            return False
+        if name == "lcm" and a.dtype.kind in "iu" and b.dtype.kind in "iu":
+            # lcm(a, b) <= |a| * |b|, which must stay below 2**63
+            return _int64_bits(a) + _int64_bits(b) <= 63
+        return True
+
+    def pair(a, b):
+        a, b = np.asarray(a), np.asarray(b)
+        return ufunc(a, b) if fits(a, b) else fallback(a, b)
+
+    def apply(*args):
+        return reduce(pair, args, identity)
+
+    return apply
+
+
+def _log(np):
+    def log(x, base=None):
+        if base is None:
+            return np.log(x)
+        return np.log(x) / np.log(base)
+
+    return log
+
+
+@cache
+def build_vectorized_functions() -> dict:
+    """
+    Build a NumPy-backed version of the scientific function table.
+
+    Every name of `scientific_calculator.build_functions()` is available:
+
+    - names with a NumPy ufunc (sin, exp, ...) map to that ufunc
+    - hypot, gcd and lcm take any number of arguments and reduce them pairwise
+      with their ufunc, falling back to exact integers where int64 would overflow
+    - erf, erfc, gamma and lgamma use `scipy.special` when SciPy is installed
+    - sequence functions (fsum, prod, dist, sumprod) are passed through unchanged
+    - everything else (comb, factorial, ...) falls back to element-wise evaluation
+
+    Built once per process and shared, like `build_functions()`; treat it as read-only.
+    """
+    np = require_numpy()
+    special = optional_scipy("special")
+    checks = _checked_calls(DEFAULT_LIMITS)
+    functions = {}
+    for name, value in build_functions().items():
+        if not callable(value) or name in _SEQUENCE_FUNCTIONS:
+            functions[name] = value
+        elif name in _UFUNC_NAMES and hasattr(np, _UFUNC_NAMES[name]):
+            functions[name] = getattr(np, _UFUNC_NAMES[name])
+        elif name in _REDUCED_NAMES:
+            functions[name] = _reduced(np, name, _elementwise(value, checks.get(name)))
+        elif special is not None and name in _SCIPY_SPECIAL_NAMES:
+            functions[name] = getattr(special, _SCIPY_SPECIAL_NAMES[name])
+        else:
+            functions[name] = _elementwise(value, checks.get(name))
+    functions["log"] = _log(np)
+    return functions
+
+
+def vectorize_expression(expression: str, variables: Iterable[str] = ("x",)) -> Callable:
+    """
+    Compile a scientific expression into a function of NumPy arrays.
+
+    The expression is parsed once; the returned function evaluates it over
+    whole arrays in a single pass and accepts the variables as keyword arguments.
+
+    ## Example
+
+    ```python
+    damped = vectorize_expression("sin(x)*exp(-x/tau)", variables=["x"])
+    damped(x=np.linspace(0, 10, 1_000_000))
+    ```
+    """
+    np = require_numpy()
+    variables = tuple(sorted(variables))
+    functions = build_vectorized_functions()
+    names = dict(functions)
+    names.update(dict.fromkeys(variables, 0.0))
+    compiled = compile_expression(
+        expression, names, mode="vectorized:" + ",".join(variables)
+    )
+
+    def evaluate(**arrays):
+        missing = set(variables) - set(arrays)
+        if missing:
+            raise TypeError(f"missing values for: {', '.join(sorted(missing))}")
+        namespace = dict(functions)
+        for name, value in arrays.items():
+            namespace[name] = np.asarray(value)
+        return compiled.evaluate(namespace)
+
+    return evaluate
+
+
+def evaluate_vectorized(expression: str, **arrays):
+    """
+    Evaluate a scientific expression over arrays of input values in one pass.
+
+    Keyword arguments name the expression's variables; arrays broadcast
+    against each other following NumPy rules.
+
+    ## Examples
+
+    - `evaluate_vectorized("sin(x)*exp(-x/tau)", x=np.linspace(0, 10, 5))`
+    - `evaluate_vectorized("hypot(x, y)", x=[3, 5], y=[4, 12])` → `array([ 5., 13.])`
+    - `evaluate_vectorized("comb(n, 2)", n=np.arange(5))` → `array([0, 0, 1, 3, 6])`
+    """
+    return vectorize_expression(expression, arrays)(**arrays)
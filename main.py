@@ -6,10 +6,10 @@ A comprehensive command-line calculator application written in Python that provi
 ## Features
 
 - **Basic Calculator**: Simple arithmetic operations with expression evaluation
-- **Scientific Calculator**: Advanced mathematical functions using Python's math module
-- **Programmer Calculator**: Binary, octal, hexadecimal operations (planned)
-- **Financial Calculator**: Financial calculations and formulas (planned)
-- **Engineering Calculator**: Engineering-specific computations (planned)
+- **Scientific Calculator**: Advanced mathematical functions using Python's math module, or at N digits with `digits N`
+- **Programmer Calculator**: Binary, octal, hexadecimal and bitwise operations at fixed bit widths
+- **Financial Calculator**: NPV, IRR, amortization schedules, annuities and bond pricing
+- **Engineering Calculator**: Menu of engineering tools, including NumPy-backed matrix operations
 
 ## Usage
 
@@ -18,6 +18,19 @@ Run the program and select from the menu options:
 1. Basic Calculator - Enter mathematical expressions like `2 + 3 * 4`
 2. Scientific Calculator - Use functions like `sin(30)`, `sqrt(16)`, `log(100)`
 
+## Batch Mode
+
+Evaluate many expressions without the interactive menu. Input is newline-delimited
+expressions or JSONL objects with an `expression` key; results are written as JSONL:
+
+    python -m calcservice batch --mode scientific --input formulas.txt --output results.jsonl
+
+## Benchmarks
+
+Measure every mode and evaluation path and compare against `benchmarks/baseline.json`:
+
+    python -m benchmarks.run
+
 ## Requirements
 
 - Python 3.x
@@ -25,7 +38,7 @@ Run the program and select from the menu options:
 
 ## Safety Note
 
-This program uses `eval()` for expression evaluation. While basic input validation is implemented, avoid using with untrusted input in production environments.
+Expressions are evaluated by `calcservice.engine`, which parses them into a small node tree with a whitelist of operators and functions instead of calling `eval()`. Limits on nesting depth, exponent size and integer bit length keep inputs like `9**9**9` from hanging the program.
 
 ## Author
 
@@ -36,8 +49,17 @@ Calculator Service Team
 See LICENSE file for details
 """
 
-# Import required modules
-from calcservice import basic_calculator, scientific_calculator, programmer_calculator, financial_calculator
+# Import required modules (calculator modes are loaded only when selected)
+import calcservice
+
+# Menu choice → calculator mode function name in the calcservice package
+MENU_MODES = {
+    1: "basic_calculator",
+    2: "scientific_calculator",
+    3: "programmer_calculator",
+    4: "financial_calculator",
+    5: "engineering_calculator",
+}
 
 def main() -> None:
     """
@@ -51,9 +73,9 @@ def main() -> None:
 
     1. **Basic Calculator**: Evaluates simple mathematical expressions
     2. **Scientific Calculator**: Provides access to advanced math functions
-    3. **Programmer Calculator**: Binary/octal/hex operations (not yet implemented)
-    4. **Financial Calculator**: Financial formulas (not yet implemented)
-    5. **Engineering Calculator**: Engineering calculations (not yet implemented)
+    3. **Programmer Calculator**: Binary/octal/hex and bitwise operations
+    4. **Financial Calculator**: NPV, IRR, amortization, annuities and bonds
+    5. **Engineering Calculator**: Engineering tools menu (matrices, financial, sessions)
 
     ## Error Handling
 
@@ -77,17 +99,8 @@ def main() -> None:
             continue
 
         # Route to appropriate calculator based on choice
-        if choice == 1:
-            basic_calculator()
-        elif choice == 2:
-            scientific_calculator()
-        elif choice == 3:
-            programmer_calculator()
-        elif choice == 4:
-            financial_calculator()
-        elif choice == 5:
-            print("Engineering Calculator - Feature not yet implemented")
-            print("---------------------------------------")
+        if choice in MENU_MODES:
+            getattr(calcservice, MENU_MODES[choice])()
         else:
             print("Invalid choice. Please select a number between 1 and 5.")
             print("---------------------------------------")
@@ -0,0 +1,95 @@
+import math
+
+import pytest
+
+from calcservice.autodiff import compile_gradient, differentiable_functions, gradient
+from calcservice.engine import ExpressionError
+from calcservice.scientific_calculator import build_functions
+
+
+def _numeric_gradient(expression, point, h=1e-6):
+    functions = build_functions()
+    compiled = compile_gradient(expression, tuple(point))
+
+    def value(values):
+        return compiled(dict(functions, **values))[0]
+
+    partials = []
+    for name in point:
+        up, down = dict(point), dict(point)
+        up[name] += h
+        down[name] -= h
+        partials.append((value(up) - value(down)) / (2 * h))
+    return partials
+
+
+def test_gradient_of_product():
+    value, partials = gradient("x**2 * y", x=3, y=2)
+    assert value == 18
+    assert partials == {"x": 12.0, "y": 9.0}
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "sin(x)*cos(y) + tan(x*y)",
+        "asin(x/2) + acos(y/3) + atan(x*y) + atan2(x, y)",
+        "sinh(x) + cosh(y) + tanh(x - y) + asinh(x) + acosh(y + 1) + atanh(x/2)",
+        "exp(x) + exp2(y) + expm1(x*y) + log(x) + log(y, 3) + log(2, x + 2)",
+        "log2(x) + log10(y) + log1p(x*y) + sqrt(x + y) + cbrt(x)",
+        "fabs(x - y) + copysign(x, y) + hypot(x, y) + fmod(x*5, y)",
+        "erf(x) + erfc(y) + degrees(x) + radians(y) + floor(x) * y",
+        "x**y + pow(y, x) + 2**x + x**3 - x/y + -x % 0.4 + +y",
+        "(x + y)**2 / (x*y) - (x + y)**2",
+    ],
+)
+def test_rules_match_finite_differences(expression):
+    point = {"x": 0.7, "y": 1.3}
+    _, partials = compile_gradient(expression, ("x", "y"))(dict(build_functions(), **point))
+    assert partials == pytest.approx(_numeric_gradient(expression, point), rel=1e-6, abs=1e-8)
+
+
+def test_parameters_and_constant_names():
+    functions = build_functions()
+    compiled = compile_gradient("a*x**2 + pi*x", ("x",))
+    value, (dx,) = compiled(dict(functions, x=2.0, a=3.0))
+    assert value == pytest.approx(12 + 2 * math.pi)
+    assert dx == pytest.approx(12 + math.pi)
+    # A variable that shadows a table constant is not folded away
+    _, partials = gradient("e * pi", e=2.0, pi=3.0)
+    assert partials == {"e": 3.0, "pi": 2.0}
+    # Compiled once: the same object comes from the cache
+    assert compile_gradient("a*x**2 + pi*x", ("x",)) is compiled
+
+
+def test_vectorized_gradient():
+    np = pytest.importorskip("numpy")
+    x = np.linspace(0, 1, 5)
+    value, partials = gradient("sin(x) * y", x=x, y=2.0)
+    assert np.allclose(value, 2 * np.sin(x))
+    assert np.allclose(partials["x"], 2 * np.cos(x))
+    assert np.allclose(partials["y"], np.sin(x))
+
+
+def test_power_rule_at_zero_and_negative_bases():
+    assert gradient("x**y", x=0.0, y=2.0) == (0.0, {"x": 0.0, "y": 0.0})
+    value, partials = gradient("x**y", x=-2.0, y=2.0)
+    assert value == 4.0 and partials["x"] == -4.0 and math.isnan(partials["y"])
+
+
+def test_power_rule_vectorized():
+    np = pytest.importorskip("numpy")
+    with np.errstate(invalid="ignore"):
+        _, partials = gradient("x**y", x=np.array([0.0, -2.0, 2.0]), y=2.0)
+    assert partials["y"][0] == 0.0 and np.isnan(partials["y"][1])
+    assert partials["y"][2] == pytest.approx(4 * math.log(2))
+
+
+def test_errors():
+    assert "sin" in differentiable_functions() and "factorial" not in differentiable_functions()
+    with pytest.raises(ExpressionError):
+        gradient("factorial(x)", x=3)
+    with pytest.raises(ExpressionError):
+        gradient("nosuch(x)", x=1.0)
+    # Non-differentiable functions of constants only are fine
+    assert gradient("factorial(4) * x", x=2.0)[1] == {"x": 24.0}
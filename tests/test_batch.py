@@ -0,0 +1,72 @@
+import io
+import json
+import math
+from decimal import Decimal
+
+from calcservice.batch import read_records, run_batch
+from calcservice.cli import main
+
+
+def _results(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_run_batch_text_and_jsonl():
+    source = io.StringIO('2 + 3\n\n{"id": "a", "expression": "sqrt(16)"}\nnope(1)\n')
+    output = io.StringIO()
+    assert run_batch(source, output, mode="scientific") == 3
+    results = _results(output.getvalue())
+    assert results[0] == {"line": 1, "expression": "2 + 3", "result": 5}
+    assert results[1]["id"] == "a" and results[1]["result"] == 4.0
+    assert "error" in results[2]
+
+
+def test_non_finite_results_are_strict_json():
+    output = io.StringIO()
+    run_batch(io.StringIO("inf - inf\n-inf\n[1.5, nan]\n0.5\n"), output, mode="scientific")
+
+    def reject(constant):
+        raise ValueError(f"non-standard JSON constant {constant}")
+
+    results = [json.loads(line, parse_constant=reject) for line in output.getvalue().splitlines()]
+    assert [r["result"] for r in results] == [None, None, [1.5, None], 0.5]
+
+
+def test_integers_beyond_the_str_digit_limit():
+    output = io.StringIO()
+    run_batch(io.StringIO("factorial(3000)\n[1, -2**20000]\n2**300000\n"), output, mode="scientific")
+    results = _results(output.getvalue())
+    assert results[0]["result"] == str(Decimal(math.factorial(3000)))
+    assert results[1]["result"] == [1, str(Decimal(-(2**20000)))]
+    assert results[2]["result"] == hex(2**300000)
+
+
+def test_read_records_is_lazy():
+    def lines():
+        yield "1 + 1\n"
+        raise AssertionError("read past the first record")
+
+    records = read_records(lines())
+    assert next(records).expression == "1 + 1"
+
+
+def test_cli_batch_files(tmp_path):
+    source = tmp_path / "in.txt"
+    target = tmp_path / "out.jsonl"
+    source.write_text("2 ** 8\n7 // 2\n")
+    assert main(["batch", "--mode", "basic", "-i", str(source), "-o", str(target)]) == 0
+    assert [r["result"] for r in _results(target.read_text())] == [256, 3]
+
+
+def test_parallel_batch_keeps_input_order():
+    lines = "".join(f"factorial({n}) % 1000003\n" for n in range(200))
+    serial, parallel = io.StringIO(), io.StringIO()
+    run_batch(io.StringIO(lines), serial, mode="scientific")
+    run_batch(io.StringIO(lines), parallel, mode="scientific", workers=2, chunk_size=7)
+    assert parallel.getvalue() == serial.getvalue()
+
+
+def test_programmer_batch_mode():
+    output = io.StringIO()
+    run_batch(io.StringIO("0x80 >> 1\n"), output, mode="programmer", bits=8, signed=True)
+    assert _results(output.getvalue())[0]["result"]["decimal"] == -64
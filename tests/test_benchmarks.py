@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from benchmarks import corpora
+from benchmarks.run import Case, compare, main, run_case
+from calcservice.basic_calculator import evaluate_basic
+
+
+def test_corpora_are_deterministic():
+    assert corpora.wide_bitwise(5) == corpora.wide_bitwise(5)
+    assert len(corpora.combinatorics(7)) == 7
+    assert corpora.modular_combinatorics(5) == corpora.modular_combinatorics(5)
+
+
+def test_run_case_and_compare():
+    result = run_case(Case("basic/tiny", evaluate_basic, corpora.short_arithmetic(10)), rounds=2)
+    assert result.operations == 20
+    assert result.ops_per_sec > 0 and result.p50_us <= result.p99_us
+
+    baseline = {"basic/tiny": {"ops_per_sec": result.ops_per_sec * 10}}
+    assert compare([result], baseline, threshold=0.25)
+    assert not compare([result], {}, threshold=0.25)
+
+
+def test_baseline_with_other_rounds_is_refused(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"rounds": 5, "cases": {}}))
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--rounds", "1", "--filter", "basic/", "--baseline", str(path)])
+    assert exit_info.value.code == 2
+    assert "--rounds 5" in capsys.readouterr().err
+    assert main(["--rounds", "5", "--filter", "basic/", "--baseline", str(path)]) == 0
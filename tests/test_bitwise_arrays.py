@@ -0,0 +1,64 @@
+import array
+import random
+import re
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from calcservice.bitwise_arrays import as_registers, evaluate_bitwise_array, evaluate_bitwise_file
+from calcservice.programmer_calculator import evaluate_programmer
+
+EXPRESSIONS = [
+    "(x >> 4) & 0xF",
+    "~x ^ 0x5A",
+    "x << 3 | x >> 5",
+    "x * 3 + 7",
+    "-x / 3",
+    "x % 7 - 1",
+    "x >> 70",
+]
+
+
+@pytest.mark.parametrize("bits", [8, 16, 32, 64])
+@pytest.mark.parametrize("signed", [False, True])
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_matches_scalar_programmer_mode(expression, bits, signed):
+    rng = random.Random(bits)
+    values = [rng.getrandbits(bits) for _ in range(64)] + [0, 1, (1 << bits) - 1, 1 << (bits - 1)]
+    data = np.array(values, dtype=f"u{bits // 8}")
+    result = evaluate_bitwise_array(expression, data, bits, signed)
+    expected = [
+        evaluate_programmer(re.sub(r"\bx\b", str(v), expression), bits, signed).decimal for v in values
+    ]
+    assert result.tolist() == expected
+
+
+def test_array_module_buffers_and_zero_division():
+    data = array.array("H", [1, 2, 0xFFFF])
+    assert evaluate_bitwise_array("~x", data, bits=16, signed=True).tolist() == [-2, -3, 0]
+    with pytest.raises(ZeroDivisionError):
+        evaluate_bitwise_array("1 / x", np.array([1, 0], np.uint8), bits=8)
+
+
+def test_typed_buffers_convert_by_value():
+    assert as_registers(array.array("Q", [1, 2]), bits=32).tolist() == [1, 2]
+    assert as_registers(array.array("B", [1, 2, 3, 4]), bits=16).tolist() == [1, 2, 3, 4]
+    assert as_registers(array.array("b", [-1]), bits=16).tolist() == [0xFFFF]
+    assert as_registers(memoryview(array.array("I", [7])), bits=32).tolist() == [7]
+    # Raw bytes are still read as packed registers
+    assert as_registers(b"\x01\x02\x03\x04", bits=16, byteorder="<").tolist() == [0x0201, 0x0403]
+    with pytest.raises(TypeError):
+        as_registers(array.array("d", [1.0]), bits=32)
+
+
+def test_memory_mapped_file_in_chunks(tmp_path):
+    source = tmp_path / "dump.bin"
+    target = tmp_path / "out.bin"
+    values = np.arange(1000, dtype="<u4")
+    values.tofile(source)
+    count = evaluate_bitwise_file(
+        "x ^ 0xFFFFFFFF", str(source), str(target), bits=32, byteorder="<", chunk_elements=77
+    )
+    assert count == 1000
+    assert np.array_equal(np.fromfile(target, dtype="<u4"), values ^ np.uint32(0xFFFFFFFF))
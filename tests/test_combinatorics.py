@@ -0,0 +1,105 @@
+import math
+
+import pytest
+
+from calcservice import combinatorics
+from calcservice.combinatorics import comb, comb_mod, factorial, factorial_mod, is_prime, perm
+from calcservice.precision import evaluate_precise
+from calcservice.scientific_calculator import evaluate_scientific
+
+
+def test_exact_against_math():
+    for n in (0, 1, 20, 1000, 16384, 20000, 50000):
+        assert factorial(n) == math.factorial(n)
+    for n, k in [(0, 0), (5, 7), (100, 50), (10**5, 2048), (10**5, 5 * 10**4), (123457, 61000), (40000, 39000)]:
+        assert comb(n, k) == math.comb(n, k)
+        assert perm(n, k) == math.perm(n, k)
+    assert perm(30000) == math.perm(30000)
+
+
+def test_nearby_factorial_extends_memoized_value():
+    assert factorial(60000) == math.factorial(60000)
+    assert combinatorics._nearby(60500) is not None
+    assert factorial(60500) == math.factorial(60500)
+    assert factorial(59000) == math.factorial(59000)
+
+
+def test_errors_match_math():
+    for function, args in [(factorial, (-1,)), (comb, (-1, 2)), (comb, (3, -1)), (perm, (-1, 2))]:
+        with pytest.raises(ValueError) as ours:
+            function(*args)
+        with pytest.raises(ValueError) as theirs:
+            getattr(math, function.__name__)(*args)
+        assert str(ours.value) == str(theirs.value)
+    with pytest.raises(TypeError):
+        factorial(5.0)
+    with pytest.raises(ValueError, match="modulus"):
+        comb_mod(5, 2, 0)
+
+
+def test_is_prime():
+    assert [n for n in range(40) if is_prime(n)] == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+    assert is_prime(10**9 + 7) and is_prime(2**61 - 1) and is_prime(2**127 - 1)
+    assert not is_prime(561) and not is_prime((2**31 - 1) * (2**61 - 1))
+
+
+def test_modular_paths_need_a_proven_prime():
+    # A strong pseudoprime to every Miller–Rabin base used, and a prime beyond that bound
+    pseudoprime = 3_317_044_064_679_887_385_961_981
+    assert is_prime(pseudoprime)
+    for m in (pseudoprime, 2**127 - 1):
+        assert factorial_mod(30, m) == math.factorial(30) % m
+        assert comb_mod(m + 40, 7, m) == math.comb(m + 40, 7) % m
+
+
+@pytest.mark.parametrize("m", [2, 7, 13, 97, 1009, 10**9 + 7, 2**89 - 1, 1, 12, 1000, 2**64, 10**9 + 8])
+def test_modular_against_exact(m):
+    for n, k in [(0, 0), (10, 3), (100, 37), (3000, 1500), (5000, 4999), (6, 9)]:
+        assert comb_mod(n, k, m) == math.comb(n, k) % m
+    for n in (0, 1, 12, 500, 3000):
+        assert factorial_mod(n, m) == math.factorial(n) % m
+
+
+def test_lucas_for_huge_n():
+    for n, k in [(1000, 333), (4096, 2048), (12345, 678)]:
+        assert comb_mod(n, k, 7) == math.comb(n, k) % 7
+    # Base-7 digits: k has a 1 where n has a 0, and C(0, 1) = 0
+    assert comb_mod(7**20, 7**10, 7) == 0
+    # n = 2·7^20 + 3, k = 7^20 + 1: C(2, 1)·C(3, 1) = 6
+    assert comb_mod(2 * 7**20 + 3, 7**20 + 1, 7) == 6
+
+
+def test_wilson_and_untabled_paths(monkeypatch):
+    monkeypatch.setattr(combinatorics, "TABLE_LIMIT", 16)
+    p = 1009
+    for n in (10, 100, 900, 1008):
+        assert factorial_mod(n, p) == math.factorial(n) % p
+        assert comb_mod(n, n // 3, p) == math.comb(n, n // 3) % p
+
+
+def test_modular_work_is_bounded(monkeypatch):
+    monkeypatch.setattr(combinatorics, "MAX_PRODUCT_TERMS", 1 << 12)
+    with pytest.raises(ValueError, match="multiplications"):
+        factorial_mod(10**6, 10**6 + 1)  # composite modulus: one factor at a time
+    assert factorial_mod(10**6, 2**40) == 0  # the product reaches 0 early
+    assert factorial_mod(10**12 + 38, 10**12 + 39) == 10**12 + 38  # Wilson's theorem
+    with pytest.raises(ValueError, match="bits"):
+        comb_mod(10**12, 5 * 10**11, 6)
+    assert comb_mod(10**12, 5, 6) == math.comb(10**12, 5) % 6
+
+
+def test_lucas_digits_share_one_budget():
+    p = 2**31 - 1
+    n = p**5 - 1
+    with pytest.raises(ValueError, match="multiplications"):
+        comb_mod(n, 8388500 * (n // (p - 1)), p)  # many cheap-looking digits
+    with pytest.raises(ValueError, match="multiplications"):
+        comb_mod(3**100000 - 1, (3**100000 - 1) // 2, 3)  # one division of n per digit
+    n = 3**2000 - 1  # every base-3 digit of n is 2 and of n // 2 is 1
+    assert comb_mod(n, n // 2, 3) == pow(2, 2000, 3)
+
+
+def test_in_expressions():
+    assert evaluate_scientific("comb_mod(10**6, 5*10**5, 10**9 + 7)") == 996692777
+    assert evaluate_scientific("factorial_mod(10**6, 10**9 + 7)") == 641102369
+    assert evaluate_precise("comb_mod(50, 25, 1000)", 20) == math.comb(50, 25) % 1000
@@ -0,0 +1,75 @@
+import cmath
+import math
+
+import pytest
+
+from calcservice.complex_calculator import (
+    build_complex_functions,
+    complex_calculator,
+    evaluate_complex,
+    evaluate_complex_vectorized,
+    format_complex,
+    vectorize_complex,
+)
+from calcservice.engine import ExpressionError
+
+
+def test_cmath_table():
+    assert evaluate_complex("sqrt(-1)") == 1j
+    assert evaluate_complex("log(-1)") == pytest.approx(math.pi * 1j)
+    assert evaluate_complex("(3+4j) * conj(3+4j)") == 25
+    assert evaluate_complex("abs(3 + 4*j)") == 5.0
+    assert evaluate_complex("exp(j*pi)") == pytest.approx(-1)
+    assert build_complex_functions() is build_complex_functions()
+    with pytest.raises(ExpressionError):
+        evaluate_complex("nope(1)")
+
+
+def test_polar_and_phasors():
+    assert evaluate_complex("10∠30 + 10∠-30") == pytest.approx(10 * math.sqrt(3))
+    assert evaluate_complex("phasor(2, 90)") == pytest.approx(2j)
+    assert evaluate_complex("angle(-1j)") == pytest.approx(-90.0)
+    assert evaluate_complex("polar(1j)") == pytest.approx((1.0, math.pi / 2))
+    assert evaluate_complex("rect(2, pi)") == pytest.approx(-2)
+    # A 100 ohm resistor in parallel with 10 uF at 50 Hz
+    xc = 1 / (2j * math.pi * 50 * 10e-6)
+    assert evaluate_complex("parallel(100, 1/(j*2*pi*50*10e-6))") == pytest.approx(100 * xc / (100 + xc))
+
+
+def test_format_complex():
+    assert format_complex(3 + 4j) == "3+4j"
+    assert format_complex(3 - 4j) == "3-4j"
+    assert format_complex(2j) == "2j"
+    assert format_complex(complex(2, 0)) == "2"
+    assert format_complex(3 + 4j, polar=True, digits=6) == "5∠53.1301°"
+    assert format_complex((1.0, 2.0)) == "(1.0, 2.0)"
+
+
+def test_vectorized_sweep_matches_cmath():
+    np = pytest.importorskip("numpy")
+    w = 2 * np.pi * np.logspace(1, 6, 1001)
+    impedance = vectorize_complex("R + j*w*L + 1/(j*w*C)", ["w", "R", "L", "C"])
+    z = impedance(w=w, R=50, L=1e-3, C=1e-6)
+    assert z.dtype == np.complex128 and z.shape == (1001,)
+    expected = [50 + 1j * x * 1e-3 + 1 / (1j * x * 1e-6) for x in w.tolist()]
+    assert np.allclose(z, expected, rtol=1e-14)
+    # Branch cuts follow cmath for real inputs
+    x = np.array([-4.0, -0.5, 2.0])
+    for name in ("sqrt", "log", "asin", "acos", "log10"):
+        got = evaluate_complex_vectorized(f"{name}(x)", x=x)
+        want = [getattr(cmath, name)(value) for value in x.tolist()]
+        assert np.allclose(got, want), name
+    assert np.allclose(evaluate_complex_vectorized("angle(phasor(2, a))", a=[30, -60]), [30, -60])
+    with pytest.raises(TypeError, match="missing"):
+        impedance(w=w)
+
+
+def test_interactive_mode(monkeypatch, capsys):
+    inputs = iter(["sqrt(-4)", "polar", "3+4j", "rect", "Z = 30 + 40j", "100∠0 / Z", "sqrt(", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    complex_calculator()
+    out = capsys.readouterr().out
+    assert "The result is:  2j" in out
+    assert "The result is:  5∠53.1301023542°" in out
+    assert "The result is:  1.2-1.6j" in out
+    assert "Invalid input" in out
@@ -0,0 +1,108 @@
+import math
+
+import pytest
+
+from calcservice.basic_calculator import evaluate_basic
+from calcservice.engine import (
+    BinOp,
+    Constant,
+    ExpressionError,
+    Limits,
+    compile_expression,
+    parse,
+)
+from calcservice.scientific_calculator import evaluate_scientific
+
+
+def test_parse_builds_node_tree():
+    assert parse("2 + 3") == BinOp("+", Constant(2), Constant(3))
+
+
+def test_basic_and_scientific_results():
+    assert evaluate_basic("2 + 3 * 4") == 14
+    assert evaluate_basic("2 ** 10 // 3") == 341
+    assert evaluate_scientific("sin(pi/2)") == 1.0
+    assert evaluate_scientific("fsum([0.1] + [0.2])") == pytest.approx(0.3)
+    assert evaluate_scientific("isclose(1.0, 1.0 + 1e-12, rel_tol=1e-9)") is True
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os')",
+        "().__class__",
+        "'a' * 10",
+        "lambda: 1",
+        "[x for x in (1, 2)]",
+        "1 if 1 else 2",
+    ],
+)
+def test_rejects_unsafe_syntax(expression):
+    with pytest.raises(ExpressionError):
+        evaluate_scientific(expression)
+
+
+def test_unknown_names_rejected_at_parse_time():
+    with pytest.raises(ExpressionError, match="unknown function"):
+        parse("invalid_func()", names={"sin": math.sin})
+    with pytest.raises(ExpressionError, match="not defined"):
+        evaluate_basic("x + 1")
+
+
+@pytest.mark.parametrize("expression", ["9**9**9", "2**(2**30)", "1 << 10**9", "10**100000 * 10**100000 * 10**10000000"])
+def test_limits_stop_runaway_integers(expression):
+    with pytest.raises(ExpressionError):
+        evaluate_basic(expression)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "factorial(10**7)",
+        "factorial(10**100)",
+        "perm(10**6)",
+        "perm(10**30, 10**6)",
+        "comb(10**7, 5 * 10**6)",
+        "comb(10**30, 10**6)",
+        "pow(3, 10**7)",
+        "isqrt(2**300000 + 1)",
+        "lcm(2**300000 + 1, 3)",
+        "prod([2**3000000 + 1, 2**3000000 + 1])",
+        "(2**1000000)**4 // (3**600000 + 7)**2",
+        "(2**1000000)**4 % (3**600000 + 7)**2",
+        "factorial_mod(5, 2**50000 + 1)",
+        "comb_mod(10, 3, 2**20000 + 1)",
+    ],
+)
+def test_function_limits_checked_before_the_call(expression):
+    # factorial(10**7) alone would run for minutes before its result could be rejected
+    with pytest.raises(ExpressionError, match="limit"):
+        evaluate_scientific(expression)
+    with pytest.raises(ExpressionError, match="limit"):
+        evaluate_scientific(expression, optimize=True)
+
+
+def test_function_limits_allow_large_results():
+    assert evaluate_scientific("factorial(100000) % 1000003") == math.factorial(100000) % 1000003
+    assert evaluate_scientific("comb(10**30, 3)") == math.comb(10**30, 3)
+    assert evaluate_scientific("perm(10**18, 3)") == math.perm(10**18, 3)
+    assert evaluate_scientific("gcd(2**200000, 6**1000)") == 2**1000
+    assert evaluate_scientific("16**1000000 // 3 % 7") == 16**1000000 // 3 % 7
+    with pytest.raises(TypeError):
+        evaluate_scientific("factorial(1, 2)")
+
+
+def test_depth_limit():
+    expr = "(" * 50 + "1" + ")" * 50
+    assert compile_expression(expr, (), mode="test-depth").evaluate() == 1
+    with pytest.raises(ExpressionError, match="nested too deeply"):
+        compile_expression("-" * 20 + "1", (), mode="test-depth", limits=Limits(max_depth=10))
+    # Deep enough to overflow the Python parser itself
+    with pytest.raises(ExpressionError, match="nested too deeply"):
+        parse("-" * 5000 + "1")
+
+
+def test_variables_resolved_from_namespace():
+    expr = compile_expression("x * 2 + 1", {"x"}, mode="test-vars")
+    assert expr.evaluate({"x": 20}) == 41
+    assert expr.evaluate({"x": 0.5}) == 2.0
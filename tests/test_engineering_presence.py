@@ -1,6 +1,25 @@
 import importlib
 
+from calcservice.engineering_calculator import MENU_ITEMS, engineering_calculator
+
 
 def test_engineering_module_importable():
     m = importlib.import_module('calcservice.engineering_calculator')
     assert m is not None
+
+
+def test_menu_dispatches_and_exits(monkeypatch, capsys):
+    inputs = iter(["3", "abc", "99", "18", "6", "27"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    engineering_calculator()
+    out = capsys.readouterr().out
+    assert "7. Matrix operations" in out
+    assert "Expression & scripting mode - Feature not yet implemented" in out
+    assert "Invalid choice" in out and "Invalid input" in out
+    assert "Financial Calculator" in out
+
+
+def test_every_implemented_item_resolves():
+    for title, module, function in MENU_ITEMS.values():
+        if module is not None:
+            assert callable(getattr(importlib.import_module(f"calcservice.{module}"), function)), title
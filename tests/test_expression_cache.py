@@ -0,0 +1,51 @@
+import pytest
+
+from calcservice.engine import compile_expression
+from calcservice.expression_cache import (
+    ExpressionCache,
+    expression_cache,
+    normalize_expression,
+)
+
+
+def test_normalize_collapses_whitespace():
+    assert normalize_expression("  2 +\t3  *  4 ") == "2 + 3 * 4"
+
+
+def test_hits_misses_and_evictions():
+    cache = ExpressionCache(maxsize=2)
+    calls = []
+
+    def compiler(text):
+        return lambda: calls.append(text) or text
+
+    assert cache.get_or_compile("a", compiler("a")) == "a"
+    assert cache.get_or_compile("a", compiler("a")) == "a"
+    cache.get_or_compile("b", compiler("b"))
+    cache.get_or_compile("c", compiler("c"))  # evicts "a"
+    cache.get_or_compile("a", compiler("a"))
+
+    assert calls == ["a", "b", "c", "a"]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 4, 2, 2)
+
+
+def test_compile_errors_are_not_cached():
+    cache = ExpressionCache()
+
+    def bad():
+        raise SyntaxError("bad")
+
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            cache.get_or_compile("2 +", bad)
+    assert cache.stats().misses == 2
+    assert len(cache) == 0
+
+
+def test_shared_cache_reuses_parsed_expressions():
+    first = compile_expression("1 + 2")
+    second = compile_expression(" 1  +  2 ")
+    assert first is second
+    assert first.evaluate() == 3
+    assert expression_cache.stats().hits >= 1
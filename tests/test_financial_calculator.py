@@ -0,0 +1,102 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from calcservice.financial_calculator import (
+    amortization_schedule,
+    annuity_fv,
+    annuity_pv,
+    bond_price,
+    financial_calculator,
+    irr,
+    npv,
+    xirr,
+)
+
+
+def test_npv_and_irr():
+    assert npv(0.1, [-100, 60, 60]) == pytest.approx(4.1322314)
+    rate = irr([-100, 60, 60])
+    assert npv(rate, [-100, 60, 60]) == pytest.approx(0.0, abs=1e-9)
+    assert npv(Decimal("0.1"), [Decimal(-100), Decimal(110)]) == Decimal(0)
+    with pytest.raises(ValueError):
+        irr([100, 50])
+
+
+def test_irr_long_series():
+    # 30 years of monthly payments: powers of (1 + rate) at the bracket ends would overflow
+    flows = [-100_000] + [600] * 360
+    rate = irr(flows)
+    assert rate == pytest.approx(0.0050058, rel=1e-4)
+    assert npv(rate, flows) == pytest.approx(0.0, abs=1e-6)
+    assert irr([0, 0, -100, 110, 0]) == pytest.approx(0.1)
+
+
+def test_irr_with_two_rates_uses_the_guess():
+    # Roots at 10% and 20%: the NPV has the same sign at both ends of the bracket
+    flows = [-100, 230, -132]
+    assert irr(flows) == pytest.approx(0.1)
+    assert irr(flows, guess=0.25) == pytest.approx(0.2)
+
+
+def test_xirr_one_year():
+    assert xirr([-1000, 1100], [date(2023, 1, 1), date(2024, 1, 1)]) == pytest.approx(0.1)
+
+
+def test_annuities_and_bond():
+    assert annuity_pv(0.05, 10, 100) == pytest.approx(772.1734929)
+    assert annuity_fv(0.05, 10, 100) == pytest.approx(1257.7892536)
+    assert annuity_pv(0, 10, 100) == 1000
+    assert bond_price(1000, 0.05, 0.05, 10) == pytest.approx(1000.0)
+    assert bond_price(1000, 0.05, 0.06, 10) == pytest.approx(925.6126, rel=1e-6)
+
+
+def test_exact_amortization_ends_at_zero_cents():
+    rows = list(amortization_schedule(10_000, 0.05 / 12, 36, exact=True))
+    assert len(rows) == 36
+    assert rows[0].payment == Decimal("299.71")
+    assert rows[-1].balance == Decimal("0.00")
+    assert sum(row.principal for row in rows) == Decimal("10000.00")
+    assert all(row.interest == row.interest.quantize(Decimal("0.01")) for row in rows)
+
+
+def test_vectorized_portfolio_and_irr():
+    np = pytest.importorskip("numpy")
+    from calcservice.financial_calculator import amortize_portfolio, irr_many
+
+    principals = np.array([10_000.0, 5_000.0, 20_000.0])
+    rates = np.array([0.05, 0.0, 0.07]) / 12
+    terms = np.array([36, 12, 60])
+    steps = list(amortize_portfolio(principals, rates, terms))
+    assert len(steps) == 60
+    assert np.allclose(steps[-1].balance, 0.0)
+    for loan in range(3):
+        rows = list(amortization_schedule(principals[loan], rates[loan], int(terms[loan])))
+        assert steps[0].payment[loan] == pytest.approx(rows[0].payment)
+        assert sum(s.interest[loan] for s in steps) == pytest.approx(sum(r.interest for r in rows))
+
+    flows = [[-100, 60, 60], [-100, 110, 0], [100, 50, 0]]
+    rates = irr_many(flows)
+    assert rates[0] == pytest.approx(irr(flows[0]))
+    assert rates[1] == pytest.approx(0.1)
+    assert np.isnan(rates[2])
+    assert np.allclose(irr_many(flows[:2], guess=rates[:2]), rates[:2])
+    assert np.allclose(irr_many([[-100, 230, -132]] * 2, guess=[0.05, 0.25]), [0.1, 0.2])
+
+    long_flows = np.zeros((3, 361))
+    long_flows[0] = [-100_000] + [600] * 360
+    long_flows[1, :3] = [-100, 60, 60]
+    long_flows[2, 200:] = [-50_000] + [400] * 160
+    rates = irr_many(long_flows)
+    assert rates[0] == pytest.approx(irr(long_flows[0]))
+    assert rates[1] == pytest.approx(irr([-100, 60, 60]))
+    for rate, row in zip(rates, long_flows):
+        assert npv(rate, row) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_interactive_npv(monkeypatch, capsys):
+    inputs = iter(["1", "0.1", "-100, 60, 60", "6"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    financial_calculator()
+    assert "NPV: 4.13" in capsys.readouterr().out
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+# Cumulative import-time budget for `import calcservice`, in microseconds
+IMPORT_BUDGET_US = 10_000
+
+
+def _import_times(code):
+    # Run in a fresh interpreter so nothing is already imported
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times, completed.stdout
+
+
+def test_package_import_is_lazy():
+    times, stdout = _import_times(
+        "import sys, calcservice; print(sorted(m for m in sys.modules if m.startswith('calcservice')))"
+    )
+    assert stdout.strip() == "['calcservice']"
+    assert times["calcservice"] < IMPORT_BUDGET_US
+
+
+def test_mode_loaded_on_first_access():
+    _, stdout = _import_times(
+        "import sys, calcservice; calcservice.basic_calculator; "
+        "print('calcservice.programmer_calculator' in sys.modules, 'calcservice.basic_calculator' in sys.modules)"
+    )
+    assert stdout.strip() == "False True"
+
+
+def test_scientific_table_built_once():
+    from calcservice.scientific_calculator import build_functions
+
+    assert build_functions() is build_functions()
@@ -0,0 +1,115 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from calcservice import matrix
+from calcservice.engine import evaluate
+from calcservice.matrix import (
+    determinant,
+    eigenvalues,
+    evaluate_matrix,
+    load_matrix,
+    log_determinant,
+    matrix_calculator,
+    solve,
+)
+
+
+def _spd(n, seed=0):
+    rng = np.random.default_rng(seed)
+    a = rng.standard_normal((n, n))
+    return a @ a.T + n * np.eye(n)
+
+
+def test_matmul_operator_in_engine():
+    assert evaluate("a @ b", {"a": np.eye(2), "b": np.array([3.0, 4.0])}).tolist() == [3.0, 4.0]
+
+
+def test_dense_linear_algebra():
+    a = _spd(50)
+    b = np.arange(50.0)
+    assert np.allclose(a @ solve(a, b), b)
+    assert determinant([[1, 2], [3, 4]]) == pytest.approx(-2)
+    sign, logdet = log_determinant(a * 1e3)  # det overflows a float, the log doesn't
+    assert sign == 1 and np.isfinite(logdet)
+    assert np.allclose(eigenvalues(a), np.sort(np.linalg.eigvals(a).real))
+    # Non-square systems are solved in the least-squares sense
+    assert np.allclose(solve([[1, 0], [0, 1], [1, 1]], [1, 2, 3]), [1, 2])
+
+
+def test_expressions():
+    a = _spd(4)
+    b = np.ones(4)
+    assert np.allclose(evaluate_matrix("inv(A) @ b", A=a, b=b), np.linalg.solve(a, b))
+    assert evaluate_matrix("det(matrix([[2, 0], [0, 4]]))") == pytest.approx(8)
+    u, s, vh = evaluate_matrix("svd(A)", A=a)
+    assert np.allclose((u * s) @ vh, a)
+    q, r = evaluate_matrix("qr(A)", A=a)
+    assert np.allclose(q @ r, a)
+    assert np.allclose(evaluate_matrix("sin(A) * 2", A=a), np.sin(a) * 2)
+
+
+def test_load_npy_and_csv_with_memory_mapping(tmp_path):
+    a = _spd(30)
+    npy = tmp_path / "a.npy"
+    np.save(npy, a)
+    loaded = load_matrix(str(npy))
+    assert isinstance(loaded, np.memmap) and np.array_equal(loaded, a)
+
+    csv = tmp_path / "a.csv"
+    csv.write_text("x,y,z\n" + "\n".join(",".join(map(repr, row)) for row in a[:, :3].tolist()) + "\n")
+    loaded = load_matrix(str(csv))
+    assert isinstance(loaded, np.memmap) and np.array_equal(loaded, a[:, :3])
+    assert (tmp_path / "a.csv.npy").exists()
+
+
+def test_csv_conversion_in_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(matrix, "CSV_CHUNK_ROWS", 7)
+    values = np.arange(100.0).reshape(25, 4)
+    csv = tmp_path / "m.csv"
+    np.savetxt(csv, values, delimiter=",")
+    matrix.csv_to_npy(str(csv), str(tmp_path / "m.npy"), chunk_rows=7)
+    assert np.array_equal(np.load(tmp_path / "m.npy"), values)
+
+
+def test_sparse():
+    sparse = pytest.importorskip("scipy.sparse")
+    n = 2000
+    a = sparse.diags([-1.0, 4.0, -1.0], [-1, 0, 1], shape=(n, n), format="csr")
+    b = np.ones(n)
+    x = solve(a, b)
+    assert np.allclose(a @ x, b)
+    assert np.allclose(log_determinant(a)[1], np.linalg.slogdet(a.toarray())[1])
+    assert eigenvalues(a, k=3).shape == (3,)
+    with pytest.raises(ValueError, match="dense"):
+        matrix.inverse(a)
+
+
+def test_partial_decompositions_of_nested_lists():
+    pytest.importorskip("scipy.sparse.linalg")
+    a = [[4, 1, 0, 0], [1, 3, 0, 0], [0, 0, 2, 0], [0, 0, 0, 1]]
+    assert np.allclose(eigenvalues(a, k=2), np.sort(np.linalg.eigvalsh(a))[-2:])
+    assert np.allclose(matrix.svd([[3, 0, 0], [0, 2, 0], [0, 0, 1]], k=2)[1], [3, 2])
+    assert np.allclose(evaluate_matrix("eigvals([[2,1],[1,2]], 1)"), [3])
+
+
+def test_lu_requires_scipy_or_works():
+    a = _spd(5)
+    try:
+        p, l, u = matrix.lu(a)
+    except ImportError as e:
+        assert "pip install scipy" in str(e)
+    else:
+        assert np.allclose(p @ l @ u, a)
+
+
+def test_interactive(monkeypatch, capsys, tmp_path):
+    path = tmp_path / "a.npy"
+    np.save(path, np.array([[2.0, 0.0], [0.0, 4.0]]))
+    inputs = iter([f"load A {path}", "b = [1, 1]", "solve(A, b)", "inv(B)", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    matrix_calculator()
+    out = capsys.readouterr().out
+    assert "(2, 2) matrix" in out
+    assert "[0.5  0.25]" in out
+    assert "Invalid input" in out
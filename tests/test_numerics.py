@@ -0,0 +1,126 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from calcservice.engine import ExpressionError
+from calcservice.numerics import differentiate, find_root, integrate, numerics_calculator, solve_ivp
+
+
+def test_differentiate():
+    assert differentiate("sin(x)", 0).value == pytest.approx(1.0, abs=1e-12)
+    assert differentiate("x**3", [1, 2], order=2).value.tolist() == pytest.approx([6.0, 12.0])
+    result = differentiate("exp(a*x)", 0, params={"a": [1, 2, 3]})
+    assert result.value.tolist() == pytest.approx([1.0, 2.0, 3.0])
+    # The stencil shrinks for points next to the edge of the domain
+    assert differentiate("log(x)", 0.01).value == pytest.approx(100.0, rel=1e-9)
+    with pytest.raises(ValueError):
+        differentiate("x", 0, order=3)
+
+
+def test_integrate():
+    result = integrate("sin(x)", 0, math.pi)
+    assert result.value == pytest.approx(2.0, rel=1e-12) and result.converged
+    assert integrate("sin(x)", math.pi, 0).value == pytest.approx(-2.0, rel=1e-12)
+    assert integrate("fabs(x - 1/3)", 0, 1).value == pytest.approx(5 / 18, rel=1e-10)
+    assert integrate("x", 1, 1).value == 0.0
+
+
+def test_integrate_infinite_limits():
+    assert integrate("exp(-x**2)", -math.inf, math.inf).value == pytest.approx(math.sqrt(math.pi), rel=1e-12)
+    assert integrate("exp(-x)", 0, math.inf).value == pytest.approx(1.0, rel=1e-12)
+    assert integrate("1/(1 + x*x)", -math.inf, 0).value == pytest.approx(math.pi / 2, rel=1e-12)
+
+
+def test_integrate_batch_and_divergence():
+    k = np.linspace(1, 100, 500)
+    result = integrate("sin(k*x)", 0, 1, params={"k": k})
+    assert result.value.shape == (500,) and result.converged.all()
+    assert np.allclose(result.value, (1 - np.cos(k)) / k, rtol=1e-10, atol=1e-14)
+    assert not integrate("1/x", 0, 1).converged
+
+
+def test_integrate_endpoint_singularities_at_zero():
+    result = integrate("1/sqrt(x)", 0, 1)
+    assert result.converged and result.value == pytest.approx(2.0, rel=1e-10)
+    result = integrate("log(x)", 0, 1)
+    assert result.converged and result.value == pytest.approx(-1.0, rel=1e-10)
+
+
+def test_find_root():
+    assert find_root("cos(x) - x", 0, 1).root == pytest.approx(0.7390851332151607, abs=1e-12)
+    c = np.linspace(1, 1000, 10_000)
+    result = find_root("x**3 - c", 0, 100, params={"c": c})
+    assert result.converged.all()
+    assert np.allclose(result.root**3, c, rtol=1e-12)
+    assert find_root("x*x - 4", 2, 5).root == 2.0
+    with pytest.raises(ValueError, match="opposite signs"):
+        find_root("x*x + 1", -1, 1)
+
+
+def test_solve_ivp_single_problem():
+    result = solve_ivp({"x": "v", "v": "-x"}, (0, 10), {"x": 1.0, "v": 0.0}, rtol=1e-10, atol=1e-12)
+    assert result.converged and result.t == 10.0
+    assert result.y["x"] == pytest.approx(math.cos(10), abs=1e-9)
+    assert result.y["v"] == pytest.approx(-math.sin(10), abs=1e-9)
+
+
+def test_solve_ivp_batch_with_dense_output():
+    c = np.linspace(0.1, 1.9, 200)
+    times = np.linspace(0, 5, 11)
+    result = solve_ivp({"x": "v", "v": "-x - c*v"}, (0, 5), {"x": 1.0, "v": 0.0}, t_eval=times, params={"c": c})
+    assert result.y["x"].shape == (200, 11)
+    # Every problem chooses its own steps
+    assert len(set(result.steps.tolist())) > 1
+    g = c[:, None] / 2
+    w = np.sqrt(1 - g * g)
+    exact = np.exp(-g * times) * (np.cos(w * times) + g / w * np.sin(w * times))
+    assert np.abs(result.y["x"] - exact).max() < 1e-5
+
+
+def test_solve_ivp_backwards_and_blow_up():
+    result = solve_ivp({"y": "-y"}, (2, 0), {"y": 1.0}, t_eval=[2, 1, 0])
+    assert result.y["y"].tolist() == pytest.approx([1.0, math.e, math.e**2], rel=1e-5)
+
+    # y' = y**2 with y(0) = 1 blows up at t = 1; y(0) = 0.1 doesn't before t = 2
+    result = solve_ivp({"y": "y*y"}, (0, 2), {"y": [1.0, 0.1]}, t_eval=[0.5, 2])
+    assert result.converged.tolist() == [False, True]
+    assert np.isnan(result.y["y"][0, 1])
+    assert result.y["y"][1, 1] == pytest.approx(0.125, rel=1e-5)
+
+
+@pytest.mark.filterwarnings("error")
+def test_solve_ivp_zero_error_estimate():
+    # k = 0 makes the error estimate exactly 0, which must not warn about error ** -0.2
+    result = solve_ivp({"y": "-k*y"}, (0, 1), {"y": 1.0}, params={"k": np.array([0.0, 1.0])})
+    assert result.converged.all()
+    assert result.y["y"].tolist() == pytest.approx([1.0, math.exp(-1)], rel=1e-5)
+
+
+def test_solve_ivp_errors():
+    with pytest.raises(ValueError):
+        solve_ivp({"x": "v"}, (0, 1), {"x": 1.0, "v": 0.0})
+    with pytest.raises(ExpressionError):
+        solve_ivp({"x": "nope(x)"}, (0, 1), {"x": 1.0})
+
+
+def test_interactive_mode(monkeypatch, capsys):
+    inputs = iter(
+        [
+            "integrate sin(x), 0, pi",
+            "diff x**3, 2",
+            "root cos(x) - x, 0, 1",
+            "ode x' = v; v' = -x; x = 1; v = 0; t = 0 to pi",
+            "root x*x + 1, -1, 1",
+            "exit",
+        ]
+    )
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    numerics_calculator()
+    out = capsys.readouterr().out
+    assert "The result is:  2.0000000000000004" in out
+    assert "The result is:  12.0" in out
+    assert "0.739085133215160" in out
+    assert "x(3.14159) = -0.99999" in out
+    assert "opposite signs" in out
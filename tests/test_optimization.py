@@ -0,0 +1,142 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from calcservice.engine import ExpressionError
+from calcservice.optimization import (
+    linprog,
+    maximize,
+    minimize,
+    multistart,
+    optimization_calculator,
+    solve_linear_program,
+)
+
+ROSENBROCK = "(1 - x)**2 + 100*(y - x**2)**2"
+
+
+def test_minimize_bfgs():
+    result = minimize(ROSENBROCK, {"x": -1.2, "y": 1})
+    assert result.converged
+    assert result.x["x"] == pytest.approx(1.0, abs=1e-7)
+    assert result.x["y"] == pytest.approx(1.0, abs=1e-7)
+    assert result.value < 1e-14
+    assert maximize("x*exp(-x)", {"x": 0.5}).x["x"] == pytest.approx(1.0, abs=1e-6)
+
+
+def test_minimize_batch_and_params():
+    result = minimize("(x - a)**2 + (y + a)**2", {"x": 0.0, "y": 0.0}, params={"a": [1.0, 2.0, 3.0]})
+    assert result.converged.all()
+    assert np.allclose(result.x["x"], [1, 2, 3])
+    assert np.allclose(result.x["y"], [-1, -2, -3])
+    starts = np.random.default_rng(0).uniform(-2, 2, (2, 40))
+    batch = minimize(ROSENBROCK, {"x": starts[0], "y": starts[1]})
+    assert batch.value.shape == (40,)
+    assert np.allclose(batch.x["x"], 1.0, atol=1e-6)
+
+
+def test_nelder_mead():
+    result = minimize("fabs(x - 2) + (y - 0.5)**2", {"x": 0, "y": 0}, method="nelder-mead")
+    assert result.converged
+    assert result.x["x"] == pytest.approx(2.0, abs=1e-6)
+    assert result.x["y"] == pytest.approx(0.5, abs=1e-6)
+    # No derivative for factorial: BFGS refuses, Nelder–Mead doesn't need one
+    with pytest.raises(ExpressionError):
+        minimize("factorial(x)", {"x": 1.0})
+    with pytest.raises(ValueError):
+        minimize("x**2", {"x": 1.0}, method="newton")
+
+
+def test_multistart_finds_global_minimum():
+    # Two local minima; the lower one is near x = -1.30
+    result = multistart("x**4 - 3*x**2 + x", {"x": (-3, 3)}, starts=16)
+    assert result.best.x["x"] == pytest.approx(-1.3008395, abs=1e-6)
+    assert result.runs.x["x"].shape == (16,)
+    assert (result.runs.x["x"] > 0).any()
+    pooled = multistart("x**4 - 3*x**2 + x", {"x": (-3, 3)}, starts=16, workers=2)
+    assert np.allclose(pooled.runs.x["x"], result.runs.x["x"])
+    best = multistart("-(x**4 - 3*x**2 + x)", {"x": (-3, 3)}, starts=16, maximize=True).best
+    assert best.x["x"] == pytest.approx(-1.3008395, abs=1e-6)
+
+
+@pytest.fixture(params=["scipy", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "scipy":
+        pytest.importorskip("scipy")
+    else:
+        monkeypatch.setattr("calcservice.optimization.optional_scipy", lambda name: None)
+    return request.param
+
+
+def test_linprog(backend):
+    result = linprog([-3, -2], A_ub=[[1, 1], [1, 3], [1, 0]], b_ub=[4, 6, 3])
+    assert result.converged
+    assert np.allclose(result.x, [3, 1], atol=1e-6)
+    assert result.value == pytest.approx(-11)
+    # Free and bounded variables
+    result = linprog([1, -1], bounds=[(1, 2), (None, 3)])
+    assert np.allclose(result.x, [1, 3], atol=1e-6)
+    # Equalities, including a redundant one
+    result = linprog([1, 2], A_eq=[[1, 1], [2, 2]], b_eq=[1, 2])
+    assert np.allclose(result.x, [1, 0], atol=1e-6)
+    for failed in (
+        linprog([-1, 0], A_ub=[[0, 1]], b_ub=[1]),  # unbounded
+        linprog([1, 1], A_ub=[[1, 1], [-1, -1]], b_ub=[1, -2]),  # infeasible
+    ):
+        assert not failed.converged
+        assert failed.x.shape == (2,) and np.isnan(failed.x).all()
+
+
+def test_linprog_larger_problem():
+    rng = np.random.default_rng(0)
+    A = rng.random((60, 100))
+    b = A @ rng.random(100) + rng.random(60)
+    c = -rng.random(100)
+    result = linprog(c, A_ub=A, b_ub=b)
+    assert result.converged
+    assert (A @ result.x <= b + 1e-6).all() and (result.x >= -1e-6).all()
+    # Every single-variable move that stays feasible is no better
+    for j in range(100):
+        step = min((b - A @ result.x)[A[:, j] > 0] / A[A[:, j] > 0, j])
+        assert c[j] * max(step, 0) >= -1e-5
+
+
+def test_solve_linear_program():
+    x, value, result = solve_linear_program("max 3*x + 2*y st x + y <= 4; x + 3*y <= 6; x <= 3")
+    assert result.converged
+    assert x == pytest.approx({"x": 3, "y": 1}, abs=1e-6)
+    assert value == pytest.approx(11)
+    x, value, _ = solve_linear_program("min x + y st x + 2*y >= 4; 3*x + y >= 6; x == y + 0.2")
+    assert x == pytest.approx({"x": 1.55, "y": 1.35}, abs=1e-6)
+    with pytest.raises(ExpressionError, match="not linear"):
+        solve_linear_program("min x*y st x + y >= 1")
+
+
+def test_solve_linear_program_reports_failure(backend):
+    for text in ("max x + y st x - y <= 1", "min x st x + y <= 1; x + y >= 2"):
+        x, value, result = solve_linear_program(text)
+        assert not result.converged and result.message
+        assert math.isnan(value) and all(math.isnan(v) for v in x.values())
+
+
+def test_interactive_mode(monkeypatch, capsys):
+    inputs = iter(
+        [
+            "min (x - 3)**2 + (y + 1)**2 from x=0, y=0",
+            "max 4 - (x - 1)**2 from x=0.5",
+            "min x**4 - 3*x**2 + x over x=-3..3 starts 8",
+            "lp max 3*x + 2*y st x + y <= 4; x + 3*y <= 6; x <= 3",
+            "min x**2 from x",
+            "exit",
+        ]
+    )
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    optimization_calculator()
+    out = capsys.readouterr().out
+    assert "x = 3, y = -1; value = 0" in out
+    assert "x = 1; value = 4" in out
+    assert "x = -1.3008396" in out
+    assert "x = 3, y = 1; value = 11" in out
+    assert "Invalid input" in out
@@ -0,0 +1,77 @@
+import math
+
+import pytest
+
+from calcservice.engine import Call, Constant, ExpressionError, parse
+from calcservice.optimizer import (
+    OptimizationReport,
+    fold_constants,
+    optimize_expression,
+    pure_functions,
+)
+from calcservice.profiling import Profiler
+from calcservice.scientific_calculator import build_functions, evaluate_scientific
+
+TABLE = build_functions()
+
+
+def test_folds_constant_subtrees():
+    tree, removed = fold_constants(parse("2*pi/360 * x"), TABLE)
+    assert tree.left == Constant(2 * math.pi / 360)
+    assert removed == 4
+    # ((x*2)*pi)/360 has no constant subtree; floats are not reassociated
+    assert fold_constants(parse("x*2*pi/360"), TABLE)[1] == 0
+
+
+def test_fold_keeps_special_values_and_errors():
+    assert math.isnan(fold_constants(parse("inf - inf"), TABLE)[0].value)
+    assert fold_constants(parse("copysign(1, -0.0)"), TABLE)[0] == Constant(-1.0)
+    # Failing subtrees are left for evaluation to report
+    tree, removed = fold_constants(parse("1/0 + x"), TABLE)
+    assert removed == 0
+    with pytest.raises(ZeroDivisionError):
+        optimize_expression("1/0 + x", TABLE).evaluate(dict(TABLE, x=1))
+    # Non-numeric results (tuples) are not folded
+    assert type(fold_constants(parse("frexp(2.0)"), TABLE)[0]) is Call
+
+
+def test_shares_repeated_subtrees():
+    expr = optimize_expression("2*pi/360 * sqrt(x*x+y*y) + sqrt(x*x+y*y)", TABLE)
+    assert expr.report == OptimizationReport(23, 4, 10, 9)
+    assert expr.report.saved == 14
+    assert expr.evaluate(dict(TABLE, x=3, y=4)) == pytest.approx(2 * math.pi / 360 * 5 + 5)
+
+
+def test_constants_of_different_types_are_not_shared():
+    expr = optimize_expression("[x + 1, x + 1.0, x + 1j, x + 0.0, x + -0.0]", {}, mode="plain")
+    result = expr.evaluate({"x": -0.0})
+    assert [type(v) for v in result[:3]] == [float, float, complex]
+    assert math.copysign(1, result[3]) == 1 and math.copysign(1, result[4]) == -1
+    assert expr.report.shared_nodes == 4  # only the repeated x
+
+
+def test_folds_integers_too_long_for_repr():
+    # 2**20000 + 1 has more digits than int-to-str conversion allows
+    expr = optimize_expression("(x + (2**20000 + 1)) % 7 + (x + (2**20000 + 1)) % 7", {}, mode="plain")
+    assert expr.evaluate({"x": 3}) == 2 * ((3 + 2**20000 + 1) % 7)
+    assert expr.report.shared_nodes > 0
+
+
+def test_impure_functions_are_neither_folded_nor_shared():
+    profiler = Profiler()
+    functions = profiler.instrument(TABLE)
+    assert "sqrt" not in pure_functions(functions)
+    assert evaluate_scientific("sqrt(4) + sqrt(4)", functions, profiler, optimize=True) == 4.0
+    assert profiler.stats()["functions"]["sqrt"]["count"] == 2
+
+
+def test_matches_unoptimized_evaluation():
+    from benchmarks.corpora import nested_trig, repeated_subterms
+
+    for expression in nested_trig(20) + repeated_subterms(20):
+        assert evaluate_scientific(expression, optimize=True) == evaluate_scientific(expression)
+
+
+def test_unknown_function():
+    with pytest.raises(ExpressionError, match="unknown function"):
+        optimize_expression("nope(1)", TABLE)
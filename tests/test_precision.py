@@ -0,0 +1,140 @@
+import math
+from decimal import Context, Decimal
+
+import pytest
+
+from calcservice.engine import ExpressionError
+from calcservice.precision import evaluate_precise, pi
+from calcservice.scientific_calculator import scientific_calculator
+
+PI_60 = "3.14159265358979323846264338327950288419716939937510582097494"
+
+
+def test_constants_and_memoized_pi():
+    assert str(evaluate_precise("pi", 60)) == PI_60
+    assert str(evaluate_precise("e", 30)) == "2.71828182845904523536028747135"
+    # Lower precisions are rounded from the cached value
+    assert pi(20) == Context(prec=20).plus(Decimal(PI_60))
+    assert pi(20) is pi(20)
+
+
+def test_literals_are_exact_and_integers_stay_exact():
+    assert evaluate_precise("0.1 + 0.2") == Decimal("0.3")
+    assert evaluate_precise("1/3", 25) == Decimal("0." + "3" * 25)
+    assert evaluate_precise("factorial(25)") == 15511210043330985984000000
+    assert evaluate_precise("-7.5 // 2") == -4 and evaluate_precise("-7.5 % 2") == Decimal("0.5")
+
+
+@pytest.mark.parametrize("digits", [20, 50, 500])
+def test_exp_and_log_match_the_decimal_module(digits):
+    context = Context(prec=digits)
+    for text in ["0.731", "-12.5", "1e-30", "123456.789", "0.9999"]:
+        x = Decimal(text)
+        assert abs(evaluate_precise(f"exp({text})", digits) - x.exp(context)) <= abs(x.exp(context)).scaleb(1 - digits)
+        if x > 0:
+            assert abs(evaluate_precise(f"log({text})", digits) - x.ln(context)) <= abs(x.ln(context)).scaleb(1 - digits)
+    assert evaluate_precise("log10(0.001)", digits) == -3
+
+
+@pytest.mark.parametrize(
+    "identity",
+    [
+        "sin(0.7)**2 + cos(0.7)**2 - 1",
+        "tan(0.3) - sin(0.3)/cos(0.3)",
+        "4*atan(1) - pi",
+        "asin(sin(0.4)) - 0.4",
+        "acos(cos(2.5)) - 2.5",
+        "atan(-5) + atan(-0.2) + pi/2",
+        "atanh(tanh(0.3)) - 0.3",
+        "asinh(sinh(-1.5)) + 1.5",
+        "cbrt(2)**3 - 2",
+    ],
+)
+def test_identities_hold_at_500_digits(identity):
+    assert abs(evaluate_precise(identity, 500)) < Decimal("1e-495")
+
+
+def test_large_argument_reduction():
+    # sin(10^22) needs 22 extra digits of pi; the float mode happens to agree in its 16 digits
+    assert str(evaluate_precise("sin(1e22)", 20)) == "-0.85220084976718880177"
+
+
+@pytest.mark.parametrize("function", ["sin", "tan", "asin", "atan", "sinh", "tanh", "asinh", "atanh"])
+@pytest.mark.parametrize("text", ["1e-30", "-3e-45", "1e-60", "7.25e-1000", "-1e-100000"])
+def test_small_arguments_keep_relative_precision(function, text):
+    # f(x) = x (1 + O(x^2)) for all of them, so every significant digit of x must come back
+    result = evaluate_precise(f"{function}({text})", 50)
+    assert abs(result - Decimal(text)) <= abs(Decimal(text)).scaleb(-49)
+    assert abs(result / Decimal(text) - 1) < Decimal("1e-49")
+
+
+@pytest.mark.parametrize("text", ["1e-30", "-3e-45", "1e-100000"])
+def test_expm1_and_log1p_of_tiny_arguments(text):
+    # x^2/3 is below the precision: x + x^2/2 and x - x^2/2 are the correctly rounded results
+    x, context = Decimal(text), Context(prec=20)
+    square = Context(prec=60).multiply(x, x) / 2
+    assert evaluate_precise(f"expm1({text})", 20) == context.plus(Context(prec=60).add(x, square))
+    assert evaluate_precise(f"log1p({text})", 20) == context.plus(Context(prec=60).subtract(x, square))
+
+
+def test_small_results_near_one_and_near_multiples_of_half_pi():
+    # acos(1 - d) = sqrt(2 d) (1 + d/12 + ...); pi/2 - asin(x) would lose 20 digits here
+    result = evaluate_precise("acos(1 - 1e-40)", 50)
+    assert abs(result / evaluate_precise("sqrt(2e-40)", 60) - 1) < Decimal("1e-48")
+    # sin(pi_50) is pi - pi_50, which only a reduction with more digits of pi gets right
+    assert str(evaluate_precise(f"sin({PI_60[:51]})", 20)) == "5.8209749445923078164E-51"
+
+
+@pytest.mark.parametrize(
+    "y, x",
+    [
+        ("-0.0", "-1"),
+        ("0.0", "-1"),
+        ("0.0", "-0.0"),
+        ("-0.0", "-0.0"),
+        ("-0.0", "1"),
+        ("1", "-0.0"),
+        ("-1", "0"),
+        ("-1", "-1"),
+    ],
+)
+def test_atan2_follows_math_atan2_signs(y, x):
+    expected = math.atan2(float(y), float(x))
+    result = float(evaluate_precise(f"atan2({y}, {x})", 30))
+    assert result == pytest.approx(expected, rel=1e-15)
+    assert math.copysign(1, result) == math.copysign(1, expected)
+
+
+def test_errors():
+    with pytest.raises(ValueError, match="math domain error"):
+        evaluate_precise("sqrt(-1)")
+    with pytest.raises(ValueError, match="math domain error"):
+        evaluate_precise("log(0)")
+    with pytest.raises(ZeroDivisionError):
+        evaluate_precise("1/0")
+    for expression in ("exp(9999999)", "exp2(10**7)", "10.0**999999 * 10"):
+        with pytest.raises(OverflowError, match="math range error"):
+            evaluate_precise(expression)
+    with pytest.raises(ExpressionError):
+        evaluate_precise("gamma(2)")
+    with pytest.raises(ExpressionError, match="complex"):
+        evaluate_precise("1j")
+    with pytest.raises(ValueError, match="digits"):
+        evaluate_precise("1", 0)
+
+
+def test_interactive_digits_command(monkeypatch, capsys):
+    inputs = iter(["digits 30", "sqrt(2)", "digits off", "sqrt(4)", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    scientific_calculator()
+    out = capsys.readouterr().out
+    assert "Precision: 30 digits" in out
+    assert "1.41421356237309504880168872421" in out
+    assert "2.0" in out
+
+
+def test_long_integers_convert_from_their_leading_bits():
+    expected = Context(prec=30).multiply(1000000, Decimal(10).ln(Context(prec=40)))
+    assert evaluate_precise("log(10**1000000)", 30) == expected
+    # Truncating the low bits of a negative integer must not move its rounded value
+    assert evaluate_precise("fabs(-7**60000)", 20) == Context(prec=20).plus(Decimal(7**60000))
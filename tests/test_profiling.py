@@ -0,0 +1,36 @@
+import io
+import json
+
+from calcservice.batch import run_batch
+from calcservice.profiling import Profiler
+from calcservice.scientific_calculator import build_functions, evaluate_scientific
+
+
+def test_records_functions_phases_and_slowest():
+    profiler = Profiler(slowest=2)
+    functions = profiler.instrument(build_functions())
+    for expression in ["sin(0) + sin(1)", "factorial(3000) % 7", "sqrt(4)"]:
+        evaluate_scientific(expression, functions, profiler)
+
+    stats = profiler.stats()
+    assert stats["expressions"] == 3
+    assert stats["functions"]["sin"]["count"] == 2
+    assert stats["phases"]["parse"]["count"] == 3
+    assert len(stats["slowest"]) == 2
+    assert stats["slowest"][0]["seconds"] >= stats["slowest"][1]["seconds"]
+    assert json.loads(profiler.to_json()) == stats
+
+    profiler.reset()
+    evaluate_scientific("sin(0)", functions, profiler)
+    assert profiler.stats()["functions"]["sin"]["count"] == 1
+
+
+def test_batch_profiling_serial_and_parallel():
+    lines = "".join(f"gamma({n}) + sqrt({n})\n" for n in range(1, 40))
+    for workers in (1, 2):
+        profiler = Profiler()
+        run_batch(io.StringIO(lines), io.StringIO(), profiler=profiler, workers=workers, chunk_size=8)
+        stats = profiler.stats()
+        assert stats["expressions"] == 39
+        assert stats["phases"]["format"]["count"] == 39
+        assert stats["functions"]["gamma"]["count"] == 39
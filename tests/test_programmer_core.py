@@ -0,0 +1,47 @@
+import pytest
+
+from calcservice.engine import ExpressionError
+from calcservice.programmer_calculator import (
+    evaluate_programmer,
+    evaluate_programmer_many,
+    tokenize,
+)
+
+
+def test_tokenize_words_and_literals():
+    assert tokenize("0XFF and 0b11 XOR 7") == ["0xff", "&", "0b11", "^", "7"]
+    with pytest.raises(ExpressionError):
+        tokenize("2 $ 3")
+
+
+@pytest.mark.parametrize(
+    "expression, bits, signed, decimal",
+    [
+        ("0b1010 & 0b1100", 8, False, 8),
+        ("0xFF + 1", 8, False, 0),
+        ("0xFF + 1", 16, False, 256),
+        ("2 + 3 * 4", 8, False, 14),
+        ("0x80 >> 1", 8, True, -64),
+        ("0x80 >> 1", 8, False, 64),
+        ("NOT 0", 16, True, -1),
+        ("-7 / 2", 8, True, -4),
+        ("1 << 100", 32, False, 0),
+    ],
+)
+def test_fixed_width_results(expression, bits, signed, decimal):
+    assert evaluate_programmer(expression, bits, signed).decimal == decimal
+
+
+def test_float_and_error_handling():
+    assert evaluate_programmer("7.5 / 2", 8).unsigned == 3.0
+    with pytest.raises(ExpressionError, match="Floating point"):
+        evaluate_programmer("1.5 & 1", 8)
+    with pytest.raises(ZeroDivisionError):
+        evaluate_programmer("1 / 0", 8)
+    with pytest.raises(ValueError):
+        evaluate_programmer("1", 12)
+
+
+def test_bulk_variant():
+    results = evaluate_programmer_many(["0xF0 | 0x0F", "~0"], bits=8)
+    assert [r.hexadecimal for r in results] == ["FF", "FF"]
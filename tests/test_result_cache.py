@@ -0,0 +1,92 @@
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from calcservice.batch import run_batch
+from calcservice.cli import main
+from calcservice.result_cache import ResultCache
+
+
+def _fill(path, start):
+    # Runs in a separate process: writes and reads through its own connection
+    with ResultCache(path, min_seconds=0) as cache:
+        for i in range(start, start + 50):
+            cache.put("scientific", f"{i} + 1", i + 1)
+        return sum(cache.get("scientific", f"{i} + 1")[1] for i in range(start, start + 50))
+
+
+def test_round_trip_and_key(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    with ResultCache(path, min_seconds=0) as cache:
+        assert cache.get("scientific", "factorial(30)") == (False, None)
+        calls = []
+        compute = lambda: calls.append(1) or 265252859812191058636308480000000
+        assert cache.get_or_compute("scientific", "factorial(30)", compute) == 265252859812191058636308480000000
+        # Whitespace is normalized; the value survives a new process-level connection
+        assert cache.get_or_compute("scientific", " factorial(30)  ", compute) == 265252859812191058636308480000000
+        assert calls == [1]
+        cache.put("programmer", "~0", {"decimal": 255}, bits=8)
+        cache.put("programmer", "~0", {"decimal": -1}, bits=8, signed=True)
+        cache.put("precise", "pi", "3.14", precision=3)
+    with ResultCache(path) as cache:
+        assert cache.get("programmer", "~0", bits=8) == (True, {"decimal": 255})
+        assert cache.get("programmer", "~0", bits=8, signed=True) == (True, {"decimal": -1})
+        assert cache.get("programmer", "~0", bits=16) == (False, None)
+        assert cache.get("precise", "pi", precision=3) == (True, "3.14")
+        stats = cache.stats()
+    assert stats.entries == 4
+    assert (stats.hits, stats.misses) == (4, 3)
+
+
+def test_errors_and_fast_results_are_not_stored(tmp_path):
+    with ResultCache(str(tmp_path / "cache.sqlite3"), min_seconds=60) as cache:
+        assert cache.get_or_compute("basic", "2 + 3", lambda: 5) == 5
+        with pytest.raises(ZeroDivisionError):
+            cache.get_or_compute("basic", "1 / 0", lambda: 1 / 0)
+        assert cache.stats().entries == 0
+
+
+def test_size_based_eviction(tmp_path):
+    with ResultCache(str(tmp_path / "cache.sqlite3"), max_bytes=20_000, min_seconds=0) as cache:
+        for i in range(100):
+            cache.put("scientific", f"x{i}", "v" * 1000)
+        stats = cache.stats()
+        assert stats.bytes <= 20_000
+        assert stats.evictions > 0
+        assert stats.entries + stats.evictions == 100
+        # The most recent entries are kept
+        assert cache.get("scientific", "x99")[0]
+        assert not cache.get("scientific", "x0")[0]
+
+
+def test_concurrent_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    with ProcessPoolExecutor(4) as pool:
+        totals = list(pool.map(_fill, [path] * 4, range(0, 200, 50)))
+    assert totals == [sum(range(start + 1, start + 51)) for start in range(0, 200, 50)]
+    with ResultCache(path) as cache:
+        assert cache.stats().entries == 200
+        assert cache.stats().hits == 200
+
+
+def test_batch_and_cli(tmp_path, capsys):
+    path = str(tmp_path / "cache.sqlite3")
+    # perm is not memoized in-process, so every evaluation is slow enough to be stored
+    source = io.StringIO("perm(40000, 20000) % (2**61 - 1)\n" * 2 + "1 / 0\n")
+    output = io.StringIO()
+    assert run_batch(source, output, cache=path) == 3
+    first = output.getvalue()
+    assert '"result": 1315297923950017763' in first and "error" in first
+
+    source.seek(0)
+    output = io.StringIO()
+    run_batch(source, output, workers=2, chunk_size=1, cache=path)
+    assert output.getvalue() == first
+
+    assert main(["cache", "stats", "--path", path]) == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["hits"] >= 3
+    assert main(["cache", "clear", "--path", path]) == 0
+    assert json.loads(capsys.readouterr().out)["entries"] == 0
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from calcservice.server import CalcServer
+
+
+async def _request(reader, writer, method, path, payload=None, close=False):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    headers = f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+    if close:
+        headers += "Connection: close\r\n"
+    writer.write(headers.encode() + b"\r\n" + body)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+    return status, json.loads(await reader.readexactly(length))
+
+
+def _with_server(scenario):
+    async def run():
+        server = CalcServer(port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            try:
+                return await scenario(reader, writer)
+            finally:
+                writer.close()
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_keep_alive_and_endpoints():
+    async def scenario(reader, writer):
+        # Several requests over one keep-alive connection
+        assert await _request(reader, writer, "GET", "/health") == (200, {"status": "ok"})
+        status, body = await _request(reader, writer, "POST", "/evaluate/scientific", {"expression": "sqrt(16)"})
+        assert status == 200 and body["result"] == 4.0
+        status, body = await _request(
+            reader, writer, "POST", "/batch", {"mode": "basic", "expressions": ["1 + 1", "2 +"]}
+        )
+        assert status == 200
+        assert body["results"][0]["result"] == 2
+        assert "error" in body["results"][1]
+
+    _with_server(scenario)
+
+
+def test_errors_and_connection_close():
+    async def scenario(reader, writer):
+        status, _ = await _request(reader, writer, "POST", "/evaluate/nope", {"expression": "1"})
+        assert status == 404
+        status, _ = await _request(reader, writer, "POST", "/batch", {"expressions": "1"})
+        assert status == 400
+        for bits in (8.0, "8", None):
+            payload = {"expression": "~0", "bits": bits}
+            status, _ = await _request(reader, writer, "POST", "/evaluate/programmer", payload)
+            assert status == 400
+        status, _ = await _request(reader, writer, "POST", "/evaluate/programmer", {"expression": "~0", "bits": 8})
+        assert status == 200
+        status, _ = await _request(reader, writer, "GET", "/health", close=True)
+        assert status == 200
+        assert await reader.read() == b""
+
+    _with_server(scenario)
+
+
+def test_rejects_bad_content_length():
+    async def send(reader, writer, length):
+        writer.write(f"POST /batch HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        return int(head.split(b" ")[1])
+
+    for length, expected in (("-5", 400), ("1_0", 400), ("abc", 400), (str(1 << 40), 413)):
+
+        async def scenario(reader, writer):
+            return await send(reader, writer, length)
+
+        assert _with_server(scenario) == expected
@@ -0,0 +1,112 @@
+import math
+
+import pytest
+
+from calcservice.engine import ExpressionError
+from calcservice.scientific_calculator import scientific_calculator
+from calcservice.session import Session
+
+
+def test_variables_and_functions():
+    session = Session()
+    assert session.execute("r = 2") == 2
+    session.execute("area(r) = pi * r**2")
+    assert session.execute("total = area(r) + area(1)") == pytest.approx(5 * math.pi)
+    assert session.evaluate("total / pi") == pytest.approx(5)
+
+
+def test_only_downstream_cells_are_recomputed():
+    session = Session()
+    session.define("a", "1")
+    session.define("b", "a * 10")
+    session.define("c", "b + a")
+    session.define("unrelated", "sqrt(16)")
+    session.define("scale", "x * a", ("x",))
+    session.define("d", "scale(2)")
+    order = session.define("a", "2")
+    assert order[0] == "a" and sorted(order[1:]) == ["b", "c", "d", "scale"]
+    assert order.index("b") < order.index("c") and order.index("scale") < order.index("d")
+    assert (session["b"], session["c"], session["d"]) == (20, 22, 4)
+    assert session.define("unrelated", "3") == ["unrelated"]
+
+
+def test_long_chains_do_not_recurse():
+    session = Session()
+    session.define("x0", "1")
+    for i in range(1, 3000):
+        session.define(f"x{i}", f"x{i - 1} + 1")
+    assert len(session.define("x0", "5")) == 3000
+    assert session["x2999"] == 3004
+
+
+def test_errors_and_forward_references():
+    session = Session()
+    session.define("b", "c + 1")
+    with pytest.raises(ExpressionError, match="not defined"):
+        session["b"]
+    assert session.define("c", "10") == ["c", "b"]
+    assert session["b"] == 11
+
+    with pytest.raises(ExpressionError, match="circular"):
+        session.define("c", "b * 2")
+    assert session["c"] == 10  # unchanged
+    with pytest.raises(ExpressionError, match="built-in"):
+        session.define("pi", "3")
+
+    session.define("z", "1/0")
+    session.define("w", "z + 1")
+    with pytest.raises(ExpressionError, match="'z' has no value"):
+        session["w"]
+
+
+def test_save_and_load_restore_values_without_evaluating(tmp_path):
+    session = Session()
+    session.execute("r = 2")
+    session.execute("area(r) = pi * r**2")
+    session.execute("total = area(r) + 1j")
+    session.execute("parts = frexp(8.0)")
+    session.define("bad", "log(0)")
+    path = tmp_path / "work.calc"
+    session.save(str(path))
+
+    loaded = Session.load(str(path))
+    assert loaded["total"] == session["total"]
+    assert loaded["parts"] == (0.5, 4)
+    with pytest.raises(ExpressionError, match="domain"):
+        loaded["bad"]
+    # Nothing was compiled on load; cells compile when recomputed
+    assert all(cell._expression is None for cell in loaded.cells())
+    assert loaded.define("r", "1") == ["r", "total"]
+    assert loaded["total"] == pytest.approx(math.pi + 1j)
+
+
+def test_save_keeps_integers_of_any_size(tmp_path):
+    session = Session()
+    session.execute("big = factorial(3000)")
+    session.execute("small = -big // 10**9000")
+    path = tmp_path / "big.calc"
+    session.save(str(path))
+    loaded = Session.load(str(path))
+    assert loaded["big"] == math.factorial(3000)
+    assert loaded["small"] == -math.factorial(3000) // 10**9000
+    assert [p.name for p in tmp_path.iterdir()] == ["big.calc"]
+
+
+def test_load_rejects_other_files(tmp_path):
+    import gzip
+
+    path = tmp_path / "other.calc"
+    with gzip.open(path, "wt") as f:
+        f.write('{"format": "something-else"}')
+    with pytest.raises(ValueError):
+        Session.load(str(path))
+
+
+def test_interactive_session(monkeypatch, capsys, tmp_path):
+    path = tmp_path / "s.calc"
+    inputs = iter(["r = 2", "area(r) = pi*r**2", "r = 3", "area(r)", f"save {path}", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    scientific_calculator()
+    out = capsys.readouterr().out
+    assert "28.274333882308138" in out
+    assert Session.load(str(path))["r"] == 3
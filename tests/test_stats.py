@@ -0,0 +1,153 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from calcservice.cli import main
+from calcservice.stats import (
+    QuantileDigest,
+    StreamingStats,
+    convert_file,
+    describe_file,
+    histogram_file,
+    read_chunks,
+    statistics_calculator,
+)
+
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(7)
+    data = rng.normal(size=(20_000, 3))
+    data[:, 2] = 0.5 * data[:, 0] + data[:, 1]
+    return data
+
+
+def test_moments_match_numpy_across_chunks_and_merges(table):
+    stats = StreamingStats()
+    for start in range(0, len(table), 3000):
+        stats.update(table[start : start + 3000])
+    other = StreamingStats()
+    other.update(table[:5000])
+    merged = StreamingStats()
+    merged.update(table[5000:])
+    merged.merge(other)
+
+    for result in (stats, merged):
+        assert result.rows == 20_000
+        assert np.allclose(result.mean, table.mean(axis=0), rtol=0, atol=1e-12)
+        assert np.allclose(result.variance(), table.var(axis=0, ddof=1), rtol=1e-12)
+        assert np.array_equal(result.min, table.min(axis=0))
+        assert np.allclose(result.correlation_matrix(), np.corrcoef(table.T), atol=1e-12)
+
+
+def test_variance_is_stable_for_large_offsets():
+    values = 1e9 + np.arange(10.0)
+    stats = StreamingStats()
+    for chunk in np.split(values, 5):
+        stats.update(chunk)
+    assert stats.variance()[0] == pytest.approx(np.var(np.arange(10.0), ddof=1), rel=1e-9)
+
+
+def test_missing_values_are_skipped():
+    data = np.array([[1.0, 2.0], [np.nan, 4.0], [3.0, np.nan], [5.0, 8.0]])
+    stats = StreamingStats()
+    stats.update(data)
+    assert stats.count.tolist() == [3, 3]
+    assert stats.mean.tolist() == pytest.approx([3.0, 14 / 3])
+    # Correlation uses the complete rows only
+    assert stats.complete_rows == 2
+    assert stats.correlation_matrix()[0, 1] == pytest.approx(1.0)
+
+
+def test_quantile_digest_is_accurate_and_bounded():
+    rng = np.random.default_rng(3)
+    values = rng.exponential(size=200_000)
+    digest, other = QuantileDigest(), QuantileDigest()
+    for chunk in np.split(values[:100_000], 10):
+        digest.update(chunk)
+    other.update(values[100_000:])
+    digest.merge(other)
+    assert digest.count == 200_000 and len(digest.means) <= 110
+    q = np.array([0.001, 0.1, 0.5, 0.9, 0.999])
+    ranks = np.searchsorted(np.sort(values), digest.quantile(q)) / values.size
+    assert np.abs(ranks - q).max() < 2e-3
+    assert digest.quantile(0) == values.min() and digest.quantile(1) == values.max()
+    assert digest.cdf(np.median(values)) == pytest.approx(0.5, abs=2e-3)
+
+
+def test_files_in_every_format(tmp_path, table):
+    csv = tmp_path / "data.csv"
+    np.savetxt(csv, table, delimiter=",", header="x,y,z", comments="")
+    npy = tmp_path / "data.npy"
+    np.save(npy, table)
+    raw = tmp_path / "data.bin"
+    table.astype(np.float32).tofile(raw)
+
+    # Small chunks force many CSV blocks and array slices
+    from_csv = describe_file(str(csv), chunk_bytes=4096)
+    from_npy = describe_file(str(npy), chunk_bytes=4096)
+    from_raw = describe_file(str(raw), dtype="float32", columns=3)
+    assert from_csv.names == ["x", "y", "z"] and from_npy.names is None
+    for stats in (from_csv, from_npy, from_raw):
+        assert stats.rows == 20_000
+        assert np.allclose(stats.mean, table.mean(axis=0), atol=1e-6)
+    assert sum(len(chunk) for chunk in read_chunks(str(csv), chunk_bytes=1000)) == 20_000
+
+
+def test_parallel_parts_give_the_same_result(tmp_path, table):
+    csv = tmp_path / "data.csv"
+    np.savetxt(csv, table, delimiter=",")
+    serial = describe_file(str(csv))
+    parallel = describe_file(str(csv), workers=3)
+    assert parallel.rows == serial.rows == 20_000
+    assert np.allclose(parallel.mean, serial.mean, atol=1e-14)
+    assert np.allclose(parallel.variance(), serial.variance(), rtol=1e-12)
+
+
+def test_histograms_are_exact(tmp_path, table):
+    npy = tmp_path / "data.npy"
+    np.save(npy, table)
+    (counts, edges), *_ = histogram_file(str(npy), bins=8)
+    low, high = table.min(), table.max()
+    expected, expected_edges = np.histogram(table[:, 0], 8, (low, high))
+    assert counts.tolist() == expected.tolist()
+    assert np.allclose(edges, expected_edges)
+    with pytest.raises(ValueError, match="range"):
+        StreamingStats(bins=8)
+
+
+def test_convert_file(tmp_path, table):
+    npy = tmp_path / "data.npy"
+    np.save(npy, table)
+    csv = tmp_path / "out.csv"
+    assert convert_file(str(npy), str(csv)) == 20_000
+    back = tmp_path / "back.npy"
+    assert convert_file(str(csv), str(back)) == 20_000
+    assert np.array_equal(np.load(back), table)
+
+
+def test_cli_stats(tmp_path, capsys, table):
+    csv = tmp_path / "data.csv"
+    np.savetxt(csv, table[:, :2], delimiter=",", header="a,b", comments="")
+    assert main(["stats", str(csv), "--quantiles", "0.5", "--bins", "4"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["rows"] == 20_000
+    assert summary["columns"][1]["name"] == "b"
+    assert list(summary["columns"][0]["quantiles"]) == ["0.5"]
+    assert sum(summary["columns"][0]["histogram"]["counts"]) == 20_000
+    assert summary["correlation"][0][0] == pytest.approx(1.0)
+
+
+def test_interactive_mode(monkeypatch, capsys, tmp_path):
+    csv = tmp_path / "data.csv"
+    np.savetxt(csv, np.arange(1, 101.0), delimiter=",", header="value", comments="")
+    inputs = iter([f"describe {csv}", f"quantile {csv} 0.5", f"hist {csv} 4", "describe missing.csv", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    statistics_calculator()
+    out = capsys.readouterr().out
+    assert "value: n=100 mean=50.5" in out
+    assert "[50.5]" in out
+    assert "[1, 25.75): 25" in out
+    assert "Invalid input" in out
@@ -0,0 +1,111 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from calcservice.uncertainty import (
+    Measurement,
+    format_uncertain,
+    monte_carlo,
+    propagate,
+    uncertainty_calculator,
+)
+
+RESISTANCE = {"V": (12.0, 0.05), "I": (0.5, 0.01)}
+
+
+def test_linear_propagation():
+    result = propagate("x * y", {"x": (2.0, 0.1), "y": (3.0, 0.2)})
+    assert result.value == 6.0
+    assert result.uncertainty == pytest.approx(0.5)
+    assert result.sensitivities == {"x": 3.0, "y": 2.0}
+    assert result.contributions == pytest.approx({"x": 0.36, "y": 0.64})
+    # Exact inputs contribute nothing
+    result = propagate("k * x", {"k": 3, "x": (1.0, 0.1)})
+    assert result.uncertainty == pytest.approx(0.3)
+    assert result.contributions["k"] == 0.0
+    # ...and are constants, so they may go through functions without a derivative
+    result = propagate("factorial(n) * x", {"n": 5, "x": (1.0, 0.1)})
+    assert result.uncertainty == pytest.approx(12.0)
+    assert result.sensitivities == {"x": 120.0}
+
+
+def test_correlations():
+    inputs = {"x": (1.0, 0.1), "y": (1.0, 0.1)}
+    assert propagate("x + y", inputs, {("x", "y"): 1}).uncertainty == pytest.approx(0.2)
+    assert propagate("x - y", inputs, {("x", "y"): 1}).uncertainty == pytest.approx(0.0)
+    result = monte_carlo("x + y", inputs, samples=200_000, correlations={("x", "y"): -0.5})
+    assert result.uncertainty == pytest.approx(0.1, rel=0.01)
+    with pytest.raises(ValueError):
+        propagate("x + y", inputs, {("x", "z"): 0.5})
+    # Perfect correlation is a singular, but valid, correlation matrix
+    for rho, expected in ((1, 0.2), (-1, 0.0)):
+        result = monte_carlo("x + y", inputs, samples=100_000, correlations={("x", "y"): rho})
+        assert result.uncertainty == pytest.approx(expected, abs=1e-3)
+    with pytest.raises(ValueError, match="positive"):
+        three = {"x": (1.0, 0.1), "y": (1.0, 0.1), "z": (1.0, 0.1)}
+        monte_carlo("x + y + z", three, samples=10, correlations={("x", "y"): 1, ("y", "z"): 1, ("x", "z"): -1})
+    with pytest.raises(ValueError, match="normally"):
+        monte_carlo("x + y", {"x": Measurement(1, 0.1, "uniform"), "y": (1, 0.1)}, correlations={("x", "y"): 0.5})
+
+
+def test_monte_carlo_agrees_with_linear():
+    linear = propagate("V / I", RESISTANCE)
+    result = monte_carlo("V / I", RESISTANCE, samples=500_000, chunk=100_000)
+    assert result.samples == 500_000
+    assert result.value == pytest.approx(linear.value, rel=1e-3)
+    assert result.uncertainty == pytest.approx(linear.uncertainty, rel=0.02)
+    low, high = result.interval
+    assert low == pytest.approx(linear.value - 1.96 * linear.uncertainty, rel=0.01)
+    assert high == pytest.approx(linear.value + 1.96 * linear.uncertainty, rel=0.01)
+
+
+def test_monte_carlo_is_reproducible():
+    first = monte_carlo("V / I", RESISTANCE, samples=10_000, seed=7)
+    assert monte_carlo("V / I", RESISTANCE, samples=10_000, seed=7) == first
+    assert monte_carlo("V / I", RESISTANCE, samples=10_000, seed=8) != first
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "triangular"])
+def test_distributions_have_the_given_standard_uncertainty(distribution):
+    result = monte_carlo("x", {"x": Measurement(5.0, 2.0, distribution)}, samples=400_000)
+    assert result.value == pytest.approx(5.0, abs=0.02)
+    assert result.uncertainty == pytest.approx(2.0, rel=0.01)
+    # Uniform ±2√3: the central 95 % spans 0.95 of the width
+    if distribution == "uniform":
+        assert result.interval[1] - result.interval[0] == pytest.approx(0.95 * 4 * math.sqrt(3), rel=0.01)
+
+
+def test_errors():
+    with pytest.raises(ValueError, match="non-negative"):
+        propagate("x", {"x": (1.0, -0.1)})
+    with pytest.raises(ValueError, match="distribution"):
+        propagate("x", {"x": Measurement(1.0, 0.1, "cauchy")})
+    with pytest.raises(ValueError, match="finite"):
+        monte_carlo("log(x)", {"x": (-10.0, 0.1)}, samples=100)
+
+
+def test_format_uncertain():
+    assert format_uncertain(24.0371, 0.5153) == "24.04 ± 0.52"
+    assert format_uncertain(123456.0, 789.0) == "123460 ± 790"
+    assert format_uncertain(2.5, 0.0) == "2.5"
+
+
+def test_interactive_mode(monkeypatch, capsys):
+    inputs = iter(
+        [
+            "x * y with x=2±0.1, y=3+-0.2",
+            "seed 3",
+            "mc 100000 V / I with V=12±0.05, I=0.5±0.01",
+            "x with x=1±0.1 cauchy",
+            "exit",
+        ]
+    )
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    uncertainty_calculator()
+    out = capsys.readouterr().out
+    assert "6.00 ± 0.50 (x 36.0%, y 64.0%)" in out
+    assert "seed set to 3" in out
+    assert "95% interval [23.0" in out and "(100000 samples)" in out
+    assert "Invalid input" in out
@@ -0,0 +1,98 @@
+import math
+
+import pytest
+
+from calcservice.engine import ExpressionError
+from calcservice.units import (
+    DimensionError,
+    Quantity,
+    compile_units,
+    conversion,
+    convert,
+    evaluate_units,
+    format_dimension,
+    parse_unit,
+    units_calculator,
+)
+
+
+def test_parse_unit():
+    assert parse_unit("kg*m/s^2") == parse_unit("N") == parse_unit("kg m/s**2")
+    assert parse_unit("km/h").factor == pytest.approx(1 / 3.6)
+    assert parse_unit("ms").factor == 1e-3 and parse_unit("mm").factor == 1e-3
+    assert parse_unit("ft").factor == 0.3048
+    assert format_dimension(parse_unit("V").dimension) == "m^2*kg/(s^3*A)"
+    with pytest.raises(ExpressionError, match="unknown unit"):
+        parse_unit("furlong")
+    with pytest.raises(DimensionError):
+        parse_unit("degC/s")
+
+
+def test_convert():
+    assert convert(100, "km/h", "m/s") == pytest.approx(27.777777777777778)
+    assert convert(212, "degF", "degC") == pytest.approx(100.0)
+    assert convert(0, "degC", "K") == pytest.approx(273.15)
+    assert convert(1, "kWh", "J") == pytest.approx(3.6e6)
+    assert conversion("psi", "kPa") is conversion("psi", "kPa")
+    with pytest.raises(DimensionError, match="cannot convert"):
+        convert(1, "m", "s")
+
+
+def test_convert_arrays_in_one_pass():
+    np = pytest.importorskip("numpy")
+    values = np.linspace(0, 100, 1_000_001)
+    assert np.allclose(convert(values, "degC", "degF"), values * 1.8 + 32)
+    assert convert([1, 2], "mi", "km").tolist() == pytest.approx([1.609344, 3.218688])
+
+
+def test_quantities():
+    speed = Quantity.of(5, "km") / Quantity.of(20, "min")
+    assert speed.to("km/h") == pytest.approx(15.0)
+    assert str(speed) == "4.166666666666667 m/s"
+    area = Quantity.of(3, "m") ** 2
+    assert area.to("cm^2") == pytest.approx(90_000)
+    with pytest.raises(DimensionError):
+        Quantity.of(1, "m") + Quantity.of(1, "s")
+    with pytest.raises(DimensionError):
+        speed.to("kg")
+
+
+def test_expressions():
+    assert evaluate_units("5 km + 300 m", "mi") == pytest.approx(5.3 / 1.609344)
+    assert evaluate_units("5 km / 20 min", "km/h") == pytest.approx(15.0)
+    assert evaluate_units("sqrt(2 * 9.81 m/s^2 * 10 m)", "m/s") == pytest.approx(math.sqrt(196.2))
+    assert evaluate_units("sin(30 deg)").value == pytest.approx(0.5)
+    assert evaluate_units("atan2(1 m, 100 cm)").value == pytest.approx(math.pi / 4)
+    assert str(evaluate_units("2 kN * 3 m / 4 s")) == "1500.0 m^2*kg/s^3"
+
+
+def test_dimensions_are_checked_when_compiling():
+    # None of these expressions is ever evaluated
+    for expression in ["3 m + 2 s", "sin(3 m)", "exp(1 s)", "sqrt(1 m)", "5 m ** x", "1 degC + 1 K"]:
+        with pytest.raises(ExpressionError):
+            compile_units(expression)
+    with pytest.raises(DimensionError, match="incompatible"):
+        compile_units("d + t", {"d": "m", "t": "s"})
+    assert compile_units("d / t", {"d": "km", "t": "h"}).dimension == parse_unit("m/s").dimension
+
+
+def test_compiled_expressions_vectorize():
+    np = pytest.importorskip("numpy")
+    expression = compile_units("d / t", {"d": "km", "t": "h"})
+    assert compile_units("d / t", {"d": "km", "t": "h"}) is expression
+    distance = np.arange(1.0, 1001.0)
+    assert np.allclose(expression.evaluate("m/s", d=distance, t=2), distance / 7.2)
+    assert expression.evaluate("km/h", d=10, t=0.5) == pytest.approx(20.0)
+    with pytest.raises(TypeError, match="missing"):
+        expression.evaluate(d=1)
+
+
+def test_interactive_mode(monkeypatch, capsys):
+    inputs = iter(["5 km + 300 m to m", "100 degC to degF", "60 mph in km/h", "3 m + 2 s", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    units_calculator()
+    out = capsys.readouterr().out
+    assert "The result is:  5300 m" in out
+    assert "The result is:  212 degF" in out
+    assert "96.56064 km/h" in out
+    assert "incompatible dimensions m and s" in out
@@ -0,0 +1,50 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from calcservice.scientific_calculator import evaluate_scientific
+from calcservice.vectorized import evaluate_vectorized, vectorize_expression
+
+
+def test_matches_scalar_evaluation():
+    xs = np.linspace(0.0, 10.0, 101)
+    expected = [evaluate_scientific(f"sin({x})*exp(-{x}/tau)") for x in xs.tolist()]
+    result = evaluate_vectorized("sin(x)*exp(-x/tau)", x=xs)
+    assert result.shape == xs.shape
+    assert np.allclose(result, expected)
+
+
+def test_broadcasting_and_log_base():
+    result = evaluate_vectorized("hypot(x, y) + log(z, 2)", x=[3, 5], y=[4, 12], z=8)
+    assert result.tolist() == [8.0, 16.0]
+
+
+def test_elementwise_fallback_keeps_exact_integers():
+    assert evaluate_vectorized("comb(n, 2)", n=np.arange(5)).tolist() == [0, 0, 1, 3, 6]
+    big = evaluate_vectorized("factorial(n)", n=[5, 30])
+    assert big.tolist() == [120, math.factorial(30)]
+
+
+def test_compiled_function_is_reusable():
+    f = vectorize_expression("x**2 + 1")
+    assert f(x=np.arange(3)).tolist() == [1, 2, 5]
+    with pytest.raises(TypeError):
+        f()
+
+
+def test_elementwise_fallback_applies_engine_limits():
+    from calcservice.engine import ExpressionError
+
+    with pytest.raises(ExpressionError):
+        evaluate_vectorized("factorial(x)", x=[10**7])
+    with pytest.raises(ExpressionError):
+        evaluate_vectorized("factorial(x)", x=10**7)
+
+
+def test_variadic_functions_reduce_pairwise():
+    assert evaluate_vectorized("gcd(x, 6, 4)", x=[8, 9]).tolist() == [2, 1]
+    assert evaluate_vectorized("hypot(x, 3, 4)", x=[0.0, 12.0]).tolist() == [5.0, 13.0]
+    assert evaluate_vectorized("lcm(x, 3**30)", x=[2**40]).tolist() == [math.lcm(2**40, 3**30)]
+    assert evaluate_vectorized("gcd(x, 2**70)", x=[2**10, 3]).tolist() == [2**10, 1]